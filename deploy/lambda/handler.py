@@ -5,6 +5,19 @@ import os
 from typing import Any, Dict
 
 from reddit_researcher.core.orchestrator import main as probe_main
+from reddit_researcher.core.warm import WarmContext
+
+# Lives as long as the container: config and Reddit/Supabase clients are built by the
+# first invocation and reused by warm ones. Importing the orchestrator is cheap; praw
+# and supabase are only imported when the first invocation builds its clients.
+_WARM: WarmContext | None = None
+
+
+def _warm_context() -> WarmContext:
+    global _WARM
+    if _WARM is None:
+        _WARM = WarmContext("config.yaml")
+    return _WARM
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -13,11 +26,19 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     if level:
         os.environ["LOG_LEVEL"] = str(level)
 
+    # Stop starting new work before Lambda's own timeout; with probe.checkpoint the
+    # next invocation resumes whatever is left
+    remaining_ms = getattr(context, "get_remaining_time_in_millis", None)
+    time_budget_sec = remaining_ms() / 1000.0 if callable(remaining_ms) else None
+
     # Run the probe; it prints a JSON summary and returns 0
-    exit_code = probe_main([])
+    warm = _warm_context()
+    exit_code = probe_main([], time_budget_sec=time_budget_sec, warm=warm)
 
     # Respond with a basic payload; CloudWatch logs contain detailed INFO lines
-    body = {"status": "ok" if exit_code == 0 else "error", "exit_code": exit_code}
+    body = {
+        "status": "ok" if exit_code == 0 else "error",
+        "exit_code": exit_code,
+        "warm": warm.invocations > 1,
+    }
     return {"statusCode": 200 if exit_code == 0 else 500, "body": json.dumps(body)}
-
-
@@ -0,0 +1,7 @@
+-- Content digests of the last written posts/comments, used to skip no-op upserts
+create table if not exists public.row_hashes (
+  table_name text not null,
+  id text not null,
+  digest text not null,
+  primary key (table_name, id)
+);
@@ -0,0 +1,2 @@
+-- Per-target breakdown for multi-subreddit fan-out runs
+alter table public.runs add column if not exists targets jsonb;
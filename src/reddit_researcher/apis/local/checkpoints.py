@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+from reddit_researcher.apis.local.sqlite import connect_state_db
+from reddit_researcher.core.checkpoint import Checkpoint
+
+
+class SqliteCheckpointStore:
+    """`CheckpointStore` backed by a local SQLite file."""
+
+    def __init__(self, path: str | Path) -> None:
+        self._conn = connect_state_db(path)
+        self._lock = threading.Lock()
+        self._conn.execute(
+            """
+            create table if not exists run_checkpoints (
+              key text primary key,
+              run_id text not null,
+              payload text not null,
+              updated_at real not null
+            )
+            """
+        )
+
+    def load(self, key: str) -> Checkpoint | None:
+        with self._lock:
+            row = self._conn.execute(
+                "select payload from run_checkpoints where key = ?", (key,)
+            ).fetchone()
+        return Checkpoint.from_json(row[0]) if row is not None else None
+
+    def save(self, key: str, checkpoint: Checkpoint) -> None:
+        with self._lock:
+            self._conn.execute(
+                "insert into run_checkpoints (key, run_id, payload, updated_at)"
+                " values (?, ?, ?, ?)"
+                " on conflict (key) do update set run_id = excluded.run_id,"
+                " payload = excluded.payload, updated_at = excluded.updated_at",
+                (key, checkpoint.run_id, checkpoint.to_json(), time.time()),
+            )
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("delete from run_checkpoints where key = ?", (key,))
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+
+from reddit_researcher.apis.local.sqlite import connect_state_db
+from reddit_researcher.core.comment_delta import CommentState
+
+# Stay well below SQLite's bound-parameter limit
+_LOOKUP_CHUNK = 500
+
+
+class SqliteCommentStateStore:
+    """`CommentStateStore` backed by a local SQLite file (`comment_state` table)."""
+
+    def __init__(self, path: str | Path) -> None:
+        self._conn = connect_state_db(path)
+        self._lock = threading.Lock()
+        self._conn.execute(
+            """
+            create table if not exists comment_state (
+              submission_id text primary key,
+              num_comments integer,
+              fetched_at real not null,
+              known_ids text not null
+            )
+            """
+        )
+
+    def get_many(self, submission_ids: Iterable[str]) -> dict[str, CommentState]:
+        id_list = list(dict.fromkeys(submission_ids))
+        found: dict[str, CommentState] = {}
+        with self._lock:
+            for i in range(0, len(id_list), _LOOKUP_CHUNK):
+                chunk = id_list[i : i + _LOOKUP_CHUNK]
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    "select submission_id, num_comments, fetched_at, known_ids"
+                    f" from comment_state where submission_id in ({marks})",
+                    chunk,
+                ).fetchall()
+                for sid, num_comments, fetched_at, known_ids in rows:
+                    found[str(sid)] = CommentState(
+                        num_comments=None if num_comments is None else int(num_comments),
+                        fetched_at=float(fetched_at),
+                        known_ids=frozenset(json.loads(known_ids)),
+                    )
+        return found
+
+    def put_many(self, states: Mapping[str, CommentState]) -> None:
+        if not states:
+            return
+        with self._lock:
+            self._conn.execute("begin")
+            self._conn.executemany(
+                "insert into comment_state (submission_id, num_comments, fetched_at, known_ids)"
+                " values (?, ?, ?, ?) on conflict (submission_id) do update set"
+                " num_comments = excluded.num_comments, fetched_at = excluded.fetched_at,"
+                " known_ids = excluded.known_ids",
+                [
+                    (sid, st.num_comments, st.fetched_at, json.dumps(sorted(st.known_ids)))
+                    for sid, st in states.items()
+                ],
+            )
+            self._conn.execute("commit")
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+from reddit_researcher.apis.local.sqlite import connect_state_db
+from reddit_researcher.core.incremental import Cursor, CursorKey
+
+
+class SqliteCursorStore:
+    """`CursorStore` backed by a local SQLite file."""
+
+    def __init__(self, path: str | Path) -> None:
+        self._conn = connect_state_db(path)
+        self._lock = threading.Lock()
+        self._conn.execute(
+            """
+            create table if not exists crawl_cursors (
+              subreddit text not null,
+              listing text not null,
+              time_filter text not null,
+              created_utc real not null,
+              fullname text not null,
+              updated_at real not null,
+              primary key (subreddit, listing, time_filter)
+            )
+            """
+        )
+
+    def load(self, key: CursorKey) -> Cursor | None:
+        with self._lock:
+            row = self._conn.execute(
+                "select created_utc, fullname from crawl_cursors"
+                " where subreddit = ? and listing = ? and time_filter = ?",
+                (key.subreddit, key.listing, key.time_filter),
+            ).fetchone()
+        if row is None:
+            return None
+        return Cursor(created_utc=float(row[0]), fullname=str(row[1]))
+
+    def save(self, key: CursorKey, cursor: Cursor) -> None:
+        with self._lock:
+            self._conn.execute(
+                "insert into crawl_cursors"
+                " (subreddit, listing, time_filter, created_utc, fullname, updated_at)"
+                " values (?, ?, ?, ?, ?, ?)"
+                " on conflict (subreddit, listing, time_filter) do update set"
+                " created_utc = excluded.created_utc, fullname = excluded.fullname,"
+                " updated_at = excluded.updated_at",
+                (
+                    key.subreddit,
+                    key.listing,
+                    key.time_filter,
+                    cursor.created_utc,
+                    cursor.fullname,
+                    time.time(),
+                ),
+            )
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+
+from reddit_researcher.apis.local.sqlite import connect_state_db
+
+# Stay well below SQLite's bound-parameter limit
+_LOOKUP_CHUNK = 500
+
+
+class SqliteHashIndex:
+    """`HashIndex` backed by a local SQLite file."""
+
+    def __init__(self, path: str | Path) -> None:
+        self._conn = connect_state_db(path)
+        self._lock = threading.Lock()
+        self._conn.execute(
+            """
+            create table if not exists row_hashes (
+              table_name text not null,
+              id text not null,
+              digest text not null,
+              primary key (table_name, id)
+            )
+            """
+        )
+
+    def get_many(self, table: str, ids: Iterable[str]) -> dict[str, str]:
+        id_list = list(dict.fromkeys(ids))
+        found: dict[str, str] = {}
+        with self._lock:
+            for i in range(0, len(id_list), _LOOKUP_CHUNK):
+                chunk = id_list[i : i + _LOOKUP_CHUNK]
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"select id, digest from row_hashes where table_name = ? and id in ({marks})",
+                    (table, *chunk),
+                ).fetchall()
+                found.update({str(r[0]): str(r[1]) for r in rows})
+        return found
+
+    def put_many(self, table: str, digests: Mapping[str, str]) -> None:
+        if not digests:
+            return
+        with self._lock:
+            self._conn.execute("begin")
+            self._conn.executemany(
+                "insert into row_hashes (table_name, id, digest) values (?, ?, ?)"
+                " on conflict (table_name, id) do update set digest = excluded.digest",
+                [(table, rid, digest) for rid, digest in digests.items()],
+            )
+            self._conn.execute("commit")
+
+    def close(self) -> None:
+        self._conn.close()
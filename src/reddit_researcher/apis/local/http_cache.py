@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+import zlib
+from collections.abc import Callable
+from pathlib import Path
+
+from reddit_researcher.apis.local.sqlite import connect_state_db
+from reddit_researcher.config.config import HttpCacheConfig
+from reddit_researcher.core.response_cache import CachedResponse, CachePolicy
+
+# Eviction trims the cache to this share of `max_bytes`, so a full cache does not
+# evict on every insert
+_EVICT_TO = 0.9
+
+
+class SqliteResponseCache:
+    """`ResponseCache` backed by a local SQLite file (`http_cache` table).
+
+    Bodies are stored zlib-compressed. Once the stored bytes exceed `max_bytes`, the
+    least recently used entries are evicted; a `get` counts as a use.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        policy: CachePolicy | None = None,
+        max_bytes: int = 256 * 1024 * 1024,
+        time_fn: Callable[[], float] = time.time,
+    ) -> None:
+        self.policy = policy or CachePolicy()
+        self.path = str(path)
+        self._max_bytes = max(0, max_bytes)
+        self._time = time_fn
+        self._conn = connect_state_db(path)
+        self._lock = threading.Lock()
+        self._conn.execute(
+            """
+            create table if not exists http_cache (
+              key text primary key,
+              status integer not null,
+              headers text not null,
+              body blob not null,
+              size integer not null,
+              stored_at real not null,
+              expires_at real not null,
+              last_used real not null
+            )
+            """
+        )
+        self._conn.execute(
+            "create index if not exists http_cache_last_used on http_cache (last_used)"
+        )
+        (size,) = self._conn.execute("select coalesce(sum(size), 0) from http_cache").fetchone()
+        self._size = int(size)
+        self.evictions = 0
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            row = self._conn.execute(
+                "select status, headers, body, stored_at, expires_at from http_cache where key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "update http_cache set last_used = ? where key = ?", (self._time(), key)
+            )
+        status, headers, body, stored_at, expires_at = row
+        return CachedResponse(
+            status=int(status),
+            headers=json.loads(headers),
+            body=zlib.decompress(body),
+            stored_at=float(stored_at),
+            expires_at=float(expires_at),
+        )
+
+    def put(self, key: str, response: CachedResponse) -> None:
+        body = zlib.compress(response.body, 1)
+        with self._lock:
+            row = self._conn.execute("select size from http_cache where key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "insert into http_cache"
+                " (key, status, headers, body, size, stored_at, expires_at, last_used)"
+                " values (?, ?, ?, ?, ?, ?, ?, ?) on conflict (key) do update set"
+                " status = excluded.status, headers = excluded.headers, body = excluded.body,"
+                " size = excluded.size, stored_at = excluded.stored_at,"
+                " expires_at = excluded.expires_at, last_used = excluded.last_used",
+                (
+                    key,
+                    response.status,
+                    json.dumps(dict(response.headers)),
+                    body,
+                    len(body),
+                    response.stored_at,
+                    response.expires_at,
+                    self._time(),
+                ),
+            )
+            self._size += len(body) - (int(row[0]) if row else 0)
+            if self._size > self._max_bytes:
+                self._evict(int(self._max_bytes * _EVICT_TO))
+
+    def refresh(self, key: str, expires_at: float) -> None:
+        """Mark a revalidated entry fresh until `expires_at`."""
+        with self._lock:
+            self._conn.execute(
+                "update http_cache set expires_at = ?, last_used = ? where key = ?",
+                (expires_at, self._time(), key),
+            )
+
+    def _evict(self, target: int) -> None:
+        # Caller holds the lock
+        self._conn.execute("begin")
+        rows = self._conn.execute("select key, size from http_cache order by last_used").fetchall()
+        doomed: list[tuple[str]] = []
+        for key, size in rows:
+            if self._size <= target:
+                break
+            doomed.append((key,))
+            self._size -= int(size)
+        self._conn.executemany("delete from http_cache where key = ?", doomed)
+        self._conn.execute("commit")
+        self.evictions += len(doomed)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def make_response_cache(cfg: HttpCacheConfig) -> SqliteResponseCache:
+    """Open the `http_cache` section's cache file with its TTLs and size cap."""
+    return SqliteResponseCache(
+        cfg.path,
+        policy=CachePolicy(
+            default_ttl_sec=cfg.default_ttl_sec, ttl_sec=cfg.ttl_sec, replay=cfg.replay
+        ),
+        max_bytes=int(cfg.max_mb * 1024 * 1024),
+    )
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote
+
+from reddit_researcher.core.records import CommentRecord, PostRecord, iso_utc
+
+# Arrow type aliases per dataset column; "timestamp" columns hold ISO-8601 UTC strings
+# in the rows and are stored as UTC timestamps.
+_ALIASES = {"str": "string", "int": "int64", "float": "double", "bool": "bool"}
+
+
+def _record_types(record_type: type[PostRecord] | type[CommentRecord]) -> dict[str, str]:
+    types = {f.name: _ALIASES[str(f.type).split(" |")[0]] for f in fields(record_type)}
+    types.update(dict.fromkeys(record_type.TIMESTAMPS, "timestamp"))
+    types["run_id"] = "string"
+    return types
+
+
+_DATASETS: dict[str, dict[str, str]] = {
+    "posts": _record_types(PostRecord),
+    "comments": _record_types(CommentRecord),
+    "runs": {
+        "run_id": "string",
+        "started_at": "double",
+        "ended_at": "double",
+        "elapsed_sec": "double",
+        "subreddit": "string",
+        "listing": "string",
+        "post_limit": "int64",
+        "comment_sample": "int64",
+        "replace_more_limit": "int64",
+        "qpm_cap": "int64",
+        "raw_json": "int64",
+        "posts_count": "int64",
+        "comments_total": "int64",
+        "targets": "string",  # JSON, as in runs.targets
+        "telemetry": "string",  # JSON, as in runs.telemetry
+    },
+    "runs_posts": {"run_id": "string", "post_id": "string"},
+    "runs_comments": {"run_id": "string", "comment_id": "string"},
+}
+_ISO_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+@dataclass
+class _Partition:
+    dataset: str
+    path: Path
+    columns: dict[str, list[Any]]
+    writer: Any = None
+    rows: int = 0
+
+
+class ParquetSink:
+    """`MetricsSink` that writes runs, posts and comments as hive-partitioned Parquet.
+
+    Layout under `directory` (`<dataset>/<key>=<value>/.../part-<token>.parquet`):
+
+    - `posts/subreddit=<s>/date=<retrieved day>/`, `comments/subreddit=<s>/date=<...>/`,
+      with the run's `run_id` as an extra column
+    - `runs/date=<started day>/`
+    - `runs_posts/date=<day>/`, `runs_comments/date=<day>/` for link-only writes
+
+    Rows are buffered column-wise per partition and written as one row group every
+    `row_group_rows` rows, compressed with `compression`. Each partition gets one file
+    per sink, written as `.tmp` and renamed by `close()`, so readers never see a
+    partial file.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        row_group_rows: int = 50_000,
+        compression: str = "zstd",
+        time_fn: Callable[[], float] = time.time,
+    ) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+            import pyarrow.parquet as pq
+        except ImportError as exc:  # pragma: no cover - depends on the environment
+            raise RuntimeError(
+                "parquet.enabled requires pyarrow; install the 'parquet' extra"
+            ) from exc
+        self._pa, self._pc, self._pq = pa, pc, pq
+        self._dir = Path(directory)
+        self._row_group_rows = max(1, row_group_rows)
+        self._compression = compression
+        self._time = time_fn
+        # Unique per sink, so reruns and resumed runs add files instead of replacing them
+        started = time.strftime("%Y%m%dT%H%M%S", time.gmtime(time_fn()))
+        self._token = f"{started}-{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._partitions: dict[tuple[str, tuple[tuple[str, str], ...]], _Partition] = {}
+        self.files_written: list[Path] = []
+
+    def upsert_run(self, row: dict[str, Any]) -> None:
+        values = {
+            k: json.dumps(v) if isinstance(v, dict | list) else v for k, v in row.items()
+        }
+        with self._lock:
+            self._append("runs", (("date", _day(iso_utc(row.get("started_at")))),), values, None)
+
+    def upsert_posts(self, rows: Iterable[dict[str, Any]]) -> None:
+        self._append_rows("posts", rows, None)
+
+    def upsert_comments(self, rows: Iterable[dict[str, Any]]) -> None:
+        self._append_rows("comments", rows, None)
+
+    def link_run_posts(self, run_id: str, post_ids: Iterable[str]) -> None:
+        self._append_links("runs_posts", "post_id", run_id, post_ids)
+
+    def link_run_comments(self, run_id: str, comment_ids: Iterable[str]) -> None:
+        self._append_links("runs_comments", "comment_id", run_id, comment_ids)
+
+    def ingest_posts(self, run_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        self._append_rows("posts", rows, run_id)
+
+    def ingest_comments(self, run_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        self._append_rows("comments", rows, run_id)
+
+    def close(self) -> None:
+        """Write buffered rows and publish every partition file."""
+        with self._lock:
+            for part in self._partitions.values():
+                self._write_row_group(part)
+                if part.writer is not None:
+                    part.writer.close()
+                    tmp = part.path.with_name(part.path.name + ".tmp")
+                    tmp.rename(part.path)
+                    self.files_written.append(part.path)
+            self._partitions.clear()
+
+    def _append_rows(
+        self, dataset: str, rows: Iterable[dict[str, Any]], run_id: str | None
+    ) -> None:
+        with self._lock:
+            for row in rows:
+                keys = (
+                    ("subreddit", _partition_value(row.get("subreddit"))),
+                    ("date", _day(row.get("retrieved_at"))),
+                )
+                self._append(dataset, keys, row, run_id)
+
+    def _append_links(self, dataset: str, column: str, run_id: str, ids: Iterable[str]) -> None:
+        keys = (("date", _day(iso_utc(self._time()))),)
+        with self._lock:
+            for rid in ids:
+                self._append(dataset, keys, {column: rid}, run_id)
+
+    def _append(
+        self,
+        dataset: str,
+        keys: tuple[tuple[str, str], ...],
+        row: dict[str, Any],
+        run_id: str | None,
+    ) -> None:
+        part = self._partitions.get((dataset, keys))
+        if part is None:
+            path = self._dir / dataset
+            for name, value in keys:
+                path = path / f"{name}={value}"
+            part = self._partitions[(dataset, keys)] = _Partition(
+                dataset=dataset,
+                path=path / f"part-{self._token}.parquet",
+                columns={name: [] for name in _DATASETS[dataset]},
+            )
+        for name, values in part.columns.items():
+            values.append(row.get(name))
+        if run_id is not None:
+            part.columns["run_id"][-1] = run_id
+        part.rows += 1
+        if part.rows >= self._row_group_rows:
+            self._write_row_group(part)
+
+    def _write_row_group(self, part: _Partition) -> None:
+        if not part.rows:
+            return
+        pa, pc = self._pa, self._pc
+        types = _DATASETS[part.dataset]
+        arrays = []
+        for name, alias in types.items():
+            values = part.columns[name]
+            if alias == "timestamp":
+                parsed = pc.strptime(pa.array(values, pa.string()), format=_ISO_FORMAT, unit="s")
+                arrays.append(parsed.cast(pa.timestamp("s", tz="UTC")))
+            else:
+                arrays.append(pa.array(values, pa.type_for_alias(alias)))
+        table = pa.Table.from_arrays(arrays, names=list(types))
+        if part.writer is None:
+            part.path.parent.mkdir(parents=True, exist_ok=True)
+            part.writer = self._pq.ParquetWriter(
+                part.path.with_name(part.path.name + ".tmp"),
+                table.schema,
+                compression=self._compression,
+            )
+        part.writer.write_table(table, row_group_size=self._row_group_rows)
+        for values in part.columns.values():
+            values.clear()
+        part.rows = 0
+
+
+def _day(iso: str | None) -> str:
+    return iso[:10] if iso else "__HIVE_DEFAULT_PARTITION__"
+
+
+def _partition_value(value: Any) -> str:
+    if value is None or value == "":
+        return "__HIVE_DEFAULT_PARTITION__"
+    return quote(str(value), safe="")
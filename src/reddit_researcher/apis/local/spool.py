@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from reddit_researcher.core.batching import batched
+from reddit_researcher.core.ports import MetricsSink
+
+logger = logging.getLogger(__name__)
+
+# `MetricsSink` calls a spool records; the drainer only replays these
+_OPS = {
+    "upsert_run",
+    "upsert_posts",
+    "upsert_comments",
+    "link_run_posts",
+    "link_run_comments",
+    "ingest_posts",
+    "ingest_comments",
+}
+
+
+class Spool:
+    """Append-only log of sink calls in segmented JSONL files under `directory`.
+
+    Each line is one call (`{"op": ..., "args": [...]}`). Lines go to an open
+    `NNNNNNNN.jsonl.open` segment, which is sealed (renamed to `.jsonl`) once it holds
+    `segment_rows` rows, once it is `segment_age_s` old (checked on `append` and
+    `seal_stale()`) or on `seal()`. Only sealed segments are drained, so the age bound
+    is what lets a drainer keep up with a crawl that writes fewer rows. Segments left
+    open by a crash are sealed on start-up; a torn last line is skipped.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        segment_rows: int = 1000,
+        segment_age_s: float = 5.0,
+        time_fn: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._dir = Path(directory)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._segment_rows = max(1, segment_rows)
+        self._segment_age_s = max(0.0, segment_age_s)
+        self._time = time_fn
+        self._lock = threading.Lock()
+        self._file: Any = None
+        self._path: Path | None = None
+        self._rows = 0
+        self._opened_at = 0.0
+        for stale in sorted(self._dir.glob("*.jsonl.open")):
+            stale.rename(stale.with_suffix(""))
+        existing = [int(p.name.split(".")[0]) for p in self._dir.glob("*.jsonl")]
+        self._seq = max(existing, default=0)
+
+    def append(self, op: str, *args: Any, rows: int = 1) -> None:
+        if op not in _OPS:
+            raise ValueError(f"unknown spool op: {op!r}")
+        line = json.dumps({"op": op, "args": list(args)}, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is None:
+                self._seq += 1
+                self._path = self._dir / f"{self._seq:08d}.jsonl.open"
+                self._file = self._path.open("a", encoding="utf-8")
+                self._opened_at = self._time()
+            self._file.write(line)
+            self._file.flush()
+            self._rows += rows
+            if self._rows >= self._segment_rows or self._is_stale_locked():
+                self._seal_locked()
+
+    def seal(self) -> None:
+        with self._lock:
+            self._seal_locked()
+
+    def seal_stale(self) -> None:
+        """Seal the open segment if it is at least `segment_age_s` old."""
+        with self._lock:
+            if self._is_stale_locked():
+                self._seal_locked()
+
+    def _is_stale_locked(self) -> bool:
+        return self._file is not None and self._time() - self._opened_at >= self._segment_age_s
+
+    def sealed_segments(self) -> list[Path]:
+        return sorted(self._dir.glob("*.jsonl"))
+
+    def _seal_locked(self) -> None:
+        if self._file is None or self._path is None:
+            return
+        self._file.close()
+        self._path.rename(self._path.with_suffix(""))
+        self._file = None
+        self._path = None
+        self._rows = 0
+
+
+def read_segment(path: Path) -> Iterator[tuple[str, list[Any]]]:
+    """Yield the `(op, args)` calls of one segment, skipping a torn final line."""
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning("skipping torn line in spool segment %s", path.name)
+                continue
+            if entry.get("op") in _OPS:
+                yield entry["op"], entry["args"]
+
+
+class SpoolingSink:
+    """`MetricsSink` that only appends to a `Spool`; a `SpoolDrainer` does the real writes.
+
+    Row batches are split into lines of at most `chunk_rows` rows so a large flush
+    never has to be serialized as one string.
+    """
+
+    def __init__(self, spool: Spool, *, chunk_rows: int = 500) -> None:
+        self._spool = spool
+        self._chunk_rows = max(1, chunk_rows)
+
+    def upsert_run(self, row: dict[str, Any]) -> None:
+        self._spool.append("upsert_run", row)
+
+    def upsert_posts(self, rows: Iterable[dict[str, Any]]) -> None:
+        for chunk in self._chunks(rows):
+            self._spool.append("upsert_posts", chunk, rows=len(chunk))
+
+    def upsert_comments(self, rows: Iterable[dict[str, Any]]) -> None:
+        for chunk in self._chunks(rows):
+            self._spool.append("upsert_comments", chunk, rows=len(chunk))
+
+    def link_run_posts(self, run_id: str, post_ids: Iterable[str]) -> None:
+        ids = list(post_ids)
+        self._spool.append("link_run_posts", run_id, ids, rows=len(ids))
+
+    def link_run_comments(self, run_id: str, comment_ids: Iterable[str]) -> None:
+        ids = list(comment_ids)
+        self._spool.append("link_run_comments", run_id, ids, rows=len(ids))
+
+    def ingest_posts(self, run_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        for chunk in self._chunks(rows):
+            self._spool.append("ingest_posts", run_id, chunk, rows=len(chunk))
+
+    def ingest_comments(self, run_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        for chunk in self._chunks(rows):
+            self._spool.append("ingest_comments", run_id, chunk, rows=len(chunk))
+
+    def _chunks(self, rows: Iterable[dict[str, Any]]) -> Iterator[list[dict[str, Any]]]:
+        return batched(rows, self._chunk_rows)
+
+
+class SpoolDrainer:
+    """Replay sealed spool segments into `sink`, oldest first, deleting each when done.
+
+    Replays are safe to repeat (every sink write is an idempotent upsert), so a
+    segment that fails part-way is kept whole and retried on the next pass. With
+    `start()`, a background thread drains every `interval_s` seconds so sink latency
+    and outages stay off the crawl's path; `close()` seals the open segment and makes
+    a final pass.
+    """
+
+    def __init__(self, spool: Spool, sink: MetricsSink, *, interval_s: float = 2.0) -> None:
+        self._spool = spool
+        self._sink = sink
+        self._interval_s = max(0.01, interval_s)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._drain_lock = threading.Lock()
+        self.segments_drained = 0
+        self.calls_replayed = 0
+        self.last_error: BaseException | None = None
+
+    def drain(self) -> bool:
+        """Replay every sealed segment; return False if one failed and was kept."""
+        with self._drain_lock:
+            for path in self._spool.sealed_segments():
+                try:
+                    for op, args in read_segment(path):
+                        getattr(self._sink, op)(*args)
+                        self.calls_replayed += 1
+                except Exception as exc:
+                    self.last_error = exc
+                    logger.warning("spool drain stopped at %s: %s", path.name, exc)
+                    return False
+                path.unlink()
+                self.segments_drained += 1
+            self.last_error = None
+            return True
+
+    def pending_segments(self) -> int:
+        return len(self._spool.sealed_segments())
+
+    def start(self) -> SpoolDrainer:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="spool-drainer", daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self) -> bool:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self._spool.seal()
+        return self.drain()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval_s):
+            # Rows written since the last pass become drainable once their segment ages
+            self._spool.seal_stale()
+            self.drain()
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+
+def connect_state_db(path: str | Path) -> sqlite3.Connection:
+    """Open (creating if needed) the local state database shared by the local stores.
+
+    The connection may be used from worker threads; callers serialize access with
+    their own lock.
+    """
+    db_path = Path(path)
+    if str(db_path) != ":memory:":
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None)
+    conn.execute("pragma journal_mode=wal")
+    conn.execute("pragma synchronous=normal")
+    return conn
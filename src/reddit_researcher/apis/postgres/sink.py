@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import fields
+from typing import Any
+
+from reddit_researcher.config.config import AppConfig
+from reddit_researcher.core.batching import batched
+from reddit_researcher.core.records import CommentRecord, PostRecord
+from reddit_researcher.core.telemetry import TelemetryRecorder
+
+POST_COLUMNS = tuple(f.name for f in fields(PostRecord))
+COMMENT_COLUMNS = tuple(f.name for f in fields(CommentRecord))
+
+
+def connect_postgres(dsn: str) -> Any:
+    """Open an autocommit psycopg connection; each sink write runs its own transaction."""
+    try:
+        import psycopg
+    except ImportError as exc:  # pragma: no cover - depends on the environment
+        raise RuntimeError(
+            "postgres.enabled requires psycopg; install the 'postgres' extra"
+        ) from exc
+    return psycopg.connect(dsn, autocommit=True)
+
+
+def _ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+class PostgresCopySink:
+    """`MetricsSink` that bulk-loads over a direct Postgres connection.
+
+    Each batch of up to `copy_batch_rows` rows is streamed with `COPY ... FROM STDIN`
+    into a temporary staging table shaped like its target, then merged with a single
+    `INSERT ... SELECT ... ON CONFLICT` (plus the run's link rows for `ingest_*`), all
+    in one transaction. Conflict handling matches the Supabase sink, so both can write
+    to the same tables. Calls are serialized on the one connection.
+    """
+
+    def __init__(
+        self,
+        cfg: AppConfig,
+        *,
+        telemetry: TelemetryRecorder | None = None,
+        connect: Callable[[str], Any] = connect_postgres,
+    ) -> None:
+        self._conn = connect(cfg.postgres.dsn)
+        self._schema = _ident(cfg.postgres.schema)
+        self._batch_rows = max(1, cfg.postgres.copy_batch_rows)
+        self._telemetry = telemetry
+        self._lock = threading.Lock()
+
+    def upsert_run(self, row: dict[str, Any]) -> None:
+        columns = list(row)
+        values: list[Any] = []
+        placeholders: list[str] = []
+        for name in columns:
+            value = row[name]
+            if isinstance(value, dict | list):
+                # e.g. runs.targets (migrations/0004)
+                values.append(json.dumps(value))
+                placeholders.append("%s::jsonb")
+            else:
+                values.append(value)
+                placeholders.append("%s")
+        updates = ", ".join(f"{_ident(c)} = excluded.{_ident(c)}" for c in columns if c != "run_id")
+        statement = (
+            f"insert into {self._table('runs')} ({', '.join(map(_ident, columns))}) "
+            f"values ({', '.join(placeholders)}) on conflict (run_id) "
+            + (f"do update set {updates}" if updates else "do nothing")
+        )
+        started = time.perf_counter()
+        with self._lock, self._conn.transaction(), self._conn.cursor() as cur:
+            cur.execute(statement, values)
+        self._record("runs", started, 1)
+
+    def upsert_posts(self, rows: Iterable[dict[str, Any]]) -> None:
+        self._merge("posts", POST_COLUMNS, rows)
+
+    def upsert_comments(self, rows: Iterable[dict[str, Any]]) -> None:
+        self._merge("comments", COMMENT_COLUMNS, rows)
+
+    def link_run_posts(self, run_id: str, post_ids: Iterable[str]) -> None:
+        self._link("runs_posts", "post_id", run_id, post_ids)
+
+    def link_run_comments(self, run_id: str, comment_ids: Iterable[str]) -> None:
+        self._link("runs_comments", "comment_id", run_id, comment_ids)
+
+    def ingest_posts(self, run_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        self._merge("posts", POST_COLUMNS, rows, link=("runs_posts", "post_id", run_id))
+
+    def ingest_comments(self, run_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        self._merge(
+            "comments", COMMENT_COLUMNS, rows, link=("runs_comments", "comment_id", run_id)
+        )
+
+    def _table(self, name: str) -> str:
+        return f"{self._schema}.{_ident(name)}"
+
+    def _merge(
+        self,
+        table: str,
+        columns: tuple[str, ...],
+        rows: Iterable[dict[str, Any]],
+        *,
+        link: tuple[str, str, str] | None = None,
+    ) -> None:
+        stage = _ident(f"_stage_{table}")
+        cols = ", ".join(map(_ident, columns))
+        updates = ", ".join(f"{_ident(c)} = excluded.{_ident(c)}" for c in columns if c != "id")
+        merge = (
+            f"insert into {self._table(table)} ({cols}) "
+            f"select distinct on (id) {cols} from {stage} "
+            f"on conflict (id) do update set {updates}"
+        )
+        for batch in batched(rows, self._batch_rows):
+            started = time.perf_counter()
+            with self._lock, self._conn.transaction(), self._conn.cursor() as cur:
+                cur.execute(
+                    f"create temp table {stage} (like {self._table(table)}) on commit drop"
+                )
+                with cur.copy(f"copy {stage} ({cols}) from stdin") as copy:
+                    for row in batch:
+                        copy.write_row(tuple(row.get(c) for c in columns))
+                cur.execute(merge)
+                if link is not None:
+                    link_table, id_column, run_id = link
+                    cur.execute(
+                        f"insert into {self._table(link_table)} (run_id, {_ident(id_column)}) "
+                        f"select distinct %s::text, id from {stage} on conflict do nothing",
+                        (run_id,),
+                    )
+            self._record(table, started, len(batch))
+
+    def _link(self, table: str, id_column: str, run_id: str, ids: Iterable[str]) -> None:
+        stage = _ident(f"_stage_{table}")
+        for batch in batched(ids, self._batch_rows):
+            started = time.perf_counter()
+            with self._lock, self._conn.transaction(), self._conn.cursor() as cur:
+                cur.execute(f"create temp table {stage} (id text) on commit drop")
+                with cur.copy(f"copy {stage} (id) from stdin") as copy:
+                    for rid in batch:
+                        copy.write_row((rid,))
+                cur.execute(
+                    f"insert into {self._table(table)} (run_id, {_ident(id_column)}) "
+                    f"select distinct %s::text, id from {stage} on conflict do nothing",
+                    (run_id,),
+                )
+            self._record(table, started, len(batch))
+
+    def _record(self, table: str, started: float, rows: int) -> None:
+        if self._telemetry is not None:
+            self._telemetry.record(
+                f"postgres.copy.{table}", None, time.perf_counter() - started, rows=rows
+            )
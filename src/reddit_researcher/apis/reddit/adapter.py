@@ -1,43 +1,113 @@
 from __future__ import annotations
 
-from collections.abc import Iterator
+from collections.abc import Callable, Collection, Iterator, Mapping
 from typing import Any
 
 from reddit_researcher.apis.reddit.comments import fetch_comments as _fetch_comments
-from reddit_researcher.apis.reddit.listings import iter_hot, iter_top
-from reddit_researcher.apis.reddit.reddit_client import make_reddit
+from reddit_researcher.apis.reddit.listings import iter_hot, iter_new, iter_top
+from reddit_researcher.apis.reddit.reddit_client import make_reddit, paced_iter
 from reddit_researcher.config.config import AppConfig
+from reddit_researcher.core.incremental import Cursor, applies_to, skip_seen
+from reddit_researcher.core.ratelimit import AdaptiveRateLimiter, RateLimiter
+from reddit_researcher.core.response_cache import is_cache_hit
+from reddit_researcher.core.retry import RetryPolicy
+from reddit_researcher.core.telemetry import TelemetryRecorder
 
 
 class RedditSourceAdapter:
-    def __init__(self, cfg: AppConfig) -> None:
+    def __init__(
+        self,
+        cfg: AppConfig,
+        *,
+        limiter: RateLimiter | None = None,
+        telemetry: TelemetryRecorder | None = None,
+        make_client: Callable[..., Any] | None = None,
+        retry: RetryPolicy | None = None,
+    ) -> None:
         self._cfg = cfg
-        self._client = make_reddit(cfg)
+        # Retries comment requests one at a time; PRAW's listing generators page on their own
+        self._retry = retry
+        # Shared with the orchestrator so concurrent workers honor one QPM cap
+        self._limiter = limiter
+        self._telemetry = telemetry
+        # `make_client` lets a warm process reuse one client (see core/warm.py)
+        self._client = (make_client or make_reddit)(cfg, on_response=self._on_response)
+
+    def _on_response(
+        self,
+        endpoint: str,
+        headers: Mapping[str, str],
+        elapsed_s: float,
+        status: int,
+        nbytes: int = 0,
+    ) -> None:
+        if is_cache_hit(headers):
+            # Served from the response cache: no request, no limiter token
+            if self._telemetry is not None:
+                self._telemetry.record(f"cache:{endpoint}", None, elapsed_s)
+            return
+        if isinstance(self._limiter, AdaptiveRateLimiter):
+            self._limiter.observe(headers)
+        if self._telemetry is not None:
+            self._telemetry.record(
+                endpoint=f"reddit:{endpoint}", headers=headers, elapsed_s=elapsed_s, nbytes=nbytes
+            )
 
     def iter_posts(
-        self, subreddit: str, listing: str, time_filter: str, limit: int
+        self,
+        subreddit: str,
+        listing: str,
+        time_filter: str,
+        limit: int,
+        *,
+        since: Cursor | None = None,
+        after: str | None = None,
     ) -> Iterator[Any]:
+        items: Iterator[Any]
         if listing == "hot":
-            return iter_hot(
+            items = iter_hot(
                 self._client,
                 subreddit=subreddit,
                 limit=limit,
                 raw_json=self._cfg.probe.raw_json,
+                after=after,
             )
-        return iter_top(
-            self._client,
-            subreddit=subreddit,
-            time_filter=time_filter,
-            limit=limit,
-            raw_json=self._cfg.probe.raw_json,
-        )
+        elif listing == "new":
+            items = iter_new(
+                self._client,
+                subreddit=subreddit,
+                limit=limit,
+                raw_json=self._cfg.probe.raw_json,
+                after=after,
+            )
+        else:
+            items = iter_top(
+                self._client,
+                subreddit=subreddit,
+                time_filter=time_filter,
+                limit=limit,
+                raw_json=self._cfg.probe.raw_json,
+                after=after,
+            )
+        # One token per listing page: the generator sends a request when it needs a page
+        items = paced_iter(items, self._limiter)
+        # `new` is time-ordered, so the first already-seen post ends pagination
+        return skip_seen(items, since) if applies_to(listing) else items
 
-    def fetch_comments(self, submission_id: str, replace_more_limit: int) -> list[Any]:
+    def fetch_comments(
+        self,
+        submission_id: str,
+        replace_more_limit: int,
+        *,
+        known_ids: Collection[str] | None = None,
+    ) -> list[Any]:
         return _fetch_comments(
             self._client,
             submission_id=submission_id,
             replace_more_limit=replace_more_limit,
-            limiter=None,
+            limiter=self._limiter,
+            known_ids=known_ids,
+            retry=self._retry,
         )
 
 
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Collection
+from typing import Any
+
+from reddit_researcher.apis.reddit.json_source import PAGE_SIZE, _flatten, _strip_replies, _unseen
+from reddit_researcher.apis.reddit.reddit_client import endpoint_label, make_user_agent
+from reddit_researcher.config.config import AppConfig
+from reddit_researcher.core.aio import AsyncRateLimiter
+from reddit_researcher.core.budget import MORECHILDREN_BATCH
+from reddit_researcher.core.incremental import Cursor, applies_to, skip_seen_async
+from reddit_researcher.core.ratelimit import compute_backoff_seconds, parse_retry_after
+from reddit_researcher.core.telemetry import Stopwatch, TelemetryRecorder
+
+TOKEN_URL = "https://www.reddit.com/api/v1/access_token"
+OAUTH_BASE = "https://oauth.reddit.com"
+# Statuses retried like prawcore does: throttling and transient server errors
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class AsyncRedditJsonSource:
+    """`AsyncRedditSource` over Reddit's OAuth JSON endpoints, on one `httpx.AsyncClient`.
+
+    The asyncio counterpart of `RedditJsonSourceAdapter`: same requests, same raw
+    `data` dicts, same morechildren packing. Concurrent `fetch_comments` calls share
+    the client's connection pool instead of a thread each. Every request first
+    awaits `limiter`. The app-only token is fetched on first use and refreshed when
+    it expires or a request gets a 401. 429s, 5xx and transport errors are retried
+    with backoff, honoring `Retry-After`.
+    """
+
+    def __init__(
+        self,
+        cfg: AppConfig,
+        *,
+        limiter: AsyncRateLimiter | None = None,
+        telemetry: TelemetryRecorder | None = None,
+        client: Any | None = None,
+        max_connections: int = 32,
+        max_retries: int = 3,
+    ) -> None:
+        try:
+            import httpx
+        except ImportError as exc:  # pragma: no cover - httpx comes with supabase
+            raise RuntimeError(
+                "the async source needs httpx: pip install 'reddit-researcher[async]'"
+            ) from exc
+        self._cfg = cfg
+        self._limiter = limiter
+        self._telemetry = telemetry
+        self._max_retries = max(0, max_retries)
+        self._client = client or httpx.AsyncClient(
+            headers={"User-Agent": make_user_agent(cfg.reddit.user_agent)},
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+            timeout=httpx.Timeout(30.0),
+        )
+        self._token: str | None = None
+        self._token_expires = 0.0
+        self._token_lock = asyncio.Lock()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def __aenter__(self) -> AsyncRedditJsonSource:
+        return self
+
+    async def __aexit__(self, *_exc: Any) -> None:
+        await self.aclose()
+
+    def iter_posts(
+        self,
+        subreddit: str,
+        listing: str,
+        time_filter: str,
+        limit: int,
+        *,
+        since: Cursor | None = None,
+    ) -> AsyncIterator[Any]:
+        items = self._iter_listing(subreddit, listing, time_filter, limit)
+        # `new` is time-ordered, so the first already-seen post ends pagination
+        return skip_seen_async(items, since) if applies_to(listing) else items
+
+    async def _iter_listing(
+        self, subreddit: str, listing: str, time_filter: str, limit: int
+    ) -> AsyncIterator[dict[str, Any]]:
+        path = f"/r/{subreddit}/{listing if listing in {'hot', 'new'} else 'top'}"
+        after: str | None = None
+        yielded = 0
+        while yielded < limit:
+            params: dict[str, Any] = {"limit": min(PAGE_SIZE, limit - yielded)}
+            if path.endswith("/top"):
+                params["t"] = time_filter
+            if after:
+                params["after"] = after
+            page = (await self._get(path, params)).get("data") or {}
+            children = page.get("children") or []
+            for child in children:
+                if child.get("kind") != "t3":
+                    continue
+                yield child["data"]
+                yielded += 1
+                if yielded >= limit:
+                    return
+            after = page.get("after")
+            if not after or not children:
+                return
+
+    async def fetch_comments(
+        self,
+        submission_id: str,
+        replace_more_limit: int,
+        *,
+        known_ids: Collection[str] | None = None,
+    ) -> list[Any]:
+        params = {"sort": "new"} if known_ids is not None else {}
+        body = await self._get(f"/comments/{submission_id}", params)
+        comments: list[dict[str, Any]] = []
+        pending_more: list[dict[str, Any]] = []
+        tree = body[1] if isinstance(body, list) and len(body) > 1 else {}
+        _flatten(tree, comments, pending_more)
+
+        pending_ids: deque[str] = deque(
+            _unseen((cid for more in pending_more for cid in more.get("children") or []), known_ids)
+        )
+        requests_left = replace_more_limit
+        while pending_ids and requests_left > 0:
+            size = min(MORECHILDREN_BATCH, len(pending_ids))
+            batch = [pending_ids.popleft() for _ in range(size)]
+            requests_left -= 1
+            body = await self._get(
+                "/api/morechildren",
+                {"api_type": "json", "link_id": f"t3_{submission_id}", "children": ",".join(batch)},
+            )
+            for thing in ((body.get("json") or {}).get("data") or {}).get("things") or []:
+                if thing.get("kind") == "t1":
+                    comments.append(_strip_replies(thing["data"]))
+                elif thing.get("kind") == "more":
+                    children = (thing.get("data") or {}).get("children") or []
+                    pending_ids.extend(_unseen(children, known_ids))
+        return comments
+
+    async def _get(self, path: str, params: dict[str, Any]) -> Any:
+        import httpx
+
+        params = {**params, "raw_json": self._cfg.probe.raw_json}
+        attempt = 0
+        while True:
+            if self._limiter is not None:
+                await self._limiter.acquire()
+            token = await self._access_token()
+            try:
+                with Stopwatch() as sw:
+                    resp = await self._client.get(
+                        OAUTH_BASE + path,
+                        params=params,
+                        headers={"Authorization": f"bearer {token}"},
+                    )
+            except httpx.TransportError:
+                # Connection reset or timeout: retried like a 5xx
+                if attempt >= self._max_retries:
+                    raise
+                await asyncio.sleep(compute_backoff_seconds(attempt))
+                attempt += 1
+                continue
+            self._on_response(path, resp, sw.elapsed or 0.0)
+            if resp.status_code == 401 and attempt == 0:
+                # Token revoked or expired early; fetch a new one once
+                self._token = None
+                attempt += 1
+                continue
+            if resp.status_code in _RETRY_STATUSES and attempt < self._max_retries:
+                await asyncio.sleep(
+                    compute_backoff_seconds(attempt, retry_after_s=parse_retry_after(resp.headers))
+                )
+                attempt += 1
+                continue
+            resp.raise_for_status()
+            return resp.json()
+
+    async def _access_token(self) -> str:
+        async with self._token_lock:
+            if self._token is None or time.monotonic() >= self._token_expires:
+                rcfg = self._cfg.reddit
+                with Stopwatch() as sw:
+                    resp = await self._client.post(
+                        TOKEN_URL,
+                        data={"grant_type": "client_credentials"},
+                        auth=(rcfg.client_id, rcfg.client_secret),
+                    )
+                self._on_response("/api/v1/access_token", resp, sw.elapsed or 0.0)
+                resp.raise_for_status()
+                body = resp.json()
+                self._token = str(body["access_token"])
+                # Refresh a minute early rather than race the expiry
+                self._token_expires = time.monotonic() + float(body.get("expires_in", 3600)) - 60
+            return self._token
+
+    def _on_response(self, path: str, resp: Any, elapsed_s: float) -> None:
+        if self._limiter is not None:
+            self._limiter.observe(resp.headers)
+        if self._telemetry is not None:
+            self._telemetry.record(
+                endpoint=f"reddit:{endpoint_label(path)}",
+                headers=resp.headers,
+                elapsed_s=elapsed_s,
+                nbytes=len(resp.content),
+            )
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Callable, Mapping
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from reddit_researcher.apis.reddit.reddit_client import endpoint_label
+from reddit_researcher.core.ports import ResponseCache
+from reddit_researcher.core.response_cache import (
+    CACHE_HEADER,
+    STORED_HEADERS,
+    CachedResponse,
+    cache_key,
+)
+
+# Imported by `reddit_client._make_session` only when a cache is configured, since it
+# needs `requests` at import time.
+
+TOKEN_PATH = "/api/v1/access_token"
+
+
+class CacheMiss(requests.ConnectionError):
+    """A replay-only run asked for a response the cache does not hold."""
+
+    # Asking again cannot help (see `core/retry.py::is_retryable`)
+    retryable = False
+
+
+class CachingAdapter(HTTPAdapter):
+    """`requests` transport adapter that answers Reddit GETs from a `ResponseCache`.
+
+    A fresh entry is returned without a request (`x-probe-cache: hit`). A stale entry
+    that carries an ETag or Last-Modified is revalidated with a conditional request; a
+    304 refreshes it and returns the cached body (`x-probe-cache: revalidated`) with
+    the live response's rate-limit headers. A 200 is stored for the endpoint's TTL.
+
+    In replay mode nothing goes out: entries are served however old, a miss raises
+    `CacheMiss`, and the OAuth token request gets a placeholder token.
+
+    Requests that do go out are sent through `transport` when given (e.g. an adapter
+    that takes a rate-limit token first), so cached answers cost nothing.
+    """
+
+    def __init__(
+        self,
+        cache: ResponseCache,
+        *,
+        transport: HTTPAdapter | None = None,
+        time_fn: Callable[[], float] = time.time,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self._cache = cache
+        self._transport = transport
+        self._time = time_fn
+
+    def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+        super().close()
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:  # type: ignore[override]
+        policy = self._cache.policy
+        url = request.url or ""
+        if request.method != "GET":
+            if policy.replay and url.split("?")[0].endswith(TOKEN_PATH):
+                return _replay_token(request)
+            return self._send(request, **kwargs)
+
+        key = cache_key("GET", url)
+        now = self._time()
+        entry = self._cache.get(key)
+        if entry is not None and (policy.replay or entry.expires_at > now):
+            return _from_cache(request, entry, "hit")
+        if policy.replay:
+            raise CacheMiss(f"not in the response cache: {url}", request=request)
+
+        if entry is not None:
+            request.headers.update(entry.validators)
+        resp = self._send(request, **kwargs)
+        ttl = policy.ttl(endpoint_label(url))
+        if resp.status_code == 304 and entry is not None:
+            self._cache.refresh(key, now + ttl)
+            live = resp.headers
+            resp.close()
+            return _from_cache(request, entry, "revalidated", live)
+        if resp.status_code == 200 and ttl > 0:
+            self._cache.put(
+                key,
+                CachedResponse(
+                    status=200,
+                    headers={k: resp.headers[k] for k in STORED_HEADERS if k in resp.headers},
+                    body=resp.content,
+                    stored_at=now,
+                    expires_at=now + ttl,
+                ),
+            )
+        return resp
+
+    def _send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        if self._transport is not None:
+            return self._transport.send(request, **kwargs)
+        return super().send(request, **kwargs)
+
+
+def _from_cache(
+    request: requests.PreparedRequest,
+    entry: CachedResponse,
+    outcome: str,
+    live_headers: Mapping[str, str] | None = None,
+) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = entry.status
+    resp.reason = "OK"
+    resp.headers = CaseInsensitiveDict({**(live_headers or {}), **entry.headers})
+    resp.headers[CACHE_HEADER] = outcome
+    resp._content = entry.body
+    resp.url = request.url or ""
+    resp.request = request
+    return resp
+
+
+def _replay_token(request: requests.PreparedRequest) -> requests.Response:
+    token = {"access_token": "replay", "token_type": "bearer", "expires_in": 86400, "scope": "*"}
+    return _from_cache(
+        request,
+        CachedResponse(
+            status=200,
+            headers={"content-type": "application/json"},
+            body=json.dumps(token).encode(),
+            stored_at=0.0,
+            expires_at=0.0,
+        ),
+        "hit",
+    )
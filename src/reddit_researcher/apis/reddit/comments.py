@@ -1,10 +1,16 @@
 from __future__ import annotations
 
-from typing import Any
-
-import praw
+import logging
+from collections.abc import Callable, Collection
+from typing import TYPE_CHECKING, Any
 
+from reddit_researcher.apis.reddit.reddit_client import paced_requests
 from reddit_researcher.core.ratelimit import RateLimiter
+from reddit_researcher.core.retry import RetryPolicy
+
+if TYPE_CHECKING:
+    import praw
+    from praw.models.comment_forest import CommentForest
 
 
 def fetch_comments(
@@ -13,13 +19,66 @@ def fetch_comments(
     *,
     replace_more_limit: int,
     limiter: RateLimiter | None = None,
+    known_ids: Collection[str] | None = None,
+    retry: RetryPolicy | None = None,
 ) -> list[Any]:
+    from praw.models import MoreComments
+
+    call: Callable[[Callable[[], Any]], Any] = retry.call if retry is not None else _once
     sub = reddit.submission(id=submission_id)
-    if limiter:
-        limiter.acquire()
-    sub.comments.replace_more(limit=replace_more_limit)
-    if limiter:
-        limiter.acquire()
-    return list(sub.comments.list())
+    if known_ids is not None:
+        # Comment-delta mode: load newest-first; once the initial load already
+        # reaches comments seen before, the "more" stubs hold only older ones.
+        sub.comment_sort = "new"
+    # One token per HTTP request: the initial load, each stub `replace_more` expands and
+    # each retry
+    with paced_requests(limiter):
+        # Reading `comments` fetches the submission's initial comment tree
+        forest = call(lambda: sub.comments)
+        limit = replace_more_limit
+        if known_ids is not None and any(
+            c.id in known_ids for c in forest.list() if not isinstance(c, MoreComments)
+        ):
+            limit = 0
+        try:
+            _replace_more(forest, limit, call)
+        except Exception as exc:
+            logging.getLogger("reddit_researcher.probe").warning(
+                "replace_more failed for %s, keeping the comments loaded so far: %s",
+                submission_id,
+                exc,
+            )
+    return [c for c in forest.list() if not isinstance(c, MoreComments)]
+
+
+def _replace_more(
+    forest: CommentForest, limit: int, call: Callable[[Callable[[], Any]], Any]
+) -> None:
+    """`forest.replace_more(limit=limit)` that resumes when retried after a failure.
+
+    Stubs PRAW expanded before a request failed are already gone from the tree, so
+    each retry continues with the stubs left and only the rest of `limit`. (Stubs
+    surfaced and expanded within the failed attempt are not counted, so a retry may
+    spend a few more requests than `limit`.)
+    """
+    from praw.models import MoreComments
+
+    remaining = limit
+
+    def _attempt() -> None:
+        nonlocal remaining
+        stubs = [c for c in forest.list() if isinstance(c, MoreComments)]
+        try:
+            forest.replace_more(limit=remaining)
+        except Exception:
+            left = {id(c) for c in forest.list() if isinstance(c, MoreComments)}
+            remaining = max(0, remaining - sum(1 for c in stubs if id(c) not in left))
+            raise
+
+    call(_attempt)
+
+
+def _once(fn: Callable[[], Any]) -> Any:
+    return fn()
 
 
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import logging
+from collections import deque
+from collections.abc import Callable, Collection, Iterable, Iterator, Mapping
+from typing import Any
+
+from reddit_researcher.apis.reddit.reddit_client import make_json_session, paced_requests
+from reddit_researcher.config.config import AppConfig
+from reddit_researcher.core.budget import MORECHILDREN_BATCH
+from reddit_researcher.core.incremental import Cursor, applies_to, skip_seen
+from reddit_researcher.core.ratelimit import AdaptiveRateLimiter, RateLimiter
+from reddit_researcher.core.response_cache import is_cache_hit
+from reddit_researcher.core.retry import RetryPolicy
+from reddit_researcher.core.telemetry import TelemetryRecorder
+
+# Reddit caps listing pages at 100 items
+PAGE_SIZE = 100
+
+
+class RedditJsonSourceAdapter:
+    """`RedditSource` that reads the OAuth JSON endpoints directly.
+
+    Listing children and comments are yielded as their raw `data` dicts, which
+    `core/normalizers.py` normalizes without building PRAW models first.
+    """
+
+    def __init__(
+        self,
+        cfg: AppConfig,
+        *,
+        limiter: RateLimiter | None = None,
+        telemetry: TelemetryRecorder | None = None,
+        session: Any | None = None,
+        make_session: Callable[..., Any] | None = None,
+        retry: RetryPolicy | None = None,
+    ) -> None:
+        self._cfg = cfg
+        self._limiter = limiter
+        self._telemetry = telemetry
+        self._retry = retry
+        self._session = session or (make_session or make_json_session)(
+            cfg, on_response=self._on_response
+        )
+
+    def _on_response(
+        self,
+        endpoint: str,
+        headers: Mapping[str, str],
+        elapsed_s: float,
+        status: int,
+        nbytes: int = 0,
+    ) -> None:
+        if is_cache_hit(headers):
+            # Served from the response cache: no request, no limiter token
+            if self._telemetry is not None:
+                self._telemetry.record(f"cache:{endpoint}", None, elapsed_s)
+            return
+        if isinstance(self._limiter, AdaptiveRateLimiter):
+            self._limiter.observe(headers)
+        if self._telemetry is not None:
+            self._telemetry.record(
+                endpoint=f"reddit:{endpoint}", headers=headers, elapsed_s=elapsed_s, nbytes=nbytes
+            )
+
+    def _get(self, path: str, params: dict[str, Any]) -> Any:
+        """One GET, retried on its own by `retry`.
+
+        Each request the session sends (retries and prawcore's own included) takes a
+        limiter token; one answered by the response cache does not.
+        """
+        params = {**params, "raw_json": self._cfg.probe.raw_json}
+
+        def _request() -> Any:
+            with paced_requests(self._limiter):
+                return self._session.request(method="GET", path=path, params=params)
+
+        return self._retry.call(_request) if self._retry is not None else _request()
+
+    def iter_posts(
+        self,
+        subreddit: str,
+        listing: str,
+        time_filter: str,
+        limit: int,
+        *,
+        since: Cursor | None = None,
+        after: str | None = None,
+    ) -> Iterator[Any]:
+        items = self._iter_listing(subreddit, listing, time_filter, limit, after)
+        # `new` is time-ordered, so the first already-seen post ends pagination
+        return skip_seen(items, since) if applies_to(listing) else items
+
+    def _iter_listing(
+        self, subreddit: str, listing: str, time_filter: str, limit: int, after: str | None
+    ) -> Iterator[dict[str, Any]]:
+        path = f"/r/{subreddit}/{listing if listing in {'hot', 'new'} else 'top'}"
+        yielded = 0
+        while yielded < limit:
+            params: dict[str, Any] = {"limit": min(PAGE_SIZE, limit - yielded)}
+            if path.endswith("/top"):
+                params["t"] = time_filter
+            if after:
+                params["after"] = after
+            page = self._get(path, params).get("data") or {}
+            children = page.get("children") or []
+            for child in children:
+                if child.get("kind") != "t3":
+                    continue
+                yield child["data"]
+                yielded += 1
+                if yielded >= limit:
+                    return
+            after = page.get("after")
+            if not after or not children:
+                return
+
+    def fetch_comments(
+        self,
+        submission_id: str,
+        replace_more_limit: int,
+        *,
+        known_ids: Collection[str] | None = None,
+    ) -> list[Any]:
+        # With `known_ids` (comment-delta mode) the tree is loaded newest-first and
+        # "more" stubs are only expanded for comment IDs not seen before.
+        params = {"sort": "new"} if known_ids is not None else {}
+        body = self._get(f"/comments/{submission_id}", params)
+        comments: list[dict[str, Any]] = []
+        pending_more: list[dict[str, Any]] = []
+        # Body is [submission listing, comment listing]
+        tree = body[1] if isinstance(body, list) and len(body) > 1 else {}
+        _flatten(tree, comments, pending_more)
+
+        # Pack pending child IDs from every "more" stub into maximal morechildren
+        # batches; `replace_more_limit` caps the number of morechildren requests.
+        pending_ids: deque[str] = deque(
+            _unseen((cid for more in pending_more for cid in more.get("children") or []), known_ids)
+        )
+        # Each request is retried on its own, so a failure does not redo the batches
+        # already fetched; one that still fails ends the expansion with what it has.
+        requests_left = replace_more_limit
+        while pending_ids and requests_left > 0:
+            size = min(MORECHILDREN_BATCH, len(pending_ids))
+            batch = [pending_ids.popleft() for _ in range(size)]
+            requests_left -= 1
+            try:
+                things = self._morechildren(submission_id, batch)
+            except Exception as exc:
+                logging.getLogger("reddit_researcher.probe").warning(
+                    "morechildren failed for %s, keeping %d comments: %s",
+                    submission_id,
+                    len(comments),
+                    exc,
+                )
+                if self._telemetry is not None:
+                    self._telemetry.record("comments.partial", None, None)
+                break
+            for thing in things:
+                if thing.get("kind") == "t1":
+                    comments.append(_strip_replies(thing["data"]))
+                elif thing.get("kind") == "more":
+                    # Deeper stubs surfaced by the expansion join the same pool
+                    children = (thing.get("data") or {}).get("children") or []
+                    pending_ids.extend(_unseen(children, known_ids))
+        return comments
+
+    def _morechildren(self, submission_id: str, children: list[str]) -> list[dict[str, Any]]:
+        body = self._get(
+            "/api/morechildren",
+            {
+                "api_type": "json",
+                "link_id": f"t3_{submission_id}",
+                "children": ",".join(children),
+            },
+        )
+        data = (body.get("json") or {}).get("data") or {}
+        return list(data.get("things") or [])
+
+
+def _unseen(ids: Iterable[str], known_ids: Collection[str] | None) -> Iterable[str]:
+    return ids if known_ids is None else (cid for cid in ids if cid not in known_ids)
+
+
+def _strip_replies(data: dict[str, Any]) -> dict[str, Any]:
+    # The nested reply tree is flattened separately; don't keep it alive per row
+    return {k: v for k, v in data.items() if k != "replies"}
+
+
+def _flatten(
+    listing: Mapping[str, Any],
+    comments: list[dict[str, Any]],
+    pending_more: list[dict[str, Any]],
+) -> None:
+    """Breadth-first walk of a comment listing (same order as PRAW's `CommentForest.list()`)."""
+    queue: deque[Mapping[str, Any]] = deque(
+        (listing.get("data") or {}).get("children") or [] if listing else []
+    )
+    while queue:
+        child = queue.popleft()
+        kind = child.get("kind")
+        data = child.get("data") or {}
+        if kind == "more":
+            pending_more.append(data)
+            continue
+        if kind != "t1":
+            continue
+        comments.append(_strip_replies(data))
+        replies = data.get("replies")
+        if isinstance(replies, Mapping):
+            queue.extend((replies.get("data") or {}).get("children") or [])
@@ -1,17 +1,23 @@
 from __future__ import annotations
 
 from collections.abc import Iterator
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import praw
+if TYPE_CHECKING:
+    import praw
 
 
 def iter_hot(
-    reddit: praw.Reddit, subreddit: str, limit: int, *, raw_json: int = 1
+    reddit: praw.Reddit,
+    subreddit: str,
+    limit: int,
+    *,
+    raw_json: int = 1,
+    after: str | None = None,
 ) -> Iterator[Any]:
     sr = reddit.subreddit(subreddit)
     # Turn the PRAW ListingGenerator into a typed iterator
-    yield from sr.hot(limit=limit)
+    yield from sr.hot(limit=limit, **_after(after))
 
 
 def iter_top(
@@ -21,8 +27,24 @@ def iter_top(
     limit: int,
     *,
     raw_json: int = 1,
+    after: str | None = None,
+) -> Iterator[Any]:
+    sr = reddit.subreddit(subreddit)
+    yield from sr.top(time_filter=time_filter, limit=limit, **_after(after))
+
+
+def iter_new(
+    reddit: praw.Reddit,
+    subreddit: str,
+    limit: int,
+    *,
+    raw_json: int = 1,
+    after: str | None = None,
 ) -> Iterator[Any]:
     sr = reddit.subreddit(subreddit)
-    yield from sr.top(time_filter=time_filter, limit=limit)
+    yield from sr.new(limit=limit, **_after(after))
 
 
+def _after(after: str | None) -> dict[str, Any]:
+    # The first page starts after this fullname; PRAW pages on from there
+    return {} if after is None else {"params": {"after": after}}
@@ -1,8 +1,61 @@
 from __future__ import annotations
 
-from typing import Any
+import threading
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit
 
-import praw
+if TYPE_CHECKING:
+    import praw
+    import prawcore
+    import requests
+
+    from reddit_researcher.core.ports import ResponseCache
+    from reddit_researcher.core.ratelimit import RateLimiter
+
+# praw, prawcore and requests are imported on first use: together they are about a
+# quarter of a second of cold start, which a Lambda pays before any request is made.
+
+# Called with (endpoint_label, headers, elapsed_s, status_code, body_bytes) for every
+# HTTP response
+ResponseCallback = Callable[[str, Mapping[str, str], float, int, int], None]
+
+# Limiter that sessions built by `_make_session` take a token from before each API
+# request sent on this thread (see `paced_requests`)
+_pacing = threading.local()
+
+
+@contextmanager
+def paced_requests(limiter: RateLimiter | None) -> Iterator[None]:
+    """Take a `limiter` token before every API request this thread sends in the block.
+
+    For calls that make an unknown number of requests, e.g. PRAW's `replace_more`,
+    which sends one per `MoreComments` stub it expands. Only requests that reach
+    `oauth.reddit.com` are paced: responses served by the cache and the OAuth token
+    request cost no token.
+    """
+    previous = getattr(_pacing, "limiter", None)
+    _pacing.limiter = limiter
+    try:
+        yield
+    finally:
+        _pacing.limiter = previous
+
+
+def paced_iter(items: Iterator[Any], limiter: RateLimiter | None) -> Iterator[Any]:
+    """Step `items` inside `paced_requests(limiter)`.
+
+    For generators that send requests as they are consumed, e.g. PRAW's listing
+    generators, which fetch their next page when the current one runs out.
+    """
+    while True:
+        with paced_requests(limiter):
+            try:
+                item = next(items)
+            except StopIteration:
+                return
+        yield item
 
 
 def make_user_agent(base_agent: str) -> str:
@@ -11,9 +64,77 @@ def make_user_agent(base_agent: str) -> str:
     return ua
 
 
-def make_reddit(cfg: Any) -> praw.Reddit:
+def endpoint_label(url: str) -> str:
+    """Collapse a request URL into a low-cardinality label, e.g. `/r/{sub}/hot`."""
+    parts = [p for p in urlsplit(url).path.split("/") if p]
+    label: list[str] = []
+    for i, part in enumerate(parts):
+        prev = parts[i - 1] if i else ""
+        if prev == "r":
+            label.append("{sub}")
+        elif prev in {"user", "u"}:
+            label.append("{user}")
+        elif prev == "comments":
+            label.append("{id}")
+        elif i >= 2 and parts[i - 2] == "comments":
+            # Title slug (and anything after) following a submission id
+            label.append("{slug}")
+            break
+        else:
+            label.append(part)
+    return "/" + "/".join(label)
+
+
+def _make_session(
+    on_response: ResponseCallback | None, cache: ResponseCache | None = None
+) -> requests.Session:
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    class _PacedAdapter(HTTPAdapter):
+        def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:  # type: ignore[override]
+            limiter = getattr(_pacing, "limiter", None)
+            if limiter is not None:
+                limiter.acquire()
+            return super().send(request, **kwargs)
+
+    session = requests.Session()
+    # Pacing happens in the transport, so only requests that are really sent take a token
+    paced = _PacedAdapter()
+    if cache is None:
+        session.mount("https://oauth.reddit.com/", paced)
+    else:
+        from reddit_researcher.apis.reddit.caching import CachingAdapter
+
+        session.mount("https://oauth.reddit.com/", CachingAdapter(cache, transport=paced))
+        # The token endpoint lives on www.reddit.com; replay mode answers it offline
+        session.mount("https://www.reddit.com/", CachingAdapter(cache))
+    if on_response is None:
+        return session
+
+    def _hook(resp: requests.Response, *_args: Any, **_kwargs: Any) -> None:
+        on_response(
+            endpoint_label(resp.url),
+            resp.headers,
+            resp.elapsed.total_seconds(),
+            resp.status_code,
+            len(resp.content or b""),
+        )
+
+    session.hooks["response"].append(_hook)
+    return session
+
+
+def make_reddit(
+    cfg: Any,
+    *,
+    on_response: ResponseCallback | None = None,
+    cache: ResponseCache | None = None,
+) -> praw.Reddit:
     # Accept either an AppConfig-like object with a `reddit` attribute
     # or a RedditConfig-like object directly.
+    import praw
+
     rcfg = getattr(cfg, "reddit", cfg)
 
     reddit = praw.Reddit(
@@ -22,6 +143,9 @@ def make_reddit(cfg: Any) -> praw.Reddit:
         user_agent=make_user_agent(rcfg.user_agent),
         check_for_updates=False,
         ratelimit_seconds=0,
+        # Observe real response headers (x-ratelimit-*, Retry-After) on every request, and
+        # pace the requests sent inside `paced_requests`
+        requestor_kwargs={"session": _make_session(on_response, cache)},
     )
 
     # Read-only by default for this probe
@@ -29,3 +153,33 @@ def make_reddit(cfg: Any) -> praw.Reddit:
     return reddit
 
 
+def make_json_session(
+    cfg: Any,
+    *,
+    on_response: ResponseCallback | None = None,
+    cache: ResponseCache | None = None,
+) -> prawcore.Session:
+    """Build an app-only (read-only) prawcore session that returns raw JSON.
+
+    prawcore handles OAuth token refresh and transient-status retries; callers get the
+    decoded response body instead of PRAW models. With `cache`, GETs are answered from
+    the response cache where it can (see `apis/reddit/caching.py`).
+    """
+    import prawcore
+
+    rcfg = getattr(cfg, "reddit", cfg)
+    requestor = prawcore.Requestor(
+        user_agent=make_user_agent(rcfg.user_agent),
+        session=(
+            _make_session(on_response, cache)
+            if on_response is not None or cache is not None
+            else None
+        ),
+    )
+    authenticator = prawcore.TrustedAuthenticator(
+        requestor=requestor,
+        client_id=rcfg.client_id,
+        client_secret=rcfg.client_secret,
+    )
+    authorizer = prawcore.ReadOnlyAuthorizer(authenticator=authenticator)
+    return prawcore.session(authorizer=authorizer)
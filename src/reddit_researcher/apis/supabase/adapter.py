@@ -1,37 +1,86 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable, Iterator
 from typing import Any
 
-from reddit_researcher.apis.supabase.client import make_supabase
+from reddit_researcher.apis.supabase.client import SupabaseHandle, make_supabase
 from reddit_researcher.apis.supabase.sink import (
+    UpsertOptions,
+    ingest_comments,
+    ingest_posts,
     link_run_comments,
+    link_run_comments_bulk,
     link_run_posts,
+    link_run_posts_bulk,
     upsert_comments,
     upsert_posts,
     upsert_run,
 )
 from reddit_researcher.config.config import AppConfig
+from reddit_researcher.core.telemetry import TelemetryRecorder
 
 
 class SupabaseSinkAdapter:
-    def __init__(self, cfg: AppConfig) -> None:
+    def __init__(
+        self,
+        cfg: AppConfig,
+        *,
+        telemetry: TelemetryRecorder | None = None,
+        make_client: Callable[[str, str, str], SupabaseHandle] | None = None,
+    ) -> None:
         self._cfg = cfg
-        self._sb = make_supabase(cfg.supabase.url, cfg.supabase.key, cfg.supabase.schema)
+        self._sb = (make_client or make_supabase)(
+            cfg.supabase.url, cfg.supabase.key, cfg.supabase.schema
+        )
+        self._opts = UpsertOptions(
+            chunk_size=cfg.supabase.chunk_size,
+            max_in_flight=cfg.supabase.max_in_flight,
+            max_retries=cfg.supabase.max_retries,
+        )
+        self._telemetry = telemetry
+        # Set-based server-side ingest/linking (migrations/0006)
+        self._rpc = cfg.supabase.rpc_ingest
 
     def upsert_run(self, row: dict[str, Any]) -> None:
-        upsert_run(self._sb, row)
+        upsert_run(self._sb, row, options=self._opts, telemetry=self._telemetry)
 
     def upsert_posts(self, rows: Iterable[dict[str, Any]]) -> None:
-        upsert_posts(self._sb, rows)
+        upsert_posts(self._sb, rows, options=self._opts, telemetry=self._telemetry)
 
     def upsert_comments(self, rows: Iterable[dict[str, Any]]) -> None:
-        upsert_comments(self._sb, rows)
+        upsert_comments(self._sb, rows, options=self._opts, telemetry=self._telemetry)
 
     def link_run_posts(self, run_id: str, post_ids: Iterable[str]) -> None:
-        link_run_posts(self._sb, run_id, post_ids)
+        link = link_run_posts_bulk if self._rpc else link_run_posts
+        link(self._sb, run_id, post_ids, options=self._opts, telemetry=self._telemetry)
 
     def link_run_comments(self, run_id: str, comment_ids: Iterable[str]) -> None:
-        link_run_comments(self._sb, run_id, comment_ids)
+        link = link_run_comments_bulk if self._rpc else link_run_comments
+        link(self._sb, run_id, comment_ids, options=self._opts, telemetry=self._telemetry)
 
+    def ingest_posts(self, run_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        if self._rpc:
+            ingest_posts(self._sb, run_id, rows, options=self._opts, telemetry=self._telemetry)
+            return
+        ids: list[str] = []
+        self.upsert_posts(_collect_ids(rows, ids))
+        if ids:
+            self.link_run_posts(run_id, ids)
 
+    def ingest_comments(self, run_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        if self._rpc:
+            ingest_comments(self._sb, run_id, rows, options=self._opts, telemetry=self._telemetry)
+            return
+        ids: list[str] = []
+        self.upsert_comments(_collect_ids(rows, ids))
+        if ids:
+            self.link_run_comments(run_id, ids)
+
+
+def _collect_ids(rows: Iterable[dict[str, Any]], ids: list[str]) -> Iterator[dict[str, Any]]:
+    # Gather IDs while the upsert streams the rows, so they are not iterated twice
+    for row in rows:
+        rid = row.get("id")
+        if isinstance(rid, str):
+            ids.append(rid)
+        yield row
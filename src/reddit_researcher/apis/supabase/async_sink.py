@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
+
+from reddit_researcher.apis.supabase.sink import UpsertOptions, is_transient_error
+from reddit_researcher.config.config import AppConfig
+from reddit_researcher.core.batching import batched
+from reddit_researcher.core.ratelimit import compute_backoff_seconds
+from reddit_researcher.core.telemetry import Stopwatch, TelemetryRecorder
+
+
+class PostgrestError(Exception):
+    """Failed PostgREST request; `code` is the SQLSTATE/PGRST code, else the HTTP status."""
+
+    def __init__(self, status: int, body: str) -> None:
+        code: Any = status
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            payload = None
+        if isinstance(payload, dict) and payload.get("code"):
+            code = str(payload["code"])
+        super().__init__(f"PostgREST {status}: {body[:500]}")
+        self.status = status
+        self.code = code
+
+
+class AsyncSupabaseSink:
+    """`AsyncMetricsSink` that writes to Supabase's PostgREST API over a pooled `httpx.AsyncClient`.
+
+    The asyncio counterpart of `SupabaseSinkAdapter`: same tables, conflict targets,
+    ingest functions (`supabase.rpc_ingest`) and telemetry endpoints. Each call is
+    split into `chunk_size` requests sent up to `max_in_flight` at a time over at most
+    `max_in_flight` pooled connections. Each chunk is retried on its own on
+    transient errors, classified as in `sink.is_transient_error`.
+    """
+
+    def __init__(
+        self,
+        cfg: AppConfig,
+        *,
+        telemetry: TelemetryRecorder | None = None,
+        client: Any | None = None,
+    ) -> None:
+        try:
+            import httpx
+        except ImportError as exc:  # pragma: no cover - httpx comes with supabase
+            raise RuntimeError(
+                "the async sink needs httpx: pip install 'reddit-researcher[async]'"
+            ) from exc
+        sb = cfg.supabase
+        self._opts = UpsertOptions(
+            chunk_size=sb.chunk_size, max_in_flight=sb.max_in_flight, max_retries=sb.max_retries
+        )
+        self._rpc = sb.rpc_ingest
+        self._telemetry = telemetry
+        pool = max(1, sb.max_in_flight)
+        self._client = client or httpx.AsyncClient(
+            base_url=sb.url.rstrip("/") + "/rest/v1",
+            headers={
+                "apikey": sb.key,
+                "Authorization": f"Bearer {sb.key}",
+                "Content-Profile": sb.schema,
+                "Accept-Profile": sb.schema,
+            },
+            limits=httpx.Limits(max_connections=pool, max_keepalive_connections=pool),
+            timeout=httpx.Timeout(60.0),
+        )
+        self._in_flight = asyncio.Semaphore(pool)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def __aenter__(self) -> AsyncSupabaseSink:
+        return self
+
+    async def __aexit__(self, *_exc: Any) -> None:
+        await self.aclose()
+
+    async def upsert_run(self, row: dict[str, Any]) -> None:
+        await self._upsert("runs", [row], conflict="run_id")
+
+    async def upsert_posts(self, rows: Iterable[dict[str, Any]]) -> None:
+        await self._upsert("posts", rows, conflict="id")
+
+    async def upsert_comments(self, rows: Iterable[dict[str, Any]]) -> None:
+        await self._upsert("comments", rows, conflict="id")
+
+    async def link_run_posts(self, run_id: str, post_ids: Iterable[str]) -> None:
+        ids = list(dict.fromkeys(post_ids))
+        if self._rpc:
+            await self._rpc_chunks(
+                "link_run_posts", ids, lambda c: {"p_run_id": run_id, "p_post_ids": c}, 10_000
+            )
+            return
+        rows = [{"run_id": run_id, "post_id": pid} for pid in ids]
+        await self._upsert("runs_posts", rows, conflict="run_id,post_id", chunk_size=1000)
+
+    async def link_run_comments(self, run_id: str, comment_ids: Iterable[str]) -> None:
+        ids = list(dict.fromkeys(comment_ids))
+        if self._rpc:
+            await self._rpc_chunks(
+                "link_run_comments", ids, lambda c: {"p_run_id": run_id, "p_comment_ids": c}, 10_000
+            )
+            return
+        rows = [{"run_id": run_id, "comment_id": cid} for cid in ids]
+        await self._upsert("runs_comments", rows, conflict="run_id,comment_id", chunk_size=1000)
+
+    async def ingest_posts(self, run_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        await self._ingest("posts", run_id, rows)
+
+    async def ingest_comments(self, run_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        await self._ingest("comments", run_id, rows)
+
+    async def _ingest(self, table: str, run_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        if self._rpc:
+            await self._rpc_chunks(
+                f"ingest_{table}",
+                rows,
+                lambda c: {"p_run_id": run_id, "p_rows": c},
+                self._opts.chunk_size,
+            )
+            return
+        rows = list(rows)
+        await self._upsert(table, rows, conflict="id")
+        ids = [r["id"] for r in rows if r.get("id")]
+        if ids:
+            link = self.link_run_posts if table == "posts" else self.link_run_comments
+            await link(run_id, ids)
+
+    async def _upsert(
+        self,
+        table: str,
+        rows: Iterable[dict[str, Any]],
+        *,
+        conflict: str,
+        chunk_size: int | None = None,
+    ) -> None:
+        async def send(chunk: list[dict[str, Any]]) -> None:
+            await self._post(
+                f"/{table}",
+                chunk,
+                params={"on_conflict": conflict},
+                prefer="resolution=merge-duplicates,return=minimal",
+                endpoint=f"supabase.upsert.{table}",
+                rows=len(chunk),
+            )
+
+        await self._gather(rows, send, chunk_size or self._opts.chunk_size)
+
+    async def _rpc_chunks(
+        self,
+        fn: str,
+        items: Iterable[Any],
+        make_params: Callable[[list[Any]], dict[str, Any]],
+        chunk_size: int,
+    ) -> None:
+        async def send(chunk: list[Any]) -> None:
+            await self._post(
+                f"/rpc/{fn}",
+                make_params(chunk),
+                prefer="return=minimal",
+                endpoint=f"supabase.rpc.{fn}",
+                rows=len(chunk),
+            )
+
+        await self._gather(items, send, chunk_size)
+
+    async def _gather(
+        self,
+        items: Iterable[Any],
+        send: Callable[[list[Any]], Awaitable[None]],
+        chunk_size: int,
+    ) -> None:
+        async def bounded(chunk: list[Any]) -> None:
+            async with self._in_flight:
+                await send(chunk)
+
+        await asyncio.gather(*(bounded(c) for c in batched(items, max(1, chunk_size))))
+
+    async def _post(
+        self,
+        path: str,
+        payload: Any,
+        *,
+        prefer: str,
+        endpoint: str,
+        rows: int,
+        params: dict[str, str] | None = None,
+    ) -> None:
+        body = json.dumps(payload, separators=(",", ":"), default=str)
+        attempt = 0
+        while True:
+            try:
+                with Stopwatch() as sw:
+                    resp = await self._client.post(
+                        path,
+                        content=body,
+                        params=params,
+                        headers={"Content-Type": "application/json", "Prefer": prefer},
+                    )
+                if resp.status_code >= 400:
+                    raise PostgrestError(resp.status_code, resp.text)
+            except Exception as exc:
+                if attempt >= self._opts.max_retries or not is_transient_error(exc):
+                    raise
+                await asyncio.sleep(compute_backoff_seconds(attempt, cfg=self._opts.backoff))
+                attempt += 1
+                continue
+            if self._telemetry is not None:
+                self._telemetry.record(
+                    endpoint=endpoint,
+                    headers=None,
+                    elapsed_s=sw.elapsed,
+                    rows=rows,
+                    nbytes=len(body),
+                )
+            return
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import json
+import time
+
+from reddit_researcher.apis.supabase.client import SupabaseHandle
+from reddit_researcher.core.checkpoint import Checkpoint
+
+
+class SupabaseCheckpointStore:
+    """`CheckpointStore` backed by the `run_checkpoints` table (see migrations/0005)."""
+
+    def __init__(self, sb: SupabaseHandle) -> None:
+        self._sb = sb
+
+    def load(self, key: str) -> Checkpoint | None:
+        res = (
+            self._sb.client.table("run_checkpoints")
+            .select("payload")
+            .eq("key", key)
+            .limit(1)
+            .execute()
+        )
+        rows = getattr(res, "data", None) or []
+        if not rows:
+            return None
+        return Checkpoint.from_json(rows[0]["payload"])
+
+    def save(self, key: str, checkpoint: Checkpoint) -> None:
+        row = {
+            "key": key,
+            "run_id": checkpoint.run_id,
+            "payload": json.loads(checkpoint.to_json()),
+            "updated_at": time.time(),
+        }
+        self._sb.client.table("run_checkpoints").upsert(row, on_conflict="key").execute()
+
+    def clear(self, key: str) -> None:
+        self._sb.client.table("run_checkpoints").delete().eq("key", key).execute()
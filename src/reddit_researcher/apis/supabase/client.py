@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-from supabase import Client, create_client
+if TYPE_CHECKING:
+    from supabase import Client
 
 
 @dataclass(frozen=True)
@@ -12,6 +14,9 @@ class SupabaseHandle:
 
 
 def make_supabase(url: str, key: str, schema: str = "public") -> SupabaseHandle:
+    # supabase (with postgrest, gotrue and httpx) is the slowest import; defer it
+    from supabase import create_client
+
     # Normalize to avoid double slashes in REST paths
     url = url.rstrip("/")
     client: Client = create_client(url, key)
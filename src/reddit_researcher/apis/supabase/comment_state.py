@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+
+from reddit_researcher.apis.supabase.client import SupabaseHandle
+from reddit_researcher.apis.supabase.sink import UpsertOptions, upsert_rows
+from reddit_researcher.core.comment_delta import CommentState
+
+# Keep `submission_id=in.(…)` filters comfortably inside URL length limits
+_LOOKUP_CHUNK = 200
+
+
+class SupabaseCommentStateStore:
+    """`CommentStateStore` backed by the `comment_state` table (see migrations/0008)."""
+
+    def __init__(self, sb: SupabaseHandle, *, options: UpsertOptions | None = None) -> None:
+        self._sb = sb
+        self._opts = options
+
+    def get_many(self, submission_ids: Iterable[str]) -> dict[str, CommentState]:
+        id_list = list(dict.fromkeys(submission_ids))
+        found: dict[str, CommentState] = {}
+        for i in range(0, len(id_list), _LOOKUP_CHUNK):
+            chunk = id_list[i : i + _LOOKUP_CHUNK]
+            res = (
+                self._sb.client.table("comment_state")
+                .select("submission_id,num_comments,fetched_at,known_ids")
+                .in_("submission_id", chunk)
+                .execute()
+            )
+            for row in getattr(res, "data", None) or []:
+                n = row.get("num_comments")
+                found[str(row["submission_id"])] = CommentState(
+                    num_comments=None if n is None else int(n),
+                    fetched_at=float(row["fetched_at"]),
+                    known_ids=frozenset(row.get("known_ids") or ()),
+                )
+        return found
+
+    def put_many(self, states: Mapping[str, CommentState]) -> None:
+        rows = (
+            {
+                "submission_id": sid,
+                "num_comments": st.num_comments,
+                "fetched_at": st.fetched_at,
+                "known_ids": sorted(st.known_ids),
+            }
+            for sid, st in states.items()
+        )
+        upsert_rows(self._sb, "comment_state", rows, conflict="submission_id", options=self._opts)
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from reddit_researcher.apis.supabase.client import SupabaseHandle
+from reddit_researcher.core.incremental import Cursor, CursorKey
+
+
+class SupabaseCursorStore:
+    """`CursorStore` backed by the `crawl_cursors` table (see migrations/0002)."""
+
+    def __init__(self, sb: SupabaseHandle) -> None:
+        self._sb = sb
+
+    def load(self, key: CursorKey) -> Cursor | None:
+        res = (
+            self._sb.client.table("crawl_cursors")
+            .select("created_utc,fullname")
+            .eq("subreddit", key.subreddit)
+            .eq("listing", key.listing)
+            .eq("time_filter", key.time_filter)
+            .limit(1)
+            .execute()
+        )
+        rows = getattr(res, "data", None) or []
+        if not rows:
+            return None
+        return Cursor(created_utc=float(rows[0]["created_utc"]), fullname=str(rows[0]["fullname"]))
+
+    def save(self, key: CursorKey, cursor: Cursor) -> None:
+        row: dict[str, Any] = {
+            "subreddit": key.subreddit,
+            "listing": key.listing,
+            "time_filter": key.time_filter,
+            "created_utc": cursor.created_utc,
+            "fullname": cursor.fullname,
+            "updated_at": time.time(),
+        }
+        self._sb.client.table("crawl_cursors").upsert(
+            row, on_conflict="subreddit,listing,time_filter"
+        ).execute()
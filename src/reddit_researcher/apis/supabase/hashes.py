@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+
+from reddit_researcher.apis.supabase.client import SupabaseHandle
+from reddit_researcher.apis.supabase.sink import UpsertOptions, upsert_rows
+
+# Keep `id=in.(…)` filters comfortably inside URL length limits
+_LOOKUP_CHUNK = 200
+
+
+class SupabaseHashIndex:
+    """`HashIndex` backed by the `row_hashes` table (see migrations/0003)."""
+
+    def __init__(self, sb: SupabaseHandle, *, options: UpsertOptions | None = None) -> None:
+        self._sb = sb
+        self._opts = options
+
+    def get_many(self, table: str, ids: Iterable[str]) -> dict[str, str]:
+        id_list = list(dict.fromkeys(ids))
+        found: dict[str, str] = {}
+        for i in range(0, len(id_list), _LOOKUP_CHUNK):
+            chunk = id_list[i : i + _LOOKUP_CHUNK]
+            res = (
+                self._sb.client.table("row_hashes")
+                .select("id,digest")
+                .eq("table_name", table)
+                .in_("id", chunk)
+                .execute()
+            )
+            for row in getattr(res, "data", None) or []:
+                found[str(row["id"])] = str(row["digest"])
+        return found
+
+    def put_many(self, table: str, digests: Mapping[str, str]) -> None:
+        rows = (
+            {"table_name": table, "id": rid, "digest": digest} for rid, digest in digests.items()
+        )
+        upsert_rows(self._sb, "row_hashes", rows, conflict="table_name,id", options=self._opts)
@@ -0,0 +1,10 @@
+-- High-water-mark cursors for incremental crawling
+create table if not exists public.crawl_cursors (
+  subreddit text not null,
+  listing text not null,
+  time_filter text not null,
+  created_utc double precision not null,
+  fullname text not null,
+  updated_at double precision,
+  primary key (subreddit, listing, time_filter)
+);
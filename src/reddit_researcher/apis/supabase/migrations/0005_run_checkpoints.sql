@@ -0,0 +1,7 @@
+-- Progress of a run stopped at its deadline (max_runtime_sec / Lambda timeout)
+create table if not exists public.run_checkpoints (
+  key text primary key,
+  run_id text not null,
+  payload jsonb not null,
+  updated_at double precision
+);
@@ -0,0 +1,94 @@
+-- Set-based ingest: upsert entities and link them to a run in one statement per call,
+-- and link bulk ID arrays without sending one JSON row per ID.
+
+create or replace function public.ingest_posts(p_run_id text, p_rows jsonb)
+returns integer
+language sql
+as $$
+  with rows as (
+    select distinct on (id) * from jsonb_populate_recordset(null::public.posts, p_rows)
+  ), upserted as (
+    insert into public.posts as t
+    select * from rows
+    on conflict (id) do update set
+      subreddit = excluded.subreddit,
+      title = excluded.title,
+      selftext = excluded.selftext,
+      url = excluded.url,
+      domain = excluded.domain,
+      author = excluded.author,
+      created_utc = excluded.created_utc,
+      score = excluded.score,
+      num_comments = excluded.num_comments,
+      over_18 = excluded.over_18,
+      upvote_ratio = excluded.upvote_ratio,
+      permalink = excluded.permalink,
+      retrieved_at = excluded.retrieved_at
+    returning t.id
+  ), linked as (
+    insert into public.runs_posts (run_id, post_id)
+    select p_run_id, id from upserted
+    on conflict do nothing
+    returning 1
+  )
+  select count(*)::integer from upserted;
+$$;
+
+create or replace function public.ingest_comments(p_run_id text, p_rows jsonb)
+returns integer
+language sql
+as $$
+  with rows as (
+    select distinct on (id) * from jsonb_populate_recordset(null::public.comments, p_rows)
+  ), upserted as (
+    insert into public.comments as t
+    select * from rows
+    on conflict (id) do update set
+      link_id = excluded.link_id,
+      parent_id = excluded.parent_id,
+      subreddit = excluded.subreddit,
+      author = excluded.author,
+      body = excluded.body,
+      created_utc = excluded.created_utc,
+      score = excluded.score,
+      depth = excluded.depth,
+      retrieved_at = excluded.retrieved_at
+    returning t.id
+  ), linked as (
+    insert into public.runs_comments (run_id, comment_id)
+    select p_run_id, id from upserted
+    on conflict do nothing
+    returning 1
+  )
+  select count(*)::integer from upserted;
+$$;
+
+create or replace function public.link_run_posts(p_run_id text, p_post_ids text[])
+returns integer
+language sql
+as $$
+  with linked as (
+    insert into public.runs_posts (run_id, post_id)
+    select p_run_id, unnest(p_post_ids)
+    on conflict do nothing
+    returning 1
+  )
+  select count(*)::integer from linked;
+$$;
+
+create or replace function public.link_run_comments(p_run_id text, p_comment_ids text[])
+returns integer
+language sql
+as $$
+  with linked as (
+    insert into public.runs_comments (run_id, comment_id)
+    select p_run_id, unnest(p_comment_ids)
+    on conflict do nothing
+    returning 1
+  )
+  select count(*)::integer from linked;
+$$;
+
+-- Reverse lookups ("which runs saw this post/comment"); the primary keys lead with run_id
+create index if not exists runs_posts_post_id_idx on public.runs_posts (post_id);
+create index if not exists runs_comments_comment_id_idx on public.runs_comments (comment_id);
@@ -0,0 +1,3 @@
+-- Where a run's wall time went: per-endpoint call counts, rows, bytes and latency
+-- percentiles, limiter waits and the x-ratelimit remaining/reset timeline
+alter table public.runs add column if not exists telemetry jsonb;
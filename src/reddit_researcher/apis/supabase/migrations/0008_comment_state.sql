@@ -0,0 +1,8 @@
+-- Per-submission comment state for comment-delta runs: the listing's num_comments at the
+-- last fetch and every comment ID seen so far
+create table if not exists public.comment_state (
+  submission_id text primary key,
+  num_comments integer,
+  fetched_at double precision not null,
+  known_ids text[] not null default '{}'
+);
@@ -1,53 +1,356 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+import json
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
 from typing import Any
 
 from reddit_researcher.apis.supabase.client import SupabaseHandle
+from reddit_researcher.core.batching import batched
+from reddit_researcher.core.ratelimit import BackoffConfig, compute_backoff_seconds
+from reddit_researcher.core.telemetry import Stopwatch, TelemetryRecorder
+
+# Postgres SQLSTATE classes worth retrying: connection, transaction rollback,
+# insufficient resources and operator intervention (e.g. statement timeout).
+_TRANSIENT_SQLSTATE_CLASSES = ("08", "40", "53", "57")
+# PostgREST codes for "could not connect to the database" style failures
+_TRANSIENT_PGRST_CODES = {"PGRST000", "PGRST001", "PGRST002", "PGRST003"}
+
+@dataclass(frozen=True)
+class UpsertOptions:
+    chunk_size: int = 500
+    max_in_flight: int = 1
+    max_retries: int = 3
+    backoff: BackoffConfig = field(default_factory=BackoffConfig)
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Return True for failures a retry may fix (5xx/408/429, timeouts, dropped connections).
+
+    Anything else, including programming errors such as `KeyError`, fails fast.
+    """
+    code = getattr(exc, "code", None)
+    if code is None:
+        # Transport-level errors (httpx timeouts, resets) carry no PostgREST code
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+        if isinstance(status, int):
+            return _is_transient_status(status)
+        return isinstance(exc, OSError | TimeoutError) or _is_http_transport_error(exc)
+    if isinstance(code, int):
+        # postgrest-py reports non-JSON error bodies with the HTTP status as the code
+        return _is_transient_status(code)
+    code = str(code)
+    if code.isdigit() and len(code) == 3:
+        return _is_transient_status(int(code))
+    return code in _TRANSIENT_PGRST_CODES or code[:2] in _TRANSIENT_SQLSTATE_CLASSES
+
+
+def _is_transient_status(status: int) -> bool:
+    return status in (408, 429) or status >= 500
+
+
+def _is_http_transport_error(exc: BaseException) -> bool:
+    # httpx (under supabase-py) is imported here so this module loads without it
+    try:
+        import httpx
+    except ImportError:
+        return False
+    return isinstance(exc, httpx.TransportError)
 
 
 def upsert_rows(
-    sb: SupabaseHandle, table: str, rows: Iterable[dict[str, Any]], *, conflict: str
+    sb: SupabaseHandle,
+    table: str,
+    rows: Iterable[dict[str, Any]],
+    *,
+    conflict: str,
+    options: UpsertOptions | None = None,
+    telemetry: TelemetryRecorder | None = None,
+    sleep_fn: Callable[[float], None] = time.sleep,
 ) -> None:
-    data = list(rows)
-    if not data:
+    """Upsert `rows` in chunks of `options.chunk_size`.
+
+    Up to `options.max_in_flight` chunks are sent concurrently. Each chunk is
+    retried independently on transient errors with `compute_backoff_seconds`, so
+    one failed request does not resend (or lose) the rest of the batch.
+    """
+    opts = options or UpsertOptions()
+
+    def _send(chunk: list[dict[str, Any]]) -> None:
+        _upsert_chunk(sb, table, chunk, conflict, opts, telemetry, sleep_fn)
+
+    chunks = batched(rows, max(1, opts.chunk_size))
+    if opts.max_in_flight <= 1:
+        for chunk in chunks:
+            _send(chunk)
         return
+    _run_bounded(chunks, _send, opts.max_in_flight)
+
+
+def _upsert_chunk(
+    sb: SupabaseHandle,
+    table: str,
+    chunk: list[dict[str, Any]],
+    conflict: str,
+    opts: UpsertOptions,
+    telemetry: TelemetryRecorder | None,
+    sleep_fn: Callable[[float], None],
+) -> None:
     # supabase client: client.table(table).upsert(data, on_conflict=conflict)
-    sb.client.table(table).upsert(data, on_conflict=conflict).execute()
+    _execute_with_retries(
+        lambda: sb.client.table(table).upsert(chunk, on_conflict=conflict).execute(),
+        endpoint=f"supabase.upsert.{table}",
+        rows=len(chunk),
+        payload=chunk,
+        opts=opts,
+        telemetry=telemetry,
+        sleep_fn=sleep_fn,
+    )
 
 
-def upsert_run(sb: SupabaseHandle, run_row: dict[str, Any]) -> None:
-    upsert_rows(sb, "runs", [run_row], conflict="run_id")
+def _execute_with_retries(
+    execute: Callable[[], Any],
+    *,
+    endpoint: str,
+    rows: int,
+    opts: UpsertOptions,
+    telemetry: TelemetryRecorder | None,
+    sleep_fn: Callable[[float], None],
+    payload: Any = None,
+) -> None:
+    # Request body size as JSON (PostgREST's wire format). supabase-py encodes the body
+    # itself, so measuring it means encoding the chunk twice: only when asked for
+    nbytes = (
+        _json_size(payload)
+        if telemetry is not None and telemetry.payload_sizes and payload is not None
+        else None
+    )
+    attempt = 0
+    while True:
+        try:
+            with Stopwatch() as sw:
+                execute()
+        except Exception as exc:
+            if attempt >= opts.max_retries or not is_transient_error(exc):
+                raise
+            sleep_fn(compute_backoff_seconds(attempt, cfg=opts.backoff))
+            attempt += 1
+            continue
+        if telemetry is not None:
+            telemetry.record(
+                endpoint=endpoint, headers=None, elapsed_s=sw.elapsed, rows=rows, nbytes=nbytes
+            )
+        return
+
+
+def _json_size(payload: Any) -> int:
+    # ensure_ascii (the default) makes the character count the byte count
+    return len(json.dumps(payload, separators=(",", ":"), default=str))
+
+
+def _run_bounded(
+    chunks: Iterable[list[Any]],
+    fn: Callable[[list[Any]], None],
+    max_in_flight: int,
+) -> None:
+    # Submit lazily so at most `max_in_flight` chunks are materialized at once
+    with ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="upsert") as pool:
+        pending: set[Future[None]] = set()
+        for chunk in chunks:
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    fut.result()
+            pending.add(pool.submit(fn, chunk))
+        for fut in pending:
+            fut.result()
 
 
-def upsert_posts(sb: SupabaseHandle, posts: Iterable[dict[str, Any]]) -> None:
-    upsert_rows(sb, "posts", posts, conflict="id")
+def upsert_run(
+    sb: SupabaseHandle,
+    run_row: dict[str, Any],
+    *,
+    options: UpsertOptions | None = None,
+    telemetry: TelemetryRecorder | None = None,
+) -> None:
+    upsert_rows(sb, "runs", [run_row], conflict="run_id", options=options, telemetry=telemetry)
 
 
-def upsert_comments(sb: SupabaseHandle, comments: Iterable[dict[str, Any]]) -> None:
-    upsert_rows(sb, "comments", comments, conflict="id")
+def upsert_posts(
+    sb: SupabaseHandle,
+    posts: Iterable[dict[str, Any]],
+    *,
+    options: UpsertOptions | None = None,
+    telemetry: TelemetryRecorder | None = None,
+) -> None:
+    upsert_rows(sb, "posts", posts, conflict="id", options=options, telemetry=telemetry)
 
 
-def _batched(iterable: Iterable[dict[str, Any]], batch_size: int) -> Iterable[list[dict[str, Any]]]:
-    batch: list[dict[str, Any]] = []
-    for item in iterable:
-        batch.append(item)
-        if len(batch) >= batch_size:
-            yield batch
-            batch = []
-    if batch:
-        yield batch
+def upsert_comments(
+    sb: SupabaseHandle,
+    comments: Iterable[dict[str, Any]],
+    *,
+    options: UpsertOptions | None = None,
+    telemetry: TelemetryRecorder | None = None,
+) -> None:
+    upsert_rows(sb, "comments", comments, conflict="id", options=options, telemetry=telemetry)
 
 
-def link_run_posts(sb: SupabaseHandle, run_id: str, post_ids: Iterable[str], *, batch_size: int = 1000) -> None:
+def link_run_posts(
+    sb: SupabaseHandle,
+    run_id: str,
+    post_ids: Iterable[str],
+    *,
+    batch_size: int = 1000,
+    options: UpsertOptions | None = None,
+    telemetry: TelemetryRecorder | None = None,
+) -> None:
     rows_iter = ({"run_id": run_id, "post_id": pid} for pid in set(post_ids))
-    for chunk in _batched(rows_iter, batch_size):
-        sb.client.table("runs_posts").upsert(chunk, on_conflict="run_id,post_id").execute()
+    opts = replace(options or UpsertOptions(), chunk_size=batch_size)
+    upsert_rows(
+        sb, "runs_posts", rows_iter, conflict="run_id,post_id", options=opts, telemetry=telemetry
+    )
 
 
-def link_run_comments(sb: SupabaseHandle, run_id: str, comment_ids: Iterable[str], *, batch_size: int = 1000) -> None:
+def link_run_comments(
+    sb: SupabaseHandle,
+    run_id: str,
+    comment_ids: Iterable[str],
+    *,
+    batch_size: int = 1000,
+    options: UpsertOptions | None = None,
+    telemetry: TelemetryRecorder | None = None,
+) -> None:
     rows_iter = ({"run_id": run_id, "comment_id": cid} for cid in set(comment_ids))
-    for chunk in _batched(rows_iter, batch_size):
-        sb.client.table("runs_comments").upsert(chunk, on_conflict="run_id,comment_id").execute()
+    opts = replace(options or UpsertOptions(), chunk_size=batch_size)
+    upsert_rows(
+        sb,
+        "runs_comments",
+        rows_iter,
+        conflict="run_id,comment_id",
+        options=opts,
+        telemetry=telemetry,
+    )
+
+
+def call_rpc_chunked(
+    sb: SupabaseHandle,
+    fn: str,
+    items: Iterable[Any],
+    make_params: Callable[[list[Any]], dict[str, Any]],
+    *,
+    chunk_size: int,
+    options: UpsertOptions | None = None,
+    telemetry: TelemetryRecorder | None = None,
+    sleep_fn: Callable[[float], None] = time.sleep,
+) -> None:
+    """Call the Postgres function `fn` once per chunk of `items`.
+
+    Chunks are retried and run `options.max_in_flight` at a time, like `upsert_rows`.
+    """
+    opts = options or UpsertOptions()
+
+    def _send(chunk: list[Any]) -> None:
+        params = make_params(chunk)
+        _execute_with_retries(
+            lambda: sb.client.rpc(fn, params).execute(),
+            endpoint=f"supabase.rpc.{fn}",
+            rows=len(chunk),
+            payload=params,
+            opts=opts,
+            telemetry=telemetry,
+            sleep_fn=sleep_fn,
+        )
+
+    chunks = batched(items, max(1, chunk_size))
+    if opts.max_in_flight <= 1:
+        for chunk in chunks:
+            _send(chunk)
+        return
+    _run_bounded(chunks, _send, opts.max_in_flight)
+
+
+def ingest_posts(
+    sb: SupabaseHandle,
+    run_id: str,
+    posts: Iterable[dict[str, Any]],
+    *,
+    options: UpsertOptions | None = None,
+    telemetry: TelemetryRecorder | None = None,
+) -> None:
+    """Upsert posts and link them to `run_id` in one request per chunk (migrations/0006)."""
+    opts = options or UpsertOptions()
+    call_rpc_chunked(
+        sb,
+        "ingest_posts",
+        posts,
+        lambda chunk: {"p_run_id": run_id, "p_rows": chunk},
+        chunk_size=opts.chunk_size,
+        options=opts,
+        telemetry=telemetry,
+    )
+
 
+def ingest_comments(
+    sb: SupabaseHandle,
+    run_id: str,
+    comments: Iterable[dict[str, Any]],
+    *,
+    options: UpsertOptions | None = None,
+    telemetry: TelemetryRecorder | None = None,
+) -> None:
+    """Upsert comments and link them to `run_id` in one request per chunk (migrations/0006)."""
+    opts = options or UpsertOptions()
+    call_rpc_chunked(
+        sb,
+        "ingest_comments",
+        comments,
+        lambda chunk: {"p_run_id": run_id, "p_rows": chunk},
+        chunk_size=opts.chunk_size,
+        options=opts,
+        telemetry=telemetry,
+    )
 
+
+def link_run_posts_bulk(
+    sb: SupabaseHandle,
+    run_id: str,
+    post_ids: Iterable[str],
+    *,
+    batch_size: int = 10_000,
+    options: UpsertOptions | None = None,
+    telemetry: TelemetryRecorder | None = None,
+) -> None:
+    """Link post IDs to `run_id` by sending them as one text[] per request."""
+    call_rpc_chunked(
+        sb,
+        "link_run_posts",
+        dict.fromkeys(post_ids),
+        lambda chunk: {"p_run_id": run_id, "p_post_ids": chunk},
+        chunk_size=batch_size,
+        options=options,
+        telemetry=telemetry,
+    )
+
+
+def link_run_comments_bulk(
+    sb: SupabaseHandle,
+    run_id: str,
+    comment_ids: Iterable[str],
+    *,
+    batch_size: int = 10_000,
+    options: UpsertOptions | None = None,
+    telemetry: TelemetryRecorder | None = None,
+) -> None:
+    """Link comment IDs to `run_id` by sending them as one text[] per request."""
+    call_rpc_chunked(
+        sb,
+        "link_run_comments",
+        dict.fromkeys(comment_ids),
+        lambda chunk: {"p_run_id": run_id, "p_comment_ids": chunk},
+        chunk_size=batch_size,
+        options=options,
+        telemetry=telemetry,
+    )
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+from reddit_researcher.bench.fakes import FakeRedditConfig
+from reddit_researcher.bench.harness import BenchScenario, compare, run_benchmark
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m reddit_researcher.bench",
+        description="Run the probe offline against a fake Reddit and a fake sink.",
+    )
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--mean-comments", type=int, default=150)
+    parser.add_argument("--comment-sample", type=int, default=50)
+    parser.add_argument("--replace-more", type=int, default=5)
+    parser.add_argument("--comment-concurrency", type=int, default=4)
+    parser.add_argument("--comment-budget", type=int, default=0)
+    parser.add_argument("--sampling", default="top", help="probe.comment_sampling strategy")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--sink-latency-ms", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after-ms", type=float, default=0.0)
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--qpm", type=int, default=100, help="QPM cap of the fake Reddit app")
+    parser.add_argument(
+        "--credentials", type=int, default=0, help="spread requests over this many fake apps"
+    )
+    parser.add_argument("--credential-qpm", type=int, default=600, help="QPM cap of each app")
+    parser.add_argument(
+        "--runtime", choices=("threads", "async"), default="threads", help="probe runtime"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", type=Path, help="JSON result to regression-check against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--save", type=Path, help="write the result JSON here")
+    args = parser.parse_args(argv)
+
+    # The probe logs every step at INFO; keep benchmark output to the result
+    logging.basicConfig(level=logging.WARNING, force=True)
+
+    scenario = BenchScenario(
+        reddit=FakeRedditConfig(
+            posts=args.posts,
+            mean_comments=args.mean_comments,
+            latency_s=args.latency_ms / 1000.0,
+            throttle_rate=args.throttle_rate,
+            retry_after_s=args.retry_after_ms / 1000.0,
+            seed=args.seed,
+        ),
+        sink_latency_s=args.sink_latency_ms / 1000.0,
+        comment_sample=args.comment_sample,
+        replace_more_limit=args.replace_more,
+        comment_concurrency=args.comment_concurrency,
+        comment_request_budget=args.comment_budget,
+        comment_sampling=args.sampling,
+        stream=args.stream,
+        runtime=args.runtime,
+        qpm_cap=args.qpm,
+        credentials=args.credentials,
+        credential_qpm=args.credential_qpm,
+    )
+    result = run_benchmark(scenario).as_dict()
+    print(json.dumps(result, indent=2))
+    if args.save:
+        args.save.write_text(json.dumps(result, indent=2) + "\n")
+
+    if args.baseline:
+        problems = compare(result, json.loads(args.baseline.read_text()), tolerance=args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION: {problem}", file=sys.stderr)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
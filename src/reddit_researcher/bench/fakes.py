@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Callable, Collection, Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from reddit_researcher.core.budget import INITIAL_LOAD, MORECHILDREN_BATCH
+from reddit_researcher.core.incremental import Cursor, applies_to, skip_seen
+from reddit_researcher.core.ratelimit import RateLimiter
+
+
+@dataclass(frozen=True)
+class FakeRedditConfig:
+    """Shape of the synthetic Reddit served by `FakeRedditSource`."""
+
+    posts: int = 1000
+    mean_comments: int = 150
+    page_size: int = 100
+    latency_s: float = 0.0
+    throttle_rate: float = 0.0  # probability that a request is answered with a 429
+    retry_after_s: float = 0.0
+    seed: int = 0
+
+
+class FakeClock:
+    """Virtual time for rate limiters: `sleep` advances the clock instead of blocking.
+
+    A sleep ends `seconds` after the time its thread last read, so waits of concurrent
+    workers overlap as they would in real time. The final reading is how long the
+    requests would have taken against the limiters' QPM.
+    """
+
+    def __init__(self) -> None:
+        self._now = 0.0
+        self._lock = threading.Lock()
+        self._read = threading.local()
+
+    def __call__(self) -> float:
+        with self._lock:
+            now = self._now
+        self._read.now = now
+        return now
+
+    def sleep(self, seconds: float) -> None:
+        with self._lock:
+            start = getattr(self._read, "now", self._now)
+            self._now = max(self._now, start + max(0.0, seconds))
+
+
+class FakeRedditSource:
+    """In-process `RedditSource` that serves synthetic listings and comment trees.
+
+    Items are raw JSON `data` dicts, like `RedditJsonSourceAdapter` yields. Comment
+    counts are exponentially distributed around `mean_comments`, so a few threads are
+    much larger than the rest. Each simulated request sleeps `latency_s`; a throttled
+    one also waits `retry_after_s` and is retried, as prawcore does on a 429. With a
+    `limiter`, every request (retries included) first takes a token from it, like an
+    adapter spending one OAuth app's quota.
+    """
+
+    def __init__(
+        self,
+        cfg: FakeRedditConfig,
+        *,
+        sleep_fn: Callable[[float], None] = time.sleep,
+        limiter: RateLimiter | None = None,
+    ) -> None:
+        self._cfg = cfg
+        self._sleep = sleep_fn
+        self._limiter = limiter
+        self._rng = random.Random(cfg.seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        base = 1_700_000_000.0
+        self._num_comments = [
+            int(self._rng.expovariate(1 / cfg.mean_comments)) if cfg.mean_comments > 0 else 0
+            for _ in range(cfg.posts)
+        ]
+        self._created = [base - i * 30.0 for i in range(cfg.posts)]
+        # Each subreddit serves the same synthetic posts under its own block of IDs
+        self._id_blocks: dict[str, int] = {}
+
+    def iter_posts(
+        self,
+        subreddit: str,
+        listing: str,
+        time_filter: str,
+        limit: int,
+        *,
+        since: Cursor | None = None,
+        after: str | None = None,
+    ) -> Iterator[Any]:
+        start = 0 if after is None else self._index(after.removeprefix("t3_")) + 1
+        items = self._iter_listing(subreddit, start, min(start + limit, self._cfg.posts))
+        return skip_seen(items, since) if applies_to(listing) else items
+
+    def fetch_comments(
+        self,
+        submission_id: str,
+        replace_more_limit: int,
+        *,
+        known_ids: Collection[str] | None = None,
+    ) -> list[Any]:
+        index = self._index(submission_id)
+        total = self._num_comments[index]
+        if known_ids is None:
+            order = range(total)
+        else:
+            # sort=new: newest (highest index) first, expansion stops at a seen comment
+            order = range(total - 1, -1, -1)
+        self._request()
+        available = min(total, INITIAL_LOAD)
+        for _ in range(max(0, replace_more_limit)):
+            if available >= total:
+                break
+            if known_ids and any(
+                f"{submission_id}c{_base36(i)}" in known_ids for i in order[:available]
+            ):
+                break
+            self._request()
+            available = min(total, available + MORECHILDREN_BATCH)
+        return [self._comment(submission_id, index, i) for i in order[:available]]
+
+    def _iter_listing(self, subreddit: str, start: int, stop: int) -> Iterator[dict[str, Any]]:
+        page = max(1, self._cfg.page_size)
+        for first in range(start, stop, page):
+            self._request()
+            for i in range(first, min(first + page, stop)):
+                yield self._post(subreddit, i)
+
+    def _index(self, submission_id: str) -> int:
+        return int(submission_id.removeprefix("p"), 36) % max(1, self._cfg.posts)
+
+    def _request(self) -> None:
+        if self._limiter is not None:
+            self._limiter.acquire()
+        with self._lock:
+            self.requests += 1
+            throttled = self._rng.random() < self._cfg.throttle_rate
+            if throttled:
+                self.throttled += 1
+        if throttled:
+            self._sleep(self._cfg.retry_after_s)
+            self._request()
+            return
+        if self._cfg.latency_s > 0:
+            self._sleep(self._cfg.latency_s)
+
+    def _post(self, subreddit: str, index: int) -> dict[str, Any]:
+        with self._lock:
+            block = self._id_blocks.setdefault(subreddit, len(self._id_blocks))
+        pid = f"p{_base36(block * self._cfg.posts + index)}"
+        return {
+            "id": pid,
+            "name": f"t3_{pid}",
+            "subreddit": subreddit,
+            "title": f"Synthetic post {index}",
+            "selftext": "",
+            "url": f"https://example.com/{pid}",
+            "domain": "example.com",
+            "author": f"user{index % 97}",
+            "created_utc": self._created[index],
+            "score": self._num_comments[index] * 3,
+            "num_comments": self._num_comments[index],
+            "over_18": False,
+            "upvote_ratio": 0.9,
+            "permalink": f"/r/{subreddit}/comments/{pid}/synthetic/",
+        }
+
+    def _comment(self, submission_id: str, post_index: int, index: int) -> dict[str, Any]:
+        cid = f"{submission_id}c{_base36(index)}"
+        # Ten top-level comments, every later one replying to an earlier comment
+        parent = f"t1_{submission_id}c{_base36(index // 10)}" if index >= 10 else None
+        return {
+            "id": cid,
+            "link_id": f"t3_{submission_id}",
+            "parent_id": parent or f"t3_{submission_id}",
+            "subreddit": "bench",
+            "author": f"user{index % 89}",
+            "body": "lorem ipsum " * (1 + index % 8),
+            "created_utc": self._created[post_index] + index,
+            "score": index % 50,
+            "depth": 0 if index < 10 else 1,
+        }
+
+
+class FakeSink:
+    """In-process `MetricsSink` that counts calls and rows, optionally sleeping per call.
+
+    Each method is one simulated round trip, so `ingest_*` costs a single call like
+    the server-side ingest functions.
+    """
+
+    def __init__(
+        self, *, latency_s: float = 0.0, sleep_fn: Callable[[float], None] = time.sleep
+    ) -> None:
+        self._latency_s = latency_s
+        self._sleep = sleep_fn
+        self._lock = threading.Lock()
+        self.calls: Counter[str] = Counter()
+        self.rows: Counter[str] = Counter()
+
+    def upsert_run(self, row: dict[str, Any]) -> None:
+        self._call("upsert_run", [row])
+
+    def upsert_posts(self, rows: Iterable[dict[str, Any]]) -> None:
+        self._call("upsert_posts", rows)
+
+    def upsert_comments(self, rows: Iterable[dict[str, Any]]) -> None:
+        self._call("upsert_comments", rows)
+
+    def link_run_posts(self, run_id: str, post_ids: Iterable[str]) -> None:
+        self._call("link_run_posts", post_ids)
+
+    def link_run_comments(self, run_id: str, comment_ids: Iterable[str]) -> None:
+        self._call("link_run_comments", comment_ids)
+
+    def ingest_posts(self, run_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        self._call("ingest_posts", rows)
+
+    def ingest_comments(self, run_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        self._call("ingest_comments", rows)
+
+    def _call(self, name: str, items: Iterable[Any]) -> None:
+        n = sum(1 for _ in items)
+        if self._latency_s > 0:
+            self._sleep(self._latency_s)
+        with self._lock:
+            self.calls[name] += 1
+            self.rows[name] += n
+
+
+class AsyncFakeRedditSource:
+    """`AsyncRedditSource` over the same synthetic Reddit as `FakeRedditSource`.
+
+    Simulated latency and `Retry-After` waits are `asyncio.sleep`s, so concurrent
+    fetches overlap on the event loop instead of occupying a thread each. A `limiter`
+    must not block the loop: give it a `FakeClock`.
+    """
+
+    def __init__(self, cfg: FakeRedditConfig, *, limiter: RateLimiter | None = None) -> None:
+        self._cfg = cfg
+        self._source = FakeRedditSource(cfg, sleep_fn=lambda _s: None, limiter=limiter)
+
+    @property
+    def requests(self) -> int:
+        return self._source.requests
+
+    @property
+    def throttled(self) -> int:
+        return self._source.throttled
+
+    async def iter_posts(
+        self,
+        subreddit: str,
+        listing: str,
+        time_filter: str,
+        limit: int,
+        *,
+        since: Cursor | None = None,
+    ) -> AsyncIterator[Any]:
+        mark = self._mark()
+        for item in self._source.iter_posts(subreddit, listing, time_filter, limit, since=since):
+            # A new page was requested while producing this item
+            await self._wait_since(mark)
+            mark = self._mark()
+            yield item
+
+    async def fetch_comments(
+        self,
+        submission_id: str,
+        replace_more_limit: int,
+        *,
+        known_ids: Collection[str] | None = None,
+    ) -> list[Any]:
+        mark = self._mark()
+        comments = self._source.fetch_comments(
+            submission_id, replace_more_limit, known_ids=known_ids
+        )
+        await self._wait_since(mark)
+        return comments
+
+    def _mark(self) -> tuple[int, int]:
+        return self._source.requests, self._source.throttled
+
+    async def _wait_since(self, mark: tuple[int, int]) -> None:
+        throttled = self._source.throttled - mark[1]
+        answered = self._source.requests - mark[0] - throttled
+        delay = answered * self._cfg.latency_s + throttled * self._cfg.retry_after_s
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class AsyncFakeSink:
+    """`AsyncMetricsSink` counterpart of `FakeSink`; each call awaits `latency_s`."""
+
+    def __init__(self, *, latency_s: float = 0.0) -> None:
+        self._latency_s = latency_s
+        self._sink = FakeSink()
+
+    @property
+    def calls(self) -> Counter[str]:
+        return self._sink.calls
+
+    @property
+    def rows(self) -> Counter[str]:
+        return self._sink.rows
+
+    async def upsert_run(self, row: dict[str, Any]) -> None:
+        await self._call(self._sink.upsert_run, row)
+
+    async def upsert_posts(self, rows: Iterable[dict[str, Any]]) -> None:
+        await self._call(self._sink.upsert_posts, rows)
+
+    async def upsert_comments(self, rows: Iterable[dict[str, Any]]) -> None:
+        await self._call(self._sink.upsert_comments, rows)
+
+    async def link_run_posts(self, run_id: str, post_ids: Iterable[str]) -> None:
+        await self._call(self._sink.link_run_posts, run_id, post_ids)
+
+    async def link_run_comments(self, run_id: str, comment_ids: Iterable[str]) -> None:
+        await self._call(self._sink.link_run_comments, run_id, comment_ids)
+
+    async def ingest_posts(self, run_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        await self._call(self._sink.ingest_posts, run_id, rows)
+
+    async def ingest_comments(self, run_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        await self._call(self._sink.ingest_comments, run_id, rows)
+
+    async def _call(self, method: Callable[..., None], *args: Any) -> None:
+        if self._latency_s > 0:
+            await asyncio.sleep(self._latency_s)
+        method(*args)
+
+
+def _base36(n: int) -> str:
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+    out = ""
+    while True:
+        n, r = divmod(n, 36)
+        out = digits[r] + out
+        if n == 0:
+            return out
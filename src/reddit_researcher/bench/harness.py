@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from reddit_researcher.bench.fakes import (
+    AsyncFakeRedditSource,
+    AsyncFakeSink,
+    FakeClock,
+    FakeRedditConfig,
+    FakeRedditSource,
+    FakeSink,
+)
+from reddit_researcher.config.config import AppConfig, ProbeConfig, RedditConfig
+from reddit_researcher.core.async_orchestrator import run_probe_async
+from reddit_researcher.core.orchestrator import run_probe
+from reddit_researcher.core.pool import CredentialPool, PooledRedditSource
+from reddit_researcher.core.ports import RedditSource
+from reddit_researcher.core.ratelimit import RateLimiter
+
+
+@dataclass(frozen=True)
+class BenchScenario:
+    """One offline run: the synthetic Reddit, the sink's latency and the probe settings."""
+
+    reddit: FakeRedditConfig = field(default_factory=FakeRedditConfig)
+    sink_latency_s: float = 0.0
+    comment_sample: int = 50
+    replace_more_limit: int = 5
+    comment_concurrency: int = 4
+    comment_request_budget: int = 0
+    comment_sampling: str = "top"
+    stream: bool = False
+    stream_batch_size: int = 500
+    # "threads" drives `run_probe`, "async" drives `run_probe_async` (which always streams)
+    runtime: str = "threads"
+    # >0: spread requests over this many fake OAuth apps, each limited to credential_qpm
+    credentials: int = 0
+    credential_qpm: int = 600
+    # One OAuth app's quota, as Reddit grants it; waits run on a `FakeClock`
+    qpm_cap: int = 100
+
+    def probe_config(self) -> ProbeConfig:
+        return ProbeConfig(
+            subreddit="bench",
+            listing="hot",
+            post_limit=self.reddit.posts,
+            comment_sample=self.comment_sample,
+            comment_replace_more_limit=self.replace_more_limit,
+            comment_concurrency=self.comment_concurrency,
+            comment_request_budget=self.comment_request_budget,
+            comment_sampling=self.comment_sampling,
+            qpm_cap=self.qpm_cap,
+            stream=self.stream,
+            stream_batch_size=self.stream_batch_size,
+            stream_flush_sec=0.5,
+        )
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    elapsed_sec: float
+    posts: int
+    comments: int
+    posts_per_sec: float
+    comments_per_sec: float
+    peak_mem_mb: float
+    reddit_requests: int
+    reddit_throttled: int
+    # How long the requests take at the scenario's QPM (fake-clock seconds)
+    ratelimit_sec: float
+    comments_per_request: float
+    sink_calls: dict[str, int]
+    sink_rows: dict[str, int]
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def run_benchmark(scenario: BenchScenario) -> BenchResult:
+    """Drive the probe against in-process fakes and measure throughput and memory.
+
+    `scenario.runtime` picks `run_probe` or `run_probe_async` and the matching fakes.
+    The fakes take a token per request from limiters at `qpm_cap` (or `credential_qpm`
+    per app) that wait on a `FakeClock`, so quota costs no wall time but is reported.
+
+    Peak memory is the tracemalloc high-water mark of Python allocations during the
+    run, so it includes tracemalloc's own overhead but no interpreter baseline.
+    """
+    cfg = AppConfig(
+        reddit=RedditConfig(client_id="bench", client_secret="bench", user_agent="bench"),
+        probe=scenario.probe_config(),
+    )
+    clock = FakeClock()
+    # One fake per OAuth app in a pooled scenario, else the source itself
+    apps: list[FakeRedditSource | AsyncFakeRedditSource] = []
+    sink: FakeSink | AsyncFakeSink
+    run: Callable[[], dict[str, Any]]
+    if scenario.runtime == "async":
+        if scenario.credentials > 0:
+            raise ValueError("credential pools need the threads runtime")
+        async_source = AsyncFakeRedditSource(
+            scenario.reddit, limiter=_limiter(scenario.qpm_cap, clock)
+        )
+        async_sink = AsyncFakeSink(latency_s=scenario.sink_latency_s)
+        apps.append(async_source)
+        sink = async_sink
+
+        def run() -> dict[str, Any]:
+            return asyncio.run(run_probe_async(cfg, source=async_source, sink=async_sink))
+
+    elif scenario.runtime == "threads":
+        source: RedditSource
+        if scenario.credentials > 0:
+            pool = CredentialPool()
+            for i in range(scenario.credentials):
+                member = pool.add(f"app{i}", _limiter(scenario.credential_qpm, clock))
+                app = FakeRedditSource(scenario.reddit, limiter=member.limiter)
+                apps.append(app)
+                member.source = app
+            source = PooledRedditSource(pool)
+        else:
+            fake = FakeRedditSource(scenario.reddit, limiter=_limiter(scenario.qpm_cap, clock))
+            apps.append(fake)
+            source = fake
+        threaded_sink = FakeSink(latency_s=scenario.sink_latency_s)
+        sink = threaded_sink
+
+        def run() -> dict[str, Any]:
+            return run_probe(cfg, source=source, sink=threaded_sink)
+
+    else:
+        raise ValueError(f"unknown runtime: {scenario.runtime!r}")
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        metrics = run()
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    posts = int(metrics["posts_count"])
+    comments = int(metrics["comments_total"])
+    requests = sum(app.requests for app in apps)
+    return BenchResult(
+        elapsed_sec=round(elapsed, 4),
+        posts=posts,
+        comments=comments,
+        posts_per_sec=round(posts / elapsed, 1) if elapsed > 0 else 0.0,
+        comments_per_sec=round(comments / elapsed, 1) if elapsed > 0 else 0.0,
+        peak_mem_mb=round(peak / 1_048_576, 2),
+        reddit_requests=requests,
+        reddit_throttled=sum(app.throttled for app in apps),
+        ratelimit_sec=round(clock(), 2),
+        comments_per_request=round(comments / requests, 1) if requests else 0.0,
+        sink_calls=dict(sink.calls),
+        sink_rows=dict(sink.rows),
+    )
+
+
+def _limiter(qpm: int, clock: FakeClock) -> RateLimiter:
+    return RateLimiter(qpm, time_fn=clock, sleep_fn=clock.sleep)
+
+
+def compare(
+    result: dict[str, Any], baseline: dict[str, Any], *, tolerance: float
+) -> list[str]:
+    """Return regressions of `result` against `baseline` beyond `tolerance` (0.1 = 10%)."""
+    problems: list[str] = []
+    for key in ("posts_per_sec", "comments_per_sec"):
+        if float(result[key]) < float(baseline[key]) * (1 - tolerance):
+            problems.append(f"{key} {result[key]} < baseline {baseline[key]}")
+    if float(result["peak_mem_mb"]) > float(baseline["peak_mem_mb"]) * (1 + tolerance):
+        problems.append(f"peak_mem_mb {result['peak_mem_mb']} > baseline {baseline['peak_mem_mb']}")
+    return problems
@@ -0,0 +1,157 @@
+"""Startup benchmark: import time and time to first Reddit request, cold and warm.
+
+Each mode runs in a fresh interpreter, like a new Lambda container, and then invokes
+the probe several times in that process, like warm invocations of the container.
+HTTP is answered in-process (an OAuth token, then empty listings), so no network or
+credentials are needed and the numbers measure only our own start-up path.
+
+    python -m reddit_researcher.bench.startup --invocations 3
+"""
+
+from __future__ import annotations
+
+import time
+
+_STARTED = time.perf_counter()
+
+import argparse  # noqa: E402
+import json  # noqa: E402
+import logging  # noqa: E402
+import os  # noqa: E402
+import subprocess  # noqa: E402
+import sys  # noqa: E402
+import tempfile  # noqa: E402
+from pathlib import Path  # noqa: E402
+from typing import Any  # noqa: E402
+
+_CONFIG = """\
+reddit:
+  client_id: bench
+  client_secret: bench
+  user_agent: reddit-probe-startup-bench
+probe:
+  subreddit: bench
+  post_limit: 10
+  comment_sample: 0
+  source: {source}
+  adaptive_ratelimit: 0
+supabase:
+  enabled: 0
+"""
+
+_TOKEN = b'{"access_token": "bench", "token_type": "bearer", "expires_in": 86400, "scope": "*"}'
+_EMPTY_LISTING = b'{"kind": "Listing", "data": {"children": [], "after": null}}'
+
+
+def measure(*, mode: str, source: str, invocations: int) -> dict[str, Any]:
+    """Run `invocations` probes in a fresh interpreter and return its timings."""
+    started = time.perf_counter()
+    out = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "reddit_researcher.bench.startup",
+            "--child",
+            mode,
+            "--source",
+            source,
+            "--invocations",
+            str(invocations),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "LOG_LEVEL": "WARNING"},
+    )
+    result: dict[str, Any] = json.loads(out.stdout.strip().splitlines()[-1])
+    result["process_s"] = round(time.perf_counter() - started, 4)
+    return result
+
+
+def _child(mode: str, source: str, invocations: int) -> dict[str, Any]:
+    t0 = time.perf_counter()
+    from reddit_researcher.core.orchestrator import main as probe_main
+    from reddit_researcher.core.warm import WarmContext
+
+    import_s = time.perf_counter() - t0
+
+    requests: list[float] = []
+    _answer_http_in_process(requests)
+    logging.disable(logging.INFO)
+
+    results: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        Path("config.yaml").write_text(_CONFIG.format(source=source))
+        warm = WarmContext("config.yaml") if mode == "warm" else None
+        for _ in range(invocations):
+            requests.clear()
+            start = time.perf_counter()
+            code = probe_main([], warm=warm)
+            end = time.perf_counter()
+            results.append(
+                {
+                    "exit_code": code,
+                    "first_request_s": round(requests[0] - start, 4) if requests else None,
+                    "duration_s": round(end - start, 4),
+                    "requests": len(requests),
+                }
+            )
+    return {
+        "mode": mode,
+        "source": source,
+        "interpreter_to_main_s": round(t0 - _STARTED, 4),
+        "import_s": round(import_s, 4),
+        "invocations": results,
+    }
+
+
+def _answer_http_in_process(sent: list[float]) -> None:
+    """Answer every `requests` call locally, recording when each one was sent."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    def send(self: HTTPAdapter, request: Any, **_kwargs: Any) -> requests.Response:
+        sent.append(time.perf_counter())
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.url = request.url
+        resp.request = request
+        resp.headers["content-type"] = "application/json"
+        resp._content = _TOKEN if "access_token" in request.url else _EMPTY_LISTING
+        return resp
+
+    # The fake's signature is looser than `HTTPAdapter.send`'s
+    setattr(HTTPAdapter, "send", send)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m reddit_researcher.bench.startup",
+        description="Measure probe import time and time to first request, cold and warm.",
+    )
+    parser.add_argument("--invocations", type=int, default=3)
+    parser.add_argument("--source", choices=("praw", "json"), default="praw")
+    parser.add_argument(
+        "--mode",
+        choices=("warm", "fresh", "both"),
+        default="both",
+        help="warm: reuse a WarmContext across invocations; fresh: rebuild clients each time",
+    )
+    parser.add_argument("--child", choices=("warm", "fresh"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_child(args.child, args.source, max(1, args.invocations))))
+        return 0
+
+    modes = ("fresh", "warm") if args.mode == "both" else (args.mode,)
+    results = [
+        measure(mode=m, source=args.source, invocations=max(1, args.invocations)) for m in modes
+    ]
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
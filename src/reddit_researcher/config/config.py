@@ -7,9 +7,6 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
-import yaml
-from dotenv import load_dotenv
-
 
 @dataclass(frozen=True)
 class RedditConfig:
@@ -18,6 +15,13 @@ class RedditConfig:
     user_agent: str
 
 
+@dataclass(frozen=True)
+class TargetConfig:
+    subreddit: str
+    listing: str = "hot"
+    time_filter: str = "day"
+
+
 @dataclass(frozen=True)
 class ProbeConfig:
     subreddit: str = "all"
@@ -26,9 +30,33 @@ class ProbeConfig:
     post_limit: int = 100
     comment_sample: int = 10
     comment_replace_more_limit: int = 5
+    comment_concurrency: int = 1
+    comment_request_budget: int = 0
+    comment_sampling: str = "top"
     qpm_cap: int = 90
+    adaptive_ratelimit: bool = False
+    adaptive_max_qpm: int = 300
     max_runtime_sec: int = 600
+    deadline_margin_sec: float = 30.0
     raw_json: int = 1
+    source: str = "praw"
+    stream: bool = False
+    stream_batch_size: int = 500
+    stream_flush_sec: float = 2.0
+    incremental: bool = False
+    cursor_store: str = "sqlite"
+    state_path: str = ".state/reddit_researcher.sqlite"
+    change_detection: bool = False
+    hash_index: str = "sqlite"
+    checkpoint: bool = False
+    checkpoint_store: str = "sqlite"
+    spool: bool = False
+    spool_dir: str = ".state/spool"
+    run_telemetry: bool = False
+    comment_delta: bool = False
+    comment_state_store: str = "sqlite"
+    targets: tuple[TargetConfig, ...] = ()
+    target_concurrency: int = 4
 
 
 @dataclass(frozen=True)
@@ -37,6 +65,64 @@ class SupabaseConfig:
     url: str = ""
     key: str = ""
     schema: str = "public"
+    chunk_size: int = 500
+    max_in_flight: int = 4
+    max_retries: int = 3
+    rpc_ingest: bool = False
+
+
+@dataclass(frozen=True)
+class PostgresConfig:
+    enabled: bool = False
+    dsn: str = ""
+    schema: str = "public"
+    copy_batch_rows: int = 50_000
+
+
+@dataclass(frozen=True)
+class ParquetConfig:
+    enabled: bool = False
+    dir: str = "exports"
+    row_group_rows: int = 50_000
+    compression: str = "zstd"
+
+
+@dataclass(frozen=True)
+class RedditPoolConfig:
+    # Extra OAuth apps; with any set, requests are spread over `reddit` plus these
+    credentials: tuple[RedditConfig, ...] = ()
+    failure_threshold: int = 3
+    cooldown_sec: float = 300.0
+
+
+@dataclass(frozen=True)
+class HttpCacheConfig:
+    enabled: bool = False
+    path: str = ".state/http_cache.sqlite"
+    max_mb: float = 256.0
+    # Freshness by endpoint label; other endpoints use `default_ttl_sec`, 0 disables
+    default_ttl_sec: float = 300.0
+    ttl_sec: tuple[tuple[str, float], ...] = (
+        ("/r/{sub}/new", 60.0),
+        ("/r/{sub}/hot", 300.0),
+        ("/r/{sub}/top", 3600.0),
+        ("/comments/{id}", 600.0),
+        ("/comments/{id}/{slug}", 600.0),
+        ("/api/morechildren", 600.0),
+    )
+    # Serve only from the cache, however stale; a miss fails instead of hitting Reddit
+    replay: bool = False
+
+
+@dataclass(frozen=True)
+class RetryConfig:
+    # Attempts per Reddit request; only timeouts, 429 and 5xx are retried
+    max_attempts: int = 4
+    backoff_base_sec: float = 0.5
+    backoff_max_sec: float = 60.0
+    # Consecutive retryable failures before requests fail fast for the cooldown
+    breaker_failures: int = 8
+    breaker_cooldown_sec: float = 60.0
 
 
 @dataclass(frozen=True)
@@ -44,6 +130,11 @@ class AppConfig:
     reddit: RedditConfig
     probe: ProbeConfig
     supabase: SupabaseConfig = SupabaseConfig()
+    postgres: PostgresConfig = PostgresConfig()
+    parquet: ParquetConfig = ParquetConfig()
+    reddit_pool: RedditPoolConfig = RedditPoolConfig()
+    http_cache: HttpCacheConfig = HttpCacheConfig()
+    retry: RetryConfig = RetryConfig()
 
 
 def _expand_env(value: Any) -> Any:
@@ -56,7 +147,66 @@ def _expand_env(value: Any) -> Any:
     return value
 
 
+def _parse_targets(probe_raw: Mapping[str, Any]) -> tuple[TargetConfig, ...]:
+    # Entries may be a bare subreddit name or a mapping; missing fields inherit the
+    # probe-level listing/time_filter.
+    listing = str(probe_raw.get("listing", ProbeConfig.listing))
+    time_filter = str(probe_raw.get("time_filter", ProbeConfig.time_filter))
+    targets: list[TargetConfig] = []
+    for entry in probe_raw.get("targets") or []:
+        if isinstance(entry, Mapping):
+            targets.append(
+                TargetConfig(
+                    subreddit=str(entry["subreddit"]),
+                    listing=str(entry.get("listing", listing)),
+                    time_filter=str(entry.get("time_filter", time_filter)),
+                )
+            )
+        else:
+            targets.append(
+                TargetConfig(subreddit=str(entry), listing=listing, time_filter=time_filter)
+            )
+    return tuple(targets)
+
+
+def _parse_credentials(
+    pool_raw: Mapping[str, Any], default: RedditConfig
+) -> tuple[RedditConfig, ...]:
+    # Entries without a user_agent share the primary app's
+    return tuple(
+        RedditConfig(
+            client_id=str(entry["client_id"]).strip(),
+            client_secret=str(entry["client_secret"]).strip(),
+            user_agent=str(entry.get("user_agent") or default.user_agent).strip(),
+        )
+        for entry in pool_raw.get("credentials") or []
+    )
+
+
+def _parse_ttls(cache_raw: Mapping[str, Any]) -> tuple[tuple[str, float], ...]:
+    # Configured endpoints override (or add to) the defaults
+    ttls = dict(HttpCacheConfig.ttl_sec)
+    for label, ttl in (cache_raw.get("ttl_sec") or {}).items():
+        ttls[str(label)] = float(ttl)
+    return tuple(ttls.items())
+
+
+def pool_credentials(cfg: AppConfig) -> list[RedditConfig]:
+    """Every Reddit app a run may use: `reddit` first, then `reddit_pool.credentials`."""
+    return [cfg.reddit, *cfg.reddit_pool.credentials]
+
+
+def probe_targets(probe: ProbeConfig) -> list[TargetConfig]:
+    """Targets to crawl: `probe.targets`, or the single subreddit/listing/time_filter."""
+    if probe.targets:
+        return list(probe.targets)
+    return [TargetConfig(probe.subreddit, probe.listing, probe.time_filter)]
+
+
 def load_config(config_path: str | Path = "config.yaml") -> AppConfig:
+    import yaml
+    from dotenv import load_dotenv
+
     # Load .env if present
     load_dotenv(override=False)
 
@@ -72,6 +222,11 @@ def load_config(config_path: str | Path = "config.yaml") -> AppConfig:
     reddit_raw = raw.get("reddit", {})
     probe_raw = raw.get("probe", {})
     supabase_raw = raw.get("supabase", {})
+    postgres_raw = raw.get("postgres", {})
+    parquet_raw = raw.get("parquet", {})
+    pool_raw = raw.get("reddit_pool", {})
+    cache_raw = raw.get("http_cache", {})
+    retry_raw = raw.get("retry", {})
 
     reddit_cfg = RedditConfig(
         client_id=str(
@@ -102,11 +257,55 @@ def load_config(config_path: str | Path = "config.yaml") -> AppConfig:
                 ProbeConfig.comment_replace_more_limit,
             )
         ),
+        comment_concurrency=int(
+            probe_raw.get("comment_concurrency", ProbeConfig.comment_concurrency)
+        ),
+        comment_request_budget=int(
+            probe_raw.get("comment_request_budget", ProbeConfig.comment_request_budget)
+        ),
+        comment_sampling=str(
+            probe_raw.get("comment_sampling", ProbeConfig.comment_sampling)
+        ).strip(),
         qpm_cap=int(probe_raw.get("qpm_cap", ProbeConfig.qpm_cap)),
+        adaptive_ratelimit=bool(
+            probe_raw.get("adaptive_ratelimit", ProbeConfig.adaptive_ratelimit)
+        ),
+        adaptive_max_qpm=int(probe_raw.get("adaptive_max_qpm", ProbeConfig.adaptive_max_qpm)),
         max_runtime_sec=int(
             probe_raw.get("max_runtime_sec", ProbeConfig.max_runtime_sec)
         ),
+        deadline_margin_sec=float(
+            probe_raw.get("deadline_margin_sec", ProbeConfig.deadline_margin_sec)
+        ),
         raw_json=int(probe_raw.get("raw_json", ProbeConfig.raw_json)),
+        source=str(probe_raw.get("source", ProbeConfig.source)),
+        stream=bool(probe_raw.get("stream", ProbeConfig.stream)),
+        stream_batch_size=int(
+            probe_raw.get("stream_batch_size", ProbeConfig.stream_batch_size)
+        ),
+        stream_flush_sec=float(
+            probe_raw.get("stream_flush_sec", ProbeConfig.stream_flush_sec)
+        ),
+        incremental=bool(probe_raw.get("incremental", ProbeConfig.incremental)),
+        cursor_store=str(probe_raw.get("cursor_store", ProbeConfig.cursor_store)),
+        state_path=str(probe_raw.get("state_path", ProbeConfig.state_path)),
+        change_detection=bool(
+            probe_raw.get("change_detection", ProbeConfig.change_detection)
+        ),
+        hash_index=str(probe_raw.get("hash_index", ProbeConfig.hash_index)),
+        checkpoint=bool(probe_raw.get("checkpoint", ProbeConfig.checkpoint)),
+        checkpoint_store=str(probe_raw.get("checkpoint_store", ProbeConfig.checkpoint_store)),
+        spool=bool(probe_raw.get("spool", ProbeConfig.spool)),
+        spool_dir=str(probe_raw.get("spool_dir", ProbeConfig.spool_dir)),
+        run_telemetry=bool(probe_raw.get("run_telemetry", ProbeConfig.run_telemetry)),
+        comment_delta=bool(probe_raw.get("comment_delta", ProbeConfig.comment_delta)),
+        comment_state_store=str(
+            probe_raw.get("comment_state_store", ProbeConfig.comment_state_store)
+        ),
+        targets=_parse_targets(probe_raw),
+        target_concurrency=int(
+            probe_raw.get("target_concurrency", ProbeConfig.target_concurrency)
+        ),
     )
 
     supabase_cfg = SupabaseConfig(
@@ -114,9 +313,65 @@ def load_config(config_path: str | Path = "config.yaml") -> AppConfig:
         url=str(supabase_raw.get("url") or os.getenv("SUPABASE_URL", "")).strip(),
         key=str(supabase_raw.get("key") or os.getenv("SUPABASE_KEY", "")).strip(),
         schema=str(supabase_raw.get("schema", "public")),
+        chunk_size=int(supabase_raw.get("chunk_size", SupabaseConfig.chunk_size)),
+        max_in_flight=int(supabase_raw.get("max_in_flight", SupabaseConfig.max_in_flight)),
+        max_retries=int(supabase_raw.get("max_retries", SupabaseConfig.max_retries)),
+        rpc_ingest=bool(supabase_raw.get("rpc_ingest", SupabaseConfig.rpc_ingest)),
+    )
+
+    postgres_cfg = PostgresConfig(
+        enabled=bool(postgres_raw.get("enabled", PostgresConfig.enabled)),
+        dsn=str(postgres_raw.get("dsn") or os.getenv("POSTGRES_DSN", "")).strip(),
+        schema=str(postgres_raw.get("schema", PostgresConfig.schema)),
+        copy_batch_rows=int(
+            postgres_raw.get("copy_batch_rows", PostgresConfig.copy_batch_rows)
+        ),
+    )
+
+    parquet_cfg = ParquetConfig(
+        enabled=bool(parquet_raw.get("enabled", ParquetConfig.enabled)),
+        dir=str(parquet_raw.get("dir", ParquetConfig.dir)),
+        row_group_rows=int(parquet_raw.get("row_group_rows", ParquetConfig.row_group_rows)),
+        compression=str(parquet_raw.get("compression", ParquetConfig.compression)),
+    )
+
+    pool_cfg = RedditPoolConfig(
+        credentials=_parse_credentials(pool_raw, reddit_cfg),
+        failure_threshold=int(
+            pool_raw.get("failure_threshold", RedditPoolConfig.failure_threshold)
+        ),
+        cooldown_sec=float(pool_raw.get("cooldown_sec", RedditPoolConfig.cooldown_sec)),
+    )
+
+    cache_cfg = HttpCacheConfig(
+        enabled=bool(cache_raw.get("enabled", HttpCacheConfig.enabled)),
+        path=str(cache_raw.get("path", HttpCacheConfig.path)),
+        max_mb=float(cache_raw.get("max_mb", HttpCacheConfig.max_mb)),
+        default_ttl_sec=float(cache_raw.get("default_ttl_sec", HttpCacheConfig.default_ttl_sec)),
+        ttl_sec=_parse_ttls(cache_raw),
+        replay=bool(cache_raw.get("replay", HttpCacheConfig.replay)),
     )
 
-    return AppConfig(reddit=reddit_cfg, probe=probe_cfg, supabase=supabase_cfg)
+    retry_cfg = RetryConfig(
+        max_attempts=int(retry_raw.get("max_attempts", RetryConfig.max_attempts)),
+        backoff_base_sec=float(retry_raw.get("backoff_base_sec", RetryConfig.backoff_base_sec)),
+        backoff_max_sec=float(retry_raw.get("backoff_max_sec", RetryConfig.backoff_max_sec)),
+        breaker_failures=int(retry_raw.get("breaker_failures", RetryConfig.breaker_failures)),
+        breaker_cooldown_sec=float(
+            retry_raw.get("breaker_cooldown_sec", RetryConfig.breaker_cooldown_sec)
+        ),
+    )
+
+    return AppConfig(
+        reddit=reddit_cfg,
+        probe=probe_cfg,
+        supabase=supabase_cfg,
+        postgres=postgres_cfg,
+        parquet=parquet_cfg,
+        reddit_pool=pool_cfg,
+        http_cache=cache_cfg,
+        retry=retry_cfg,
+    )
 
 
 def generate_run_id() -> str:
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from reddit_researcher.core.ports import AsyncMetricsSink, MetricsSink
+from reddit_researcher.core.ratelimit import AdaptiveRateLimiter, RateLimiter
+
+# The asyncio runtime's helpers live here, so the threaded (and Lambda) import path
+# never loads asyncio
+
+_STOP = object()
+
+
+class ThreadedAsyncSink:
+    """`AsyncMetricsSink` that runs a synchronous `MetricsSink` in worker threads.
+
+    Lets the async runtime use sinks with no asyncio client (Postgres COPY, Parquet):
+    each call is one `asyncio.to_thread`, so the event loop keeps fetching meanwhile.
+    Calls are serialized, since the wrapped sinks are not all thread-safe.
+    """
+
+    def __init__(self, sink: MetricsSink) -> None:
+        self.sink = sink
+        self._lock = asyncio.Lock()
+
+    async def upsert_run(self, row: dict[str, Any]) -> None:
+        await self._call("upsert_run", row)
+
+    async def upsert_posts(self, rows: Iterable[dict[str, Any]]) -> None:
+        await self._call("upsert_posts", rows)
+
+    async def upsert_comments(self, rows: Iterable[dict[str, Any]]) -> None:
+        await self._call("upsert_comments", rows)
+
+    async def link_run_posts(self, run_id: str, post_ids: Iterable[str]) -> None:
+        await self._call("link_run_posts", run_id, post_ids)
+
+    async def link_run_comments(self, run_id: str, comment_ids: Iterable[str]) -> None:
+        await self._call("link_run_comments", run_id, comment_ids)
+
+    async def ingest_posts(self, run_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        await self._call("ingest_posts", run_id, rows)
+
+    async def ingest_comments(self, run_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        await self._call("ingest_comments", run_id, rows)
+
+    async def _call(self, op: str, *args: Any) -> None:
+        async with self._lock:
+            await asyncio.to_thread(getattr(self.sink, op), *args)
+
+
+class AsyncRateLimiter:
+    """Awaitable front for a `RateLimiter`, for sources running on an event loop.
+
+    Reservations go through the wrapped limiter (so thread and async callers can share
+    one budget); the wait is `asyncio.sleep`, which never blocks the loop.
+    """
+
+    def __init__(self, limiter: RateLimiter) -> None:
+        self.limiter = limiter
+
+    async def acquire(self, cost: float = 1.0) -> None:
+        wait_s = self.limiter.reserve(cost)
+        if wait_s > 0:
+            await asyncio.sleep(wait_s)
+
+    def observe(self, headers: Mapping[str, str] | None) -> None:
+        if isinstance(self.limiter, AdaptiveRateLimiter):
+            self.limiter.observe(headers)
+
+    @property
+    def qpm(self) -> float:
+        return self.limiter.qpm
+
+
+class AsyncStreamingWriter:
+    """`StreamingWriter` for the event loop: a flush task instead of a thread.
+
+    `put_post`/`put_comment` await a bounded `asyncio.Queue`, so a slow sink pauses
+    producers; the flush task ingests `batch_size` rows or whatever arrived within
+    `flush_interval_s`, while listing and comment fetches continue.
+    """
+
+    def __init__(
+        self,
+        sink: AsyncMetricsSink,
+        run_id: str,
+        *,
+        batch_size: int = 500,
+        flush_interval_s: float = 2.0,
+        max_pending: int | None = None,
+    ) -> None:
+        if batch_size <= 0:
+            raise ValueError("batch_size must be > 0")
+        self._sink = sink
+        self._run_id = run_id
+        self._batch_size = batch_size
+        self._flush_interval_s = max(0.01, float(flush_interval_s))
+        self._queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=max_pending or batch_size * 4)
+        self._task: asyncio.Task[None] | None = None
+        self._error: BaseException | None = None
+        self.posts_written = 0
+        self.comments_written = 0
+        self.flushes = 0
+
+    def start(self) -> AsyncStreamingWriter:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    async def put_post(self, row: dict[str, Any]) -> None:
+        await self._put(("posts", row))
+
+    async def put_comment(self, row: dict[str, Any]) -> None:
+        await self._put(("comments", row))
+
+    async def close(self) -> None:
+        """Flush whatever is buffered, stop the task and re-raise any sink error."""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        if self._error is None:
+            await self._queue.put(_STOP)
+        await task
+
+    async def _put(self, item: Any) -> None:
+        if self._error is not None:
+            raise self._error
+        await self._queue.put(item)
+
+    async def _run(self) -> None:
+        try:
+            await self._drain()
+        except BaseException as exc:
+            # Surface to producers, and unblock any waiting on a full queue
+            self._error = exc
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            raise
+
+    async def _drain(self) -> None:
+        loop = asyncio.get_running_loop()
+        buffers: dict[str, list[dict[str, Any]]] = {"posts": [], "comments": []}
+        next_flush = loop.time() + self._flush_interval_s
+        while True:
+            if not self._queue.empty():
+                # wait_for costs a task per call; only wait when there is nothing to take
+                item = self._queue.get_nowait()
+            else:
+                try:
+                    item = await asyncio.wait_for(
+                        self._queue.get(), timeout=max(0.0, next_flush - loop.time())
+                    )
+                except TimeoutError:
+                    item = None
+            if item is _STOP:
+                await self._flush(buffers)
+                return
+            if item is not None:
+                kind, row = item
+                buffers[kind].append(row)
+                if len(buffers[kind]) >= self._batch_size:
+                    rows, buffers[kind] = buffers[kind], []
+                    await self._flush_kind(kind, rows)
+            if loop.time() >= next_flush:
+                await self._flush(buffers)
+                next_flush = loop.time() + self._flush_interval_s
+
+    async def _flush(self, buffers: dict[str, list[dict[str, Any]]]) -> None:
+        for kind in ("posts", "comments"):
+            if buffers[kind]:
+                rows, buffers[kind] = buffers[kind], []
+                await self._flush_kind(kind, rows)
+
+    async def _flush_kind(self, kind: str, rows: list[dict[str, Any]]) -> None:
+        if kind == "posts":
+            await self._sink.ingest_posts(self._run_id, rows)
+            self.posts_written += len(rows)
+        else:
+            await self._sink.ingest_comments(self._run_id, rows)
+            self.comments_written += len(rows)
+        self.flushes += 1
@@ -0,0 +1,481 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from reddit_researcher.apis.postgres.sink import PostgresCopySink
+from reddit_researcher.apis.reddit.async_source import AsyncRedditJsonSource
+from reddit_researcher.apis.supabase.async_sink import AsyncSupabaseSink
+from reddit_researcher.config.config import (
+    AppConfig,
+    TargetConfig,
+    generate_run_id,
+    load_config,
+    probe_targets,
+)
+from reddit_researcher.core.aio import AsyncRateLimiter, AsyncStreamingWriter, ThreadedAsyncSink
+from reddit_researcher.core.checkpoint import Deadline
+from reddit_researcher.core.dedupe import SeenIds
+from reddit_researcher.core.incremental import CursorTracker, applies_to
+from reddit_researcher.core.normalizers import comment_records, post_records
+from reddit_researcher.core.ports import AsyncMetricsSink, AsyncRedditSource, CursorStore
+from reddit_researcher.core.records import CommentRecord, PostRecord
+from reddit_researcher.core.retry import is_retryable
+from reddit_researcher.core.run import (
+    POST_PAGE_SIZE,
+    TargetStats,
+    comments_per_post_stats,
+    configure_logging,
+    cursor_key,
+    expansion_plan,
+    make_cursor_store,
+    make_limiter,
+    time_budget,
+)
+from reddit_researcher.core.sampling import make_sampler, sample_cost
+from reddit_researcher.core.telemetry import Stopwatch, TelemetryRecorder
+
+# Probe options only the threaded runtime implements; the async runtime rejects them
+_THREADED_ONLY = ("checkpoint", "comment_delta", "change_detection", "spool")
+
+
+def main(argv: list[str] | None = None, *, time_budget_sec: float | None = None) -> int:
+    configure_logging()
+    _ = argv or sys.argv[1:]
+
+    try:
+        cfg: AppConfig = load_config("config.yaml")
+    except FileNotFoundError as exc:
+        print(str(exc))
+        return 2
+
+    metrics = asyncio.run(run_probe_async(cfg, time_budget_sec=time_budget_sec))
+    print(
+        json.dumps(
+            {
+                "run_id": metrics["run_id"],
+                "posts": metrics["posts_count"],
+                "comments": metrics["comments_total"],
+                "complete": metrics["complete"],
+            }
+        )
+    )
+    return 0
+
+
+async def run_probe_async(
+    cfg: AppConfig,
+    *,
+    source: AsyncRedditSource | None = None,
+    sink: AsyncMetricsSink | None = None,
+    time_budget_sec: float | None = None,
+) -> dict[str, Any]:
+    """Run one probe crawl on the running event loop and return its metrics.
+
+    The asyncio counterpart of `run_probe`, with the same sampling, request budget,
+    deadline, incremental cursors and metrics. Listing pages, comment expansions
+    (up to `comment_concurrency` in flight across all targets) and sink flushes
+    all overlap on one loop, with no worker threads. Rows always stream to the sink
+    through an `AsyncStreamingWriter`.
+
+    `source` defaults to `AsyncRedditJsonSource`. `sink` defaults to
+    `AsyncSupabaseSink`, or the Postgres COPY sink in a worker thread.
+    """
+    logger = logging.getLogger("reddit_researcher.probe")
+    _check_supported(cfg)
+
+    targets = probe_targets(cfg.probe)
+    deadline = Deadline(time_budget(cfg, time_budget_sec))
+    run_id = generate_run_id()
+    started_at = time.time()
+    logger.info(
+        "starting async run %s targets=%s N=%s K=%s repl_more=%s",
+        run_id,
+        ",".join(f"{t.subreddit}/{t.listing}" for t in targets),
+        cfg.probe.post_limit,
+        cfg.probe.comment_sample,
+        cfg.probe.comment_replace_more_limit,
+    )
+
+    telem = TelemetryRecorder()
+    limiter = AsyncRateLimiter(make_limiter(cfg, telem))
+    # Adapters built here are closed here; injected ones belong to the caller
+    owned: list[Any] = []
+    if source is None:
+        source = AsyncRedditJsonSource(
+            cfg,
+            limiter=limiter,
+            telemetry=telem,
+            max_connections=max(1, cfg.probe.comment_concurrency) + len(targets),
+            max_retries=cfg.retry.max_attempts - 1,
+        )
+        owned.append(source)
+    if sink is None:
+        sink = _make_async_sink(cfg, telem)
+        if isinstance(sink, AsyncSupabaseSink):
+            owned.append(sink)
+
+    try:
+        writer: AsyncStreamingWriter | None = None
+        emit_post: Callable[[PostRecord], Awaitable[None]] = _discard
+        emit_comment: Callable[[CommentRecord], Awaitable[None]] = _discard
+        if sink is not None:
+            stream = writer = AsyncStreamingWriter(
+                sink,
+                run_id,
+                batch_size=cfg.probe.stream_batch_size,
+                flush_interval_s=cfg.probe.stream_flush_sec,
+            ).start()
+
+            async def emit_post(rec: PostRecord) -> None:
+                await stream.put_post(rec.as_row())
+
+            async def emit_comment(rec: CommentRecord) -> None:
+                await stream.put_comment(rec.as_row())
+
+        cursor_store: CursorStore | None = None
+        trackers = {t: CursorTracker() for t in targets}
+        if cfg.probe.incremental:
+            cursor_store = make_cursor_store(cfg)
+            for t in [t for t in targets if applies_to(t.listing)]:
+                trackers[t] = CursorTracker(cursor_store.load(cursor_key(t)))
+
+        request_budget = cfg.probe.comment_request_budget // len(targets) if targets else 0
+        # Posts listed by more than one target are emitted and expanded once
+        seen_posts = SeenIds()
+        target_slots = asyncio.Semaphore(max(1, cfg.probe.target_concurrency))
+        comment_slots = asyncio.Semaphore(max(1, cfg.probe.comment_concurrency))
+        results = await asyncio.gather(
+            *(
+                _crawl_target_async(
+                    t,
+                    cfg=cfg,
+                    source=source,
+                    telem=telem,
+                    tracker=trackers[t],
+                    emit_post=emit_post,
+                    emit_comment=emit_comment,
+                    request_budget=request_budget,
+                    seen_posts=seen_posts,
+                    deadline=deadline,
+                    target_slots=target_slots,
+                    comment_slots=comment_slots,
+                )
+                for t in targets
+            )
+        )
+
+        if writer is not None:
+            await writer.close()
+            logger.info(
+                "streamed %d posts and %d comments in %d flushes",
+                writer.posts_written,
+                writer.comments_written,
+                writer.flushes,
+            )
+
+        ended_at = time.time()
+        elapsed_sec = max(0.0, ended_at - started_at)
+        posts_count = sum(r.stats.posts for r in results)
+        comments_total = sum(r.stats.comments for r in results)
+        subreddit_label = "+".join(dict.fromkeys(t.subreddit for t in targets))
+        listing_label = ",".join(dict.fromkeys(t.listing for t in targets))
+        complete = all(r.listed and r.skipped == 0 for r in results)
+        metrics: dict[str, Any] = {
+            "run_id": run_id,
+            "config": {
+                "subreddit": subreddit_label,
+                "listing": listing_label,
+                "post_limit": cfg.probe.post_limit,
+                "comment_sample": cfg.probe.comment_sample,
+                "comment_replace_more_limit": cfg.probe.comment_replace_more_limit,
+                "comment_concurrency": cfg.probe.comment_concurrency,
+                "qpm_cap": cfg.probe.qpm_cap,
+                "adaptive_ratelimit": cfg.probe.adaptive_ratelimit,
+                "final_qpm": round(limiter.qpm, 1),
+                "raw_json": cfg.probe.raw_json,
+                "stream": True,
+                "runtime": "async",
+            },
+            "timing": {"started_at": started_at, "ended_at": ended_at, "elapsed_sec": elapsed_sec},
+            "telemetry": telem.summary(),
+            "posts_count": posts_count,
+            "comments_total": comments_total,
+            "comments_per_expanded_post": comments_per_post_stats(r.stats for r in results),
+            "targets": [r.stats.as_row() for r in results],
+            "resumed": False,
+            "complete": complete,
+        }
+
+        if sink is not None:
+            run_row: dict[str, Any] = {
+                "run_id": run_id,
+                "started_at": started_at,
+                "ended_at": ended_at,
+                "elapsed_sec": elapsed_sec,
+                "subreddit": subreddit_label,
+                "listing": listing_label,
+                "post_limit": cfg.probe.post_limit,
+                "comment_sample": cfg.probe.comment_sample,
+                "replace_more_limit": cfg.probe.comment_replace_more_limit,
+                "qpm_cap": cfg.probe.qpm_cap,
+                "raw_json": cfg.probe.raw_json,
+                "posts_count": posts_count,
+                "comments_total": comments_total,
+            }
+            if len(targets) > 1:
+                run_row["targets"] = metrics["targets"]
+            metrics["telemetry"] = telem.summary()
+            if cfg.probe.run_telemetry:
+                run_row["telemetry"] = metrics["telemetry"]
+            await sink.upsert_run(run_row)
+            logger.info("upserted run %s", run_id)
+
+        # A listing the deadline cut short keeps its cursor: with no checkpoint to
+        # continue from, the next run lists the posts this one did not reach
+        if cursor_store is not None:
+            for t, r in zip(targets, results, strict=True):
+                tracker = trackers[t]
+                if not (applies_to(t.listing) and r.listed):
+                    continue
+                if tracker.cursor is not None and tracker.advanced:
+                    cursor_store.save(cursor_key(t), tracker.cursor)
+                    logger.info("saved cursor %s/%s %s", t.subreddit, t.listing, tracker.cursor)
+    finally:
+        for adapter in owned:
+            await adapter.aclose()
+
+    logger.info("finished async run %s elapsed=%.2fs", run_id, elapsed_sec)
+    return metrics
+
+
+def _check_supported(cfg: AppConfig) -> None:
+    """Refuse a config that enables what only `run_probe` implements."""
+    unsupported = [f"probe.{flag}" for flag in _THREADED_ONLY if getattr(cfg.probe, flag)]
+    if cfg.parquet.enabled:
+        unsupported.append("parquet.enabled")
+    if cfg.reddit_pool.credentials:
+        unsupported.append("reddit_pool.credentials")
+    if cfg.http_cache.enabled:
+        unsupported.append("http_cache.enabled")
+    if unsupported:
+        raise ValueError(
+            f"not supported by the async runtime: {', '.join(unsupported)}; "
+            "disable them or use reddit-probe"
+        )
+
+
+class _TargetResult:
+    """`TargetStats` plus what the deadline cut short (the async runtime has no checkpoint)."""
+
+    def __init__(self, target: TargetConfig) -> None:
+        self.stats = TargetStats(target=target)
+        self.listed = False
+        self.skipped = 0
+
+
+async def _crawl_target_async(
+    target: TargetConfig,
+    *,
+    cfg: AppConfig,
+    source: AsyncRedditSource,
+    telem: TelemetryRecorder,
+    tracker: CursorTracker,
+    emit_post: Callable[[PostRecord], Awaitable[None]],
+    emit_comment: Callable[[CommentRecord], Awaitable[None]],
+    request_budget: int,
+    seen_posts: SeenIds,
+    deadline: Deadline,
+    target_slots: asyncio.Semaphore,
+    comment_slots: asyncio.Semaphore,
+) -> _TargetResult:
+    """List one target, then expand its sample; each expansion's rows are emitted as it lands."""
+    logger = logging.getLogger("reddit_researcher.probe")
+    result = _TargetResult(target)
+    stats = result.stats
+    started = time.monotonic()
+    try:
+        async with target_slots:
+            if deadline.expired:
+                logger.warning(
+                    "deadline reached before listing %s/%s", target.subreddit, target.listing
+                )
+                return result
+            pending, result.listed = await _list_target_async(
+                target,
+                cfg=cfg,
+                source=source,
+                telem=telem,
+                tracker=tracker,
+                emit_post=emit_post,
+                stats=stats,
+                request_budget=request_budget,
+                seen_posts=seen_posts,
+                deadline=deadline,
+            )
+
+        async def _expand(submission_id: str, replace_more_limit: int) -> None:
+            async with comment_slots:
+                if deadline.expired:
+                    result.skipped += 1
+                    return
+                comments = await _expand_comments_async(
+                    source, submission_id, replace_more_limit=replace_more_limit, telem=telem
+                )
+            if comments is None:
+                return
+            stats.comments_per_post.append(len(comments))
+            stats.comments += len(comments)
+            for rec in comment_records(comments, link_id=submission_id):
+                await emit_comment(rec)
+
+        await asyncio.gather(*(_expand(pid, rml) for pid, rml in pending.items()))
+        if result.skipped:
+            logger.warning(
+                "deadline reached; dropped %d pending expansions for %s/%s",
+                result.skipped,
+                target.subreddit,
+                target.listing,
+            )
+    except Exception as exc:
+        logger.exception("target %s/%s failed", target.subreddit, target.listing)
+        stats.error = f"{type(exc).__name__}: {exc}"
+        result.listed = True
+    stats.elapsed_sec = time.monotonic() - started
+    return result
+
+
+async def _list_target_async(
+    target: TargetConfig,
+    *,
+    cfg: AppConfig,
+    source: AsyncRedditSource,
+    telem: TelemetryRecorder,
+    tracker: CursorTracker,
+    emit_post: Callable[[PostRecord], Awaitable[None]],
+    stats: TargetStats,
+    request_budget: int,
+    seen_posts: SeenIds,
+    deadline: Deadline,
+) -> tuple[dict[str, int], bool]:
+    """Fetch and emit a target's posts; return the sample to expand (id -> replace_more).
+
+    The returned flag is False when `deadline` stopped the listing before its last
+    page; the sample then covers the posts listed so far.
+    """
+    logger = logging.getLogger("reddit_researcher.probe")
+    logger.info(
+        "fetching posts listing=%s subreddit=%s limit=%s",
+        target.listing,
+        target.subreddit,
+        cfg.probe.post_limit,
+    )
+    # Samplers consume a plain iterable, so the target's records are kept until listed
+    records: list[PostRecord] = []
+    page: list[Any] = []
+
+    async def _flush_page(elapsed_s: float) -> None:
+        telem.record("listing.page", None, elapsed_s, rows=len(page))
+        for rec in post_records(page):
+            if rec.id and not seen_posts.first(rec.id):
+                continue
+            stats.posts += 1
+            await emit_post(rec)
+            records.append(rec)
+        page.clear()
+
+    listed = True
+    sw = Stopwatch()
+    sw.start()
+    async for item in source.iter_posts(
+        subreddit=target.subreddit,
+        listing=target.listing,
+        time_filter=target.time_filter,
+        limit=cfg.probe.post_limit,
+        since=tracker.cursor,
+    ):
+        tracker.observe(item)
+        page.append(item)
+        if len(page) >= POST_PAGE_SIZE:
+            sw.stop()
+            await _flush_page(sw.elapsed or 0.0)
+            # No further page is requested once the deadline has passed
+            if deadline.expired:
+                listed = False
+                break
+            sw = Stopwatch()
+            sw.start()
+    if page:
+        sw.stop()
+        await _flush_page(sw.elapsed or 0.0)
+    if not listed:
+        logger.warning(
+            "deadline reached while listing %s/%s; %d posts listed",
+            target.subreddit,
+            target.listing,
+            stats.posts,
+        )
+
+    sampler = make_sampler(
+        cfg.probe.comment_sampling,
+        k=cfg.probe.comment_sample,
+        request_budget=request_budget,
+        replace_more_limit=cfg.probe.comment_replace_more_limit,
+    )
+    sample = sampler.select(records)
+    est_requests, est_comments = sample_cost(sample, cfg.probe.comment_replace_more_limit)
+    logger.info(
+        "fetched %d posts from %s/%s; sampling %d for comments (%s, ~%d requests, ~%d comments)",
+        stats.posts,
+        target.subreddit,
+        target.listing,
+        len(sample),
+        cfg.probe.comment_sampling,
+        est_requests,
+        est_comments,
+    )
+    plan = expansion_plan(sample, target=target, cfg=cfg, request_budget=request_budget)
+    return plan, listed
+
+
+async def _expand_comments_async(
+    source: AsyncRedditSource,
+    submission_id: str,
+    *,
+    replace_more_limit: int,
+    telem: TelemetryRecorder,
+) -> list[Any] | None:
+    """Expand one submission's comments; None if it failed (the source retries requests)."""
+    try:
+        with Stopwatch() as sw:
+            comments = await source.fetch_comments(
+                submission_id=submission_id, replace_more_limit=replace_more_limit
+            )
+    except Exception as exc:
+        logging.getLogger("reddit_researcher.probe").warning(
+            "skipping comments of %s (%s): %s",
+            submission_id,
+            "retryable" if is_retryable(exc) else "fatal",
+            exc,
+        )
+        telem.record(endpoint="comments.failed", headers={}, elapsed_s=None)
+        return None
+    telem.record(endpoint="comments.fetch", headers={}, elapsed_s=sw.elapsed)
+    return comments
+
+
+def _make_async_sink(cfg: AppConfig, telem: TelemetryRecorder) -> AsyncMetricsSink | None:
+    if cfg.postgres.enabled and cfg.postgres.dsn:
+        return ThreadedAsyncSink(PostgresCopySink(cfg, telemetry=telem))
+    if cfg.supabase.enabled and cfg.supabase.url and cfg.supabase.key:
+        return AsyncSupabaseSink(cfg, telemetry=telem)
+    return None
+
+
+async def _discard(_rec: Any) -> None:
+    return None
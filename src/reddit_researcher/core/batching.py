@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+def batched(items: Iterable[T], size: int) -> Iterator[list[T]]:  # noqa: UP047
+    """Consume `items` lazily in lists of `size`; the last one may be shorter."""
+    it = iter(items)
+    while batch := list(islice(it, max(1, size))):
+        yield batch
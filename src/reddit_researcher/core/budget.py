@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import heapq
+import math
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+# Comments Reddit returns with the initial /comments/{id} request (default `limit`)
+INITIAL_LOAD = 200
+# Child IDs one /api/morechildren request can expand
+MORECHILDREN_BATCH = 100
+
+
+def plan_comment_budget(
+    posts: Iterable[Mapping[str, Any]],
+    total_requests: int,
+    *,
+    initial_load: int = INITIAL_LOAD,
+    per_request: int = MORECHILDREN_BATCH,
+) -> dict[str, int]:
+    """Spread a run's comment request budget across submissions by expected yield.
+
+    Each planned submission costs one request for its initial tree, which yields
+    up to `initial_load` comments. Every further request expands up to `per_request`
+    hidden comments. Requests go greedily to whichever submission would return the
+    most new comments for its next request. The result maps post id to its total
+    requests (0 = not expanded).
+    """
+    rows = [(str(p.get("id")), int(p.get("num_comments") or 0)) for p in posts if p.get("id")]
+    plan = {pid: 0 for pid, _ in rows}
+    remaining = max(0, int(total_requests))
+    # Max-heap on the next request's yield: (-yield, order, post_id, comments not yet reachable)
+    heap = [
+        (-min(num_comments, initial_load), order, pid, num_comments)
+        for order, (pid, num_comments) in enumerate(rows)
+        if num_comments > 0
+    ]
+    heapq.heapify(heap)
+    while remaining > 0 and heap:
+        neg_yield, order, pid, left = heapq.heappop(heap)
+        plan[pid] += 1
+        remaining -= 1
+        left = max(0, left + neg_yield)
+        if left > 0:
+            heapq.heappush(heap, (-min(left, per_request), order, pid, left))
+    return plan
+
+
+def expected_requests(num_comments: int, *, initial_load: int = INITIAL_LOAD) -> int:
+    """Requests needed to fetch a whole thread: one initial load plus morechildren batches."""
+    hidden = max(0, int(num_comments) - initial_load)
+    return 1 + math.ceil(hidden / MORECHILDREN_BATCH)
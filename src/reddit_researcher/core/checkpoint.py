@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from reddit_researcher.config.config import TargetConfig
+
+
+class Deadline:
+    """Monotonic cut-off for starting new work; `None` seconds means no limit."""
+
+    def __init__(
+        self, seconds: float | None, *, time_fn: Callable[[], float] = time.monotonic
+    ) -> None:
+        self._time = time_fn
+        self._at = None if seconds is None else time_fn() + max(0.0, seconds)
+
+    @property
+    def expired(self) -> bool:
+        return self._at is not None and self._time() >= self._at
+
+    def remaining(self) -> float | None:
+        return None if self._at is None else max(0.0, self._at - self._time())
+
+
+@dataclass
+class TargetProgress:
+    """How far one target got: listing fetched, expansions still to do, counts so far."""
+
+    listed: bool = False
+    # Fullname of the last post listed when the deadline cut the listing short
+    after: str | None = None
+    # post id -> replace_more_limit, for sampled posts whose comments are not fetched yet
+    pending: dict[str, int] = field(default_factory=dict)
+    expanded: list[str] = field(default_factory=list)
+    posts: int = 0
+    comments: int = 0
+
+    @property
+    def done(self) -> bool:
+        return self.listed and not self.pending
+
+
+@dataclass
+class Checkpoint:
+    """Progress of a run that stopped at its deadline, resumed by the next invocation."""
+
+    run_id: str
+    started_at: float
+    targets: dict[str, TargetProgress] = field(default_factory=dict)
+
+    def progress(self, target: TargetConfig) -> TargetProgress:
+        return self.targets.setdefault(target_label(target), TargetProgress())
+
+    @property
+    def complete(self) -> bool:
+        return all(p.done for p in self.targets.values())
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, raw: str | dict[str, Any]) -> Checkpoint:
+        data = json.loads(raw) if isinstance(raw, str) else raw
+        return cls(
+            run_id=str(data["run_id"]),
+            started_at=float(data["started_at"]),
+            targets={k: TargetProgress(**v) for k, v in (data.get("targets") or {}).items()},
+        )
+
+
+def target_label(target: TargetConfig) -> str:
+    return f"{target.subreddit}/{target.listing}/{target.time_filter}"
+
+
+def checkpoint_key(targets: Iterable[TargetConfig]) -> str:
+    """Identify the crawl a checkpoint belongs to by its target list."""
+    return ",".join(target_label(t) for t in targets)
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from reddit_researcher.core.ports import CommentStateStore
+
+
+@dataclass(frozen=True)
+class CommentState:
+    """What the last run knew about one submission's comments."""
+
+    num_comments: int | None
+    fetched_at: float
+    known_ids: frozenset[str]
+
+
+class CommentDelta:
+    """Decide which sampled submissions need their comments fetched again.
+
+    `observe()` is fed the sampled posts with their listing `num_comments`. A post
+    whose count equals the stored one is unchanged and is skipped; the rest are
+    fetched newest-first, passing `known_ids(post_id)` to the source so it stops at
+    comments it has already seen. `update()` collects the fetched IDs and `save()`
+    writes the merged states once the run's rows have reached the sink, like cursors.
+    """
+
+    def __init__(
+        self, store: CommentStateStore, *, time_fn: Callable[[], float] = time.time
+    ) -> None:
+        self._store = store
+        self._time = time_fn
+        self._lock = threading.Lock()
+        self._states: dict[str, CommentState] = {}
+        self._num_comments: dict[str, int | None] = {}
+        self._updates: dict[str, CommentState] = {}
+        self.skipped = 0
+
+    def observe(self, posts: Iterable[tuple[str, int | None]]) -> set[str]:
+        """Record `(post_id, num_comments)` pairs; return the IDs that are unchanged."""
+        counts = dict(posts)
+        states = self._store.get_many(counts)
+        unchanged = {
+            pid
+            for pid, n in counts.items()
+            if n is not None and pid in states and states[pid].num_comments == n
+        }
+        with self._lock:
+            self._states.update(states)
+            self._num_comments.update(counts)
+            self.skipped += len(unchanged)
+        return unchanged
+
+    def lookup(self, post_ids: Iterable[str]) -> dict[str, CommentState]:
+        """Stored states of `post_ids` (e.g. for velocity sampling), cached for the run."""
+        states = self._store.get_many(post_ids)
+        with self._lock:
+            for pid, state in states.items():
+                self._states.setdefault(pid, state)
+        return states
+
+    def known_ids(self, post_id: str) -> frozenset[str] | None:
+        with self._lock:
+            state = self._states.get(post_id)
+        if state is None and post_id not in self._num_comments:
+            # Pending expansion resumed from a checkpoint; not observed this invocation
+            state = self._store.get_many([post_id]).get(post_id)
+            if state is not None:
+                with self._lock:
+                    self._states.setdefault(post_id, state)
+        return state.known_ids if state is not None else None
+
+    def update(self, post_id: str, comment_ids: Iterable[str]) -> None:
+        with self._lock:
+            previous = self._states.get(post_id)
+            known = frozenset(comment_ids)
+            if previous is not None:
+                known |= previous.known_ids
+            # A resumed run may not have listed this post; its count is then unknown
+            # and the next run refetches rather than skipping on a stale value.
+            state = CommentState(self._num_comments.get(post_id), self._time(), known)
+            self._states[post_id] = self._updates[post_id] = state
+
+    def save(self) -> int:
+        with self._lock:
+            updates, self._updates = self._updates, {}
+        if updates:
+            self._store.put_many(updates)
+        return len(updates)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable
+from typing import Any
+
+from reddit_researcher.core.hashing import row_digest
+from reddit_researcher.core.ports import HashIndex, MetricsSink
+
+
+class ChangeDetectingSink:
+    """`MetricsSink` wrapper that drops post/comment rows whose content is unchanged.
+
+    Each row is digested with `row_digest` (ignoring `retrieved_at`) and compared
+    with the digest stored in `index` from the last successful write. Only new or
+    changed rows reach the wrapped sink; digests are recorded after it succeeds.
+    Run rows and link rows pass through untouched; `ingest_*` still links the
+    unchanged rows' IDs to the run.
+    """
+
+    def __init__(self, sink: MetricsSink, index: HashIndex) -> None:
+        self._sink = sink
+        self._index = index
+        self._lock = threading.Lock()
+        self.rows_written = 0
+        self.rows_skipped = 0
+
+    def upsert_run(self, row: dict[str, Any]) -> None:
+        self._sink.upsert_run(row)
+
+    def upsert_posts(self, rows: Iterable[dict[str, Any]]) -> None:
+        changed, digests, _ = self._changed("posts", rows)
+        if changed:
+            self._sink.upsert_posts(changed)
+            self._index.put_many("posts", digests)
+
+    def upsert_comments(self, rows: Iterable[dict[str, Any]]) -> None:
+        changed, digests, _ = self._changed("comments", rows)
+        if changed:
+            self._sink.upsert_comments(changed)
+            self._index.put_many("comments", digests)
+
+    def link_run_posts(self, run_id: str, post_ids: Iterable[str]) -> None:
+        self._sink.link_run_posts(run_id, post_ids)
+
+    def link_run_comments(self, run_id: str, comment_ids: Iterable[str]) -> None:
+        self._sink.link_run_comments(run_id, comment_ids)
+
+    def ingest_posts(self, run_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        changed, digests, unchanged = self._changed("posts", rows)
+        if changed:
+            self._sink.ingest_posts(run_id, changed)
+            self._index.put_many("posts", digests)
+        if unchanged:
+            self._sink.link_run_posts(run_id, unchanged)
+
+    def ingest_comments(self, run_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        changed, digests, unchanged = self._changed("comments", rows)
+        if changed:
+            self._sink.ingest_comments(run_id, changed)
+            self._index.put_many("comments", digests)
+        if unchanged:
+            self._sink.link_run_comments(run_id, unchanged)
+
+    def _changed(
+        self, table: str, rows: Iterable[dict[str, Any]]
+    ) -> tuple[list[dict[str, Any]], dict[str, str], list[str]]:
+        data = list(rows)
+        ids = [r["id"] for r in data if isinstance(r.get("id"), str)]
+        known = self._index.get_many(table, ids) if ids else {}
+        changed: list[dict[str, Any]] = []
+        digests: dict[str, str] = {}
+        unchanged: list[str] = []
+        for row in data:
+            rid = row.get("id")
+            digest = row_digest(row)
+            if isinstance(rid, str):
+                if known.get(rid) == digest:
+                    unchanged.append(rid)
+                    continue
+                digests[rid] = digest
+            changed.append(row)
+        with self._lock:
+            self.rows_written += len(changed)
+            self.rows_skipped += len(data) - len(changed)
+        return changed, digests, unchanged
+
+
+class SeenIds:
+    """Thread-safe set of IDs shared by concurrent workers; only the first offer wins."""
+
+    def __init__(self, ids: Iterable[str] = ()) -> None:
+        self._ids = set(ids)
+        self._lock = threading.Lock()
+
+    def first(self, item_id: str) -> bool:
+        """Record `item_id`; True if no worker offered it before."""
+        with self._lock:
+            if item_id in self._ids:
+                return False
+            self._ids.add(item_id)
+            return True
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sized
+from typing import Any
+
+from reddit_researcher.core.ports import MetricsSink
+
+
+class FanOutSink:
+    """`MetricsSink` that forwards every call to each wrapped sink, in order.
+
+    Row iterables that are not re-iterable (generators) are materialized once so
+    every sink sees the same rows; a `RecordBatch` or list is passed through as is.
+    """
+
+    def __init__(self, sinks: Iterable[MetricsSink]) -> None:
+        self._sinks = list(sinks)
+
+    def upsert_run(self, row: dict[str, Any]) -> None:
+        for sink in self._sinks:
+            sink.upsert_run(row)
+
+    def upsert_posts(self, rows: Iterable[dict[str, Any]]) -> None:
+        rows = _reiterable(rows)
+        for sink in self._sinks:
+            sink.upsert_posts(rows)
+
+    def upsert_comments(self, rows: Iterable[dict[str, Any]]) -> None:
+        rows = _reiterable(rows)
+        for sink in self._sinks:
+            sink.upsert_comments(rows)
+
+    def link_run_posts(self, run_id: str, post_ids: Iterable[str]) -> None:
+        post_ids = _reiterable(post_ids)
+        for sink in self._sinks:
+            sink.link_run_posts(run_id, post_ids)
+
+    def link_run_comments(self, run_id: str, comment_ids: Iterable[str]) -> None:
+        comment_ids = _reiterable(comment_ids)
+        for sink in self._sinks:
+            sink.link_run_comments(run_id, comment_ids)
+
+    def ingest_posts(self, run_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        rows = _reiterable(rows)
+        for sink in self._sinks:
+            sink.ingest_posts(run_id, rows)
+
+    def ingest_comments(self, run_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        rows = _reiterable(rows)
+        for sink in self._sinks:
+            sink.ingest_comments(run_id, rows)
+
+
+def _reiterable(items: Iterable[Any]) -> Iterable[Any]:
+    return items if isinstance(items, Sized) else list(items)
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Mapping
+from typing import Any
+
+# Fields that change on every fetch without the content changing
+VOLATILE_FIELDS = frozenset({"retrieved_at"})
+
+
+def row_digest(row: Mapping[str, Any], *, exclude: frozenset[str] = VOLATILE_FIELDS) -> str:
+    """Stable digest over a normalized row's non-volatile fields."""
+    stable = {k: v for k, v in row.items() if k not in exclude}
+    payload = json.dumps(stable, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
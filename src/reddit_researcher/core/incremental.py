@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class CursorKey:
+    subreddit: str
+    listing: str
+    time_filter: str
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """High-water mark for one listing: newest `created_utc` seen and its fullname."""
+
+    created_utc: float
+    fullname: str
+
+
+def item_position(item: Any) -> tuple[float, str] | None:
+    """Return `(created_utc, fullname)` for a listing item, or None if it has no timestamp.
+
+    Accepts PRAW models and raw JSON `data` dicts alike.
+    """
+    raw_created = _get(item, "created_utc")
+    if raw_created is None:
+        return None
+    try:
+        created = float(raw_created)
+    except (TypeError, ValueError):
+        return None
+    fullname = _get(item, "name") or f"t3_{_get(item, 'id') or ''}"
+    return created, str(fullname)
+
+
+def _get(obj: Any, name: str) -> Any:
+    if isinstance(obj, Mapping):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+def is_seen(position: tuple[float, str], cursor: Cursor) -> bool:
+    created, fullname = position
+    return created < cursor.created_utc or fullname == cursor.fullname
+
+
+def applies_to(listing: str) -> bool:
+    """Whether a cursor can skip part of `listing`.
+
+    Only `new` is time-ordered. On ranked listings (`hot`, `top`) an older post can
+    rise into the listing after the cursor passed its timestamp, so they are always
+    crawled in full.
+    """
+    return listing == "new"
+
+
+def skip_seen(items: Iterable[Any], cursor: Cursor | None) -> Iterator[Any]:
+    """Yield a time-ordered listing's items down to the cursor.
+
+    The first already-seen item ends iteration, so no further pages are requested.
+    """
+    if cursor is None:
+        yield from items
+        return
+    for item in items:
+        position = item_position(item)
+        if position is not None and is_seen(position, cursor):
+            return
+        yield item
+
+
+async def skip_seen_async(items: AsyncIterable[Any], cursor: Cursor | None) -> AsyncIterator[Any]:
+    """`skip_seen` for an async listing."""
+    async for item in items:
+        position = item_position(item) if cursor is not None else None
+        if cursor is not None and position is not None and is_seen(position, cursor):
+            return
+        yield item
+
+
+class CursorTracker:
+    """Fold observed items into the next high-water mark."""
+
+    def __init__(self, start: Cursor | None = None) -> None:
+        self.cursor = start
+        self.advanced = False
+
+    def observe(self, item: Any) -> None:
+        position = item_position(item)
+        if position is None:
+            return
+        created, fullname = position
+        if self.cursor is None or created > self.cursor.created_utc:
+            self.cursor = Cursor(created_utc=created, fullname=fullname)
+            self.advanced = True
@@ -1,55 +1,136 @@
 from __future__ import annotations
 
-from datetime import UTC, datetime
+import time
+from collections.abc import Iterable, Mapping
 from typing import Any
 
+from reddit_researcher.core.records import CommentRecord, PostRecord
 
-def _ts_to_iso(ts: Any) -> str | None:
+
+def _epoch(ts: Any) -> float | None:
+    if type(ts) is float:
+        return ts
     try:
-        t = float(ts)
+        return float(ts)
     except Exception:
         return None
-    return datetime.fromtimestamp(t, tz=UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
 def normalize_post(submission: Any) -> dict[str, Any]:
-    return {
-        "id": getattr(submission, "id", None),
-        "subreddit": (
+    return post_record(submission).as_row()
+
+
+def normalize_comment(comment: Any, link_id: str | None = None) -> dict[str, Any]:
+    return comment_record(comment, link_id=link_id).as_row()
+
+
+def normalize_post_json(data: Mapping[str, Any]) -> dict[str, Any]:
+    """Normalize the `data` object of a raw `t3` listing child (no PRAW models)."""
+    return post_record(data).as_row()
+
+
+def normalize_comment_json(data: Mapping[str, Any], link_id: str | None = None) -> dict[str, Any]:
+    """Normalize the `data` object of a raw `t1` comment (no PRAW models)."""
+    return comment_record(data, link_id=link_id).as_row()
+
+
+def post_records(submissions: Iterable[Any]) -> list[PostRecord]:
+    """Normalize a page of listing items, stamping one `retrieved_at` for the page."""
+    retrieved_at = time.time()
+    return [post_record(s, retrieved_at=retrieved_at) for s in submissions]
+
+
+def comment_records(comments: Iterable[Any], link_id: str | None = None) -> list[CommentRecord]:
+    """Normalize one submission's comments, stamping one `retrieved_at` for the batch."""
+    retrieved_at = time.time()
+    return [comment_record(c, link_id=link_id, retrieved_at=retrieved_at) for c in comments]
+
+
+def post_record(submission: Any, *, retrieved_at: float | None = None) -> PostRecord:
+    """Build a `PostRecord` from a PRAW `Submission` or a raw JSON `data` dict."""
+    if retrieved_at is None:
+        retrieved_at = time.time()
+    if isinstance(submission, Mapping):
+        return _post_record_json(submission, retrieved_at)
+    return PostRecord(
+        id=getattr(submission, "id", None),
+        subreddit=(
             getattr(getattr(submission, "subreddit", None), "display_name", None)
             or getattr(submission, "subreddit", None)
         ),
-        "title": getattr(submission, "title", None),
-        "selftext": getattr(submission, "selftext", None),
-        "url": getattr(submission, "url", None),
-        "domain": getattr(submission, "domain", None),
-        "author": getattr(getattr(submission, "author", None), "name", None),
-        "created_utc": _ts_to_iso(getattr(submission, "created_utc", None)),
-        "score": getattr(submission, "score", None),
-        "num_comments": getattr(submission, "num_comments", None),
-        "over_18": getattr(submission, "over_18", None),
-        "upvote_ratio": getattr(submission, "upvote_ratio", None),
-        "permalink": getattr(submission, "permalink", None),
-        "retrieved_at": _ts_to_iso(datetime.now(tz=UTC).timestamp()),
-    }
+        title=getattr(submission, "title", None),
+        selftext=getattr(submission, "selftext", None),
+        url=getattr(submission, "url", None),
+        domain=getattr(submission, "domain", None),
+        author=getattr(getattr(submission, "author", None), "name", None),
+        created_utc=_epoch(getattr(submission, "created_utc", None)),
+        score=getattr(submission, "score", None),
+        num_comments=getattr(submission, "num_comments", None),
+        over_18=getattr(submission, "over_18", None),
+        upvote_ratio=getattr(submission, "upvote_ratio", None),
+        permalink=getattr(submission, "permalink", None),
+        retrieved_at=retrieved_at,
+    )
 
 
-def normalize_comment(comment: Any, link_id: str | None = None) -> dict[str, Any]:
-    cid = getattr(comment, "id", None)
-    link = link_id or getattr(comment, "link_id", None)
-    parent_id = getattr(comment, "parent_id", None)
-    return {
-        "id": cid,
-        "link_id": link,
-        "parent_id": parent_id,
-        "subreddit": (
+def comment_record(
+    comment: Any, link_id: str | None = None, *, retrieved_at: float | None = None
+) -> CommentRecord:
+    """Build a `CommentRecord` from a PRAW `Comment` or a raw JSON `data` dict."""
+    if retrieved_at is None:
+        retrieved_at = time.time()
+    if isinstance(comment, Mapping):
+        return _comment_record_json(comment, link_id, retrieved_at)
+    return CommentRecord(
+        id=getattr(comment, "id", None),
+        link_id=link_id or getattr(comment, "link_id", None),
+        parent_id=getattr(comment, "parent_id", None),
+        subreddit=(
             getattr(getattr(comment, "subreddit", None), "display_name", None)
             or getattr(comment, "subreddit", None)
         ),
-        "author": getattr(getattr(comment, "author", None), "name", None),
-        "body": getattr(comment, "body", None),
-        "created_utc": _ts_to_iso(getattr(comment, "created_utc", None)),
-        "score": getattr(comment, "score", None),
-        "depth": getattr(comment, "depth", None),
-        "retrieved_at": _ts_to_iso(datetime.now(tz=UTC).timestamp()),
-    }
+        author=getattr(getattr(comment, "author", None), "name", None),
+        body=getattr(comment, "body", None),
+        created_utc=_epoch(getattr(comment, "created_utc", None)),
+        score=getattr(comment, "score", None),
+        depth=getattr(comment, "depth", None),
+        retrieved_at=retrieved_at,
+    )
+
+
+def _post_record_json(data: Mapping[str, Any], retrieved_at: float) -> PostRecord:
+    get = data.get
+    return PostRecord(
+        id=get("id"),
+        subreddit=get("subreddit"),
+        title=get("title"),
+        selftext=get("selftext"),
+        url=get("url"),
+        domain=get("domain"),
+        author=get("author"),
+        created_utc=_epoch(get("created_utc")),
+        score=get("score"),
+        num_comments=get("num_comments"),
+        over_18=get("over_18"),
+        upvote_ratio=get("upvote_ratio"),
+        permalink=get("permalink"),
+        retrieved_at=retrieved_at,
+    )
+
+
+def _comment_record_json(
+    data: Mapping[str, Any], link_id: str | None, retrieved_at: float
+) -> CommentRecord:
+    get = data.get
+    return CommentRecord(
+        id=get("id"),
+        link_id=link_id or get("link_id"),
+        parent_id=get("parent_id"),
+        subreddit=get("subreddit"),
+        author=get("author"),
+        body=get("body"),
+        created_utc=_epoch(get("created_utc")),
+        score=get("score"),
+        depth=get("depth"),
+        retrieved_at=retrieved_at,
+    )
@@ -2,37 +2,151 @@ from __future__ import annotations
 
 import json
 import logging
-import os
-import random
 import sys
 import time
-from collections.abc import Iterator
+from collections import deque
+from collections.abc import Callable, Collection, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from typing import Any
 
+from reddit_researcher.apis.local.checkpoints import SqliteCheckpointStore
+from reddit_researcher.apis.local.comment_state import SqliteCommentStateStore
+from reddit_researcher.apis.local.hashes import SqliteHashIndex
+from reddit_researcher.apis.local.http_cache import make_response_cache
+from reddit_researcher.apis.local.parquet import ParquetSink
+from reddit_researcher.apis.local.spool import Spool, SpoolDrainer, SpoolingSink
+from reddit_researcher.apis.postgres.sink import PostgresCopySink
 from reddit_researcher.apis.reddit.adapter import RedditSourceAdapter
+from reddit_researcher.apis.reddit.json_source import RedditJsonSourceAdapter
+from reddit_researcher.apis.reddit.reddit_client import make_json_session, make_reddit
 from reddit_researcher.apis.supabase.adapter import SupabaseSinkAdapter
-from reddit_researcher.config.config import AppConfig, generate_run_id, load_config
-from reddit_researcher.core.ratelimit import RateLimiter, compute_backoff_seconds
+from reddit_researcher.apis.supabase.checkpoints import SupabaseCheckpointStore
+from reddit_researcher.apis.supabase.comment_state import SupabaseCommentStateStore
+from reddit_researcher.apis.supabase.hashes import SupabaseHashIndex
+from reddit_researcher.config.config import (
+    AppConfig,
+    TargetConfig,
+    generate_run_id,
+    load_config,
+    pool_credentials,
+    probe_targets,
+)
+from reddit_researcher.core.batching import batched
+from reddit_researcher.core.checkpoint import (
+    Checkpoint,
+    Deadline,
+    TargetProgress,
+    checkpoint_key,
+)
+from reddit_researcher.core.comment_delta import CommentDelta
+from reddit_researcher.core.dedupe import ChangeDetectingSink, SeenIds
+from reddit_researcher.core.fanout import FanOutSink
+from reddit_researcher.core.incremental import CursorTracker, applies_to
+from reddit_researcher.core.normalizers import comment_records, post_records
+from reddit_researcher.core.pool import CredentialPool, PooledRedditSource, PoolMember
+from reddit_researcher.core.ports import (
+    CheckpointStore,
+    CommentStateStore,
+    CursorStore,
+    HashIndex,
+    MetricsSink,
+    RedditSource,
+    ResponseCache,
+)
+from reddit_researcher.core.ratelimit import (
+    BackoffConfig,
+    RateLimiter,
+)
+from reddit_researcher.core.records import CommentRecord, PostRecord, RecordBatch
+from reddit_researcher.core.retry import CircuitBreaker, RetryPolicy, is_retryable
+from reddit_researcher.core.run import (
+    POST_PAGE_SIZE,
+    TargetStats,
+    comments_per_post_stats,
+    configure_logging,
+    cursor_key,
+    expansion_plan,
+    make_cursor_store,
+    make_limiter,
+    supabase_handle,
+    time_budget,
+)
+from reddit_researcher.core.sampling import make_sampler, sample_cost
+from reddit_researcher.core.streaming import StreamingWriter
 from reddit_researcher.core.telemetry import Stopwatch, TelemetryRecorder
-from reddit_researcher.core.normalizers import normalize_comment, normalize_post
+from reddit_researcher.core.warm import WarmContext
 
 
-def main(argv: list[str] | None = None) -> int:
-    _configure_logging()
-    logger = logging.getLogger("reddit_researcher.probe")
+def main(
+    argv: list[str] | None = None,
+    *,
+    time_budget_sec: float | None = None,
+    warm: WarmContext | None = None,
+) -> int:
+    configure_logging()
     _ = argv or sys.argv[1:]
 
     try:
-        cfg: AppConfig = load_config("config.yaml")
+        cfg: AppConfig = warm.config() if warm is not None else load_config("config.yaml")
     except FileNotFoundError as exc:
         print(str(exc))
         return 2
 
-    run_id = generate_run_id()
+    metrics = run_probe(cfg, time_budget_sec=time_budget_sec, warm=warm)
+    print(
+        json.dumps(
+            {
+                "run_id": metrics["run_id"],
+                "posts": metrics["posts_count"],
+                "comments": metrics["comments_total"],
+                "complete": metrics["complete"],
+            }
+        )
+    )
+    return 0
+
+
+def run_probe(
+    cfg: AppConfig,
+    *,
+    source: RedditSource | None = None,
+    sink: MetricsSink | None = None,
+    time_budget_sec: float | None = None,
+    warm: WarmContext | None = None,
+) -> dict[str, Any]:
+    """Run one probe crawl and return its metrics.
+
+    `source` and `sink` default to the adapters selected by `cfg`; passing them in
+    lets callers (tests, `reddit_researcher.bench`) run the pipeline offline. With
+    `warm`, those adapters and the Supabase stores reuse its clients.
+
+    No new listing or comment expansion is started once `max_runtime_sec` (or the
+    caller's `time_budget_sec`, if shorter) minus `deadline_margin_sec` has passed;
+    what was fetched is still flushed. With `probe.checkpoint`, unfinished work is
+    saved and the next run resumes it under the same run id.
+    """
+    logger = logging.getLogger("reddit_researcher.probe")
+    targets = probe_targets(cfg.probe)
+    deadline = Deadline(time_budget(cfg, time_budget_sec))
+
+    # Resume an unfinished run for the same targets, or start a new one
+    checkpoint_store: CheckpointStore | None = None
+    ckpt_key = checkpoint_key(targets)
+    checkpoint: Checkpoint | None = None
+    if cfg.probe.checkpoint:
+        checkpoint_store = _make_checkpoint_store(cfg, warm)
+        checkpoint = checkpoint_store.load(ckpt_key)
+    resumed = checkpoint is not None
+    if checkpoint is None:
+        checkpoint = Checkpoint(run_id=generate_run_id(), started_at=time.time())
+    else:
+        logger.info("resuming run %s from checkpoint", checkpoint.run_id)
+    run_id = checkpoint.run_id
     logger.info(
-        "starting run %s subreddit=%s listing=%s N=%s K=%s repl_more=%s supabase=%s",
+        "starting run %s targets=%s N=%s K=%s repl_more=%s supabase=%s",
         run_id,
-        cfg.probe.subreddit,
-        cfg.probe.listing,
+        ",".join(f"{t.subreddit}/{t.listing}" for t in targets),
         cfg.probe.post_limit,
         cfg.probe.comment_sample,
         cfg.probe.comment_replace_more_limit,
@@ -40,121 +154,172 @@ def main(argv: list[str] | None = None) -> int:
     )
     # Local file outputs disabled: no JSONL or report writes
 
-    limiter = RateLimiter(cfg.probe.qpm_cap, burst_tokens=1)
-    telem = TelemetryRecorder()
-    started_at = time.time()
+    # Supabase payload sizes cost a second JSON encode per chunk; only the persisted
+    # run telemetry reports them
+    telem = TelemetryRecorder(payload_sizes=bool(cfg.probe.run_telemetry))
+    # Sources take one token per request they send to Reddit; with a credential pool
+    # each app gets its own limiter instead (see _make_source)
+    limiter = make_limiter(cfg, telem)
+    started_at = checkpoint.started_at
 
     # Build adapters
-    source = RedditSourceAdapter(cfg)
-    logger.info("reddit source ready")
+    retry = _make_retry_policy(cfg, telem)
+    if source is None:
+        source = _make_source(cfg, limiter, telem, warm, retry=retry)
+        logger.info(
+            "reddit source ready (%s, %d credentials)",
+            cfg.probe.source,
+            len(pool_credentials(cfg)),
+        )
 
-    # Fetch posts
-    logger.info(
-        "fetching posts listing=%s subreddit=%s limit=%s",
-        cfg.probe.listing,
-        cfg.probe.subreddit,
-        cfg.probe.post_limit,
-    )
-    posts_iter = source.iter_posts(
-        subreddit=cfg.probe.subreddit,
-        listing=cfg.probe.listing,
-        time_filter=cfg.probe.time_filter,
-        limit=cfg.probe.post_limit,
+    # Optional sink (direct Postgres or Supabase); built up front so streaming mode can
+    # flush while fetching
+    if sink is None:
+        sink = _make_sink(cfg, telem, warm)
+    change_filter: ChangeDetectingSink | None = None
+    if sink is not None and cfg.probe.change_detection:
+        # Skip rows whose content digest matches the last write
+        sink = change_filter = ChangeDetectingSink(sink, _make_hash_index(cfg, warm))
+    # Optional local spool: sink calls are appended to disk and replayed into the
+    # real sink by a background drainer, so sink latency/outages cost no Reddit quota
+    drainer: SpoolDrainer | None = None
+    if sink is not None and cfg.probe.spool:
+        spool = Spool(cfg.probe.spool_dir)
+        drainer = SpoolDrainer(spool, sink).start()
+        logger.info(
+            "spooling sink writes to %s (%d segments from earlier runs)",
+            cfg.probe.spool_dir,
+            drainer.pending_segments(),
+        )
+        sink = SpoolingSink(spool)
+    # Optional Parquet export; outermost so it sees every row, changed or not
+    export: ParquetSink | None = None
+    if cfg.parquet.enabled:
+        export = ParquetSink(
+            cfg.parquet.dir,
+            row_group_rows=cfg.parquet.row_group_rows,
+            compression=cfg.parquet.compression,
+        )
+        sink = export if sink is None else FanOutSink([sink, export])
+        logger.info("exporting parquet to %s", cfg.parquet.dir)
+    writer: StreamingWriter | None = None
+    if cfg.probe.stream and sink is not None:
+        writer = StreamingWriter(
+            sink,
+            run_id,
+            batch_size=cfg.probe.stream_batch_size,
+            flush_interval_s=cfg.probe.stream_flush_sec,
+        ).start()
+        logger.info(
+            "streaming to sink batch_size=%s flush_sec=%s",
+            cfg.probe.stream_batch_size,
+            cfg.probe.stream_flush_sec,
+        )
+
+    # Incremental mode: resume each `new` target from its listing's high-water mark;
+    # ranked listings are crawled in full (see incremental.applies_to)
+    cursor_store: CursorStore | None = None
+    trackers = {t: CursorTracker() for t in targets}
+    if cfg.probe.incremental:
+        cursor_store = make_cursor_store(cfg, warm)
+        for t in [t for t in targets if applies_to(t.listing)]:
+            trackers[t] = CursorTracker(cursor_store.load(cursor_key(t)))
+            logger.info(
+                "incremental crawl %s/%s since=%s", t.subreddit, t.listing, trackers[t].cursor
+            )
+
+    # In streaming mode rows go straight to the writer; otherwise records are buffered
+    # column-wise until the crawl finishes and serialized to rows as the sink reads them.
+    posts_batch = RecordBatch(PostRecord)
+    comments_batch = RecordBatch(CommentRecord)
+    emit_post: Callable[[PostRecord], None] = posts_batch.append
+    emit_comment: Callable[[CommentRecord], None] = comments_batch.append
+    if writer is not None:
+        stream = writer
+
+        def emit_post(rec: PostRecord) -> None:
+            stream.put_post(rec.as_row())
+
+        def emit_comment(rec: CommentRecord) -> None:
+            stream.put_comment(rec.as_row())
+
+    # Targets are crawled concurrently, one worker each; comment expansion for all
+    # targets shares one bounded pool. Every worker's requests draw from the source's
+    # limiter, whose reservations are served in arrival order, so targets take turns
+    # on the budget.
+    target_workers = max(1, min(cfg.probe.target_concurrency, len(targets)))
+    # Optional comment-delta mode: skip unchanged submissions, fetch only new comments
+    delta: CommentDelta | None = None
+    if cfg.probe.comment_delta:
+        delta = CommentDelta(_make_comment_state_store(cfg, warm))
+    # Optional per-run comment request budget, split evenly across targets
+    request_budget = cfg.probe.comment_request_budget // len(targets) if targets else 0
+    # Overlapping targets list some posts twice; each is emitted and expanded once per run
+    # (a duplicate id within one upsert makes Postgres reject the whole statement)
+    seen_posts = SeenIds(
+        pid for p in checkpoint.targets.values() for pid in [*p.pending, *p.expanded]
     )
+    with ThreadPoolExecutor(
+        max_workers=max(1, cfg.probe.comment_concurrency), thread_name_prefix="comments"
+    ) as comment_pool, ThreadPoolExecutor(
+        max_workers=target_workers, thread_name_prefix="target"
+    ) as target_pool:
+        target_stats = list(
+            target_pool.map(
+                lambda t: _crawl_target(
+                    t,
+                    cfg=cfg,
+                    source=source,
+                    telem=telem,
+                    tracker=trackers[t],
+                    comment_pool=comment_pool,
+                    emit_post=emit_post,
+                    emit_comment=emit_comment,
+                    request_budget=request_budget,
+                    progress=checkpoint.progress(t),
+                    deadline=deadline,
+                    delta=delta,
+                    seen_posts=seen_posts,
+                ),
+                targets,
+            )
+        )
 
-    posts = []
-    posts_batch: list[dict[str, object]] = []
-    post_ids_for_run: list[str] = []
-    for s in posts_iter:
-        limiter.acquire()
-        posts.append(s)
-        norm = normalize_post(s)
-        posts_batch.append(norm)
-        post_id = norm.get("id")
-        if isinstance(post_id, str):
-            post_ids_for_run.append(post_id)
-
-    # Choose K posts to expand comments (by num_comments desc)
-    posts_sorted = sorted(posts, key=lambda x: getattr(x, "num_comments", 0), reverse=True)
-    sample = posts_sorted[: cfg.probe.comment_sample]
-    logger.info("fetched %d posts; sampling %d for comments", len(posts), len(sample))
-
-    # Expand comments with basic retry/backoff
-    rng = random.Random()
-    comments_per_post: list[int] = []
-    comment_ids_for_run: list[str] = []
-    comments_batch: list[dict[str, object]] = []
-    for s in sample:
-        attempts = 0
-        while True:
-            try:
-                logger.debug(
-                    "expand comments submission_id=%s replace_more=%s",
-                    getattr(s, "id", None),
-                    cfg.probe.comment_replace_more_limit,
-                )
-                with Stopwatch() as sw:
-                    comments = source.fetch_comments(
-                        submission_id=getattr(s, "id", ""),
-                        replace_more_limit=cfg.probe.comment_replace_more_limit,
-                    )
-                telem.record(
-                    endpoint="comments.fetch",
-                    headers={},
-                    elapsed_s=sw.elapsed,
-                )
-                comments_per_post.append(len(comments))
-                def _gen() -> Iterator[dict[str, object]]:
-                    for c in comments:
-                        nc = normalize_comment(c, link_id=getattr(s, "id", None))
-                        cid = nc.get("id")
-                        if isinstance(cid, str):
-                            comment_ids_for_run.append(cid)
-                        comments_batch.append(nc)
-                        yield nc
-
-                # Local comment JSONL writes disabled
-                _ = list(_gen())
-                break
-            except Exception:
-                attempts += 1
-                delay = compute_backoff_seconds(attempts - 1, rng=rng)
-                time.sleep(delay)
-                if attempts >= 5:
-                    break
+    if writer is not None:
+        writer.close()
+        logger.info(
+            "streamed %d posts and %d comments in %d flushes",
+            writer.posts_written,
+            writer.comments_written,
+            writer.flushes,
+        )
 
     ended_at = time.time()
-
-    comments_total = len(comments_batch)
-
-    # Compute simple per-post stats for expanded posts
-    def _percentile(sorted_vals: list[int], pct: float) -> int:
-        if not sorted_vals:
-            return 0
-        k = max(0, min(len(sorted_vals) - 1, int(round((pct / 100.0) * (len(sorted_vals) - 1)))))
-        return sorted_vals[k]
-
-    cps_sorted = sorted(comments_per_post)
-    per_post_stats = {
-        "min": cps_sorted[0] if cps_sorted else 0,
-        "p50": _percentile(cps_sorted, 50),
-        "p95": _percentile(cps_sorted, 95),
-        "max": cps_sorted[-1] if cps_sorted else 0,
-    }
+    posts_count = sum(st.posts for st in target_stats)
+    comments_total = sum(st.comments for st in target_stats)
+    per_post_stats = comments_per_post_stats(target_stats)
 
     elapsed_sec = max(0.0, ended_at - started_at)
     telem_summary = telem.summary()
     ratelimit_windows = int(telem_summary.get("ratelimit_windows", 0))
+    subreddit_label = "+".join(dict.fromkeys(t.subreddit for t in targets))
+    listing_label = ",".join(dict.fromkeys(t.listing for t in targets))
     metrics = {
         "run_id": run_id,
         "config": {
-            "subreddit": cfg.probe.subreddit,
-            "listing": cfg.probe.listing,
+            "subreddit": subreddit_label,
+            "listing": listing_label,
             "post_limit": cfg.probe.post_limit,
             "comment_sample": cfg.probe.comment_sample,
             "comment_replace_more_limit": cfg.probe.comment_replace_more_limit,
+            "comment_concurrency": cfg.probe.comment_concurrency,
             "qpm_cap": cfg.probe.qpm_cap,
+            "adaptive_ratelimit": cfg.probe.adaptive_ratelimit,
+            "final_qpm": round(
+                source.pool.qpm if isinstance(source, PooledRedditSource) else limiter.qpm, 1
+            ),
             "raw_json": cfg.probe.raw_json,
+            "stream": cfg.probe.stream,
         },
         "timing": {
             "started_at": started_at,
@@ -162,76 +327,566 @@ def main(argv: list[str] | None = None) -> int:
             "elapsed_sec": elapsed_sec,
         },
         "telemetry": telem_summary,
-        "posts_count": len(posts),
+        "posts_count": posts_count,
         "comments_total": comments_total,
         "comments_per_expanded_post": per_post_stats,
+        "targets": [st.as_row() for st in target_stats],
+        "resumed": resumed,
+        "complete": checkpoint.complete,
     }
+    if isinstance(source, PooledRedditSource):
+        metrics["credentials"] = source.pool.summary()
+    metrics["retries"] = retry.summary()
 
-    # Local metrics/report writes disabled
-
-    # Optional Supabase sink
-    if cfg.supabase.enabled and cfg.supabase.url and cfg.supabase.key:
-        sink = SupabaseSinkAdapter(cfg)
-        run_row = {
+    if sink is not None:
+        run_row: dict[str, Any] = {
             "run_id": run_id,
             "started_at": started_at,
             "ended_at": ended_at,
             "elapsed_sec": elapsed_sec,
-            "subreddit": cfg.probe.subreddit,
-            "listing": cfg.probe.listing,
+            "subreddit": subreddit_label,
+            "listing": listing_label,
             "post_limit": cfg.probe.post_limit,
             "comment_sample": cfg.probe.comment_sample,
             "replace_more_limit": cfg.probe.comment_replace_more_limit,
             "qpm_cap": cfg.probe.qpm_cap,
             "raw_json": cfg.probe.raw_json,
-            "posts_count": len(posts),
-            "comments_total": comments_total,
+            # Totals across every invocation of a resumed run
+            "posts_count": sum(p.posts for p in checkpoint.targets.values()),
+            "comments_total": sum(p.comments for p in checkpoint.targets.values()),
         }
-        sink.upsert_run(run_row)
-        logger.info("upserted run %s", run_id)
-        # Upsert rows (idempotent)
+        if len(targets) > 1:
+            # Per-target breakdown (runs.targets, migrations/0004)
+            run_row["targets"] = metrics["targets"]
+        # Upsert rows and link them to the run (idempotent); already flushed when streaming
         if posts_batch:
-            sink.upsert_posts(posts_batch)
-            logger.info("upserted %d posts", len(posts_batch))
+            sink.ingest_posts(run_id, posts_batch)
+            logger.info("ingested %d posts", len(posts_batch))
         if comments_batch:
-            sink.upsert_comments(comments_batch)
-            logger.info("upserted %d comments", len(comments_batch))
-        if post_ids_for_run:
-            logger.info("linking runs_posts count=%d", len(post_ids_for_run))
-            sink.link_run_posts(run_id, post_ids_for_run)
-            logger.info("linked %d runs_posts", len(post_ids_for_run))
-        if comment_ids_for_run:
-            logger.info("linking runs_comments count=%d", len(comment_ids_for_run))
-            sink.link_run_comments(run_id, comment_ids_for_run)
-            logger.info("linked %d runs_comments", len(comment_ids_for_run))
+            sink.ingest_comments(run_id, comments_batch)
+            logger.info("ingested %d comments", len(comments_batch))
+        # The run row goes last so its telemetry covers the sink writes above
+        metrics["telemetry"] = telem.summary()
+        if cfg.probe.run_telemetry:
+            # Per-endpoint latency/rows/bytes and rate-limit timeline (migrations/0007)
+            run_row["telemetry"] = metrics["telemetry"]
+        sink.upsert_run(run_row)
+        logger.info("upserted run %s", run_id)
+
+    if export is not None:
+        export.close()
+        logger.info("wrote %d parquet files", len(export.files_written))
+
+    if drainer is not None:
+        if drainer.close():
+            logger.info(
+                "drained spool: %d segments, %d sink calls",
+                drainer.segments_drained,
+                drainer.calls_replayed,
+            )
+        else:
+            logger.warning(
+                "sink unavailable (%s); %d spool segments kept for the next run",
+                drainer.last_error,
+                drainer.pending_segments(),
+            )
+
+    if change_filter is not None:
+        logger.info(
+            "change detection wrote %d rows, skipped %d unchanged",
+            change_filter.rows_written,
+            change_filter.rows_skipped,
+        )
+
+    # Rows are flushed; record what is left for the next invocation
+    pending = sum(len(p.pending) for p in checkpoint.targets.values())
+    unlisted = sum(not p.listed for p in checkpoint.targets.values())
+    if checkpoint_store is not None:
+        if checkpoint.complete:
+            if resumed:
+                checkpoint_store.clear(ckpt_key)
+                logger.info("run %s complete; cleared checkpoint", run_id)
+        else:
+            checkpoint_store.save(ckpt_key, checkpoint)
+            logger.info(
+                "deadline reached; checkpointed run %s with %d pending expansions, "
+                "%d targets not listed",
+                run_id,
+                pending,
+                unlisted,
+            )
+    elif not checkpoint.complete:
+        logger.warning(
+            "deadline reached; dropped %d pending expansions and %d targets not listed",
+            pending,
+            unlisted,
+        )
+
+    # Advance cursors only once the run's rows have been handed to the sink, and only
+    # for listings that finished: a listing the deadline cut short continues from its
+    # checkpoint, and an advanced cursor would stop it at the posts already listed
+    if cursor_store is not None:
+        for t, tracker in trackers.items():
+            if not (applies_to(t.listing) and checkpoint.progress(t).listed):
+                continue
+            if tracker.cursor is not None and tracker.advanced:
+                cursor_store.save(cursor_key(t), tracker.cursor)
+                logger.info("saved cursor %s/%s %s", t.subreddit, t.listing, tracker.cursor)
+    if delta is not None:
+        saved = delta.save()
+        logger.info(
+            "comment delta: skipped %d unchanged submissions, saved state for %d",
+            delta.skipped,
+            saved,
+        )
 
     logger.info("finished run %s elapsed=%.2fs", run_id, elapsed_sec)
-    print(json.dumps({"run_id": run_id, "posts": len(posts), "comments": comments_total}))
-    return 0
+    return metrics
 
 
-if __name__ == "__main__":
-    raise SystemExit(main())
+def _crawl_target(
+    target: TargetConfig,
+    *,
+    cfg: AppConfig,
+    source: RedditSource,
+    telem: TelemetryRecorder,
+    tracker: CursorTracker,
+    comment_pool: ThreadPoolExecutor,
+    emit_post: Callable[[PostRecord], None],
+    emit_comment: Callable[[CommentRecord], None],
+    request_budget: int = 0,
+    progress: TargetProgress | None = None,
+    deadline: Deadline | None = None,
+    delta: CommentDelta | None = None,
+    seen_posts: SeenIds | None = None,
+) -> TargetStats:
+    """Fetch one target's listing, emit its rows and expand its sampled submissions.
+
+    `progress` carries the target's state across invocations: a listed target only
+    expands its still-pending submissions, and a listing cut short by `deadline`
+    continues after its last post. Work not started by `deadline` stays pending in
+    `progress`. Posts already in `seen_posts` (listed by another target)
+    are neither emitted nor sampled.
+    """
+    logger = logging.getLogger("reddit_researcher.probe")
+    progress = progress if progress is not None else TargetProgress()
+    deadline = deadline if deadline is not None else Deadline(None)
+    stats = TargetStats(target=target)
+    started = time.monotonic()
+    try:
+        if not progress.listed:
+            if deadline.expired:
+                logger.warning(
+                    "deadline reached before listing %s/%s", target.subreddit, target.listing
+                )
+                return stats
+            if progress.after is not None:
+                logger.info(
+                    "resuming listing of %s/%s after %s (%d posts listed)",
+                    target.subreddit,
+                    target.listing,
+                    progress.after,
+                    progress.posts,
+                )
+            # Sampled posts of an earlier, interrupted listing stay pending
+            progress.pending.update(
+                _list_target(
+                    target,
+                    cfg=cfg,
+                    source=source,
+                    tracker=tracker,
+                    telem=telem,
+                    emit_post=emit_post,
+                    stats=stats,
+                    request_budget=request_budget,
+                    progress=progress,
+                    deadline=deadline,
+                    delta=delta,
+                    seen_posts=seen_posts,
+                )
+            )
+            progress.posts += stats.posts
+        elif progress.pending:
+            logger.info(
+                "resuming %d pending expansions for %s/%s",
+                len(progress.pending),
+                target.subreddit,
+                target.listing,
+            )
+
+        def _expand(item: tuple[str, int]) -> tuple[bool, list[Any] | None]:
+            if deadline.expired:
+                return False, None
+            submission_id, replace_more_limit = item
+            return True, _expand_comments(
+                source,
+                submission_id,
+                replace_more_limit=replace_more_limit,
+                telem=telem,
+                known_ids=delta.known_ids(submission_id) if delta is not None else None,
+            )
 
-def _configure_logging() -> None:
-    level_name = os.getenv("LOG_LEVEL", "INFO").upper()
-    level = getattr(logging, level_name, logging.INFO)
-    log_format = "%(asctime)s %(levelname)s %(name)s: %(message)s"
-    if os.getenv("LOG_JSON") == "1":
-        # Minimal JSON formatter
-        log_format = (
-            '{"ts":"%(asctime)s","level":"%(levelname)s",'
-            '"logger":"%(name)s","msg":"%(message)s"}'
-        )
-    # In AWS Lambda, logging may be pre-configured; force ensures our config applies
+        # Expand comments on the shared pool; the source retries individual requests
+        pending = list(progress.pending.items())
+        for (pid, _), (ran, comments) in zip(pending, comment_pool.map(_expand, pending)):
+            if not ran:
+                continue
+            del progress.pending[pid]
+            if comments is None:
+                continue
+            progress.expanded.append(pid)
+            progress.comments += len(comments)
+            stats.comments_per_post.append(len(comments))
+            stats.comments += len(comments)
+            # Local comment JSONL writes disabled
+            records = comment_records(comments, link_id=pid)
+            for rec in records:
+                emit_comment(rec)
+            if delta is not None:
+                delta.update(pid, (rec.id for rec in records if rec.id))
+    except Exception as exc:
+        # One bad target (banned/private subreddit, ...) must not sink the whole run
+        logger.exception("target %s/%s failed", target.subreddit, target.listing)
+        stats.error = f"{type(exc).__name__}: {exc}"
+        # A failed target is not retried by resuming the run
+        progress.listed = True
+        progress.pending.clear()
+    stats.elapsed_sec = time.monotonic() - started
+    return stats
+
+
+def _list_target(
+    target: TargetConfig,
+    *,
+    cfg: AppConfig,
+    source: RedditSource,
+    tracker: CursorTracker,
+    telem: TelemetryRecorder,
+    emit_post: Callable[[PostRecord], None],
+    stats: TargetStats,
+    request_budget: int,
+    progress: TargetProgress | None = None,
+    deadline: Deadline | None = None,
+    delta: CommentDelta | None = None,
+    seen_posts: SeenIds | None = None,
+) -> dict[str, int]:
+    """Fetch and emit a target's posts; return the sample to expand (id -> replace_more).
+
+    No page is requested once `deadline` has passed: the listing then stays unlisted
+    in `progress`, with the position to continue from, and the sample covers the
+    posts listed so far. A continued listing samples only what is left of the
+    target's `comment_sample` and request budget.
+    """
+    logger = logging.getLogger("reddit_researcher.probe")
+    progress = progress if progress is not None else TargetProgress()
+    deadline = deadline if deadline is not None else Deadline(None)
+    # Requests each planned expansion takes: the initial load, then its replace_more
+    planned = progress.pending.values()
+    comment_sample = max(0, cfg.probe.comment_sample - len(progress.pending))
+    if request_budget > 0:
+        request_budget = max(0, request_budget - sum(1 + n for n in planned))
+    limit = max(0, cfg.probe.post_limit - progress.posts)
+    logger.info(
+        "fetching posts listing=%s subreddit=%s limit=%s",
+        target.listing,
+        target.subreddit,
+        limit,
+    )
+    # Only a continued listing passes `after`, so plain sources need not accept it
+    resume_kwargs = {} if progress.after is None else {"after": progress.after}
+    posts_iter = source.iter_posts(
+        subreddit=target.subreddit,
+        listing=target.listing,
+        time_filter=target.time_filter,
+        limit=limit,
+        since=tracker.cursor,
+        **resume_kwargs,
+    )
+    # Posts another target emitted first
+    repeats = 0
+    interrupted = False
+
+    def _normalized_posts() -> Iterator[PostRecord]:
+        nonlocal repeats, interrupted
+        # Normalize a listing page at a time (one retrieved_at per page)
+        pages = batched(posts_iter, POST_PAGE_SIZE)
+        while True:
+            if deadline.expired:
+                interrupted = True
+                return
+            with Stopwatch() as sw:
+                page = next(pages, None)
+            if page is None:
+                return
+            telem.record("listing.page", None, sw.elapsed, rows=len(page))
+            # The source paced the page's request; posts cost no tokens of their own
+            for s in page:
+                tracker.observe(s)
+            records = post_records(page)
+            if records and records[-1].id:
+                progress.after = f"t3_{records[-1].id}"
+            for rec in records:
+                if seen_posts is not None and rec.id and not seen_posts.first(rec.id):
+                    repeats += 1
+                    continue
+                stats.posts += 1
+                emit_post(rec)
+                yield rec
+
+    # Choose the posts to expand comments; samplers retain a bounded number of records
+    sampler = make_sampler(
+        cfg.probe.comment_sampling,
+        k=comment_sample,
+        request_budget=request_budget,
+        replace_more_limit=cfg.probe.comment_replace_more_limit,
+        history=delta.lookup if delta is not None else None,
+    )
+    posts = _normalized_posts()
+    sample = sampler.select(posts)
+    # A sampler may stop reading early (`nlargest(0, ...)` reads nothing), but every post
+    # must still be emitted and counted
+    deque(posts, maxlen=0)
+    progress.listed = not interrupted
+    if interrupted:
+        logger.warning(
+            "deadline reached while listing %s/%s; %d posts listed, continuing after %s",
+            target.subreddit,
+            target.listing,
+            progress.posts + stats.posts,
+            progress.after,
+        )
+    if repeats:
+        logger.info(
+            "skipped %d posts of %s/%s already listed by another target",
+            repeats,
+            target.subreddit,
+            target.listing,
+        )
+    est_requests, est_comments = sample_cost(sample, cfg.probe.comment_replace_more_limit)
+    logger.info(
+        "fetched %d posts from %s/%s; sampling %d for comments (%s, ~%d requests, ~%d comments)",
+        stats.posts,
+        target.subreddit,
+        target.listing,
+        len(sample),
+        cfg.probe.comment_sampling,
+        est_requests,
+        est_comments,
+    )
+    if delta is not None:
+        unchanged = delta.observe((p.id, p.num_comments) for p in sample if p.id)
+        if unchanged:
+            stats.unchanged = len(unchanged)
+            sample = [p for p in sample if p.id not in unchanged]
+            logger.info(
+                "skipping %d submissions with unchanged num_comments in %s/%s",
+                len(unchanged),
+                target.subreddit,
+                target.listing,
+            )
+    return expansion_plan(sample, target=target, cfg=cfg, request_budget=request_budget)
+
+
+def _expand_comments(
+    source: RedditSource,
+    submission_id: str,
+    *,
+    replace_more_limit: int,
+    telem: TelemetryRecorder,
+    known_ids: Collection[str] | None = None,
+) -> list[Any] | None:
+    """Expand one submission's comments; None if it failed.
+
+    Not retried here: the source retries each request (see `core/retry.py`), so a
+    failure that reaches this point is fatal (e.g. a deleted post) or persistent.
+    """
+    logger = logging.getLogger("reddit_researcher.probe")
+    # Only comment-delta runs pass `known_ids`, so plain sources need not accept it
+    delta_kwargs = {} if known_ids is None else {"known_ids": known_ids}
+    logger.debug(
+        "expand comments submission_id=%s replace_more=%s",
+        submission_id,
+        replace_more_limit,
+    )
     try:
-        logging.basicConfig(level=level, format=log_format, force=True)
-    except TypeError:
-        # Fallback for older environments without force param
-        root = logging.getLogger()
-        for h in list(root.handlers):
-            root.removeHandler(h)
-        logging.basicConfig(level=level, format=log_format)
+        with Stopwatch() as sw:
+            comments = source.fetch_comments(
+                submission_id=submission_id,
+                replace_more_limit=replace_more_limit,
+                **delta_kwargs,
+            )
+    except Exception as exc:
+        logger.warning(
+            "skipping comments of %s (%s): %s",
+            submission_id,
+            "retryable" if is_retryable(exc) else "fatal",
+            exc,
+        )
+        telem.record(endpoint="comments.failed", headers={}, elapsed_s=None)
+        return None
+    telem.record(
+        endpoint="comments.fetch",
+        headers={},
+        elapsed_s=sw.elapsed,
+    )
+    return comments
+
+
+def _make_retry_policy(cfg: AppConfig, telem: TelemetryRecorder) -> RetryPolicy:
+    """One per run: its breaker sees the failures of every worker and app."""
+    return RetryPolicy(
+        max_attempts=cfg.retry.max_attempts,
+        backoff=BackoffConfig(
+            base=cfg.retry.backoff_base_sec, max_delay=cfg.retry.backoff_max_sec
+        ),
+        breaker=CircuitBreaker(
+            failure_threshold=cfg.retry.breaker_failures,
+            cooldown_sec=cfg.retry.breaker_cooldown_sec,
+        ),
+        telemetry=telem,
+    )
+
 
+def _make_source(
+    cfg: AppConfig,
+    limiter: RateLimiter,
+    telem: TelemetryRecorder,
+    warm: WarmContext | None = None,
+    *,
+    retry: RetryPolicy | None = None,
+) -> RedditSource:
+    cache = _make_response_cache(cfg, warm)
+    if cfg.reddit_pool.credentials:
+        return _make_pooled_source(cfg, telem, warm, cache=cache, retry=retry)
+    return _make_app_source(cfg, limiter, telem, warm, cache=cache, retry=retry)
 
 
+def _make_response_cache(cfg: AppConfig, warm: WarmContext | None = None) -> ResponseCache | None:
+    if not cfg.http_cache.enabled:
+        return None
+    if warm is not None:
+        return warm.response_cache(cfg.http_cache)
+    return make_response_cache(cfg.http_cache)
+
+
+def _make_pooled_source(
+    cfg: AppConfig,
+    telem: TelemetryRecorder,
+    warm: WarmContext | None = None,
+    *,
+    cache: ResponseCache | None = None,
+    retry: RetryPolicy | None = None,
+) -> PooledRedditSource:
+    # One adapter per app, each with its own limiter and client; the pool routes calls
+    pool = CredentialPool(
+        failure_threshold=cfg.reddit_pool.failure_threshold,
+        cooldown_sec=cfg.reddit_pool.cooldown_sec,
+    )
+    for rcfg in pool_credentials(cfg):
+        member = pool.add(rcfg.client_id, make_limiter(cfg, telem))
+        member.source = _make_app_source(
+            replace(cfg, reddit=rcfg),
+            member.limiter,
+            telem,
+            warm,
+            member=member,
+            cache=cache,
+            retry=retry,
+        )
+    return PooledRedditSource(pool)
+
+
+def _make_app_source(
+    cfg: AppConfig,
+    limiter: RateLimiter,
+    telem: TelemetryRecorder,
+    warm: WarmContext | None = None,
+    *,
+    member: PoolMember | None = None,
+    cache: ResponseCache | None = None,
+    retry: RetryPolicy | None = None,
+) -> RedditSource:
+    if cfg.probe.source == "json":
+        return RedditJsonSourceAdapter(
+            cfg,
+            limiter=limiter,
+            telemetry=telem,
+            retry=retry,
+            make_session=_client_factory(
+                warm.json_session if warm is not None else make_json_session, member, cache
+            ),
+        )
+    if cfg.probe.source == "praw":
+        return RedditSourceAdapter(
+            cfg,
+            limiter=limiter,
+            telemetry=telem,
+            retry=retry,
+            make_client=_client_factory(
+                warm.reddit if warm is not None else make_reddit, member, cache
+            ),
+        )
+    raise ValueError(f"unknown source: {cfg.probe.source!r}")
+
+
+def _client_factory(
+    factory: Callable[..., Any], member: PoolMember | None, cache: ResponseCache | None
+) -> Callable[..., Any]:
+    """Wrap a client factory for one app's source.
+
+    The response callback also feeds the pool member's quota tracking, and the client's
+    session answers from the response cache.
+    """
+    if member is None and cache is None:
+        return factory
+
+    def _factory(cfg: Any, *, on_response: Any = None) -> Any:
+        if member is not None:
+            on_response = member.watch(on_response)
+        if cache is None:
+            return factory(cfg, on_response=on_response)
+        return factory(cfg, on_response=on_response, cache=cache)
+
+    return _factory
+
+
+def _make_checkpoint_store(cfg: AppConfig, warm: WarmContext | None = None) -> CheckpointStore:
+    if cfg.probe.checkpoint_store == "supabase":
+        return SupabaseCheckpointStore(supabase_handle(cfg, warm))
+    if cfg.probe.checkpoint_store == "sqlite":
+        return SqliteCheckpointStore(cfg.probe.state_path)
+    raise ValueError(f"unknown checkpoint_store: {cfg.probe.checkpoint_store!r}")
+
+
+def _make_comment_state_store(
+    cfg: AppConfig, warm: WarmContext | None = None
+) -> CommentStateStore:
+    if cfg.probe.comment_state_store == "supabase":
+        return SupabaseCommentStateStore(supabase_handle(cfg, warm))
+    if cfg.probe.comment_state_store == "sqlite":
+        return SqliteCommentStateStore(cfg.probe.state_path)
+    raise ValueError(f"unknown comment_state_store: {cfg.probe.comment_state_store!r}")
+
+
+def _make_sink(
+    cfg: AppConfig, telem: TelemetryRecorder, warm: WarmContext | None = None
+) -> MetricsSink | None:
+    if cfg.postgres.enabled and cfg.postgres.dsn:
+        return PostgresCopySink(cfg, telemetry=telem)
+    if cfg.supabase.enabled and cfg.supabase.url and cfg.supabase.key:
+        return SupabaseSinkAdapter(
+            cfg, telemetry=telem, make_client=warm.supabase if warm is not None else None
+        )
+    return None
+
+
+def _make_hash_index(cfg: AppConfig, warm: WarmContext | None = None) -> HashIndex:
+    if cfg.probe.hash_index == "supabase":
+        return SupabaseHashIndex(supabase_handle(cfg, warm))
+    if cfg.probe.hash_index == "sqlite":
+        return SqliteHashIndex(cfg.probe.state_path)
+    raise ValueError(f"unknown hash_index: {cfg.probe.hash_index!r}")
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
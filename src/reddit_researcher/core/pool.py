@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from collections.abc import Callable, Collection, Iterator, Mapping
+from typing import Any
+
+from reddit_researcher.core.incremental import Cursor
+from reddit_researcher.core.ports import RedditSource
+from reddit_researcher.core.ratelimit import RateLimiter
+from reddit_researcher.core.telemetry import parse_ratelimit_headers
+
+# Called with (endpoint_label, headers, elapsed_s, status_code, body_bytes), like
+# `apis/reddit/reddit_client.ResponseCallback`
+ResponseHook = Callable[[str, Mapping[str, str], float, int, int], None]
+
+# Statuses that count against a credential: revoked/invalid app, or throttled
+FAILURE_STATUSES = frozenset({401, 429})
+
+
+class CredentialsExhausted(RuntimeError):
+    """Every credential in the pool is benched; `retry_in` is when the first returns."""
+
+    def __init__(self, retry_in: float) -> None:
+        super().__init__(f"all Reddit credentials are benched; next returns in {retry_in:.0f}s")
+        self.retry_in = retry_in
+
+
+class PoolMember:
+    """One registered Reddit app: its source, its limiter and what its responses said.
+
+    `watch()` wraps the response callback of the member's client so every response
+    updates the member's quota (`x-ratelimit-remaining/reset`) and failure streak.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limiter: RateLimiter,
+        *,
+        failure_threshold: int,
+        cooldown_sec: float,
+        time_fn: Callable[[], float],
+    ) -> None:
+        self.name = name
+        self.limiter = limiter
+        self.source: RedditSource | None = None
+        self._failure_threshold = max(1, failure_threshold)
+        self._cooldown_sec = max(0.0, cooldown_sec)
+        self._time = time_fn
+        self._lock = threading.Lock()
+        self.remaining: float | None = None
+        self.reset_at = 0.0
+        self.in_flight = 0
+        self.calls = 0
+        self.failures = 0
+        self.benched_until = 0.0
+        self.times_benched = 0
+        self._streak = 0
+
+    def watch(self, on_response: ResponseHook | None) -> ResponseHook:
+        """Return a response callback that observes this member, then calls `on_response`."""
+
+        def _hook(
+            endpoint: str, headers: Mapping[str, str], elapsed_s: float, status: int, nbytes: int
+        ) -> None:
+            self.observe(headers, status)
+            if on_response is not None:
+                on_response(endpoint, headers, elapsed_s, status, nbytes)
+
+        return _hook
+
+    def observe(self, headers: Mapping[str, str] | None, status: int) -> None:
+        quota = parse_ratelimit_headers(headers) or {}
+        remaining = quota.get("remaining")
+        reset = quota.get("reset_sec")
+        now = self._time()
+        with self._lock:
+            if remaining is not None and reset is not None:
+                self.remaining = float(remaining)
+                self.reset_at = now + float(reset)
+            if status in FAILURE_STATUSES:
+                self.failures += 1
+                self._streak += 1
+                if self._streak >= self._failure_threshold:
+                    self._streak = 0
+                    self.times_benched += 1
+                    self.benched_until = now + self._cooldown_sec
+                    logging.getLogger("reddit_researcher.pool").warning(
+                        "benching credential %s for %.0fs after %d consecutive %d responses",
+                        self.name,
+                        self._cooldown_sec,
+                        self._failure_threshold,
+                        status,
+                    )
+            elif status < 400:
+                self._streak = 0
+
+    def budget(self, now: float) -> float:
+        """Requests left in the current quota window, less calls still in flight."""
+        if self.remaining is None or now >= self.reset_at:
+            # No quota reported for the current window yet: assume it is full
+            return math.inf
+        return self.remaining - self.in_flight
+
+    def benched(self, now: float | None = None) -> bool:
+        return self.benched_until > (self._time() if now is None else now)
+
+    def as_row(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "failures": self.failures,
+            "times_benched": self.times_benched,
+            "remaining": self.remaining,
+            "qpm": round(self.limiter.qpm, 1),
+        }
+
+
+class CredentialPool:
+    """Registered Reddit apps and the routing between them.
+
+    `acquire()` picks the member with the most quota left in its current window
+    (members that have not reported one count as full), breaking ties by the
+    tokens in its limiter, so calls spread evenly until the headers say otherwise.
+    A member answering `failure_threshold` 401/429 responses in a row is benched
+    for `cooldown_sec` and skipped until then.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 3,
+        cooldown_sec: float = 300.0,
+        time_fn: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._cooldown_sec = cooldown_sec
+        self._time = time_fn
+        self._lock = threading.Lock()
+        self.members: list[PoolMember] = []
+
+    def add(self, name: str, limiter: RateLimiter) -> PoolMember:
+        member = PoolMember(
+            name,
+            limiter,
+            failure_threshold=self._failure_threshold,
+            cooldown_sec=self._cooldown_sec,
+            time_fn=self._time,
+        )
+        self.members.append(member)
+        return member
+
+    def acquire(self, *, exclude: Collection[PoolMember] = ()) -> PoolMember:
+        """Route one call: return the best available member, counted as in flight."""
+        now = self._time()
+        with self._lock:
+            active = [m for m in self.members if not m.benched(now) and m not in exclude]
+            if not active:
+                benched = [m.benched_until for m in self.members if m.benched(now)]
+                raise CredentialsExhausted(min(benched) - now if benched else 0.0)
+            member = max(active, key=lambda m: (m.budget(now), m.limiter.available()))
+            member.in_flight += 1
+            member.calls += 1
+            return member
+
+    def release(self, member: PoolMember) -> None:
+        with self._lock:
+            member.in_flight -= 1
+
+    @property
+    def qpm(self) -> float:
+        return sum(m.limiter.qpm for m in self.members)
+
+    def summary(self) -> list[dict[str, Any]]:
+        return [m.as_row() for m in self.members]
+
+
+class PooledRedditSource:
+    """`RedditSource` that spreads calls over the sources of a `CredentialPool`.
+
+    Each listing and each submission's comment expansion is routed as one unit, so
+    a `replace_more` expansion stays on one app. A comment fetch that fails on a
+    member that has just been benched is retried once on each of the others.
+    """
+
+    def __init__(self, pool: CredentialPool) -> None:
+        self.pool = pool
+
+    def iter_posts(
+        self,
+        subreddit: str,
+        listing: str,
+        time_filter: str,
+        limit: int,
+        *,
+        since: Cursor | None = None,
+        after: str | None = None,
+    ) -> Iterator[Any]:
+        # Only resumed listings pass `after`, so plain sources need not accept it
+        resume_kwargs = {} if after is None else {"after": after}
+        member = self.pool.acquire()
+        try:
+            yield from _source(member).iter_posts(
+                subreddit, listing, time_filter, limit, since=since, **resume_kwargs
+            )
+        finally:
+            self.pool.release(member)
+
+    def fetch_comments(
+        self,
+        submission_id: str,
+        replace_more_limit: int,
+        *,
+        known_ids: Collection[str] | None = None,
+    ) -> list[Any]:
+        # Only comment-delta runs pass `known_ids`, so plain sources need not accept it
+        delta_kwargs = {} if known_ids is None else {"known_ids": known_ids}
+        tried: list[PoolMember] = []
+        while True:
+            member = self.pool.acquire(exclude=tried)
+            try:
+                return _source(member).fetch_comments(
+                    submission_id, replace_more_limit, **delta_kwargs
+                )
+            except Exception:
+                tried.append(member)
+                if not member.benched() or len(tried) >= len(self.pool.members):
+                    raise
+            finally:
+                self.pool.release(member)
+
+
+def _source(member: PoolMember) -> RedditSource:
+    if member.source is None:
+        raise RuntimeError(f"pool member {member.name} has no source")
+    return member.source
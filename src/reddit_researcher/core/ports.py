@@ -1,16 +1,35 @@
 from __future__ import annotations
 
-from collections.abc import Iterable, Iterator
+from collections.abc import AsyncIterator, Collection, Iterable, Iterator, Mapping
 from typing import Any, Protocol
 
+from reddit_researcher.core.checkpoint import Checkpoint
+from reddit_researcher.core.comment_delta import CommentState
+from reddit_researcher.core.incremental import Cursor, CursorKey
+from reddit_researcher.core.response_cache import CachedResponse, CachePolicy
+
 
 class RedditSource(Protocol):
+    # `after` (a post fullname) continues a listing an earlier run stopped partway through
     def iter_posts(
-        self, subreddit: str, listing: str, time_filter: str, limit: int
+        self,
+        subreddit: str,
+        listing: str,
+        time_filter: str,
+        limit: int,
+        *,
+        since: Cursor | None = None,
+        after: str | None = None,
     ) -> Iterator[Any]:
         ...
 
-    def fetch_comments(self, submission_id: str, replace_more_limit: int) -> list[Any]:
+    def fetch_comments(
+        self,
+        submission_id: str,
+        replace_more_limit: int,
+        *,
+        known_ids: Collection[str] | None = None,
+    ) -> list[Any]:
         ...
 
 
@@ -30,4 +49,105 @@ class MetricsSink(Protocol):
     def link_run_comments(self, run_id: str, comment_ids: Iterable[str]) -> None:
         ...
 
+    def ingest_posts(self, run_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        ...
+
+    def ingest_comments(self, run_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        ...
+
+
+class AsyncRedditSource(Protocol):
+    """`RedditSource` for an event loop; requests of concurrent calls overlap."""
+
+    def iter_posts(
+        self,
+        subreddit: str,
+        listing: str,
+        time_filter: str,
+        limit: int,
+        *,
+        since: Cursor | None = None,
+    ) -> AsyncIterator[Any]:
+        ...
+
+    async def fetch_comments(
+        self,
+        submission_id: str,
+        replace_more_limit: int,
+        *,
+        known_ids: Collection[str] | None = None,
+    ) -> list[Any]:
+        ...
+
+
+class AsyncMetricsSink(Protocol):
+    """`MetricsSink` for an event loop."""
+
+    async def upsert_run(self, row: dict[str, Any]) -> None:
+        ...
+
+    async def upsert_posts(self, rows: Iterable[dict[str, Any]]) -> None:
+        ...
+
+    async def upsert_comments(self, rows: Iterable[dict[str, Any]]) -> None:
+        ...
+
+    async def link_run_posts(self, run_id: str, post_ids: Iterable[str]) -> None:
+        ...
+
+    async def link_run_comments(self, run_id: str, comment_ids: Iterable[str]) -> None:
+        ...
+
+    async def ingest_posts(self, run_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        ...
+
+    async def ingest_comments(self, run_id: str, rows: Iterable[dict[str, Any]]) -> None:
+        ...
+
 
+class CursorStore(Protocol):
+    def load(self, key: CursorKey) -> Cursor | None:
+        ...
+
+    def save(self, key: CursorKey, cursor: Cursor) -> None:
+        ...
+
+
+class HashIndex(Protocol):
+    def get_many(self, table: str, ids: Iterable[str]) -> dict[str, str]:
+        ...
+
+    def put_many(self, table: str, digests: Mapping[str, str]) -> None:
+        ...
+
+
+class CheckpointStore(Protocol):
+    def load(self, key: str) -> Checkpoint | None:
+        ...
+
+    def save(self, key: str, checkpoint: Checkpoint) -> None:
+        ...
+
+    def clear(self, key: str) -> None:
+        ...
+
+
+class CommentStateStore(Protocol):
+    def get_many(self, submission_ids: Iterable[str]) -> dict[str, CommentState]:
+        ...
+
+    def put_many(self, states: Mapping[str, CommentState]) -> None:
+        ...
+
+
+class ResponseCache(Protocol):
+    policy: CachePolicy
+
+    def get(self, key: str) -> CachedResponse | None:
+        ...
+
+    def put(self, key: str, response: CachedResponse) -> None:
+        ...
+
+    def refresh(self, key: str, expires_at: float) -> None:
+        ...
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import random
+import threading
 import time
 from collections.abc import Callable, Mapping
 from dataclasses import dataclass
 
+from reddit_researcher.core.telemetry import TelemetryRecorder, parse_ratelimit_headers
+
 
 class RateLimiter:
     """Simple token-bucket rate limiter.
@@ -12,6 +15,12 @@ class RateLimiter:
     Tokens refill continuously at qpm_cap/60 per second.
     Capacity is controlled by `burst_tokens`.
     `acquire()` will sleep as needed via the injected sleep function.
+
+    Thread-safe: each caller reserves its token under a lock (the balance may go
+    negative) and then sleeps outside the lock until the reservation matures, so
+    concurrent workers share one QPM budget and are served in arrival order.
+
+    With `telemetry`, every acquire records its wait as `ratelimit.wait`.
     """
 
     def __init__(
@@ -21,6 +30,7 @@ class RateLimiter:
         burst_tokens: float | int = 1.0,
         time_fn: Callable[[], float] | None = None,
         sleep_fn: Callable[[float], None] | None = None,
+        telemetry: TelemetryRecorder | None = None,
     ) -> None:
         if qpm_cap <= 0:
             raise ValueError("qpm_cap must be > 0")
@@ -32,6 +42,8 @@ class RateLimiter:
         self._time = time_fn or time.monotonic
         self._sleep = sleep_fn or time.sleep
         self._last_ts = self._time()
+        self._lock = threading.Lock()
+        self._telemetry = telemetry
 
     def _refill(self) -> None:
         now = self._time()
@@ -41,16 +53,107 @@ class RateLimiter:
             self._last_ts = now
 
     def acquire(self, cost: float = 1.0) -> None:
+        wait_s = self.reserve(cost)
+        if wait_s > 0:
+            self._sleep(wait_s)
+
+    def reserve(self, cost: float = 1.0) -> float:
+        """Take `cost` tokens now and return how long the caller must wait before using them."""
         if cost <= 0:
+            return 0.0
+        with self._lock:
+            wait_s = self._reserve(cost)
+        if self._telemetry is not None:
+            self._telemetry.record("ratelimit.wait", None, wait_s)
+        return wait_s
+
+    def _reserve(self, cost: float) -> float:
+        # Caller holds the lock; returns how long this reservation must wait
+        self._refill()
+        self._tokens -= cost
+        deficit = -self._tokens
+        return deficit / self._rate_per_sec if deficit > 0 else 0.0
+
+    def available(self) -> float:
+        """Tokens that could be taken without waiting; negative while reservations queue."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    @property
+    def qpm(self) -> float:
+        return self._rate_per_sec * 60.0
+
+
+class AdaptiveRateLimiter(RateLimiter):
+    """Token bucket whose refill rate follows Reddit's `x-ratelimit-*` headers.
+
+    `observe()` is fed the headers of every response. The rate is set to spread the
+    remaining quota (minus `reserve`) evenly over the seconds until reset, clamped to
+    `[min_qpm, max_qpm]`. When the quota is exhausted, or a `Retry-After` is present,
+    new reservations are held until the window resets.
+    """
+
+    def __init__(
+        self,
+        qpm_cap: int,
+        *,
+        min_qpm: float = 10.0,
+        max_qpm: float = 300.0,
+        reserve: float = 5.0,
+        burst_tokens: float | int = 1.0,
+        time_fn: Callable[[], float] | None = None,
+        sleep_fn: Callable[[float], None] | None = None,
+        telemetry: TelemetryRecorder | None = None,
+    ) -> None:
+        super().__init__(
+            qpm_cap,
+            burst_tokens=burst_tokens,
+            time_fn=time_fn,
+            sleep_fn=sleep_fn,
+            telemetry=telemetry,
+        )
+        if not 0 < min_qpm <= max_qpm:
+            raise ValueError("require 0 < min_qpm <= max_qpm")
+        self._min_rate = float(min_qpm) / 60.0
+        self._max_rate = float(max_qpm) / 60.0
+        self._reserve_quota = max(0.0, float(reserve))
+        self._paused_until = 0.0
+
+    def observe(self, headers: Mapping[str, str] | None) -> None:
+        if not headers:
             return
-        while True:
+        retry_after = parse_retry_after(headers)
+        quota = parse_ratelimit_headers(headers) or {}
+        remaining = quota.get("remaining")
+        reset = quota.get("reset_sec")
+        with self._lock:
+            # Settle tokens earned at the old rate before switching rates
             self._refill()
-            if self._tokens >= cost:
-                self._tokens -= cost
+            now = self._time()
+            if retry_after is not None:
+                self._paused_until = max(self._paused_until, now + retry_after)
+            if remaining is None or reset is None:
                 return
-            deficit = cost - self._tokens
-            wait_s = deficit / self._rate_per_sec
-            self._sleep(wait_s)
+            usable = remaining - self._reserve_quota
+            if usable <= 0:
+                self._paused_until = max(self._paused_until, now + reset)
+                self._rate_per_sec = self._min_rate
+                return
+            rate = usable / max(reset, 1.0)
+            self._rate_per_sec = min(self._max_rate, max(self._min_rate, rate))
+
+    def _reserve(self, cost: float) -> float:
+        # Reservations queued behind a pause keep their spacing after it lifts
+        wait_s = super()._reserve(cost)
+        return wait_s + max(0.0, self._paused_until - self._time())
+
+    def available(self) -> float:
+        # A pause costs what the bucket would have refilled while it lasts
+        tokens = super().available()
+        with self._lock:
+            paused_s = max(0.0, self._paused_until - self._time())
+            return tokens - paused_s * self._rate_per_sec
 
 
 def parse_retry_after(headers: Mapping[str, str] | None) -> float | None:
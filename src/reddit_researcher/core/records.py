@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import math
+import threading
+from collections.abc import Iterator
+from dataclasses import dataclass, fields
+from datetime import date
+from functools import lru_cache
+from typing import Any, ClassVar, Generic, TypeVar
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+@lru_cache(maxsize=4096)
+def _day_prefix(days: int) -> str:
+    return date.fromordinal(_EPOCH_ORDINAL + days).isoformat() + "T"
+
+
+def iso_utc(ts: float | None) -> str | None:
+    """Format an epoch timestamp the way the `posts`/`comments` tables store it.
+
+    Equivalent to `datetime.fromtimestamp(ts, UTC).strftime("%Y-%m-%dT%H:%M:%SZ")`,
+    but the date part is cached per day: a crawl's timestamps span few days, so
+    each row only pays for the time-of-day arithmetic.
+    """
+    if ts is None:
+        return None
+    days, secs = divmod(math.floor(ts), 86400)
+    hours, secs = divmod(secs, 3600)
+    minutes, secs = divmod(secs, 60)
+    return f"{_day_prefix(days)}{hours:02d}:{minutes:02d}:{secs:02d}Z"
+
+
+@dataclass(slots=True)
+class PostRecord:
+    """One normalized submission; timestamps stay epoch floats until `as_row()`."""
+
+    # Low-cardinality columns whose values a `RecordBatch` stores once
+    SHARED: ClassVar[tuple[str, ...]] = ("subreddit", "domain", "author")
+    TIMESTAMPS: ClassVar[tuple[str, ...]] = ("created_utc", "retrieved_at")
+
+    id: str | None
+    subreddit: str | None
+    title: str | None
+    selftext: str | None
+    url: str | None
+    domain: str | None
+    author: str | None
+    created_utc: float | None
+    score: int | None
+    num_comments: int | None
+    over_18: bool | None
+    upvote_ratio: float | None
+    permalink: str | None
+    retrieved_at: float | None
+
+    def as_row(self) -> dict[str, Any]:
+        """Serialize to the PostgREST JSON shape of a `posts` row."""
+        return _as_row(self, _POST_COLUMNS)
+
+
+@dataclass(slots=True)
+class CommentRecord:
+    """One normalized comment; timestamps stay epoch floats until `as_row()`."""
+
+    SHARED: ClassVar[tuple[str, ...]] = ("link_id", "subreddit", "author")
+    TIMESTAMPS: ClassVar[tuple[str, ...]] = ("created_utc", "retrieved_at")
+
+    id: str | None
+    link_id: str | None
+    parent_id: str | None
+    subreddit: str | None
+    author: str | None
+    body: str | None
+    created_utc: float | None
+    score: int | None
+    depth: int | None
+    retrieved_at: float | None
+
+    def as_row(self) -> dict[str, Any]:
+        """Serialize to the PostgREST JSON shape of a `comments` row."""
+        return _as_row(self, _COMMENT_COLUMNS)
+
+
+_POST_COLUMNS = tuple(f.name for f in fields(PostRecord))
+_COMMENT_COLUMNS = tuple(f.name for f in fields(CommentRecord))
+
+
+def _as_row(record: PostRecord | CommentRecord, columns: tuple[str, ...]) -> dict[str, Any]:
+    row = {name: getattr(record, name) for name in columns}
+    for name in record.TIMESTAMPS:
+        row[name] = iso_utc(row[name])
+    return row
+
+
+R = TypeVar("R", PostRecord, CommentRecord)
+
+
+class RecordBatch(Generic[R]):  # noqa: UP046
+    """Column-oriented buffer of records that yields table rows only when iterated.
+
+    Each field is one list, so a buffered row costs a pointer per column instead of
+    a dict. Values of the record type's `SHARED` columns are deduplicated per batch.
+    Iterating yields PostgREST row dicts one at a time, so the batch can be passed
+    straight to a `MetricsSink`.
+
+    `append` is thread-safe (concurrent targets and comment workers share one batch);
+    read the batch once the writers are done.
+    """
+
+    def __init__(self, record_type: type[R]) -> None:
+        self._type: type[R] = record_type
+        self._columns: tuple[str, ...] = tuple(f.name for f in fields(record_type))
+        self._data: dict[str, list[Any]] = {name: [] for name in self._columns}
+        self._shared: dict[str, dict[Any, Any]] = {name: {} for name in record_type.SHARED}
+        # A row is appended a column at a time; without the lock, rows from two threads
+        # could interleave and misalign the columns
+        self._lock = threading.Lock()
+
+    def append(self, record: R) -> None:
+        values = [getattr(record, name) for name in self._columns]
+        with self._lock:
+            for name, value in zip(self._columns, values, strict=True):
+                pool = self._shared.get(name)
+                if pool is not None and value is not None:
+                    value = pool.setdefault(value, value)
+                self._data[name].append(value)
+
+    def __len__(self) -> int:
+        return len(self._data["id"])
+
+    def __getitem__(self, index: int) -> R:
+        return self._type(*(self._data[name][index] for name in self._columns))
+
+    def ids(self) -> list[str]:
+        return [rid for rid in self._data["id"] if isinstance(rid, str)]
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        timestamps = self._type.TIMESTAMPS
+        columns = [(name, self._data[name], name in timestamps) for name in self._columns]
+        # Batches share one retrieved_at, so consecutive rows mostly repeat timestamps
+        formatted: dict[float, str | None] = {}
+        for i in range(len(self)):
+            row: dict[str, Any] = {}
+            for name, values, is_ts in columns:
+                value = values[i]
+                if is_ts and value is not None:
+                    iso = formatted.get(value)
+                    if iso is None:
+                        if len(formatted) >= 4096:
+                            formatted.clear()
+                        iso = formatted[value] = iso_utc(value)
+                    value = iso
+                row[name] = value
+            yield row
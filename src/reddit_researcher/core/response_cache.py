@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Response headers stored with a cached body. Rate-limit headers describe the window
+# of the request that filled the entry, so replaying them would mislead the limiter.
+STORED_HEADERS = ("content-type", "etag", "last-modified")
+
+# Set on responses served from the cache: "hit" (no request was sent) or
+# "revalidated" (a conditional request came back 304 Not Modified)
+CACHE_HEADER = "x-probe-cache"
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    status: int
+    headers: Mapping[str, str]
+    body: bytes
+    stored_at: float
+    expires_at: float
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers that revalidate this entry, if Reddit sent any."""
+        headers = {k.lower(): v for k, v in self.headers.items()}
+        found: dict[str, str] = {}
+        if headers.get("etag"):
+            found["If-None-Match"] = headers["etag"]
+        if headers.get("last-modified"):
+            found["If-Modified-Since"] = headers["last-modified"]
+        return found
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """How long responses stay fresh, by endpoint label (e.g. `/r/{sub}/new`).
+
+    With `replay`, entries are served however old they are and a miss is an error
+    rather than a request, so a run can be repeated fully offline.
+    """
+
+    default_ttl_sec: float = 300.0
+    ttl_sec: tuple[tuple[str, float], ...] = ()
+    replay: bool = False
+
+    def ttl(self, endpoint: str) -> float:
+        for label, ttl in self.ttl_sec:
+            if label == endpoint:
+                return ttl
+        return self.default_ttl_sec
+
+
+def cache_key(method: str, url: str) -> str:
+    """Identify a request by method and URL, with query parameters in a stable order."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{method.upper()} {urlunsplit(parts._replace(query=query, fragment=''))}"
+
+
+def is_cache_hit(headers: Mapping[str, str] | None) -> bool:
+    """True for a response served from the cache without a request to Reddit."""
+    return headers is not None and headers.get(CACHE_HEADER) == "hit"
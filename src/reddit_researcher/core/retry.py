@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable, Iterator, Mapping
+from typing import Any, TypeVar
+
+from reddit_researcher.core.ratelimit import (
+    BackoffConfig,
+    compute_backoff_seconds,
+    parse_retry_after,
+)
+from reddit_researcher.core.telemetry import TelemetryRecorder
+
+T = TypeVar("T")
+
+# Statuses worth another try: timeouts, throttling and transient server errors. Any
+# other status (404/403 on deleted or private posts, 400, redirects to a banned
+# subreddit) fails the same way every time.
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class CircuitOpen(RuntimeError):
+    """Requests are failing fast after sustained failures; `retry_in` is the cooldown left."""
+
+    retryable = False
+
+    def __init__(self, retry_in: float) -> None:
+        super().__init__(f"too many consecutive request failures; retrying in {retry_in:.0f}s")
+        self.retry_in = retry_in
+
+
+def _chain(exc: BaseException) -> Iterator[BaseException]:
+    # prawcore wraps transport errors in `RequestException.original_exception`
+    seen: set[int] = set()
+    current: BaseException | None = exc
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        yield current
+        current = (
+            getattr(current, "original_exception", None) or current.__cause__ or current.__context__
+        )
+
+
+def error_status(exc: BaseException) -> int | None:
+    """HTTP status of the response behind `exc` (prawcore, requests or httpx), if any."""
+    for err in _chain(exc):
+        status = getattr(getattr(err, "response", None), "status_code", None)
+        if isinstance(status, int):
+            return status
+    return None
+
+
+def error_retry_after(exc: BaseException) -> float | None:
+    """Seconds the server asked callers to wait (`Retry-After`), if it did."""
+    for err in _chain(exc):
+        headers = getattr(getattr(err, "response", None), "headers", None)
+        if isinstance(headers, Mapping):
+            retry_after = parse_retry_after(headers)
+            if retry_after is not None:
+                return retry_after
+    return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Whether repeating the request that raised `exc` could succeed.
+
+    An exception may decide for itself with a boolean `retryable` attribute. Otherwise
+    a response status decides (`RETRYABLE_STATUSES`), and without one only connection
+    errors and timeouts are retryable; anything else (a bug, a malformed body) would
+    fail again.
+    """
+    for err in _chain(exc):
+        explicit = getattr(err, "retryable", None)
+        if isinstance(explicit, bool):
+            return explicit
+    status = error_status(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUSES
+    return any(isinstance(err, OSError | TimeoutError) for err in _chain(exc))
+
+
+class CircuitBreaker:
+    """Fails requests fast once `failure_threshold` retryable failures happen in a row.
+
+    While open (for `cooldown_sec`), `check()` raises `CircuitOpen` without a request
+    being made. After the cooldown requests go through again, but the first failure
+    reopens the breaker; a success closes it.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 8,
+        cooldown_sec: float = 60.0,
+        time_fn: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._failure_threshold = max(1, failure_threshold)
+        self._cooldown_sec = max(0.0, cooldown_sec)
+        self._time = time_fn
+        self._lock = threading.Lock()
+        self._streak = 0
+        self._open_until: float | None = None
+        self._probing = False
+        self.trips = 0
+
+    def check(self) -> None:
+        with self._lock:
+            if self._open_until is None:
+                return
+            now = self._time()
+            if now < self._open_until:
+                raise CircuitOpen(self._open_until - now)
+            self._open_until = None
+            self._probing = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._streak = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._streak += 1
+            if not self._probing and self._streak < self._failure_threshold:
+                return
+            self._streak = 0
+            self._probing = False
+            self._open_until = self._time() + self._cooldown_sec
+            self.trips += 1
+        logging.getLogger("reddit_researcher.retry").warning(
+            "opening circuit breaker for %.0fs after repeated request failures",
+            self._cooldown_sec,
+        )
+
+
+class RetryPolicy:
+    """Retries one request at a time, only when the error says it could succeed.
+
+    `call(fn)` runs `fn` (one HTTP request) up to `max_attempts` times. Fatal errors
+    (`is_retryable` false) are raised at once. Between attempts it sleeps for the
+    server's `Retry-After`, else `compute_backoff_seconds(attempt, cfg=backoff)`.
+    Retryable failures feed `breaker`, which can stop requests altogether.
+
+    Thread-safe; one policy (and breaker) is shared by every worker of a run.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_attempts: int = 4,
+        backoff: BackoffConfig | None = None,
+        breaker: CircuitBreaker | None = None,
+        sleep_fn: Callable[[float], None] = time.sleep,
+        rng: random.Random | None = None,
+        telemetry: TelemetryRecorder | None = None,
+    ) -> None:
+        self.max_attempts = max(1, max_attempts)
+        self.breaker = breaker
+        self._backoff = backoff or BackoffConfig()
+        self._sleep = sleep_fn
+        self._rng = rng or random.Random()
+        self._telemetry = telemetry
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.fatal = 0
+        self.gave_up = 0
+
+    def call(self, fn: Callable[[], T]) -> T:
+        attempt = 0
+        while True:
+            if self.breaker is not None:
+                self.breaker.check()
+            try:
+                result = fn()
+            except Exception as exc:
+                retryable = is_retryable(exc)
+                if self.breaker is not None:
+                    if retryable:
+                        self.breaker.record_failure()
+                    elif error_status(exc) is not None:
+                        # Reddit answered (e.g. 404 on a deleted post): it is up
+                        self.breaker.record_success()
+                attempt += 1
+                if not retryable or attempt >= self.max_attempts:
+                    with self._lock:
+                        if retryable:
+                            self.gave_up += 1
+                        else:
+                            self.fatal += 1
+                    raise
+                delay = compute_backoff_seconds(
+                    attempt - 1,
+                    cfg=self._backoff,
+                    retry_after_s=error_retry_after(exc),
+                    rng=self._rng,
+                )
+                with self._lock:
+                    self.retries += 1
+                if self._telemetry is not None:
+                    self._telemetry.record("retry.wait", None, delay)
+                self._sleep(delay)
+                continue
+            if self.breaker is not None:
+                self.breaker.record_success()
+            return result
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "retries": self.retries,
+            "fatal": self.fatal,
+            "gave_up": self.gave_up,
+            "breaker_trips": self.breaker.trips if self.breaker is not None else 0,
+        }
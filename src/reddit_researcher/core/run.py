@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import logging
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from reddit_researcher.apis.local.cursors import SqliteCursorStore
+from reddit_researcher.apis.supabase.client import SupabaseHandle, make_supabase
+from reddit_researcher.apis.supabase.cursors import SupabaseCursorStore
+from reddit_researcher.config.config import AppConfig, TargetConfig
+from reddit_researcher.core.budget import plan_comment_budget
+from reddit_researcher.core.incremental import CursorKey
+from reddit_researcher.core.ports import CursorStore
+from reddit_researcher.core.ratelimit import AdaptiveRateLimiter, RateLimiter
+from reddit_researcher.core.records import PostRecord
+from reddit_researcher.core.telemetry import TelemetryRecorder
+from reddit_researcher.core.warm import WarmContext
+
+# Listing items normalized together; matches Reddit's maximum listing page
+POST_PAGE_SIZE = 100
+
+
+@dataclass
+class TargetStats:
+    target: TargetConfig
+    posts: int = 0
+    comments: int = 0
+    comments_per_post: list[int] = field(default_factory=list)
+    unchanged: int = 0
+    elapsed_sec: float = 0.0
+    error: str | None = None
+
+    def as_row(self) -> dict[str, Any]:
+        return {
+            "subreddit": self.target.subreddit,
+            "listing": self.target.listing,
+            "time_filter": self.target.time_filter,
+            "posts": self.posts,
+            "comments": self.comments,
+            "expanded": len(self.comments_per_post),
+            "unchanged": self.unchanged,
+            "elapsed_sec": round(self.elapsed_sec, 3),
+            "error": self.error,
+        }
+
+
+def comments_per_post_stats(target_stats: Iterable[TargetStats]) -> dict[str, int]:
+    """min/p50/p95/max comments over the submissions expanded by a run."""
+
+    def _percentile(sorted_vals: list[int], pct: float) -> int:
+        if not sorted_vals:
+            return 0
+        k = max(0, min(len(sorted_vals) - 1, int(round((pct / 100.0) * (len(sorted_vals) - 1)))))
+        return sorted_vals[k]
+
+    cps_sorted = sorted(n for st in target_stats for n in st.comments_per_post)
+    return {
+        "min": cps_sorted[0] if cps_sorted else 0,
+        "p50": _percentile(cps_sorted, 50),
+        "p95": _percentile(cps_sorted, 95),
+        "max": cps_sorted[-1] if cps_sorted else 0,
+    }
+
+
+def expansion_plan(
+    sample: list[PostRecord], *, target: TargetConfig, cfg: AppConfig, request_budget: int
+) -> dict[str, int]:
+    """Map each sampled post to its `replace_more_limit`, spreading any request budget."""
+    logger = logging.getLogger("reddit_researcher.probe")
+    sample_ids = [p.id for p in sample if p.id]
+    if request_budget <= 0:
+        return {pid: cfg.probe.comment_replace_more_limit for pid in sample_ids}
+
+    # With a request budget, spread it over the sample by expected yield; each
+    # planned post gets (planned - 1) expansion requests after its initial load.
+    plan = plan_comment_budget(
+        ({"id": p.id, "num_comments": p.num_comments} for p in sample), request_budget
+    )
+    logger.info(
+        "planned %d comment requests over %d posts for %s/%s",
+        sum(plan.values()),
+        sum(1 for n in plan.values() if n > 0),
+        target.subreddit,
+        target.listing,
+    )
+    return {pid: plan[pid] - 1 for pid in sample_ids if plan.get(pid, 0) > 0}
+
+
+def make_limiter(cfg: AppConfig, telem: TelemetryRecorder) -> RateLimiter:
+    """One OAuth app's limiter: a token per request sent to Reddit."""
+    if cfg.probe.adaptive_ratelimit:
+        # Starts at qpm_cap, then follows Reddit's reported remaining quota
+        return AdaptiveRateLimiter(
+            cfg.probe.qpm_cap,
+            max_qpm=max(cfg.probe.qpm_cap, cfg.probe.adaptive_max_qpm),
+            telemetry=telem,
+        )
+    return RateLimiter(cfg.probe.qpm_cap, burst_tokens=1, telemetry=telem)
+
+
+def time_budget(cfg: AppConfig, time_budget_sec: float | None) -> float | None:
+    """Seconds until new work stops: the shorter runtime limit, less the flush margin."""
+    limits = [float(cfg.probe.max_runtime_sec)] if cfg.probe.max_runtime_sec > 0 else []
+    if time_budget_sec is not None:
+        limits.append(float(time_budget_sec))
+    if not limits:
+        return None
+    return max(0.0, min(limits) - cfg.probe.deadline_margin_sec)
+
+
+def cursor_key(target: TargetConfig) -> CursorKey:
+    return CursorKey(target.subreddit, target.listing, target.time_filter)
+
+
+def make_cursor_store(cfg: AppConfig, warm: WarmContext | None = None) -> CursorStore:
+    if cfg.probe.cursor_store == "supabase":
+        return SupabaseCursorStore(supabase_handle(cfg, warm))
+    if cfg.probe.cursor_store == "sqlite":
+        return SqliteCursorStore(cfg.probe.state_path)
+    raise ValueError(f"unknown cursor_store: {cfg.probe.cursor_store!r}")
+
+
+def supabase_handle(cfg: AppConfig, warm: WarmContext | None) -> SupabaseHandle:
+    connect = warm.supabase if warm is not None else make_supabase
+    return connect(cfg.supabase.url, cfg.supabase.key, cfg.supabase.schema)
+
+
+def configure_logging() -> None:
+    level_name = os.getenv("LOG_LEVEL", "INFO").upper()
+    level = getattr(logging, level_name, logging.INFO)
+    log_format = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+    if os.getenv("LOG_JSON") == "1":
+        # Minimal JSON formatter
+        log_format = (
+            '{"ts":"%(asctime)s","level":"%(levelname)s",'
+            '"logger":"%(name)s","msg":"%(message)s"}'
+        )
+    # In AWS Lambda, logging may be pre-configured; force ensures our config applies
+    try:
+        logging.basicConfig(level=level, format=log_format, force=True)
+    except TypeError:
+        # Fallback for older environments without force param
+        root = logging.getLogger()
+        for h in list(root.handlers):
+            root.removeHandler(h)
+        logging.basicConfig(level=level, format=log_format)
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import heapq
+import math
+import random
+import time
+from collections.abc import Callable, Iterable, Mapping
+from itertools import count
+from typing import Protocol
+
+from reddit_researcher.core.batching import batched
+from reddit_researcher.core.budget import INITIAL_LOAD, MORECHILDREN_BATCH, expected_requests
+from reddit_researcher.core.comment_delta import CommentState
+from reddit_researcher.core.records import PostRecord
+
+# `sampling` values accepted by `make_sampler`
+SAMPLERS = ("top", "velocity", "knapsack", "stratified", "reservoir")
+
+
+class CommentSampler(Protocol):
+    """Choose which of a target's posts get their comments expanded.
+
+    `select()` consumes the whole post stream (the probe emits each post as it is
+    read) and returns the sample, which may be shorter than the stream.
+    """
+
+    def select(self, posts: Iterable[PostRecord]) -> list[PostRecord]: ...
+
+
+def thread_cost(num_comments: int | None, replace_more_limit: int) -> tuple[int, int]:
+    """Expected `(requests, comments)` of expanding one thread.
+
+    One initial load returns up to `INITIAL_LOAD` comments; each of at most
+    `replace_more_limit` morechildren requests adds up to `MORECHILDREN_BATCH` more.
+    """
+    n = max(0, int(num_comments or 0))
+    requests = min(expected_requests(n), 1 + max(0, replace_more_limit))
+    return requests, min(n, INITIAL_LOAD + (requests - 1) * MORECHILDREN_BATCH)
+
+
+def sample_cost(posts: Iterable[PostRecord], replace_more_limit: int) -> tuple[int, int]:
+    """Expected `(requests, comments)` of expanding every post in a sample."""
+    requests = comments = 0
+    for p in posts:
+        r, c = thread_cost(p.num_comments, replace_more_limit)
+        requests += r
+        comments += c
+    return requests, comments
+
+
+class TopCommentsSampler:
+    """The `k` posts with the most comments.
+
+    Cost: O(N log k) time and O(k) retained posts. Expands at most
+    `k * (1 + replace_more_limit)` requests, all on the largest threads, which are
+    also the ones most likely to hit the `replace_more_limit` cap.
+    """
+
+    def __init__(self, k: int) -> None:
+        self._k = max(0, k)
+
+    def select(self, posts: Iterable[PostRecord]) -> list[PostRecord]:
+        return heapq.nlargest(self._k, posts, key=lambda r: r.num_comments or 0)
+
+
+class VelocitySampler:
+    """The `k` posts gaining comments fastest, in comments per hour.
+
+    With `history` (the comment states of earlier runs), velocity is the growth of
+    `num_comments` since the last fetch; posts without a state fall back to their
+    lifetime rate, `num_comments` over age. Unchanged threads therefore rank last.
+
+    Cost: O(N log k) time, O(k) retained posts, plus one `history` lookup per
+    `lookup_batch` posts. Request cost is bounded like `TopCommentsSampler`, but the
+    requests go to threads whose new comments have not been fetched yet.
+    """
+
+    def __init__(
+        self,
+        k: int,
+        *,
+        history: Callable[[list[str]], Mapping[str, CommentState]] | None = None,
+        time_fn: Callable[[], float] = time.time,
+        lookup_batch: int = 100,
+    ) -> None:
+        self._k = max(0, k)
+        self._history = history
+        self._time = time_fn
+        self._lookup_batch = max(1, lookup_batch)
+
+    def select(self, posts: Iterable[PostRecord]) -> list[PostRecord]:
+        now = self._time()
+        order = count()
+        heap: list[tuple[float, int, PostRecord]] = []
+        for chunk in batched(posts, self._lookup_batch):
+            states: Mapping[str, CommentState] = {}
+            if self._history is not None:
+                states = self._history([p.id for p in chunk if p.id])
+            for p in chunk:
+                entry = (self._velocity(p, states.get(p.id or ""), now), next(order), p)
+                if len(heap) < self._k:
+                    heapq.heappush(heap, entry)
+                elif self._k and entry[0] > heap[0][0]:
+                    heapq.heapreplace(heap, entry)
+        return [p for _, _, p in sorted(heap, key=lambda e: (-e[0], e[1]))]
+
+    @staticmethod
+    def _velocity(post: PostRecord, state: CommentState | None, now: float) -> float:
+        n = post.num_comments or 0
+        if state is not None and state.num_comments is not None:
+            hours = max(now - state.fetched_at, 60.0) / 3600
+            return max(0, n - state.num_comments) / hours
+        if post.created_utc is None:
+            return 0.0
+        return n / (max(now - post.created_utc, 60.0) / 3600)
+
+
+class KnapsackSampler:
+    """The set of posts that maximizes expected comments within `budget` requests.
+
+    Each post is an item whose weight and value are `thread_cost()`: requests to
+    expand it and the comments that returns. The sample is the exact 0/1 knapsack
+    optimum, so many small threads can beat one large thread that would need
+    many morechildren requests for the same number of comments.
+
+    Cost: O(N log M) to stream, keeping for each request cost `c` only the best
+    `budget // c` posts (no optimum uses more), so M <= budget * H(1 + replace_more_limit)
+    posts are retained. Solving is O(M * budget) time and bits. Requests spent
+    never exceed `budget`.
+    """
+
+    def __init__(self, budget: int, *, replace_more_limit: int) -> None:
+        self._budget = max(0, budget)
+        self._replace_more_limit = replace_more_limit
+
+    def select(self, posts: Iterable[PostRecord]) -> list[PostRecord]:
+        order = count()
+        # request cost -> min-heap of (comments, order, post), each capped at budget // cost
+        by_cost: dict[int, list[tuple[int, int, PostRecord]]] = {}
+        for p in posts:
+            cost, value = thread_cost(p.num_comments, self._replace_more_limit)
+            cap = self._budget // cost
+            if value <= 0 or cap <= 0:
+                continue
+            heap = by_cost.setdefault(cost, [])
+            entry = (value, next(order), p)
+            if len(heap) < cap:
+                heapq.heappush(heap, entry)
+            elif value > heap[0][0]:
+                heapq.heapreplace(heap, entry)
+
+        items = sorted(
+            ((c, v, o, p) for c, heap in by_cost.items() for v, o, p in heap),
+            key=lambda item: item[2],
+        )
+        best = [0] * (self._budget + 1)
+        taken: list[bytearray] = []
+        for cost, value, _, _ in items:
+            row = bytearray(self._budget + 1)
+            for b in range(self._budget, cost - 1, -1):
+                candidate = best[b - cost] + value
+                if candidate > best[b]:
+                    best[b] = candidate
+                    row[b] = 1
+            taken.append(row)
+
+        chosen: list[PostRecord] = []
+        b = self._budget
+        for i in range(len(items) - 1, -1, -1):
+            if taken[i][b]:
+                chosen.append(items[i][3])
+                b -= items[i][0]
+        return sorted(chosen, key=lambda r: r.num_comments or 0, reverse=True)
+
+
+class StratifiedSampler:
+    """Up to `k` posts spread over score strata, the most commented first in each.
+
+    Strata are decades of score (`<10`, `10-99`, ... with the last one open-ended),
+    so the sample is not all front-page threads. Strata are taken round-robin, and
+    slots a thin stratum cannot fill go to the others.
+
+    Cost: O(N log k) time and at most `k * strata` retained posts. Request cost is
+    bounded like `TopCommentsSampler`, and usually lower because low-score threads
+    are smaller.
+    """
+
+    def __init__(self, k: int, *, strata: int = 4) -> None:
+        self._k = max(0, k)
+        self._strata = max(1, strata)
+
+    def select(self, posts: Iterable[PostRecord]) -> list[PostRecord]:
+        order = count()
+        heaps: list[list[tuple[int, int, PostRecord]]] = [[] for _ in range(self._strata)]
+        for p in posts:
+            heap = heaps[self._stratum(p.score)]
+            entry = (p.num_comments or 0, -next(order), p)
+            if len(heap) < self._k:
+                heapq.heappush(heap, entry)
+            elif self._k and entry[0] > heap[0][0]:
+                heapq.heapreplace(heap, entry)
+
+        ranked = [[p for _, _, p in sorted(heap, reverse=True)] for heap in reversed(heaps)]
+        sample: list[PostRecord] = []
+        for i in range(self._k):
+            for stratum in ranked:
+                if i < len(stratum):
+                    sample.append(stratum[i])
+        return sample[: self._k]
+
+    def _stratum(self, score: int | None) -> int:
+        if not score or score < 10:
+            return 0
+        return min(self._strata - 1, int(math.log10(score)))
+
+
+class ReservoirSampler:
+    """A uniform random sample of `k` posts (reservoir sampling, Algorithm R).
+
+    Every post is equally likely to be expanded, so the comments are an unbiased
+    sample of the listing rather than of its busiest threads.
+
+    Cost: O(N) time, O(k) retained posts and one random draw per post. Request cost is
+    bounded like `TopCommentsSampler` and on average much lower, since a typical
+    thread fits in its initial load.
+    """
+
+    def __init__(self, k: int, *, rng: random.Random | None = None) -> None:
+        self._k = max(0, k)
+        self._rng = rng if rng is not None else random.Random()
+
+    def select(self, posts: Iterable[PostRecord]) -> list[PostRecord]:
+        reservoir: list[PostRecord] = []
+        for seen, p in enumerate(posts):
+            if seen < self._k:
+                reservoir.append(p)
+                continue
+            j = self._rng.randint(0, seen)
+            if j < self._k:
+                reservoir[j] = p
+        return reservoir
+
+
+def make_sampler(
+    name: str,
+    *,
+    k: int,
+    request_budget: int,
+    replace_more_limit: int,
+    history: Callable[[list[str]], Mapping[str, CommentState]] | None = None,
+) -> CommentSampler:
+    """Build the sampler selected by `probe.comment_sampling`.
+
+    `knapsack` spends `request_budget` when one is set, else the worst-case cost of
+    a top-`k` sample, `k * (1 + replace_more_limit)`.
+    """
+    if name == "top":
+        return TopCommentsSampler(k)
+    if name == "velocity":
+        return VelocitySampler(k, history=history)
+    if name == "knapsack":
+        budget = request_budget if request_budget > 0 else k * (1 + max(0, replace_more_limit))
+        return KnapsackSampler(budget, replace_more_limit=replace_more_limit)
+    if name == "stratified":
+        return StratifiedSampler(k)
+    if name == "reservoir":
+        return ReservoirSampler(k)
+    raise ValueError(f"unknown comment_sampling: {name!r}")
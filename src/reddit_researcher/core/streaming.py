@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from reddit_researcher.core.ports import MetricsSink
+
+_STOP = object()
+
+
+class StreamingWriter:
+    """Drain normalized rows into a `MetricsSink` in micro-batches on a background thread.
+
+    Rows pass through a bounded queue, so a slow sink applies backpressure to the
+    crawl instead of letting buffers grow. A batch is flushed once it reaches
+    `batch_size` rows or `flush_interval_s` seconds have passed, whichever is first.
+    Each flush ingests the rows: upserts them and links their IDs to `run_id`.
+    """
+
+    def __init__(
+        self,
+        sink: MetricsSink,
+        run_id: str,
+        *,
+        batch_size: int = 500,
+        flush_interval_s: float = 2.0,
+        max_pending: int | None = None,
+        time_fn: Callable[[], float] | None = None,
+    ) -> None:
+        if batch_size <= 0:
+            raise ValueError("batch_size must be > 0")
+        self._sink = sink
+        self._run_id = run_id
+        self._batch_size = batch_size
+        self._flush_interval_s = max(0.01, float(flush_interval_s))
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max_pending or batch_size * 4)
+        self._time = time_fn or time.monotonic
+        self._thread: threading.Thread | None = None
+        self._error: BaseException | None = None
+        self.posts_written = 0
+        self.comments_written = 0
+        self.flushes = 0
+
+    def start(self) -> StreamingWriter:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="streaming-writer", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def put_post(self, row: dict[str, Any]) -> None:
+        self._put(("posts", row))
+
+    def put_comment(self, row: dict[str, Any]) -> None:
+        self._put(("comments", row))
+
+    def close(self) -> None:
+        """Flush whatever is buffered, stop the worker and re-raise any sink error."""
+        if self._thread is not None:
+            if self._error is None:
+                self._put(_STOP)
+            self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self) -> StreamingWriter:
+        return self.start()
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+    def _put(self, item: Any) -> None:
+        while True:
+            if self._error is not None:
+                raise self._error
+            try:
+                self._queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def _run(self) -> None:
+        buffers: dict[str, list[dict[str, Any]]] = {"posts": [], "comments": []}
+        next_flush = self._time() + self._flush_interval_s
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=max(0.0, next_flush - self._time()))
+                except queue.Empty:
+                    item = None
+                if item is _STOP:
+                    self._flush(buffers)
+                    return
+                if item is not None:
+                    kind, row = item
+                    buffers[kind].append(row)
+                    if len(buffers[kind]) >= self._batch_size:
+                        self._flush_kind(kind, buffers[kind])
+                        buffers[kind] = []
+                if self._time() >= next_flush:
+                    self._flush(buffers)
+                    next_flush = self._time() + self._flush_interval_s
+        except BaseException as exc:  # surfaced to producers via _put/close
+            self._error = exc
+
+    def _flush(self, buffers: dict[str, list[dict[str, Any]]]) -> None:
+        for kind in ("posts", "comments"):
+            if buffers[kind]:
+                self._flush_kind(kind, buffers[kind])
+                buffers[kind] = []
+
+    def _flush_kind(self, kind: str, rows: list[dict[str, Any]]) -> None:
+        if kind == "posts":
+            self._sink.ingest_posts(self._run_id, rows)
+            self.posts_written += len(rows)
+        else:
+            self._sink.ingest_comments(self._run_id, rows)
+            self.comments_written += len(rows)
+        self.flushes += 1
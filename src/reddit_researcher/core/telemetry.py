@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import math
+import threading
 import time
-from collections.abc import Mapping
+from collections import deque
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -62,31 +65,148 @@ def _is_number(value: str) -> bool:
         return False
 
 
+class LatencySketch:
+    """Streaming quantile sketch over non-negative durations with bounded memory.
+
+    Values are counted in logarithmic buckets (`gamma = (1 + a) / (1 - a)`), so any
+    quantile is within `relative_accuracy` of the true value. Durations between a
+    microsecond and an hour need about 1,100 buckets at 1%; past `max_buckets` the
+    lowest buckets are merged, trading accuracy on the fastest calls only.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, *, max_buckets: int = 2048) -> None:
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._max_buckets = max(1, max_buckets)
+        self._buckets: dict[int, int] = {}
+        self._zeros = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        if value <= 1e-9:
+            self._zeros += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self._buckets[key] = self._buckets.get(key, 0) + 1
+        if len(self._buckets) > self._max_buckets:
+            lowest, second = sorted(self._buckets)[:2]
+            self._buckets[second] += self._buckets.pop(lowest)
+
+    def quantile(self, q: float) -> float | None:
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self._zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self._buckets):
+            seen += self._buckets[key]
+            if rank < seen:
+                # Midpoint of the bucket (gamma^(k-1), gamma^k], in relative terms
+                return min(self.max, 2 * self._gamma**key / (self._gamma + 1))
+        return self.max
+
+
 @dataclass
+class EndpointStats:
+    latency: LatencySketch = field(default_factory=LatencySketch)
+    rows: int = 0
+    bytes: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        lat = self.latency
+        return {
+            "count": lat.count,
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "total_s": round(lat.total, 6),
+            "p50_s": _round(lat.quantile(0.5)),
+            "p90_s": _round(lat.quantile(0.9)),
+            "p99_s": _round(lat.quantile(0.99)),
+            "max_s": round(lat.max, 6),
+        }
+
+
+def _round(value: float | None) -> float | None:
+    return None if value is None else round(value, 6)
+
+
 class TelemetryRecorder:
-    entries: list[dict[str, Any]] = field(default_factory=list)
+    """Thread-safe per-endpoint counters and latency sketches, plus a rate-limit timeline.
+
+    Memory stays bounded however long the run is: each endpoint keeps one
+    `EndpointStats`, and the `x-ratelimit-*` timeline keeps at most `timeline_size`
+    samples, taken no more than once per `timeline_interval_s`.
+
+    `payload_sizes` asks writers to measure request bodies they would otherwise not
+    serialize themselves (the Supabase sink re-encodes each chunk to count its bytes);
+    sizes that are free to read, such as response lengths, are always recorded.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeline_size: int = 512,
+        timeline_interval_s: float = 1.0,
+        time_fn: Callable[[], float] = time.monotonic,
+        payload_sizes: bool = False,
+    ) -> None:
+        self.payload_sizes = payload_sizes
+        self._time = time_fn
+        self._started = time_fn()
+        self._lock = threading.Lock()
+        self._endpoints: dict[str, EndpointStats] = {}
+        self._timeline: deque[dict[str, float]] = deque(maxlen=max(1, timeline_size))
+        self._timeline_interval_s = timeline_interval_s
+        self._last_sample = -math.inf
+        self.total = 0
+        self.ratelimit_windows = 0
 
     def record(
         self,
         endpoint: str,
         headers: Mapping[str, str] | None,
         elapsed_s: float | None,
+        *,
+        rows: int | None = None,
+        nbytes: int | None = None,
     ) -> None:
         ratelimit = parse_ratelimit_headers(headers)
-        self.entries.append(
-            {
-                "endpoint": endpoint,
-                "elapsed_s": float(elapsed_s) if elapsed_s is not None else None,
-                "ratelimit": ratelimit,
-            }
-        )
+        with self._lock:
+            self.total += 1
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = EndpointStats()
+            if elapsed_s is not None:
+                stats.latency.add(max(0.0, float(elapsed_s)))
+            if rows is not None:
+                stats.rows += int(rows)
+            if nbytes is not None:
+                stats.bytes += int(nbytes)
+            if ratelimit:
+                self.ratelimit_windows += 1
+                now = self._time()
+                if now - self._last_sample >= self._timeline_interval_s:
+                    self._last_sample = now
+                    self._timeline.append({"t": round(now - self._started, 3), **ratelimit})
+
+    def endpoint(self, name: str) -> dict[str, Any] | None:
+        with self._lock:
+            stats = self._endpoints.get(name)
+            return stats.as_dict() if stats is not None else None
 
     def summary(self) -> dict[str, Any]:
-        total = len(self.entries)
-        rl_seen = [e.get("ratelimit") for e in self.entries if e.get("ratelimit")]
-        return {
-            "total": total,
-            "ratelimit_windows": len(rl_seen),
-        }
-
-
+        with self._lock:
+            return {
+                "total": self.total,
+                "ratelimit_windows": self.ratelimit_windows,
+                "endpoints": {
+                    name: stats.as_dict() for name, stats in sorted(self._endpoints.items())
+                },
+                "ratelimit_timeline": list(self._timeline),
+            }
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Mapping
+from pathlib import Path
+from typing import Any
+
+from reddit_researcher.apis.local.http_cache import SqliteResponseCache, make_response_cache
+from reddit_researcher.apis.reddit.reddit_client import (
+    ResponseCallback,
+    make_json_session,
+    make_reddit,
+)
+from reddit_researcher.apis.supabase.client import SupabaseHandle, make_supabase
+from reddit_researcher.config.config import AppConfig, HttpCacheConfig, load_config
+from reddit_researcher.core.ports import ResponseCache
+
+
+class ResponseRelay:
+    """`ResponseCallback` that forwards to whichever run is using a reused client.
+
+    A client's HTTP session gets its response hook once, when it is built; each run's
+    adapter has its own limiter and telemetry, so the hook is a relay repointed per run.
+    """
+
+    def __init__(self) -> None:
+        self.target: ResponseCallback | None = None
+
+    def __call__(
+        self, endpoint: str, headers: Mapping[str, str], elapsed_s: float, status: int, nbytes: int
+    ) -> None:
+        target = self.target
+        if target is not None:
+            target(endpoint, headers, elapsed_s, status, nbytes)
+
+
+class WarmContext:
+    """Config and network clients kept for the life of the process.
+
+    A warm Lambda container runs many invocations in one process. Everything here
+    is built on first use and reused afterwards: the parsed config, the PRAW client
+    or prawcore session (with its OAuth token and `requests` connection pool) and
+    the Supabase client (with its HTTP pool). A warm invocation then skips the config
+    parse, the token request and the TLS handshakes. Clients are keyed by their
+    credentials, so a changed config builds new ones.
+    """
+
+    def __init__(
+        self,
+        config_path: str | Path = "config.yaml",
+        *,
+        loader: Callable[[str | Path], AppConfig] = load_config,
+    ) -> None:
+        self._config_path = config_path
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._cfg: AppConfig | None = None
+        self._clients: dict[tuple[Any, ...], Any] = {}
+        self._relays: dict[tuple[Any, ...], ResponseRelay] = {}
+        self.invocations = 0
+
+    def config(self) -> AppConfig:
+        with self._lock:
+            if self._cfg is None:
+                self._cfg = self._loader(self._config_path)
+            self.invocations += 1
+            return self._cfg
+
+    def reddit(
+        self,
+        cfg: Any,
+        *,
+        on_response: ResponseCallback | None = None,
+        cache: ResponseCache | None = None,
+    ) -> Any:
+        """A `make_reddit` drop-in returning the process's PRAW client for these credentials."""
+        return self._http_client("praw", make_reddit, cfg, on_response, cache)
+
+    def json_session(
+        self,
+        cfg: Any,
+        *,
+        on_response: ResponseCallback | None = None,
+        cache: ResponseCache | None = None,
+    ) -> Any:
+        """A `make_json_session` drop-in returning the process's prawcore session."""
+        return self._http_client("json", make_json_session, cfg, on_response, cache)
+
+    def response_cache(self, cfg: HttpCacheConfig) -> SqliteResponseCache:
+        """The process's response cache for this config, opened on first use."""
+        cache_key = ("http_cache", cfg)
+        with self._lock:
+            cache = self._clients.get(cache_key)
+            if cache is None:
+                cache = self._clients[cache_key] = make_response_cache(cfg)
+            return cache
+
+    def supabase(self, url: str, key: str, schema: str = "public") -> SupabaseHandle:
+        """A `make_supabase` drop-in; the sink and every Supabase store share one client."""
+        cache_key = ("supabase", url, key, schema)
+        with self._lock:
+            handle = self._clients.get(cache_key)
+            if handle is None:
+                handle = self._clients[cache_key] = make_supabase(url, key, schema)
+            return handle
+
+    def _http_client(
+        self,
+        kind: str,
+        factory: Callable[..., Any],
+        cfg: Any,
+        on_response: ResponseCallback | None,
+        cache: ResponseCache | None,
+    ) -> Any:
+        rcfg = getattr(cfg, "reddit", cfg)
+        # The response cache is mounted on the client's session, so it is part of the key
+        cache_key = (kind, rcfg.client_id, rcfg.client_secret, rcfg.user_agent, id(cache))
+        extra = {} if cache is None else {"cache": cache}
+        with self._lock:
+            relay = self._relays.get(cache_key)
+            if relay is None:
+                relay = self._relays[cache_key] = ResponseRelay()
+                self._clients[cache_key] = factory(cfg, on_response=relay, **extra)
+            relay.target = on_response
+            return self._clients[cache_key]
+
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from reddit_researcher.bench.fakes import (
+    AsyncFakeRedditSource,
+    AsyncFakeSink,
+    FakeRedditConfig,
+    FakeRedditSource,
+    FakeSink,
+)
+from reddit_researcher.config.config import (
+    AppConfig,
+    HttpCacheConfig,
+    ParquetConfig,
+    ProbeConfig,
+    RedditConfig,
+    TargetConfig,
+)
+from reddit_researcher.core.async_orchestrator import run_probe_async
+from reddit_researcher.core.orchestrator import run_probe
+
+
+def _cfg(**probe: object) -> AppConfig:
+    defaults: dict[str, object] = {
+        "subreddit": "bench",
+        "post_limit": 150,
+        "comment_sample": 8,
+        "comment_replace_more_limit": 2,
+        "comment_concurrency": 4,
+        "qpm_cap": 1_000_000,
+        "stream_batch_size": 50,
+        "stream_flush_sec": 0.05,
+    }
+    defaults.update(probe)
+    return AppConfig(
+        reddit=RedditConfig(client_id="id", client_secret="sec", user_agent="ua"),
+        probe=ProbeConfig(**defaults),  # type: ignore[arg-type]
+    )
+
+
+REDDIT = FakeRedditConfig(posts=150, mean_comments=120, seed=3)
+
+
+def test_async_run_matches_the_threaded_run() -> None:
+    cfg = _cfg()
+    sink = AsyncFakeSink()
+    metrics = asyncio.run(run_probe_async(cfg, source=AsyncFakeRedditSource(REDDIT), sink=sink))
+    expected = run_probe(cfg, source=FakeRedditSource(REDDIT), sink=FakeSink())
+
+    assert metrics["complete"] and metrics["config"]["runtime"] == "async"
+    assert metrics["posts_count"] == expected["posts_count"] == 150
+    assert metrics["comments_total"] == expected["comments_total"]
+    assert metrics["comments_per_expanded_post"] == expected["comments_per_expanded_post"]
+    assert sink.rows["ingest_posts"] == 150
+    assert sink.rows["ingest_comments"] == metrics["comments_total"]
+    assert sink.calls["upsert_run"] == 1
+
+
+def test_targets_share_the_comment_slots_and_report_separately() -> None:
+    cfg = _cfg(
+        targets=(
+            TargetConfig(subreddit="a", listing="hot"),
+            TargetConfig(subreddit="b", listing="new"),
+        ),
+        comment_request_budget=10,
+    )
+    source = AsyncFakeRedditSource(REDDIT)
+    metrics = asyncio.run(run_probe_async(cfg, source=source, sink=AsyncFakeSink()))
+
+    assert [t["subreddit"] for t in metrics["targets"]] == ["a", "b"]
+    assert metrics["posts_count"] == 300
+    # 10 requests for the two targets' expansions, plus two listing pages each
+    assert source.requests <= 10 + 4
+
+
+def test_overlapping_targets_emit_and_expand_each_post_once() -> None:
+    cfg = _cfg(
+        targets=(
+            TargetConfig(subreddit="bench", listing="hot"),
+            TargetConfig(subreddit="bench", listing="new"),
+        ),
+    )
+    source = AsyncFakeRedditSource(REDDIT)
+    sink = AsyncFakeSink()
+    metrics = asyncio.run(run_probe_async(cfg, source=source, sink=sink))
+
+    assert metrics["posts_count"] == sink.rows["ingest_posts"] == 150
+    # Both listings were read, but only the first target's sample was expanded
+    assert sorted(t["expanded"] for t in metrics["targets"]) == [0, 8]
+
+
+def test_incremental_cursor_skips_posts_already_seen(tmp_path: Path) -> None:
+    cfg = _cfg(
+        listing="new",
+        incremental=True,
+        state_path=str(tmp_path / "state.sqlite"),
+    )
+    first = asyncio.run(run_probe_async(cfg, source=AsyncFakeRedditSource(REDDIT), sink=None))
+    second = asyncio.run(run_probe_async(cfg, source=AsyncFakeRedditSource(REDDIT), sink=None))
+
+    assert first["posts_count"] == 150
+    assert second["posts_count"] == 0
+
+
+def test_expired_deadline_leaves_the_run_incomplete() -> None:
+    metrics = asyncio.run(
+        run_probe_async(
+            _cfg(deadline_margin_sec=0.0),
+            source=AsyncFakeRedditSource(REDDIT),
+            sink=AsyncFakeSink(),
+            time_budget_sec=0.0,
+        )
+    )
+    assert not metrics["complete"]
+    assert metrics["posts_count"] == 0
+
+
+def test_deadline_stops_the_listing_between_pages() -> None:
+    # Each 100-post page takes 0.2s; the third is not requested after the 0.3s budget
+    reddit = FakeRedditConfig(posts=300, mean_comments=10, latency_s=0.2, seed=3)
+    source = AsyncFakeRedditSource(reddit)
+    metrics = asyncio.run(
+        run_probe_async(
+            _cfg(post_limit=300, deadline_margin_sec=0.0),
+            source=source,
+            sink=AsyncFakeSink(),
+            time_budget_sec=0.3,
+        )
+    )
+    assert not metrics["complete"]
+    assert metrics["posts_count"] == 200 and source.requests == 2
+
+
+def test_threaded_only_options_are_rejected() -> None:
+    cfg = replace(
+        _cfg(checkpoint=1, spool=1),
+        parquet=ParquetConfig(enabled=True),
+        http_cache=HttpCacheConfig(enabled=True),
+    )
+    sink = AsyncFakeSink()
+    with pytest.raises(ValueError) as excinfo:
+        asyncio.run(run_probe_async(cfg, source=AsyncFakeRedditSource(REDDIT), sink=sink))
+    assert str(excinfo.value).startswith(
+        "not supported by the async runtime: probe.checkpoint, probe.spool, "
+        "parquet.enabled, http_cache.enabled;"
+    )
+    assert sink.calls == {}
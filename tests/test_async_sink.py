@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from reddit_researcher.apis.supabase.async_sink import AsyncSupabaseSink, PostgrestError
+from reddit_researcher.core.telemetry import TelemetryRecorder
+
+
+class RecordedPostgrest:
+    """Records PostgREST requests; fails the first `fail_first` with `fail_status`."""
+
+    def __init__(self, *, fail_first: int = 0, fail_status: int = 503) -> None:
+        self.requests: list[tuple[str, dict[str, str], object]] = []
+        self._fail = fail_first
+        self._status = fail_status
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if self._fail > 0:
+            self._fail -= 1
+            return httpx.Response(self._status, json={"code": str(self._status)})
+        self.requests.append(
+            (request.url.path, dict(request.url.params), json.loads(request.content))
+        )
+        return httpx.Response(201)
+
+
+def _sink(
+    server: RecordedPostgrest, *, chunk_size: int = 2, rpc_ingest: bool = False
+) -> tuple[AsyncSupabaseSink, TelemetryRecorder]:
+    cfg = SimpleNamespace(
+        supabase=SimpleNamespace(
+            url="https://x.supabase.co",
+            key="k",
+            schema="public",
+            chunk_size=chunk_size,
+            max_in_flight=2,
+            max_retries=2,
+            rpc_ingest=rpc_ingest,
+        )
+    )
+    telem = TelemetryRecorder()
+    client = httpx.AsyncClient(
+        base_url="https://x.supabase.co/rest/v1", transport=httpx.MockTransport(server)
+    )
+    return AsyncSupabaseSink(cfg, telemetry=telem, client=client), telem  # type: ignore[arg-type]
+
+
+def test_ingest_posts_upserts_in_chunks_then_links() -> None:
+    server = RecordedPostgrest()
+
+    async def run() -> TelemetryRecorder:
+        sink, telem = _sink(server)
+        async with sink:
+            await sink.ingest_posts("r1", [{"id": f"t3_{i}"} for i in range(5)])
+        return telem
+
+    telem = asyncio.run(run())
+    posts = [r for r in server.requests if r[0] == "/rest/v1/posts"]
+    assert [len(body) for _, _, body in posts] == [2, 2, 1]  # type: ignore[arg-type]
+    assert posts[0][1] == {"on_conflict": "id"}
+    links = [body for path, _, body in server.requests if path == "/rest/v1/runs_posts"]
+    assert links == [[{"run_id": "r1", "post_id": f"t3_{i}"} for i in range(5)]]
+    assert telem.summary()["endpoints"]["supabase.upsert.posts"]["rows"] == 5
+
+
+def test_rpc_ingest_calls_the_ingest_function() -> None:
+    server = RecordedPostgrest()
+
+    async def run() -> None:
+        sink, _ = _sink(server, chunk_size=10, rpc_ingest=True)
+        async with sink:
+            await sink.ingest_comments("r1", [{"id": "t1_a"}, {"id": "t1_b"}])
+
+    asyncio.run(run())
+    rows = [{"id": "t1_a"}, {"id": "t1_b"}]
+    assert server.requests == [
+        ("/rest/v1/rpc/ingest_comments", {}, {"p_run_id": "r1", "p_rows": rows})
+    ]
+
+
+def test_transient_errors_are_retried_and_fatal_ones_raised() -> None:
+    server = RecordedPostgrest(fail_first=1)
+
+    async def run(sink: AsyncSupabaseSink) -> None:
+        async with sink:
+            await sink.upsert_run({"run_id": "r1"})
+
+    asyncio.run(run(_sink(server)[0]))
+    assert [path for path, _, _ in server.requests] == ["/rest/v1/runs"]
+
+    with pytest.raises(PostgrestError) as err:
+        asyncio.run(run(_sink(RecordedPostgrest(fail_first=1, fail_status=400))[0]))
+    assert err.value.code == "400"
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+
+from reddit_researcher.apis.reddit.async_source import AsyncRedditJsonSource
+from reddit_researcher.core.aio import AsyncRateLimiter
+from reddit_researcher.core.ratelimit import RateLimiter
+from reddit_researcher.core.telemetry import TelemetryRecorder
+
+FIXTURES = Path(__file__).parent / "fixtures" / "reddit"
+
+
+def _load(name: str) -> object:
+    return json.loads((FIXTURES / name).read_text(encoding="utf-8"))
+
+
+class RecordedReddit:
+    """Serves the recorded Reddit JSON fixtures over an `httpx.MockTransport`."""
+
+    def __init__(self, *, throttle_first: int = 0) -> None:
+        self.calls: list[httpx.Request] = []
+        self.tokens = 0
+        self._throttle = throttle_first
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/v1/access_token":
+            self.tokens += 1
+            return httpx.Response(200, json={"access_token": f"t{self.tokens}", "expires_in": 3600})
+        self.calls.append(request)
+        if self._throttle > 0:
+            self._throttle -= 1
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        path, params = request.url.path, request.url.params
+        if path == "/r/python/hot":
+            page = "listing_hot_page2.json" if params.get("after") else "listing_hot_page1.json"
+            return httpx.Response(200, json=_load(page))
+        if path == "/comments/p1":
+            return httpx.Response(200, json=_load("comments_p1.json"))
+        if path == "/api/morechildren":
+            return httpx.Response(200, json=_load("morechildren_p1.json"))
+        return httpx.Response(404)
+
+
+def _source(
+    server: RecordedReddit, **kwargs: object
+) -> tuple[AsyncRedditJsonSource, TelemetryRecorder]:
+    cfg = SimpleNamespace(
+        reddit=SimpleNamespace(client_id="id", client_secret="sec", user_agent="ua"),
+        probe=SimpleNamespace(raw_json=1),
+    )
+    telem = TelemetryRecorder()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(server))
+    source = AsyncRedditJsonSource(
+        cfg,  # type: ignore[arg-type]
+        telemetry=telem,
+        client=client,
+        **kwargs,  # type: ignore[arg-type]
+    )
+    return source, telem
+
+
+def test_iter_posts_paginates_with_a_bearer_token() -> None:
+    server = RecordedReddit()
+
+    async def run() -> list[str]:
+        source, _ = _source(server)
+        async with source:
+            return [p["id"] async for p in source.iter_posts("python", "hot", "day", limit=10)]
+
+    assert asyncio.run(run()) == ["p1", "p2", "p3"]
+    assert server.tokens == 1
+    assert all(c.headers["Authorization"] == "bearer t1" for c in server.calls)
+    assert server.calls[0].url.params["raw_json"] == "1"
+    assert server.calls[1].url.params["after"] == "t3_p2"
+
+
+def test_fetch_comments_expands_morechildren_concurrently() -> None:
+    server = RecordedReddit()
+
+    async def run() -> list[list[str]]:
+        source, _ = _source(server)
+        async with source:
+            results = await asyncio.gather(
+                *(source.fetch_comments("p1", replace_more_limit=5) for _ in range(3))
+            )
+        return [[c["id"] for c in comments] for comments in results]
+
+    assert asyncio.run(run()) == [["c1", "c2", "c1a", "c3", "c4"]] * 3
+    # One token shared by every concurrent request
+    assert server.tokens == 1
+    more = [c for c in server.calls if c.url.path == "/api/morechildren"]
+    assert len(more) == 3 and more[0].url.params["children"] == "c3,c4"
+
+
+def test_throttled_requests_are_retried_and_recorded() -> None:
+    server = RecordedReddit(throttle_first=2)
+
+    async def run() -> tuple[list[str], TelemetryRecorder]:
+        limiter = AsyncRateLimiter(RateLimiter(6000, burst_tokens=10))
+        source, telem = _source(server, limiter=limiter)
+        async with source:
+            posts = [p["id"] async for p in source.iter_posts("python", "hot", "day", limit=2)]
+        return posts, telem
+
+    posts, telem = asyncio.run(run())
+    assert posts == ["p1", "p2"]
+    assert len(server.calls) == 3
+    endpoints = telem.summary()["endpoints"]
+    assert any(name.startswith("reddit:") for name in endpoints)
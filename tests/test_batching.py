@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from reddit_researcher.core.batching import batched
+
+
+def test_batched_splits_lazily_with_a_short_tail() -> None:
+    consumed: list[int] = []
+
+    def items():
+        for i in range(5):
+            consumed.append(i)
+            yield i
+
+    batches = batched(items(), 2)
+    assert next(batches) == [0, 1]
+    assert consumed == [0, 1]
+    assert list(batches) == [[2, 3], [4]]
+    assert list(batched([], 3)) == []
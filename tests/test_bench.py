@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import threading
+
+from reddit_researcher.bench.fakes import FakeClock, FakeRedditConfig, FakeRedditSource
+from reddit_researcher.bench.harness import BenchScenario, compare, run_benchmark
+
+
+def test_fake_source_charges_one_request_per_expansion() -> None:
+    source = FakeRedditSource(FakeRedditConfig(posts=50, mean_comments=1000, seed=1))
+    posts = list(source.iter_posts("bench", "hot", "day", 50))
+    assert source.requests == 1  # one listing page
+    big = next(p for p in posts if p["num_comments"] > 300)
+
+    comments = source.fetch_comments(big["id"], replace_more_limit=1)
+
+    assert len(comments) == 300
+    assert source.requests == 3
+
+
+def test_run_benchmark_reports_throughput_and_sink_calls() -> None:
+    scenario = BenchScenario(
+        reddit=FakeRedditConfig(posts=120, mean_comments=20, throttle_rate=0.1, seed=7),
+        comment_sample=10,
+    )
+    result = run_benchmark(scenario)
+
+    assert result.posts == 120
+    assert result.comments > 0 and result.posts_per_sec > 0
+    assert result.reddit_throttled > 0
+    assert result.sink_rows["ingest_posts"] == 120
+    assert result.sink_rows["ingest_comments"] == result.comments
+    assert result.sink_calls["upsert_run"] == 1
+    # 100 QPM: after the first token, each request waits 0.6s of fake-clock time
+    assert result.ratelimit_sec == round((result.reddit_requests - 1) * 0.6, 2)
+
+
+def test_fake_clock_overlaps_concurrent_waits() -> None:
+    clock = FakeClock()
+    both_read = threading.Barrier(2)
+
+    def wait(seconds: float) -> None:
+        clock()
+        both_read.wait()
+        clock.sleep(seconds)
+
+    workers = [threading.Thread(target=wait, args=(s,)) for s in (1.0, 2.0)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    assert clock() == 2.0
+
+
+def test_compare_flags_regressions_beyond_tolerance() -> None:
+    baseline = {"posts_per_sec": 100.0, "comments_per_sec": 1000.0, "peak_mem_mb": 10.0}
+    ok = {"posts_per_sec": 95.0, "comments_per_sec": 990.0, "peak_mem_mb": 10.5}
+    slow = {"posts_per_sec": 50.0, "comments_per_sec": 990.0, "peak_mem_mb": 20.0}
+    assert compare(ok, baseline, tolerance=0.1) == []
+    assert len(compare(slow, baseline, tolerance=0.1)) == 2
+
+
+def test_run_benchmark_drives_the_async_runtime() -> None:
+    scenario = BenchScenario(
+        reddit=FakeRedditConfig(posts=120, mean_comments=20, latency_s=0.001, seed=7),
+        comment_sample=10,
+        runtime="async",
+    )
+    result = run_benchmark(scenario)
+
+    assert result.posts == 120 and result.comments > 0
+    assert result.sink_rows["ingest_posts"] == 120
+    assert result.sink_rows["ingest_comments"] == result.comments
+
+
+def test_run_benchmark_spreads_requests_over_credentials() -> None:
+    scenario = BenchScenario(
+        reddit=FakeRedditConfig(posts=120, mean_comments=20, seed=7),
+        comment_sample=10,
+        credentials=2,
+    )
+    result = run_benchmark(scenario)
+
+    assert result.posts == 120 and result.comments > 0
+    assert result.reddit_requests >= 11  # two listing pages plus one per expansion
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from reddit_researcher.core.budget import expected_requests, plan_comment_budget
+
+POSTS = [
+    {"id": "big", "num_comments": 1000},
+    {"id": "small", "num_comments": 150},
+    {"id": "empty", "num_comments": 0},
+]
+
+
+def test_plan_prefers_initial_loads_then_largest_backlog() -> None:
+    assert plan_comment_budget(POSTS, 2) == {"big": 1, "small": 1, "empty": 0}
+    assert plan_comment_budget(POSTS, 5) == {"big": 4, "small": 1, "empty": 0}
+
+
+def test_plan_never_exceeds_what_a_thread_can_use() -> None:
+    plan = plan_comment_budget(POSTS, 100)
+    assert plan == {"big": expected_requests(1000), "small": 1, "empty": 0}
+    assert expected_requests(1000) == 9
+
+
+def test_plan_with_no_budget_expands_nothing() -> None:
+    assert plan_comment_budget(POSTS, 0) == {"big": 0, "small": 0, "empty": 0}
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from reddit_researcher.apis.local.checkpoints import SqliteCheckpointStore
+from reddit_researcher.config.config import TargetConfig
+from reddit_researcher.core.checkpoint import Checkpoint, Deadline, TargetProgress
+from reddit_researcher.core.incremental import CursorTracker
+from reddit_researcher.core.orchestrator import _crawl_target
+from reddit_researcher.core.run import POST_PAGE_SIZE
+from reddit_researcher.core.telemetry import TelemetryRecorder
+
+TARGET = TargetConfig("python")
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Source:
+    def __init__(self, clock: _Clock) -> None:
+        self.clock = clock
+        self.listed = 0
+        self.fetched: list[str] = []
+
+    def iter_posts(self, subreddit, listing, time_filter, limit, *, since=None):
+        self.listed += 1
+        return iter(
+            [{"id": f"p{i}", "num_comments": 10 - i, "created_utc": 100 + i} for i in range(3)]
+        )
+
+    def fetch_comments(self, submission_id, replace_more_limit):
+        self.fetched.append(submission_id)
+        self.clock.now += 10  # each expansion takes 10s
+        return [{"id": f"{submission_id}c", "created_utc": 1}]
+
+
+class _PagedSource(_Source):
+    """A `new` listing of 250 posts served a page at a time, 10s per page."""
+
+    def __init__(self, clock: _Clock) -> None:
+        super().__init__(clock)
+        self.calls: list[tuple[int, str | None]] = []
+
+    def iter_posts(self, subreddit, listing, time_filter, limit, *, since=None, after=None):
+        self.calls.append((limit, after))
+        start = 0 if after is None else int(after.removeprefix("t3_p")) + 1
+        for i in range(start, min(start + limit, 250)):
+            if (i - start) % POST_PAGE_SIZE == 0:
+                self.clock.now += 10
+            yield {"id": f"p{i}", "num_comments": i, "created_utc": 100 + i}
+
+
+def _crawl(
+    source: _Source,
+    progress: TargetProgress,
+    deadline: Deadline,
+    *,
+    post_limit: int = 10,
+    emit_post=lambda rec: None,
+) -> None:
+    cfg = SimpleNamespace(
+        probe=SimpleNamespace(
+            post_limit=post_limit,
+            comment_sample=3,
+            comment_replace_more_limit=2,
+            comment_sampling="top",
+        )
+    )
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        _crawl_target(
+            TARGET,
+            cfg=cfg,
+            source=source,
+            telem=TelemetryRecorder(),
+            tracker=CursorTracker(),
+            comment_pool=pool,
+            emit_post=emit_post,
+            emit_comment=lambda rec: None,
+            progress=progress,
+            deadline=deadline,
+        )
+
+
+def test_deadline_leaves_expansions_pending_and_resume_finishes_them(tmp_path) -> None:
+    clock = _Clock()
+    source = _Source(clock)
+    checkpoint = Checkpoint(run_id="r1", started_at=0.0)
+    progress = checkpoint.progress(TARGET)
+
+    _crawl(source, progress, Deadline(15, time_fn=clock))
+    assert source.fetched == ["p0", "p1"]  # p2 was not started after the deadline
+    assert progress.pending == {"p2": 2} and not checkpoint.complete
+
+    store = SqliteCheckpointStore(tmp_path / "state.sqlite")
+    store.save("k", checkpoint)
+    resumed = store.load("k")
+    assert resumed is not None and resumed.run_id == "r1"
+
+    _crawl(source, resumed.progress(TARGET), Deadline(None))
+    assert source.listed == 1  # the listing is not fetched again
+    assert source.fetched == ["p0", "p1", "p2"]
+    assert resumed.complete and resumed.progress(TARGET).comments == 3
+
+    store.clear("k")
+    assert store.load("k") is None
+
+
+def test_deadline_mid_listing_resumes_after_the_last_listed_post() -> None:
+    clock = _Clock()
+    source = _PagedSource(clock)
+    progress = TargetProgress()
+    emitted: list[str] = []
+
+    def emit(rec) -> None:
+        emitted.append(rec.id)
+
+    # Two pages are fetched by t=20; the third is not requested after the deadline
+    _crawl(source, progress, Deadline(15, time_fn=clock), post_limit=250, emit_post=emit)
+    assert not progress.listed and progress.after == "t3_p199"
+    assert progress.posts == 200 and len(progress.pending) == 3
+    assert source.fetched == []
+
+    _crawl(source, progress, Deadline(None), post_limit=250, emit_post=emit)
+    assert source.calls == [(250, None), (50, "t3_p199")]
+    assert progress.listed and progress.posts == 250
+    assert sorted(emitted) == sorted(f"p{i}" for i in range(250))
+    # The sample taken before the deadline is expanded, not topped up past K
+    assert sorted(source.fetched) == ["p197", "p198", "p199"]
+    assert progress.done
+
+
+def test_checkpoint_json_round_trip() -> None:
+    cp = Checkpoint(run_id="r", started_at=1.5)
+    cp.progress(TARGET).pending = {"a": 1}
+    cp.progress(TargetConfig("rust")).after = "t3_x"
+    again = Checkpoint.from_json(cp.to_json())
+    assert again == cp
+    assert Checkpoint.from_json({"run_id": "r", "started_at": 1}).targets == {}
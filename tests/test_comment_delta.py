@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from reddit_researcher.apis.local.comment_state import SqliteCommentStateStore
+from reddit_researcher.core.comment_delta import CommentDelta
+
+
+def test_unchanged_submissions_are_skipped_on_the_next_run(tmp_path) -> None:
+    store = SqliteCommentStateStore(tmp_path / "state.sqlite")
+
+    first = CommentDelta(store, time_fn=lambda: 100.0)
+    assert first.observe([("p1", 3), ("p2", 5)]) == set()
+    assert first.known_ids("p1") is None
+    first.update("p1", ["c1", "c2", "c3"])
+    first.update("p2", ["d1"])
+    assert store.get_many(["p1"]) == {}  # nothing persisted before save()
+    assert first.save() == 2
+
+    second = CommentDelta(store, time_fn=lambda: 200.0)
+    assert second.observe([("p1", 3), ("p2", 6)]) == {"p1"}
+    assert second.skipped == 1
+    assert second.known_ids("p2") == frozenset({"d1"})
+    second.update("p2", ["d2"])
+    second.save()
+
+    state = store.get_many(["p2"])["p2"]
+    assert state.known_ids == frozenset({"d1", "d2"})
+    assert state.num_comments == 6 and state.fetched_at == 200.0
+
+
+def test_resumed_expansion_reads_state_it_did_not_observe(tmp_path) -> None:
+    store = SqliteCommentStateStore(tmp_path / "state.sqlite")
+    first = CommentDelta(store)
+    first.observe([("p1", 1)])
+    first.update("p1", ["c1"])
+    first.save()
+
+    resumed = CommentDelta(store)
+    assert resumed.known_ids("p1") == frozenset({"c1"})
+    resumed.update("p1", ["c2"])
+    resumed.save()
+    # Count unknown in this invocation: the next run refetches instead of skipping
+    assert CommentDelta(store).observe([("p1", 1)]) == set()
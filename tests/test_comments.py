@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+from urllib.parse import parse_qs
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from reddit_researcher.apis.reddit.comments import fetch_comments
+from reddit_researcher.apis.reddit.reddit_client import make_reddit
+from reddit_researcher.config.config import RedditConfig
+
+
+def _comment(cid: str) -> dict[str, Any]:
+    return {
+        "kind": "t1",
+        "data": {
+            "id": cid,
+            "name": f"t1_{cid}",
+            "link_id": "t3_p1",
+            "parent_id": "t3_p1",
+            "subreddit": "python",
+            "author": "bob",
+            "body": cid,
+            "created_utc": 1700000400.0,
+            "replies": "",
+        },
+    }
+
+
+def _more(mid: str, children: list[str]) -> dict[str, Any]:
+    return {
+        "kind": "more",
+        "data": {
+            "count": len(children),
+            "name": f"t1_{mid}",
+            "id": mid,
+            "parent_id": "t3_p1",
+            "depth": 0,
+            "children": children,
+        },
+    }
+
+
+class ThreeStubThread:
+    """A submission whose initial load holds three `more` stubs of one comment each."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+
+    def send(self, request: requests.PreparedRequest) -> requests.Response:
+        resp = requests.Response()
+        resp.url = request.url or ""
+        resp.request = request
+        resp.status_code = 200
+        resp._content_consumed = True
+        resp.headers["content-type"] = "application/json"
+        body: Any
+        if "/api/v1/access_token" in resp.url:
+            body = {"access_token": "t", "expires_in": 3600, "scope": "*"}
+        elif "/api/morechildren" in resp.url:
+            self.requests += 1
+            child = parse_qs(str(request.body))["children"][0]
+            body = {"json": {"errors": [], "data": {"things": [_comment(child)]}}}
+        else:
+            self.requests += 1
+            post = {"kind": "t3", "data": {"id": "p1", "name": "t3_p1", "subreddit": "python"}}
+            more = [_more(f"m{i}", [f"c{i}"]) for i in (2, 3, 4)]
+            body = [
+                {"kind": "Listing", "data": {"children": [post]}},
+                {"kind": "Listing", "data": {"children": [_comment("c1"), *more]}},
+            ]
+        resp._content = json.dumps(body).encode()
+        return resp
+
+
+class CountingLimiter:
+    def __init__(self) -> None:
+        self.tokens = 0
+
+    def acquire(self, cost: float = 1.0) -> None:
+        self.tokens += 1
+
+
+@pytest.mark.parametrize("limit", [0, 2, 32])
+def test_fetch_comments_takes_a_token_per_request(
+    monkeypatch: pytest.MonkeyPatch, limit: int
+) -> None:
+    server = ThreeStubThread()
+    monkeypatch.setattr(HTTPAdapter, "send", lambda _adapter, request, **_: server.send(request))
+    reddit = make_reddit(
+        RedditConfig(client_id="id", client_secret="sec", user_agent="test:probe:v0.1")
+    )
+    limiter = CountingLimiter()
+
+    comments = fetch_comments(
+        reddit,
+        "p1",
+        replace_more_limit=limit,
+        limiter=limiter,  # type: ignore[arg-type]
+    )
+
+    assert len(comments) == 1 + min(limit, 3)
+    assert server.requests == 1 + min(limit, 3)
+    # The OAuth token request is not paced
+    assert limiter.tokens == server.requests
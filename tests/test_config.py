@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from reddit_researcher.config.config import (
+    ProbeConfig,
+    RedditConfig,
+    TargetConfig,
+    load_config,
+    pool_credentials,
+    probe_targets,
+)
+
+
+def test_load_config_parses_targets(tmp_path) -> None:
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        """
+reddit: {client_id: id, client_secret: sec, user_agent: ua}
+probe:
+  listing: top
+  time_filter: week
+  targets:
+    - python
+    - {subreddit: datascience, listing: new}
+""",
+        encoding="utf-8",
+    )
+    cfg = load_config(path)
+    assert cfg.probe.targets == (
+        TargetConfig("python", "top", "week"),
+        TargetConfig("datascience", "new", "week"),
+    )
+
+
+def test_probe_targets_defaults_to_single_subreddit() -> None:
+    probe = ProbeConfig(subreddit="python", listing="hot", time_filter="day")
+    assert probe_targets(probe) == [TargetConfig("python", "hot", "day")]
+
+
+def test_load_config_parses_the_credential_pool(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("REDDIT_CLIENT_SECRET_2", "sec2")
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        """
+reddit: {client_id: id, client_secret: sec, user_agent: ua}
+reddit_pool:
+  credentials:
+    - {client_id: id2, client_secret: "${REDDIT_CLIENT_SECRET_2}"}
+    - {client_id: id3, client_secret: sec3, user_agent: ua3}
+  cooldown_sec: 60
+""",
+        encoding="utf-8",
+    )
+    cfg = load_config(path)
+    assert pool_credentials(cfg) == [
+        RedditConfig("id", "sec", "ua"),
+        RedditConfig("id2", "sec2", "ua"),
+        RedditConfig("id3", "sec3", "ua3"),
+    ]
+    assert cfg.reddit_pool.cooldown_sec == 60.0
+    assert cfg.reddit_pool.failure_threshold == 3
+
+
+def test_load_config_merges_cache_ttls_over_the_defaults(tmp_path) -> None:
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        """
+reddit: {client_id: id, client_secret: sec, user_agent: ua}
+http_cache:
+  enabled: 1
+  ttl_sec: {"/r/{sub}/new": 5, "/api/info": 30}
+""",
+        encoding="utf-8",
+    )
+    ttls = dict(load_config(path).http_cache.ttl_sec)
+    assert ttls["/r/{sub}/new"] == 5.0
+    assert ttls["/api/info"] == 30.0
+    assert ttls["/r/{sub}/top"] == 3600.0
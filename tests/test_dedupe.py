@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from reddit_researcher.apis.local.hashes import SqliteHashIndex
+from reddit_researcher.core.dedupe import ChangeDetectingSink
+from reddit_researcher.core.hashing import row_digest
+
+
+def test_row_digest_ignores_retrieved_at() -> None:
+    a = {"id": "p1", "score": 3, "retrieved_at": "2025-01-01T00:00:00Z"}
+    b = {"id": "p1", "score": 3, "retrieved_at": "2025-01-02T00:00:00Z"}
+    assert row_digest(a) == row_digest(b)
+    assert row_digest(a) != row_digest({**a, "score": 4})
+
+
+def test_change_detecting_sink_skips_unchanged_rows(tmp_path) -> None:
+    inner = MagicMock()
+    sink = ChangeDetectingSink(inner, SqliteHashIndex(tmp_path / "state.sqlite"))
+
+    sink.upsert_posts([{"id": "p1", "score": 1}, {"id": "p2", "score": 2}])
+    assert len(inner.upsert_posts.call_args.args[0]) == 2
+
+    inner.reset_mock()
+    sink.upsert_posts(
+        [{"id": "p1", "score": 1, "retrieved_at": "later"}, {"id": "p2", "score": 5}]
+    )
+    assert inner.upsert_posts.call_args.args[0] == [{"id": "p2", "score": 5}]
+
+    inner.reset_mock()
+    sink.upsert_posts([{"id": "p1", "score": 1}])
+    inner.upsert_posts.assert_not_called()
+    assert sink.rows_skipped == 2 and sink.rows_written == 3
+
+
+def test_change_detecting_sink_records_digests_only_after_success(tmp_path) -> None:
+    inner = MagicMock()
+    inner.upsert_comments.side_effect = [RuntimeError("down"), None]
+    sink = ChangeDetectingSink(inner, SqliteHashIndex(tmp_path / "state.sqlite"))
+    rows = [{"id": "c1", "body": "hi"}]
+    try:
+        sink.upsert_comments(rows)
+    except RuntimeError:
+        pass
+    sink.upsert_comments(rows)
+    assert inner.upsert_comments.call_count == 2
+
+
+def test_sqlite_hash_index_roundtrip(tmp_path) -> None:
+    index = SqliteHashIndex(tmp_path / "state.sqlite")
+    index.put_many("posts", {"p1": "aa", "p2": "bb"})
+    index.put_many("posts", {"p1": "cc"})
+    assert index.get_many("posts", ["p1", "p2", "p3"]) == {"p1": "cc", "p2": "bb"}
+    assert index.get_many("comments", ["p1"]) == {}
+
+
+def test_ingest_forwards_changed_rows_and_links_unchanged_ids(tmp_path) -> None:
+    inner = MagicMock()
+    sink = ChangeDetectingSink(inner, SqliteHashIndex(tmp_path / "state.sqlite"))
+    sink.ingest_comments("r1", [{"id": "c1", "score": 1}, {"id": "c2", "score": 2}])
+    inner.link_run_comments.assert_not_called()
+
+    sink.ingest_comments("r2", [{"id": "c1", "score": 1}, {"id": "c2", "score": 3}])
+    inner.ingest_comments.assert_called_with("r2", [{"id": "c2", "score": 3}])
+    inner.link_run_comments.assert_called_once_with("r2", ["c1"])
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import functools
+import json
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from reddit_researcher.apis.local.http_cache import SqliteResponseCache
+from reddit_researcher.apis.reddit.json_source import RedditJsonSourceAdapter
+from reddit_researcher.apis.reddit.reddit_client import make_json_session
+from reddit_researcher.core.ratelimit import RateLimiter
+from reddit_researcher.core.response_cache import CachedResponse, CachePolicy, cache_key
+from reddit_researcher.core.telemetry import TelemetryRecorder
+
+FIXTURES = Path(__file__).parent / "fixtures" / "reddit"
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _entry(body: bytes, expires_at: float = 2000.0) -> CachedResponse:
+    return CachedResponse(200, {"etag": '"v1"'}, body, stored_at=1000.0, expires_at=expires_at)
+
+
+def test_cache_key_ignores_query_order() -> None:
+    assert cache_key("get", "https://x/r/a/hot?limit=100&after=t3_1") == cache_key(
+        "GET", "https://x/r/a/hot?after=t3_1&limit=100"
+    )
+
+
+def test_store_round_trips_and_evicts_least_recently_used(tmp_path: Path) -> None:
+    clock = _Clock()
+    cache = SqliteResponseCache(tmp_path / "c.sqlite", max_bytes=2500, time_fn=clock)
+    for key in ("a", "b", "c"):
+        clock.now += 1
+        cache.put(key, _entry(os.urandom(1000)))  # incompressible: ~1000 bytes each
+    assert cache.get("a") is None and cache.evictions == 1
+
+    clock.now += 1
+    assert cache.get("b") is not None  # b is now more recent than c
+    cache.put("d", _entry(os.urandom(1000)))
+    assert cache.get("c") is None and cache.get("b") is not None
+
+    cache.refresh("b", 5000.0)
+    reopened = SqliteResponseCache(tmp_path / "c.sqlite", max_bytes=2500, time_fn=clock)
+    b = reopened.get("b")
+    assert b is not None and b.expires_at == 5000.0 and b.validators == {"If-None-Match": '"v1"'}
+
+
+class RecordedReddit:
+    """Answers `requests` sends with the recorded fixtures; honours If-None-Match."""
+
+    def __init__(self) -> None:
+        self.calls: list[requests.PreparedRequest] = []
+        self.tokens = 0
+
+    def send(self, request: requests.PreparedRequest) -> requests.Response:
+        resp = requests.Response()
+        resp.url = request.url or ""
+        resp.request = request
+        resp._content_consumed = True
+        resp.headers["content-type"] = "application/json"
+        if "/api/v1/access_token" in resp.url:
+            self.tokens += 1
+            body: Any = {"access_token": "t", "expires_in": 3600, "scope": "*"}
+        else:
+            self.calls.append(request)
+            resp.headers.update(
+                {"x-ratelimit-remaining": "99", "x-ratelimit-used": "1", "x-ratelimit-reset": "60"}
+            )
+            resp.headers["etag"] = '"listing"'
+            if request.headers.get("If-None-Match") == '"listing"':
+                resp.status_code = 304
+                resp._content = b""
+                return resp
+            page = "listing_hot_page2.json" if "after=" in resp.url else "listing_hot_page1.json"
+            body = json.loads((FIXTURES / page).read_text(encoding="utf-8"))
+        resp.status_code = 200
+        resp._content = json.dumps(body).encode()
+        return resp
+
+
+class CountingLimiter:
+    def __init__(self) -> None:
+        self.tokens = 0
+
+    def acquire(self, cost: float = 1.0) -> None:
+        self.tokens += 1
+
+
+def _source(
+    cache: SqliteResponseCache,
+    telem: TelemetryRecorder | None = None,
+    limiter: CountingLimiter | None = None,
+) -> RedditJsonSourceAdapter:
+    cfg = SimpleNamespace(
+        reddit=SimpleNamespace(client_id="id", client_secret="sec", user_agent="test:probe:v0.1"),
+        probe=SimpleNamespace(raw_json=1),
+    )
+    return RedditJsonSourceAdapter(
+        cfg,  # type: ignore[arg-type]
+        limiter=limiter or RateLimiter(6000, burst_tokens=10),  # type: ignore[arg-type]
+        telemetry=telem,
+        make_session=functools.partial(make_json_session, cache=cache),
+    )
+
+
+def _ids(source: RedditJsonSourceAdapter) -> list[str]:
+    return [p["id"] for p in source.iter_posts("python", "hot", "day", limit=10)]
+
+
+@pytest.fixture
+def server(monkeypatch: pytest.MonkeyPatch) -> RecordedReddit:
+    server = RecordedReddit()
+    monkeypatch.setattr(HTTPAdapter, "send", lambda _adapter, request, **_: server.send(request))
+    return server
+
+
+def test_repeats_within_the_ttl_send_no_request(server: RecordedReddit, tmp_path: Path) -> None:
+    cache = SqliteResponseCache(tmp_path / "c.sqlite")
+    limiter = CountingLimiter()
+    assert _ids(_source(cache, limiter=limiter)) == ["p1", "p2", "p3"]
+    # One token per listing page sent; the OAuth token request is not paced
+    assert len(server.calls) == limiter.tokens == 2
+
+    telem = TelemetryRecorder()
+    limiter = CountingLimiter()
+    assert _ids(_source(cache, telem, limiter)) == ["p1", "p2", "p3"]
+    assert len(server.calls) == 2
+    # Cache hits never reach the paced transport
+    assert limiter.tokens == 0
+    endpoints = telem.summary()["endpoints"]
+    assert endpoints["cache:/r/{sub}/hot"]["count"] == 2
+    # The new session still fetched its own token
+    assert [n for n in endpoints if n.startswith("reddit:")] == ["reddit:/api/v1/access_token"]
+
+
+def test_stale_entries_are_revalidated_with_their_etag(
+    server: RecordedReddit, tmp_path: Path
+) -> None:
+    policy = CachePolicy(ttl_sec=(("/r/{sub}/hot", 0.0),))
+    cache = SqliteResponseCache(tmp_path / "c.sqlite", policy=policy)
+    cache.put(
+        cache_key("GET", "https://oauth.reddit.com/r/python/hot?limit=10&raw_json=1"),
+        CachedResponse(
+            200,
+            {"etag": '"listing"'},
+            (FIXTURES / "listing_hot_page2.json").read_bytes(),
+            stored_at=0.0,
+            expires_at=0.0,
+        ),
+    )
+    telem = TelemetryRecorder()
+    assert _ids(_source(cache, telem)) == ["p3"]
+    assert server.calls[0].headers["If-None-Match"] == '"listing"'
+    # A 304 is a real request: it costs quota and reports its rate-limit headers
+    assert telem.summary()["endpoints"]["reddit:/r/{sub}/hot"]["count"] == 1
+
+
+def test_replay_serves_cached_responses_offline(server: RecordedReddit, tmp_path: Path) -> None:
+    path = tmp_path / "c.sqlite"
+    assert _ids(_source(SqliteResponseCache(path))) == ["p1", "p2", "p3"]
+    server.calls.clear()
+    server.tokens = 0
+
+    replay = SqliteResponseCache(path, policy=CachePolicy(default_ttl_sec=0, replay=True))
+    assert _ids(_source(replay)) == ["p1", "p2", "p3"]
+    assert server.calls == [] and server.tokens == 0
+
+    with pytest.raises(Exception, match="not in the response cache"):
+        _ids(_source(SqliteResponseCache(tmp_path / "empty.sqlite", policy=replay.policy)))
+    assert server.calls == []
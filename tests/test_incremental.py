@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from reddit_researcher.apis.local.cursors import SqliteCursorStore
+from reddit_researcher.core.incremental import (
+    Cursor,
+    CursorKey,
+    CursorTracker,
+    applies_to,
+    skip_seen,
+)
+
+
+def _post(pid: str, created: float) -> SimpleNamespace:
+    return SimpleNamespace(id=pid, name=f"t3_{pid}", created_utc=created)
+
+
+def test_skip_seen_stops_at_the_first_seen_item() -> None:
+    items = [_post("c", 300), _post("b", 200), _post("a", 100), _post("z", 400)]
+    cursor = Cursor(created_utc=200, fullname="t3_b")
+    kept = [p.id for p in skip_seen(items, cursor)]
+    assert kept == ["c"]
+
+
+def test_skip_seen_without_cursor_passes_everything() -> None:
+    items = [_post("a", 100)]
+    assert list(skip_seen(items, None)) == items
+
+
+def test_cursor_applies_only_to_time_ordered_listings() -> None:
+    assert applies_to("new")
+    assert not applies_to("hot")
+    assert not applies_to("top")
+
+
+def test_tracker_keeps_newest_position() -> None:
+    tracker = CursorTracker(Cursor(created_utc=150, fullname="t3_x"))
+    for p in [_post("a", 100), _post("c", 300), _post("b", 200)]:
+        tracker.observe(p)
+    assert tracker.cursor == Cursor(created_utc=300, fullname="t3_c")
+    assert tracker.advanced
+
+
+def test_sqlite_cursor_store_roundtrip(tmp_path) -> None:
+    store = SqliteCursorStore(tmp_path / "state.sqlite")
+    key = CursorKey("python", "new", "day")
+    assert store.load(key) is None
+    store.save(key, Cursor(created_utc=1.0, fullname="t3_a"))
+    store.save(key, Cursor(created_utc=2.0, fullname="t3_b"))
+    assert store.load(key) == Cursor(created_utc=2.0, fullname="t3_b")
+    assert store.load(CursorKey("python", "hot", "day")) is None
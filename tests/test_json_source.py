@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+from reddit_researcher.apis.reddit.json_source import RedditJsonSourceAdapter
+from reddit_researcher.core.incremental import Cursor
+from reddit_researcher.core.normalizers import normalize_comment, normalize_post
+from reddit_researcher.core.retry import RetryPolicy
+
+FIXTURES = Path(__file__).parent / "fixtures" / "reddit"
+
+
+def _load(name: str) -> object:
+    return json.loads((FIXTURES / name).read_text(encoding="utf-8"))
+
+
+class RecordedSession:
+    """Replays recorded Reddit JSON responses keyed by path (and `after` for listings)."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, dict[str, object]]] = []
+
+    def request(self, *, method: str, path: str, params: dict[str, object]) -> object:
+        self.calls.append((path, params))
+        if path in {"/r/python/hot", "/r/python/new"}:
+            page = "listing_hot_page2.json" if params.get("after") else "listing_hot_page1.json"
+            return _load(page)
+        if path == "/comments/p1":
+            return _load("comments_p1.json")
+        if path == "/api/morechildren":
+            return _load("morechildren_p1.json")
+        raise AssertionError(f"unexpected request {path}")
+
+
+def _adapter(session: RecordedSession) -> RedditJsonSourceAdapter:
+    cfg = SimpleNamespace(probe=SimpleNamespace(raw_json=1))
+    return RedditJsonSourceAdapter(cfg, session=session)  # type: ignore[arg-type]
+
+
+def test_iter_posts_paginates_with_after_and_raw_json() -> None:
+    session = RecordedSession()
+    posts = list(_adapter(session).iter_posts("python", "hot", "day", limit=10))
+    assert [p["id"] for p in posts] == ["p1", "p2", "p3"]
+    assert session.calls[0][1] == {"limit": 10, "raw_json": 1}
+    assert session.calls[1][1]["after"] == "t3_p2"
+
+
+def test_iter_posts_continues_after_a_given_post() -> None:
+    session = RecordedSession()
+    posts = list(_adapter(session).iter_posts("python", "hot", "day", limit=10, after="t3_p2"))
+    assert [p["id"] for p in posts] == ["p3"]
+    assert session.calls[0][1]["after"] == "t3_p2"
+
+
+def test_iter_posts_respects_limit_and_cursor() -> None:
+    session = RecordedSession()
+    adapter = _adapter(session)
+    assert [p["id"] for p in adapter.iter_posts("python", "hot", "day", limit=1)] == ["p1"]
+    assert len(session.calls) == 1
+    since = Cursor(created_utc=1700000200.0, fullname="t3_p2")
+    kept = [p["id"] for p in adapter.iter_posts("python", "new", "day", limit=10, since=since)]
+    assert kept == ["p1"]
+    # Ranked listings ignore the cursor: older posts can rise into them
+    ranked = [p["id"] for p in adapter.iter_posts("python", "hot", "day", limit=10, since=since)]
+    assert ranked == ["p1", "p2", "p3"]
+
+
+def test_fetch_comments_flattens_tree_and_expands_more() -> None:
+    session = RecordedSession()
+    adapter = _adapter(session)
+    assert [c["id"] for c in adapter.fetch_comments("p1", replace_more_limit=0)] == [
+        "c1",
+        "c2",
+        "c1a",
+    ]
+    comments = adapter.fetch_comments("p1", replace_more_limit=5)
+    assert [c["id"] for c in comments] == ["c1", "c2", "c1a", "c3", "c4"]
+    more_call = session.calls[-1]
+    assert more_call[0] == "/api/morechildren"
+    assert more_call[1]["children"] == "c3,c4" and more_call[1]["link_id"] == "t3_p1"
+    assert all("replies" not in c for c in comments)
+
+
+def test_normalizers_accept_raw_json() -> None:
+    post = _load("listing_hot_page1.json")["data"]["children"][0]["data"]  # type: ignore[index]
+    row = normalize_post(post)
+    assert row["id"] == "p1" and row["subreddit"] == "python" and row["author"] == "alice"
+    assert row["created_utc"] == "2023-11-14T22:18:20Z"
+    comment = _load("comments_p1.json")[1]["data"]["children"][1]["data"]  # type: ignore[index]
+    crow = normalize_comment(comment, link_id="p1")
+    assert crow["id"] == "c2" and crow["link_id"] == "p1" and crow["author"] == "bob"
+
+
+def test_fetch_comments_packs_children_across_stubs() -> None:
+    session = RecordedSession()
+    tree = _load("comments_p1.json")
+    children = tree[1]["data"]["children"]  # type: ignore[index]
+    children.append(
+        {"kind": "more", "data": {"count": 1, "id": "m2", "children": ["c5"], "parent_id": "t1_c1"}}
+    )
+    session.request = lambda *, method, path, params: (  # type: ignore[method-assign]
+        session.calls.append((path, params)) or (tree if path == "/comments/p1" else {"json": {}})
+    )
+    _adapter(session).fetch_comments("p1", replace_more_limit=5)
+    more_calls = [params for path, params in session.calls if path == "/api/morechildren"]
+    assert [c["children"] for c in more_calls] == ["c3,c4,c5"]
+
+
+def test_fetch_comments_delta_sorts_new_and_skips_known_children() -> None:
+    session = RecordedSession()
+    _adapter(session).fetch_comments("p1", replace_more_limit=5, known_ids={"c3"})
+    assert session.calls[0] == ("/comments/p1", {"sort": "new", "raw_json": 1})
+    assert session.calls[1][1]["children"] == "c4"
+
+    session = RecordedSession()
+    _adapter(session).fetch_comments("p1", replace_more_limit=5, known_ids={"c3", "c4"})
+    assert [path for path, _ in session.calls] == ["/comments/p1"]  # nothing new to expand
+
+
+class FailingSession(RecordedSession):
+    """`RecordedSession` whose morechildren requests fail with the given statuses first."""
+
+    def __init__(self, *statuses: int) -> None:
+        super().__init__()
+        self._statuses = list(statuses)
+
+    def request(self, *, method: str, path: str, params: dict[str, object]) -> object:
+        if path == "/api/morechildren" and self._statuses:
+            self.calls.append((path, params))
+            err = RuntimeError("HTTP error")
+            err.response = SimpleNamespace(status_code=self._statuses.pop(0), headers={})  # type: ignore[attr-defined]
+            raise err
+        return super().request(method=method, path=path, params=params)
+
+
+def test_fetch_comments_retries_requests_not_the_whole_expansion() -> None:
+    cfg = SimpleNamespace(probe=SimpleNamespace(raw_json=1))
+    retry = RetryPolicy(max_attempts=3, sleep_fn=lambda _s: None)
+
+    session = FailingSession(503)
+    adapter = RedditJsonSourceAdapter(cfg, session=session, retry=retry)  # type: ignore[arg-type]
+    comments = adapter.fetch_comments("p1", replace_more_limit=5)
+    assert [c["id"] for c in comments] == ["c1", "c2", "c1a", "c3", "c4"]
+    assert [path for path, _ in session.calls].count("/comments/p1") == 1
+
+    # A deleted thread's expansion is not retried; the loaded comments are kept
+    session = FailingSession(404)
+    adapter = RedditJsonSourceAdapter(cfg, session=session, retry=retry)  # type: ignore[arg-type]
+    comments = adapter.fetch_comments("p1", replace_more_limit=5)
+    assert [c["id"] for c in comments] == ["c1", "c2", "c1a"]
+    assert len(session.calls) == 2
@@ -1,8 +1,16 @@
 from __future__ import annotations
 
+import json
+from typing import Any
 from unittest.mock import MagicMock
 
-from reddit_researcher.apis.reddit.listings import iter_hot, iter_top
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from reddit_researcher.apis.reddit.adapter import RedditSourceAdapter
+from reddit_researcher.apis.reddit.listings import iter_hot, iter_new, iter_top
+from reddit_researcher.config.config import AppConfig, ProbeConfig, RedditConfig
 
 
 def test_iter_hot_calls_praw() -> None:
@@ -21,3 +29,65 @@ def test_iter_top_calls_praw() -> None:
     reddit.subreddit.assert_called_once_with("all")
 
 
+def test_iter_new_calls_praw() -> None:
+    reddit = MagicMock()
+    reddit.subreddit.return_value.new.return_value = ["n"]
+    items = list(iter_new(reddit, "python", limit=1))
+    assert items == ["n"]
+    reddit.subreddit.return_value.new.assert_called_once_with(limit=1)
+
+
+class TwoPageListing:
+    """`/r/python/new` as two pages of 100 and 50 posts."""
+
+    def __init__(self) -> None:
+        self.pages = 0
+
+    def send(self, request: requests.PreparedRequest) -> requests.Response:
+        resp = requests.Response()
+        resp.url = request.url or ""
+        resp.request = request
+        resp.status_code = 200
+        resp._content_consumed = True
+        resp.headers["content-type"] = "application/json"
+        body: Any
+        if "/api/v1/access_token" in resp.url:
+            body = {"access_token": "t", "expires_in": 3600, "scope": "*"}
+        else:
+            first = "after" not in resp.url
+            self.pages += 1
+            ids = range(100) if first else range(100, 150)
+            children = [
+                {"kind": "t3", "data": {"id": f"p{i}", "name": f"t3_p{i}", "subreddit": "python"}}
+                for i in ids
+            ]
+            body = {
+                "kind": "Listing",
+                "data": {"children": children, "after": "t3_p99" if first else None},
+            }
+        resp._content = json.dumps(body).encode()
+        return resp
+
+
+class CountingLimiter:
+    def __init__(self) -> None:
+        self.tokens = 0
+
+    def acquire(self, cost: float = 1.0) -> None:
+        self.tokens += 1
+
+
+def test_adapter_takes_a_token_per_listing_page(monkeypatch: pytest.MonkeyPatch) -> None:
+    server = TwoPageListing()
+    monkeypatch.setattr(HTTPAdapter, "send", lambda _adapter, request, **_: server.send(request))
+    cfg = AppConfig(
+        reddit=RedditConfig(client_id="id", client_secret="sec", user_agent="test:probe:v0.1"),
+        probe=ProbeConfig(),
+    )
+    limiter = CountingLimiter()
+    adapter = RedditSourceAdapter(cfg, limiter=limiter)  # type: ignore[arg-type]
+
+    posts = list(adapter.iter_posts("python", "new", "day", limit=150))
+
+    assert len(posts) == 150
+    assert limiter.tokens == server.pages == 2
@@ -2,7 +2,12 @@ from __future__ import annotations
 
 from types import SimpleNamespace
 
-from reddit_researcher.core.normalizers import normalize_comment, normalize_post
+from reddit_researcher.core.normalizers import (
+    comment_records,
+    normalize_comment,
+    normalize_post,
+    post_records,
+)
 
 
 def test_normalize_post_basic() -> None:
@@ -52,3 +57,22 @@ def test_normalize_comment_basic() -> None:
     assert rec["created_utc"].endswith("Z")
 
 
+
+
+def test_batch_normalization_stamps_one_retrieved_at() -> None:
+    items = [
+        {"id": "c1", "created_utc": 1_700_000_000.0, "body": "a"},
+        {"id": "c2", "created_utc": "1700000061", "body": "b"},
+        {"id": "c3", "created_utc": None, "body": "c"},
+    ]
+    recs = comment_records(items, link_id="p1")
+    assert {r.retrieved_at for r in recs} == {recs[0].retrieved_at}
+    assert [r.link_id for r in recs] == ["p1", "p1", "p1"]
+    assert [r.as_row()["created_utc"] for r in recs] == [
+        "2023-11-14T22:13:20Z",
+        "2023-11-14T22:14:21Z",
+        None,
+    ]
+
+    posts = post_records([{"id": "a", "num_comments": 3}, {"id": "b", "num_comments": 0}])
+    assert posts[0].retrieved_at == posts[1].retrieved_at
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from reddit_researcher.core.fanout import FanOutSink
+from reddit_researcher.core.normalizers import post_records
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from reddit_researcher.apis.local.parquet import ParquetSink  # noqa: E402
+from reddit_researcher.core.records import PostRecord, RecordBatch  # noqa: E402
+
+
+def _post(pid: str, subreddit: str) -> dict:
+    return {
+        "id": pid,
+        "subreddit": subreddit,
+        "title": "t",
+        "created_utc": 1_700_000_000.0,
+        "score": 3,
+        "num_comments": 1,
+        "over_18": False,
+        "upvote_ratio": 1,
+    }
+
+
+def test_posts_are_partitioned_by_subreddit_and_day(tmp_path) -> None:
+    batch = RecordBatch(PostRecord)
+    for rec in post_records([_post("p1", "python"), _post("p2", "python"), _post("p3", "rust")]):
+        batch.append(rec)
+    day = next(iter(batch))["retrieved_at"][:10]
+
+    sink = ParquetSink(tmp_path, row_group_rows=1)
+    sink.ingest_posts("r1", batch)
+    assert not list(tmp_path.rglob("*.parquet"))  # nothing published before close()
+    sink.close()
+
+    files = sorted(p.relative_to(tmp_path).parent.as_posix() for p in sink.files_written)
+    assert files == [f"posts/subreddit=python/date={day}", f"posts/subreddit=rust/date={day}"]
+    python_file = next(p for p in sink.files_written if "python" in str(p))
+    assert pq.ParquetFile(python_file).num_row_groups == 2
+    table = pq.read_table(python_file)
+    assert table.column("run_id").to_pylist() == ["r1", "r1"]
+    created = table.schema.field("created_utc").type
+    assert pa.types.is_timestamp(created) and created.tz == "UTC"
+    assert table.column("upvote_ratio").to_pylist() == [1.0, 1.0]
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_run_row_and_links_are_exported(tmp_path) -> None:
+    sink = ParquetSink(tmp_path, compression="snappy")
+    sink.upsert_run({"run_id": "r1", "started_at": 0.0, "targets": [{"subreddit": "a"}]})
+    sink.link_run_comments("r1", iter(["c1", "c2"]))
+    sink.close()
+
+    runs = pq.read_table(tmp_path / "runs" / "date=1970-01-01")
+    assert runs.column("targets").to_pylist() == ['[{"subreddit": "a"}]']
+    (links,) = (tmp_path / "runs_comments").rglob("*.parquet")
+    assert pq.read_table(links).column("comment_id").to_pylist() == ["c1", "c2"]
+
+
+def test_fan_out_sink_gives_each_sink_the_same_rows() -> None:
+    first, second = MagicMock(), MagicMock()
+    FanOutSink([first, second]).ingest_comments("r1", (row for row in [{"id": "c1"}]))
+    first.ingest_comments.assert_called_once_with("r1", [{"id": "c1"}])
+    second.ingest_comments.assert_called_once_with("r1", [{"id": "c1"}])
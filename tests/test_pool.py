@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from reddit_researcher.config.config import AppConfig, ProbeConfig, RedditConfig, RedditPoolConfig
+from reddit_researcher.core.orchestrator import _make_source
+from reddit_researcher.core.pool import (
+    CredentialPool,
+    CredentialsExhausted,
+    PooledRedditSource,
+)
+from reddit_researcher.core.ratelimit import RateLimiter
+from reddit_researcher.core.telemetry import TelemetryRecorder
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _quota(remaining: int, reset: int = 300) -> dict[str, str]:
+    return {"x-ratelimit-remaining": str(remaining), "x-ratelimit-reset": str(reset)}
+
+
+def _pool(n: int, clock: _Clock, **kwargs: Any) -> CredentialPool:
+    pool = CredentialPool(time_fn=clock, **kwargs)
+    for i in range(n):
+        pool.add(f"app{i}", RateLimiter(600, burst_tokens=10, time_fn=clock))
+    return pool
+
+
+def test_routes_to_the_member_with_most_quota_left() -> None:
+    clock = _Clock()
+    pool = _pool(3, clock)
+    a, b, c = pool.members
+    a.observe(_quota(40), 200)
+    b.observe(_quota(90), 200)
+    c.observe(_quota(10), 200)
+    assert pool.acquire() is b
+
+    # b's call is in flight; a window that has reset counts as full again
+    assert b.budget(clock.now) == 89
+    clock.now += 301
+    assert c.budget(clock.now) == float("inf")
+
+
+def test_unreported_members_share_calls_by_limiter_tokens() -> None:
+    clock = _Clock()
+    pool = _pool(2, clock)
+    picked = []
+    for _ in range(4):
+        member = pool.acquire()
+        member.limiter.reserve()
+        pool.release(member)
+        picked.append(member.name)
+    assert sorted(picked) == ["app0", "app0", "app1", "app1"]
+
+
+def test_repeated_failures_bench_a_member_for_the_cooldown() -> None:
+    clock = _Clock()
+    pool = _pool(2, clock, failure_threshold=2, cooldown_sec=60)
+    bad, good = pool.members
+    bad.observe({}, 429)
+    bad.observe({}, 200)  # a success resets the streak
+    bad.observe({}, 401)
+    assert not bad.benched()
+    bad.observe({}, 429)
+    assert bad.benched() and bad.times_benched == 1
+
+    assert {pool.acquire().name for _ in range(3)} == {"app1"}
+    good.observe({}, 401)
+    good.observe({}, 401)
+    with pytest.raises(CredentialsExhausted) as exc:
+        pool.acquire()
+    assert exc.value.retry_in == 60
+
+    clock.now += 61
+    assert pool.acquire() in (bad, good)
+
+
+class _Source:
+    def __init__(self, member: Any = None, status: int | None = None) -> None:
+        self.member = member
+        self.status = status
+        self.calls = 0
+
+    def iter_posts(self, subreddit, listing, time_filter, limit, *, since=None):
+        self.calls += 1
+        yield {"id": "p1"}
+
+    def fetch_comments(self, submission_id, replace_more_limit):
+        self.calls += 1
+        if self.status is not None:
+            for _ in range(2):
+                self.member.observe({}, self.status)
+            raise RuntimeError(f"HTTP {self.status}")
+        return [{"id": f"{submission_id}c"}]
+
+
+def test_fetch_moves_to_another_member_when_its_app_is_benched() -> None:
+    clock = _Clock()
+    pool = _pool(2, clock, failure_threshold=2)
+    a, b = pool.members
+    a.source = _Source(a, status=401)
+    b.source = _Source()
+    a.observe(_quota(100), 200)  # a looks best, then fails
+    b.observe(_quota(50), 200)
+
+    source = PooledRedditSource(pool)
+    assert source.fetch_comments("p1", 1) == [{"id": "p1c"}]
+    assert a.benched() and (a.source.calls, b.source.calls) == (1, 1)
+    assert a.in_flight == b.in_flight == 0
+
+    assert [p["id"] for p in source.iter_posts("python", "hot", "day", 10)] == ["p1"]
+    assert b.source.calls == 2 and b.in_flight == 0
+
+
+def test_other_errors_are_not_retried_on_another_member() -> None:
+    clock = _Clock()
+    pool = _pool(2, clock)
+    for m in pool.members:
+        m.source = _Source(m, status=404)
+    with pytest.raises(RuntimeError):
+        PooledRedditSource(pool).fetch_comments("gone", 1)
+    assert sum(m.source.calls for m in pool.members) == 1  # type: ignore[union-attr]
+
+
+def test_make_source_builds_one_watched_client_per_app() -> None:
+    cfg = AppConfig(
+        reddit=RedditConfig("id1", "s1", "ua"),
+        probe=ProbeConfig(qpm_cap=60),
+        reddit_pool=RedditPoolConfig(
+            credentials=(RedditConfig("id2", "s2", "ua"),), failure_threshold=1
+        ),
+    )
+    hooks: dict[str, Any] = {}
+
+    class _Warm:
+        def reddit(self, app_cfg: Any, *, on_response: Any = None) -> object:
+            hooks[app_cfg.reddit.client_id] = on_response
+            return object()
+
+    source = _make_source(cfg, RateLimiter(60), TelemetryRecorder(), _Warm())  # type: ignore[arg-type]
+    assert isinstance(source, PooledRedditSource)
+    assert [m.name for m in source.pool.members] == ["id1", "id2"]
+    assert sorted(hooks) == ["id1", "id2"]
+
+    hooks["id2"]("/comments/{id}", {}, 0.1, 429, 0)
+    assert source.pool.members[1].benched() and not source.pool.members[0].benched()
+    assert source.pool.qpm == 120
@@ -5,51 +5,366 @@ from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import patch
 
+import pytest
+
+from reddit_researcher.config.config import TargetConfig
 from reddit_researcher.core.orchestrator import main
 
 
-@patch("reddit_researcher.apis.reddit.adapter.RedditSourceAdapter.fetch_comments")
-@patch("reddit_researcher.apis.reddit.adapter.RedditSourceAdapter.iter_posts")
-@patch("reddit_researcher.core.orchestrator.load_config")
-def test_probe_smoke(mock_load_cfg, mock_iter_hot, mock_fetch_comments, tmp_path) -> None:
-    cfg = SimpleNamespace(
+def _make_cfg(
+    *,
+    stream: bool = False,
+    supabase_enabled: bool = False,
+    state_path: str = "",
+    targets: tuple[TargetConfig, ...] = (),
+    comment_request_budget: int = 0,
+    checkpoint: bool = False,
+    spool_dir: str = "",
+    parquet_dir: str = "",
+    run_telemetry: bool = False,
+    comment_delta: bool = False,
+    comment_sampling: str = "top",
+    comment_sample: int = 2,
+) -> SimpleNamespace:
+    return SimpleNamespace(
         reddit=SimpleNamespace(client_id="id", client_secret="sec", user_agent="ua"),
+        reddit_pool=SimpleNamespace(credentials=(), failure_threshold=3, cooldown_sec=300.0),
+        http_cache=SimpleNamespace(enabled=False),
+        retry=SimpleNamespace(
+            max_attempts=4,
+            backoff_base_sec=0.5,
+            backoff_max_sec=60.0,
+            breaker_failures=8,
+            breaker_cooldown_sec=60.0,
+        ),
         probe=SimpleNamespace(
             subreddit="all",
             listing="hot",
             time_filter="day",
             post_limit=2,
-            comment_sample=1,
+            comment_sample=comment_sample,
             comment_replace_more_limit=1,
+            comment_concurrency=2,
+            comment_request_budget=comment_request_budget,
+            comment_sampling=comment_sampling,
             qpm_cap=100,
+            adaptive_ratelimit=True,
+            adaptive_max_qpm=300,
             max_runtime_sec=60,
+            deadline_margin_sec=0.0,
             raw_json=1,
+            source="praw",
+            stream=stream,
+            stream_batch_size=1,
+            stream_flush_sec=2.0,
+            incremental=bool(state_path),
+            cursor_store="sqlite",
+            state_path=state_path,
+            change_detection=False,
+            hash_index="sqlite",
+            checkpoint=checkpoint,
+            checkpoint_store="sqlite",
+            spool=bool(spool_dir),
+            spool_dir=spool_dir,
+            run_telemetry=run_telemetry,
+            comment_delta=comment_delta,
+            comment_state_store="sqlite",
+            targets=targets,
+            target_concurrency=2,
+        ),
+        supabase=SimpleNamespace(
+            enabled=supabase_enabled,
+            url="https://example.supabase.co" if supabase_enabled else "",
+            key="key" if supabase_enabled else "",
+            schema="public",
+        ),
+        postgres=SimpleNamespace(enabled=False, dsn="", schema="public"),
+        parquet=SimpleNamespace(
+            enabled=bool(parquet_dir),
+            dir=parquet_dir or "",
+            row_group_rows=50_000,
+            compression="zstd",
         ),
-        supabase=SimpleNamespace(enabled=False, url="", key="", schema="public"),
     )
-    mock_load_cfg.return_value = cfg
-
-    posts = [
-        SimpleNamespace(id="p1", num_comments=10, subreddit=SimpleNamespace(display_name="all")),
-        SimpleNamespace(id="p2", num_comments=5, subreddit=SimpleNamespace(display_name="all")),
-    ]
-    mock_iter_hot.return_value = posts
-    mock_fetch_comments.return_value = [
-        SimpleNamespace(
-            id="c1",
-            link_id="t3_p1",
-            parent_id="t3_p1",
-            subreddit="all",
-            author=SimpleNamespace(name="u"),
-            body="b",
-            created_utc=0,
-            score=1,
-            depth=0,
-        )
-    ]
+
+
+POSTS = [
+    SimpleNamespace(
+        id="p1",
+        name="t3_p1",
+        num_comments=10,
+        created_utc=200,
+        subreddit=SimpleNamespace(display_name="all"),
+    ),
+    SimpleNamespace(
+        id="p2",
+        name="t3_p2",
+        num_comments=5,
+        created_utc=100,
+        subreddit=SimpleNamespace(display_name="all"),
+    ),
+]
+
+COMMENTS = [
+    SimpleNamespace(
+        id="c1",
+        link_id="t3_p1",
+        parent_id="t3_p1",
+        subreddit="all",
+        author=SimpleNamespace(name="u"),
+        body="b",
+        created_utc=0,
+        score=1,
+        depth=0,
+    )
+]
+
+
+@patch("reddit_researcher.apis.reddit.adapter.RedditSourceAdapter.fetch_comments")
+@patch("reddit_researcher.apis.reddit.adapter.RedditSourceAdapter.iter_posts")
+@patch("reddit_researcher.core.orchestrator.load_config")
+def test_probe_smoke(mock_load_cfg, mock_iter_hot, mock_fetch_comments, tmp_path) -> None:
+    mock_load_cfg.return_value = _make_cfg()
+    mock_iter_hot.return_value = POSTS
+    mock_fetch_comments.return_value = COMMENTS
 
     assert main([]) == 0
 
     # Verify core result printed JSON summary via return code; no local files expected
 
 
+@patch("reddit_researcher.core.orchestrator.SupabaseSinkAdapter")
+@patch("reddit_researcher.apis.reddit.adapter.RedditSourceAdapter.fetch_comments")
+@patch("reddit_researcher.apis.reddit.adapter.RedditSourceAdapter.iter_posts")
+@patch("reddit_researcher.core.orchestrator.load_config")
+def test_probe_streaming_flushes_through_sink(
+    mock_load_cfg, mock_iter_hot, mock_fetch_comments, mock_sink_cls, capsys
+) -> None:
+    mock_load_cfg.return_value = _make_cfg(stream=True, supabase_enabled=True)
+    mock_iter_hot.return_value = POSTS
+    mock_fetch_comments.return_value = COMMENTS
+
+    assert main([]) == 0
+
+    sink = mock_sink_cls.return_value
+    streamed_posts = [r for call in sink.ingest_posts.call_args_list for r in call.args[1]]
+    assert sorted(r["id"] for r in streamed_posts) == ["p1", "p2"]
+    assert sink.ingest_comments.call_count == 2
+    sink.upsert_run.assert_called_once()
+    out = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    assert out["posts"] == 2 and out["comments"] == 2
+
+
+@pytest.mark.parametrize("stream", [False, True])
+@patch("reddit_researcher.core.orchestrator.SupabaseSinkAdapter")
+@patch("reddit_researcher.apis.reddit.adapter.RedditSourceAdapter.fetch_comments")
+@patch("reddit_researcher.apis.reddit.adapter.RedditSourceAdapter.iter_posts")
+@patch("reddit_researcher.core.orchestrator.load_config")
+def test_probe_without_a_comment_sample_still_writes_posts(
+    mock_load_cfg, mock_iter_hot, mock_fetch_comments, mock_sink_cls, capsys, stream
+) -> None:
+    mock_load_cfg.return_value = _make_cfg(stream=stream, supabase_enabled=True, comment_sample=0)
+    mock_iter_hot.return_value = POSTS
+
+    assert main([]) == 0
+
+    sink = mock_sink_cls.return_value
+    written = [r for call in sink.ingest_posts.call_args_list for r in call.args[1]]
+    assert sorted(r["id"] for r in written) == ["p1", "p2"]
+    mock_fetch_comments.assert_not_called()
+    out = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    assert out["posts"] == 2 and out["comments"] == 0
+
+
+@patch("reddit_researcher.apis.reddit.adapter.RedditSourceAdapter.fetch_comments")
+@patch("reddit_researcher.apis.reddit.adapter.RedditSourceAdapter.iter_posts")
+@patch("reddit_researcher.core.orchestrator.load_config")
+def test_probe_incremental_resumes_from_cursor(
+    mock_load_cfg, mock_iter_posts, mock_fetch_comments, tmp_path
+) -> None:
+    targets = (TargetConfig("python", "new", "day"), TargetConfig("python", "hot", "day"))
+    mock_load_cfg.return_value = _make_cfg(
+        state_path=str(tmp_path / "state.sqlite"), targets=targets
+    )
+    mock_iter_posts.return_value = POSTS
+    mock_fetch_comments.return_value = COMMENTS
+
+    assert main([]) == 0
+    assert all(call.kwargs["since"] is None for call in mock_iter_posts.call_args_list)
+
+    mock_iter_posts.reset_mock()
+    assert main([]) == 0
+    since = {c.kwargs["listing"]: c.kwargs["since"] for c in mock_iter_posts.call_args_list}
+    assert since["new"].fullname == "t3_p1" and since["new"].created_utc == 200
+    # Ranked listings are crawled in full every run
+    assert since["hot"] is None
+
+
+@patch("reddit_researcher.core.orchestrator.SupabaseSinkAdapter")
+@patch("reddit_researcher.apis.reddit.adapter.RedditSourceAdapter.fetch_comments")
+@patch("reddit_researcher.apis.reddit.adapter.RedditSourceAdapter.iter_posts")
+@patch("reddit_researcher.core.orchestrator.load_config")
+def test_probe_fans_out_over_targets(
+    mock_load_cfg, mock_iter_posts, mock_fetch_comments, mock_sink_cls
+) -> None:
+    targets = (
+        TargetConfig("python", "hot", "day"),
+        TargetConfig("private_sub", "top", "week"),
+    )
+    mock_load_cfg.return_value = _make_cfg(supabase_enabled=True, targets=targets)
+
+    def _iter_posts(subreddit, listing, time_filter, limit, *, since=None):
+        if subreddit == "private_sub":
+            raise RuntimeError("403 Forbidden")
+        return iter(POSTS)
+
+    mock_iter_posts.side_effect = _iter_posts
+    mock_fetch_comments.return_value = COMMENTS
+
+    assert main([]) == 0
+
+    run_row = mock_sink_cls.return_value.upsert_run.call_args.args[0]
+    assert run_row["subreddit"] == "python+private_sub"
+    by_sub = {t["subreddit"]: t for t in run_row["targets"]}
+    assert by_sub["python"]["posts"] == 2 and by_sub["python"]["comments"] == 2
+    assert by_sub["python"]["error"] is None
+    assert by_sub["private_sub"]["posts"] == 0
+    assert "Forbidden" in by_sub["private_sub"]["error"]
+
+
+@pytest.mark.parametrize("stream", [False, True])
+@patch("reddit_researcher.core.orchestrator.SupabaseSinkAdapter")
+@patch("reddit_researcher.apis.reddit.adapter.RedditSourceAdapter.fetch_comments")
+@patch("reddit_researcher.apis.reddit.adapter.RedditSourceAdapter.iter_posts")
+@patch("reddit_researcher.core.orchestrator.load_config")
+def test_probe_overlapping_targets_write_and_expand_each_post_once(
+    mock_load_cfg, mock_iter_posts, mock_fetch_comments, mock_sink_cls, stream
+) -> None:
+    targets = (TargetConfig("python", "hot", "day"), TargetConfig("python", "top", "day"))
+    mock_load_cfg.return_value = _make_cfg(
+        stream=stream, supabase_enabled=True, targets=targets
+    )
+    mock_iter_posts.side_effect = lambda *args, **kwargs: iter(POSTS)
+    mock_fetch_comments.return_value = COMMENTS
+
+    assert main([]) == 0
+
+    sink = mock_sink_cls.return_value
+    written = [r["id"] for call in sink.ingest_posts.call_args_list for r in call.args[1]]
+    assert sorted(written) == ["p1", "p2"]
+    fetched = [call.kwargs["submission_id"] for call in mock_fetch_comments.call_args_list]
+    assert sorted(fetched) == ["p1", "p2"]
+    run_row = sink.upsert_run.call_args.args[0]
+    assert sum(t["posts"] for t in run_row["targets"]) == 2
+
+
+@patch("reddit_researcher.apis.reddit.adapter.RedditSourceAdapter.fetch_comments")
+@patch("reddit_researcher.apis.reddit.adapter.RedditSourceAdapter.iter_posts")
+@patch("reddit_researcher.core.orchestrator.load_config")
+def test_probe_spreads_comment_request_budget(
+    mock_load_cfg, mock_iter_posts, mock_fetch_comments
+) -> None:
+    mock_load_cfg.return_value = _make_cfg(comment_request_budget=1)
+    mock_iter_posts.return_value = POSTS
+    mock_fetch_comments.return_value = COMMENTS
+
+    assert main([]) == 0
+
+    # One request only buys the initial load of the most commented post
+    mock_fetch_comments.assert_called_once_with(submission_id="p1", replace_more_limit=0)
+
+
+@patch("reddit_researcher.core.orchestrator.SupabaseSinkAdapter")
+@patch("reddit_researcher.apis.reddit.adapter.RedditSourceAdapter.fetch_comments")
+@patch("reddit_researcher.apis.reddit.adapter.RedditSourceAdapter.iter_posts")
+@patch("reddit_researcher.core.orchestrator.load_config")
+def test_probe_spools_sink_writes_and_drains_them(
+    mock_load_cfg, mock_iter_posts, mock_fetch_comments, mock_sink_cls, tmp_path
+) -> None:
+    spool_dir = tmp_path / "spool"
+    mock_load_cfg.return_value = _make_cfg(supabase_enabled=True, spool_dir=str(spool_dir))
+    mock_iter_posts.return_value = POSTS
+    mock_fetch_comments.return_value = COMMENTS
+    sink = mock_sink_cls.return_value
+    sink.ingest_posts.side_effect = RuntimeError("supabase down")
+
+    assert main([]) == 0
+    assert len(list(spool_dir.glob("*.jsonl"))) == 1  # kept; no Reddit data lost
+
+    sink.ingest_posts.side_effect = None
+    mock_iter_posts.return_value = []
+    assert main([]) == 0
+
+    replayed = [r["id"] for call in sink.ingest_posts.call_args_list for r in call.args[1]]
+    assert replayed.count("p1") == 2  # failed attempt plus the successful replay
+    assert list(spool_dir.glob("*.jsonl*")) == []
+
+
+@patch("reddit_researcher.apis.reddit.adapter.RedditSourceAdapter.fetch_comments")
+@patch("reddit_researcher.apis.reddit.adapter.RedditSourceAdapter.iter_posts")
+@patch("reddit_researcher.core.orchestrator.load_config")
+def test_probe_exports_parquet_without_a_database(
+    mock_load_cfg, mock_iter_posts, mock_fetch_comments, tmp_path
+) -> None:
+    pytest.importorskip("pyarrow")
+    mock_load_cfg.return_value = _make_cfg(parquet_dir=str(tmp_path))
+    mock_iter_posts.return_value = POSTS
+    mock_fetch_comments.return_value = COMMENTS
+
+    assert main([]) == 0
+    datasets = {p.relative_to(tmp_path).parts[0] for p in tmp_path.rglob("*.parquet")}
+    assert datasets == {"runs", "posts", "comments"}
+
+
+@patch("reddit_researcher.core.orchestrator.SupabaseSinkAdapter")
+@patch("reddit_researcher.apis.reddit.adapter.RedditSourceAdapter.fetch_comments")
+@patch("reddit_researcher.apis.reddit.adapter.RedditSourceAdapter.iter_posts")
+@patch("reddit_researcher.core.orchestrator.load_config")
+def test_probe_writes_run_telemetry(
+    mock_load_cfg, mock_iter_posts, mock_fetch_comments, mock_sink_cls
+) -> None:
+    mock_load_cfg.return_value = _make_cfg(supabase_enabled=True, run_telemetry=True)
+    mock_iter_posts.return_value = POSTS
+    mock_fetch_comments.return_value = COMMENTS
+
+    assert main([]) == 0
+    run_row = mock_sink_cls.return_value.upsert_run.call_args.args[0]
+    endpoints = run_row["telemetry"]["endpoints"]
+    assert endpoints["listing.page"]["rows"] == len(POSTS)
+    # The mocked source sends no requests, so nothing waited on the limiter
+    assert "comments.fetch" in endpoints and "ratelimit.wait" not in endpoints
+
+
+@patch("reddit_researcher.apis.reddit.adapter.RedditSourceAdapter.fetch_comments")
+@patch("reddit_researcher.apis.reddit.adapter.RedditSourceAdapter.iter_posts")
+@patch("reddit_researcher.core.orchestrator.load_config")
+def test_probe_comment_delta_skips_unchanged_submissions(
+    mock_load_cfg, mock_iter_posts, mock_fetch_comments, tmp_path
+) -> None:
+    mock_load_cfg.return_value = _make_cfg(
+        state_path=str(tmp_path / "state.sqlite"), comment_delta=True
+    )
+    mock_iter_posts.return_value = POSTS
+    mock_fetch_comments.return_value = COMMENTS
+
+    assert main([]) == 0
+    first = mock_fetch_comments.call_count
+    assert first > 0 and "known_ids" not in mock_fetch_comments.call_args.kwargs
+
+    mock_fetch_comments.reset_mock()
+    assert main([]) == 0
+    mock_fetch_comments.assert_not_called()
+
+
+@patch("reddit_researcher.apis.reddit.adapter.RedditSourceAdapter.fetch_comments")
+@patch("reddit_researcher.apis.reddit.adapter.RedditSourceAdapter.iter_posts")
+@patch("reddit_researcher.core.orchestrator.load_config")
+def test_probe_knapsack_sampling_stays_within_budget(
+    mock_load_cfg, mock_iter_posts, mock_fetch_comments
+) -> None:
+    mock_load_cfg.return_value = _make_cfg(comment_sampling="knapsack", comment_request_budget=1)
+    mock_iter_posts.return_value = POSTS
+    mock_fetch_comments.return_value = COMMENTS
+
+    assert main([]) == 0
+    mock_fetch_comments.assert_called_once_with(submission_id="p1", replace_more_limit=0)
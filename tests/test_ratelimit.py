@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from reddit_researcher.core.ratelimit import (
+    AdaptiveRateLimiter,
     BackoffConfig,
     RateLimiter,
     compute_backoff_seconds,
@@ -76,3 +77,56 @@ def test_rate_limiter_flood_total_sleep() -> None:
     assert 3.8 <= total_sleep <= 4.2
 
 
+
+
+def test_rate_limiter_shared_across_threads() -> None:
+    # Concurrent callers reserve consecutive slots instead of all passing at once.
+    import threading
+
+    slept: list[float] = []
+    rl = RateLimiter(60, burst_tokens=1, time_fn=lambda: 0.0, sleep_fn=slept.append)
+
+    threads = [threading.Thread(target=rl.acquire) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(round(s, 3) for s in slept) == [1.0, 2.0, 3.0, 4.0]
+
+
+def _fake_clock():
+    now = [0.0]
+    slept: list[float] = []
+
+    def sleep_fn(s: float) -> None:
+        slept.append(s)
+        now[0] += s
+
+    return now, slept, (lambda: now[0]), sleep_fn
+
+
+def test_adaptive_limiter_speeds_up_to_remaining_quota() -> None:
+    _now, _slept, time_fn, sleep_fn = _fake_clock()
+    rl = AdaptiveRateLimiter(60, max_qpm=600, reserve=0, time_fn=time_fn, sleep_fn=sleep_fn)
+    # 300 requests left over the next 60s => 5 per second
+    rl.observe({"x-ratelimit-remaining": "300", "x-ratelimit-reset": "60"})
+    assert rl.qpm == 300.0
+
+
+def test_adaptive_limiter_slows_down_and_pauses_when_exhausted() -> None:
+    now, slept, time_fn, sleep_fn = _fake_clock()
+    rl = AdaptiveRateLimiter(60, reserve=5, time_fn=time_fn, sleep_fn=sleep_fn)
+    rl.observe({"x-ratelimit-remaining": "3", "x-ratelimit-reset": "30"})
+    rl.acquire()
+    # Quota below the reserve: wait out the window before the next request
+    assert slept and slept[0] >= 30.0
+    assert now[0] >= 30.0
+
+
+def test_adaptive_limiter_honors_retry_after() -> None:
+    _now, slept, time_fn, sleep_fn = _fake_clock()
+    rl = AdaptiveRateLimiter(60, time_fn=time_fn, sleep_fn=sleep_fn)
+    rl.observe({"Retry-After": "12"})
+    rl.acquire()
+    assert slept and 12.0 <= slept[0] <= 12.1
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import threading
+from datetime import UTC, datetime
+
+from reddit_researcher.core.normalizers import comment_record, normalize_comment
+from reddit_researcher.core.records import CommentRecord, RecordBatch, iso_utc
+
+RAW = [
+    {
+        "id": f"c{i}",
+        "parent_id": "t3_p1",
+        "subreddit": "python",
+        "author": "alice",
+        "body": f"comment {i}",
+        "created_utc": 1_700_000_000 + i,
+        "score": i,
+        "depth": 0,
+    }
+    for i in range(3)
+]
+
+
+def test_record_row_matches_normalized_dict() -> None:
+    rec = comment_record(RAW[0], link_id="p1")
+    row = normalize_comment(RAW[0], link_id="p1")
+    assert rec.as_row().keys() == row.keys()
+    assert rec.as_row()["created_utc"] == row["created_utc"] == "2023-11-14T22:13:20Z"
+    assert rec.created_utc == 1_700_000_000.0
+
+
+def test_batch_yields_rows_in_order_and_shares_repeated_values() -> None:
+    batch = RecordBatch(CommentRecord)
+    records = [comment_record(dict(c, author="".join(["ali", "ce"])), link_id="p1") for c in RAW]
+    for rec in records:
+        batch.append(rec)
+
+    assert len(batch) == 3
+    assert batch.ids() == ["c0", "c1", "c2"]
+    assert list(batch) == [rec.as_row() for rec in records]
+    assert batch[1] == records[1]
+    # Equal author strings are stored once per batch
+    assert batch[0].author is batch[2].author
+
+
+def test_iso_utc_matches_strftime() -> None:
+    for ts in (0.0, 59.9, 951_782_400.0, 1_700_000_000.5, 4_102_444_799.0, -1.0):
+        expected = datetime.fromtimestamp(ts, tz=UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+        assert iso_utc(ts) == expected
+    assert iso_utc(None) is None
+
+
+def test_concurrent_appends_keep_rows_aligned() -> None:
+    batch = RecordBatch(CommentRecord)
+    start = threading.Barrier(4)
+
+    def _append(worker: int) -> None:
+        start.wait()
+        for i in range(5000):
+            cid = f"w{worker}c{i}"
+            batch.append(comment_record(dict(RAW[0], id=cid, body=cid, score=i), link_id="p1"))
+
+    threads = [threading.Thread(target=_append, args=(w,)) for w in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    rows = list(batch)
+    assert len(rows) == 20000
+    assert all(row["body"] == row["id"] and row["id"].endswith(f"c{row['score']}") for row in rows)
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
-from reddit_researcher.apis.reddit.reddit_client import make_reddit, make_user_agent
+from reddit_researcher.apis.reddit.reddit_client import endpoint_label, make_reddit, make_user_agent
 from reddit_researcher.config.config import AppConfig, ProbeConfig, RedditConfig, SupabaseConfig
 
 
@@ -29,3 +29,32 @@ def test_make_reddit_read_only(mock_reddit) -> None:
     mock_reddit.assert_called_once()
 
 
+
+
+@patch("praw.Reddit")
+def test_make_reddit_installs_response_hook(mock_reddit) -> None:
+    seen = []
+    make_reddit(
+        RedditConfig(client_id="id", client_secret="secret", user_agent="ua"),
+        on_response=lambda *args: seen.append(args),
+    )
+    session = mock_reddit.call_args.kwargs["requestor_kwargs"]["session"]
+    resp = MagicMock(
+        url="https://oauth.reddit.com/r/python/hot?limit=100",
+        headers={"x-ratelimit-remaining": "42"},
+        status_code=200,
+        content=b"{}",
+    )
+    resp.elapsed.total_seconds.return_value = 0.25
+    for hook in session.hooks["response"]:
+        hook(resp)
+    assert seen == [("/r/{sub}/hot", {"x-ratelimit-remaining": "42"}, 0.25, 200, 2)]
+
+
+def test_endpoint_label_collapses_ids() -> None:
+    assert endpoint_label("https://oauth.reddit.com/comments/abc123/?limit=2") == "/comments/{id}"
+    assert (
+        endpoint_label("https://oauth.reddit.com/r/python/comments/abc12/a_title/")
+        == "/r/{sub}/comments/{id}/{slug}"
+    )
+    assert endpoint_label("https://oauth.reddit.com/api/morechildren") == "/api/morechildren"
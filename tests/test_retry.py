@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+import requests
+from praw.models import MoreComments
+from prawcore.exceptions import RequestException
+
+from reddit_researcher.apis.reddit.comments import _replace_more
+from reddit_researcher.core.retry import CircuitBreaker, CircuitOpen, RetryPolicy, is_retryable
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, headers: dict[str, str] | None = None) -> None:
+        super().__init__(f"HTTP {status}")
+        self.response = SimpleNamespace(status_code=status, headers=headers or {})
+
+
+def test_errors_are_sorted_into_retryable_and_fatal() -> None:
+    assert is_retryable(HttpError(429)) and is_retryable(HttpError(503))
+    assert not is_retryable(HttpError(404)) and not is_retryable(HttpError(403))
+    # prawcore wraps transport errors; the original decides
+    reset = RequestException(requests.ConnectionError("reset"), (), {})
+    assert is_retryable(reset)
+    assert not is_retryable(KeyError("data"))
+
+    class Replay(requests.ConnectionError):
+        retryable = False
+
+    assert not is_retryable(RequestException(Replay("miss"), (), {}))
+
+
+def _flaky(errors: list[Exception]) -> Any:
+    calls: list[int] = []
+
+    def fn() -> str:
+        calls.append(1)
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    fn.calls = calls  # type: ignore[attr-defined]
+    return fn
+
+
+def test_retries_honor_retry_after_and_stop_on_fatal_errors() -> None:
+    sleeps: list[float] = []
+    policy = RetryPolicy(max_attempts=3, sleep_fn=sleeps.append)
+
+    fn = _flaky([HttpError(429, {"Retry-After": "7"}), HttpError(502)])
+    assert policy.call(fn) == "ok"
+    assert sleeps[0] == 7.0 and 0.9 <= sleeps[1] <= 1.1  # second backoff step, ±10% jitter
+
+    gone = _flaky([HttpError(404)])
+    with pytest.raises(HttpError):
+        policy.call(gone)
+    assert len(gone.calls) == 1
+
+    down = _flaky([HttpError(503)] * 3)
+    with pytest.raises(HttpError):
+        policy.call(down)
+    assert len(down.calls) == 3
+    assert policy.summary() == {"retries": 4, "fatal": 1, "gave_up": 1, "breaker_trips": 0}
+
+
+def test_breaker_fails_fast_after_sustained_failures() -> None:
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=3, cooldown_sec=30, time_fn=clock)
+    policy = RetryPolicy(max_attempts=2, breaker=breaker, sleep_fn=lambda _s: None)
+
+    with pytest.raises(HttpError):
+        policy.call(_flaky([HttpError(500)] * 2))
+    # A 404 proves Reddit answered, so it resets the streak
+    with pytest.raises(HttpError):
+        policy.call(_flaky([HttpError(404)]))
+    with pytest.raises(HttpError):
+        policy.call(_flaky([HttpError(500)] * 2))
+    with pytest.raises(CircuitOpen):
+        policy.call(_flaky([HttpError(500)]))
+    assert breaker.trips == 1
+
+    idle = _flaky([])
+    with pytest.raises(CircuitOpen) as exc:
+        policy.call(idle)
+    assert idle.calls == [] and exc.value.retry_in == 30
+
+    # After the cooldown one failure reopens it; a success closes it
+    clock.now += 31
+    with pytest.raises(CircuitOpen):
+        policy.call(_flaky([HttpError(500)] * 2))
+    clock.now += 31
+    assert policy.call(_flaky([])) == "ok"
+    assert policy.call(_flaky([HttpError(500)])) == "ok"
+    assert breaker.trips == 2
+
+
+class _Forest:
+    """A `CommentForest` stand-in whose `replace_more` fails after `fail_after` stubs."""
+
+    def __init__(self, stubs: int, fail_after: int) -> None:
+        self.items: list[Any] = [
+            MoreComments(None, {"count": 1, "children": [f"c{i}"], "id": f"m{i}"})
+            for i in range(stubs)
+        ]
+        self.limits: list[int] = []
+        self._fail_after = fail_after
+
+    def list(self) -> list[Any]:
+        return list(self.items)
+
+    def replace_more(self, *, limit: int) -> list[Any]:
+        self.limits.append(limit)
+        for _ in range(limit):
+            stub = next((c for c in self.items if isinstance(c, MoreComments)), None)
+            if stub is None:
+                break
+            if self._fail_after == 0:
+                self._fail_after = -1
+                raise HttpError(503)
+            self._fail_after -= 1
+            self.items.remove(stub)
+            self.items.append(f"comment-{stub.id}")
+        return []
+
+
+def test_replace_more_resumes_with_what_is_left_of_the_limit() -> None:
+    forest = _Forest(stubs=4, fail_after=2)
+    policy = RetryPolicy(sleep_fn=lambda _s: None)
+    _replace_more(forest, 3, policy.call)  # type: ignore[arg-type]
+    assert forest.limits == [3, 1]
+    assert sum(isinstance(c, MoreComments) for c in forest.items) == 1
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from reddit_researcher.core.comment_delta import CommentState
+from reddit_researcher.core.records import PostRecord
+from reddit_researcher.core.sampling import (
+    KnapsackSampler,
+    ReservoirSampler,
+    StratifiedSampler,
+    TopCommentsSampler,
+    VelocitySampler,
+    make_sampler,
+    sample_cost,
+    thread_cost,
+)
+
+NOW = 1_700_000_000.0
+
+
+def _post(pid: str, num_comments: int, *, score: int = 1, age_h: float = 1.0) -> PostRecord:
+    return PostRecord(
+        id=pid,
+        subreddit="python",
+        title=None,
+        selftext=None,
+        url=None,
+        domain=None,
+        author=None,
+        created_utc=NOW - age_h * 3600,
+        score=score,
+        num_comments=num_comments,
+        over_18=False,
+        upvote_ratio=None,
+        permalink=None,
+        retrieved_at=NOW,
+    )
+
+
+def _ids(posts: list[PostRecord]) -> list[str | None]:
+    return [p.id for p in posts]
+
+
+def test_thread_cost_is_capped_by_replace_more_limit() -> None:
+    assert thread_cost(150, 5) == (1, 150)
+    assert thread_cost(1000, 5) == (6, 700)
+    assert thread_cost(1000, 0) == (1, 200)
+    assert sample_cost([_post("a", 150), _post("b", 1000)], 5) == (7, 850)
+
+
+def test_top_comments_keeps_the_largest_threads() -> None:
+    posts = [_post("a", 5), _post("b", 50), _post("c", 20)]
+    assert _ids(TopCommentsSampler(2).select(iter(posts))) == ["b", "c"]
+
+
+def test_velocity_uses_growth_since_last_fetch_or_lifetime_rate() -> None:
+    posts = [
+        _post("old_big", 900, age_h=30),  # seen 1h ago at 890 comments: 10/h
+        _post("fresh", 40, age_h=1),  # never fetched: 40/h over its lifetime
+        _post("slow", 100, age_h=50),  # never fetched: 2/h
+    ]
+    history = {"old_big": CommentState(890, NOW - 3600, frozenset())}
+    sampler = VelocitySampler(
+        2,
+        history=lambda ids: {i: history[i] for i in ids if i in history},
+        time_fn=lambda: NOW,
+    )
+    assert _ids(sampler.select(posts)) == ["fresh", "old_big"]
+
+
+def test_knapsack_prefers_many_small_threads_under_a_budget() -> None:
+    # 6 requests: one 1000-comment thread yields 700; six 180-comment threads yield 1080
+    posts = [_post("big", 1000)] + [_post(f"s{i}", 180) for i in range(6)]
+    sample = KnapsackSampler(6, replace_more_limit=5).select(posts)
+    assert sorted(_ids(sample)) == [f"s{i}" for i in range(6)]
+    assert sample_cost(sample, 5)[0] <= 6
+
+
+def test_knapsack_is_exact_where_greedy_density_is_not() -> None:
+    # Budget 4: greedy by comments/request takes a (200/1) then b (300/2) for 500;
+    # b and c (2 + 2 requests) yield 600
+    posts = [_post("a", 200), _post("b", 300), _post("c", 300)]
+    sample = KnapsackSampler(4, replace_more_limit=5).select(posts)
+    assert sorted(_ids(sample)) == ["b", "c"]
+    assert sample_cost(sample, 5) == (4, 600)
+
+
+def test_stratified_spreads_the_sample_over_score_decades() -> None:
+    posts = [_post(f"hi{i}", 500 + i, score=5000) for i in range(5)]
+    posts += [_post("mid", 30, score=50), _post("low", 3, score=2)]
+    sample = StratifiedSampler(4).select(posts)
+    assert {"mid", "low"} <= set(_ids(sample))
+    assert len(sample) == 4
+
+
+def test_reservoir_is_uniform_and_bounded() -> None:
+    hits = {str(i): 0 for i in range(10)}
+    rng = random.Random(7)
+    for _ in range(2000):
+        for p in ReservoirSampler(3, rng=rng).select(_post(str(i), i) for i in range(10)):
+            hits[str(p.id)] += 1
+    # Each post is picked with probability 3/10
+    assert all(500 < n < 700 for n in hits.values())
+
+
+def test_make_sampler_rejects_unknown_names() -> None:
+    assert isinstance(
+        make_sampler("top", k=1, request_budget=0, replace_more_limit=1), TopCommentsSampler
+    )
+    with pytest.raises(ValueError):
+        make_sampler("random", k=1, request_budget=0, replace_more_limit=1)
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+from contextlib import contextmanager
+from typing import Any
+
+import pytest
+
+from reddit_researcher.apis.postgres.sink import POST_COLUMNS, PostgresCopySink
+from reddit_researcher.config.config import AppConfig, PostgresConfig, ProbeConfig, RedditConfig
+from reddit_researcher.core.telemetry import TelemetryRecorder
+
+
+class FakeCopy:
+    def __init__(self, conn: FakeConnection) -> None:
+        self._conn = conn
+
+    def write_row(self, row: tuple[Any, ...]) -> None:
+        self._conn.copied[-1][1].append(row)
+
+
+class FakeCursor:
+    def __init__(self, conn: FakeConnection) -> None:
+        self._conn = conn
+
+    def execute(self, statement: str, params: Any = None) -> None:
+        self._conn.statements.append((statement, params))
+
+    @contextmanager
+    def copy(self, statement: str):
+        self._conn.copied.append((statement, []))
+        yield FakeCopy(self._conn)
+
+    def __enter__(self) -> FakeCursor:
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        pass
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.statements: list[tuple[str, Any]] = []
+        self.copied: list[tuple[str, list[tuple[Any, ...]]]] = []
+        self.transactions = 0
+
+    @contextmanager
+    def transaction(self):
+        self.transactions += 1
+        yield
+
+    def cursor(self) -> FakeCursor:
+        return FakeCursor(self)
+
+
+def _cfg(**postgres: Any) -> AppConfig:
+    return AppConfig(
+        reddit=RedditConfig("id", "secret", "ua"),
+        probe=ProbeConfig(),
+        postgres=PostgresConfig(**{"enabled": True, "dsn": "postgresql://test", **postgres}),
+    )
+
+
+def _sink(**postgres: Any) -> tuple[PostgresCopySink, FakeConnection]:
+    conn = FakeConnection()
+    telem = TelemetryRecorder()
+    return PostgresCopySink(_cfg(**postgres), telemetry=telem, connect=lambda _dsn: conn), conn
+
+
+def test_ingest_posts_copies_batches_then_merges_and_links() -> None:
+    sink, conn = _sink(copy_batch_rows=2)
+    rows = [{"id": f"p{i}", "title": f"t{i}", "score": i} for i in range(3)]
+    sink.ingest_posts("r1", rows)
+
+    assert conn.transactions == 2  # one per COPY batch
+    assert [len(copied) for _stmt, copied in conn.copied] == [2, 1]
+    first = conn.copied[0][1][0]
+    assert first[POST_COLUMNS.index("id")] == "p0" and first[POST_COLUMNS.index("score")] == 0
+    assert first[POST_COLUMNS.index("selftext")] is None  # missing keys load as NULL
+    sql = [stmt for stmt, _ in conn.statements]
+    assert sql[0].startswith('create temp table "_stage_posts" (like "public"."posts")')
+    assert 'insert into "public"."posts"' in sql[1] and "on conflict (id) do update" in sql[1]
+    assert 'insert into "public"."runs_posts"' in sql[2] and conn.statements[2][1] == ("r1",)
+
+
+def test_upsert_and_link_only_writes() -> None:
+    sink, conn = _sink()
+    sink.upsert_comments([{"id": "c1"}])
+    sink.link_run_comments("r1", ["c1", "c2"])
+
+    sql = [stmt for stmt, _ in conn.statements]
+    assert not any("runs_comments" in s for s in sql[:2])  # upsert alone does not link
+    assert conn.copied[1] == ('copy "_stage_runs_comments" (id) from stdin', [("c1",), ("c2",)])
+    assert 'insert into "public"."runs_comments" (run_id, "comment_id")' in sql[-1]
+
+
+def test_upsert_run_casts_nested_values_to_jsonb() -> None:
+    sink, conn = _sink(schema="research")
+    sink.upsert_run({"run_id": "r1", "posts_count": 3, "targets": [{"subreddit": "a"}]})
+
+    statement, params = conn.statements[0]
+    assert statement.startswith('insert into "research"."runs"')
+    assert "values (%s, %s, %s::jsonb)" in statement
+    assert params == ["r1", 3, '[{"subreddit": "a"}]']
+
+
+@pytest.mark.skipif(
+    not os.getenv("POSTGRES_TEST_DSN"), reason="set POSTGRES_TEST_DSN to a scratch database"
+)
+def test_against_local_postgres() -> None:
+    psycopg = pytest.importorskip("psycopg")
+    dsn = os.environ["POSTGRES_TEST_DSN"]
+    with open("schema/sql/0001_init.sql", encoding="utf-8") as f:
+        ddl = f.read()
+    with psycopg.connect(dsn, autocommit=True) as conn:
+        conn.execute(ddl)
+        conn.execute("delete from runs_posts where run_id = 'pgtest'")
+
+    sink = PostgresCopySink(_cfg(dsn=dsn, copy_batch_rows=2))
+    sink.upsert_run({"run_id": "pgtest", "posts_count": 2})
+    sink.ingest_posts("pgtest", [{"id": "pg1", "score": 1}, {"id": "pg2", "score": 2}])
+    sink.ingest_posts("pgtest", [{"id": "pg1", "score": 5}])  # re-ingest updates in place
+
+    with psycopg.connect(dsn) as conn:
+        scores = dict(conn.execute("select id, score from posts where id like 'pg%'").fetchall())
+        linked = conn.execute("select count(*) from runs_posts where run_id = 'pgtest'").fetchone()
+    assert scores == {"pg1": 5, "pg2": 2}
+    assert linked == (2,)
@@ -1,15 +1,29 @@
 from __future__ import annotations
 
+import json
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
+import httpx
+import pytest
+from postgrest.exceptions import APIError
+
+from reddit_researcher.apis.supabase import adapter as adapter_mod
 from reddit_researcher.apis.supabase.client import SupabaseHandle
 from reddit_researcher.apis.supabase.sink import (
+    UpsertOptions,
+    ingest_comments,
+    ingest_posts,
+    is_transient_error,
     link_run_comments,
     link_run_posts,
+    link_run_posts_bulk,
     upsert_comments,
     upsert_posts,
+    upsert_rows,
     upsert_run,
 )
+from reddit_researcher.core.telemetry import TelemetryRecorder
 
 
 def make_mock_handle() -> SupabaseHandle:
@@ -38,3 +52,126 @@ def test_link_membership_tables() -> None:
     assert sb.client.table.call_count >= 2
 
 
+
+
+def test_upsert_rows_chunks_and_records_telemetry() -> None:
+    sb = make_mock_handle()
+    telem = TelemetryRecorder(payload_sizes=True)
+    rows = [{"id": f"t1_{i}"} for i in range(5)]
+    upsert_rows(
+        sb, "comments", rows, conflict="id", options=UpsertOptions(chunk_size=2), telemetry=telem
+    )
+    sizes = [len(call.args[0]) for call in sb.client.table.return_value.upsert.call_args_list]
+    assert sizes == [2, 2, 1]
+    stats = telem.summary()["endpoints"]
+    assert list(stats) == ["supabase.upsert.comments"]
+    assert stats["supabase.upsert.comments"]["count"] == 3
+    assert stats["supabase.upsert.comments"]["rows"] == 5
+    assert stats["supabase.upsert.comments"]["bytes"] == sum(
+        len(json.dumps(chunk, separators=(",", ":"))) for chunk in (rows[:2], rows[2:4], rows[4:])
+    )
+
+    # Without payload_sizes the chunks are not encoded a second time
+    plain = TelemetryRecorder()
+    upsert_rows(sb, "comments", rows, conflict="id", telemetry=plain)
+    assert plain.summary()["endpoints"]["supabase.upsert.comments"]["bytes"] == 0
+
+
+def test_upsert_rows_parallel_sends_every_chunk() -> None:
+    sb = make_mock_handle()
+    rows = [{"id": f"t3_{i}"} for i in range(10)]
+    opts = UpsertOptions(chunk_size=3, max_in_flight=3)
+    upsert_rows(sb, "posts", rows, conflict="id", options=opts)
+    sent = [r for call in sb.client.table.return_value.upsert.call_args_list for r in call.args[0]]
+    assert sorted(r["id"] for r in sent) == sorted(r["id"] for r in rows)
+
+
+def test_upsert_rows_retries_transient_chunk() -> None:
+    sb = make_mock_handle()
+    execute = sb.client.table.return_value.upsert.return_value.execute
+    execute.side_effect = [APIError({"code": 503, "message": "unavailable"}), None]
+    slept: list[float] = []
+    upsert_rows(
+        sb,
+        "posts",
+        [{"id": "t3_a"}],
+        conflict="id",
+        options=UpsertOptions(max_retries=2),
+        sleep_fn=slept.append,
+    )
+    assert execute.call_count == 2
+    assert len(slept) == 1
+
+
+def test_upsert_rows_does_not_retry_fatal_errors() -> None:
+    sb = make_mock_handle()
+    execute = sb.client.table.return_value.upsert.return_value.execute
+    execute.side_effect = APIError({"code": "42P01", "message": "relation does not exist"})
+    with pytest.raises(APIError):
+        upsert_rows(sb, "posts", [{"id": "t3_a"}], conflict="id", sleep_fn=lambda _s: None)
+    assert execute.call_count == 1
+
+
+def test_is_transient_error_classification() -> None:
+    assert is_transient_error(APIError({"code": 502}))
+    assert is_transient_error(APIError({"code": "57014"}))
+    assert is_transient_error(TimeoutError("read timed out"))
+    assert not is_transient_error(APIError({"code": "23505"}))
+    assert not is_transient_error(APIError({"code": 400}))
+    assert is_transient_error(APIError({"code": 408}))
+    assert is_transient_error(httpx.ConnectError("connection refused"))
+    assert is_transient_error(httpx.ReadTimeout("read timed out"))
+    request = httpx.Request("POST", "https://example.supabase.co/rest/v1/posts")
+    response = httpx.Response(503, request=request)
+    assert is_transient_error(httpx.HTTPStatusError("busy", request=request, response=response))
+    # Programming errors fail fast rather than being retried with backoff
+    assert not is_transient_error(KeyError("id"))
+    assert not is_transient_error(AttributeError("upsert"))
+
+
+def test_ingest_sends_rows_and_run_id_in_one_rpc_per_chunk() -> None:
+    sb = make_mock_handle()
+    telem = TelemetryRecorder()
+    rows = [{"id": f"t3_{i}"} for i in range(5)]
+    ingest_posts(sb, "r1", rows, options=UpsertOptions(chunk_size=2), telemetry=telem)
+    ingest_comments(sb, "r1", [{"id": "t1_x"}])
+
+    calls = sb.client.rpc.call_args_list
+    assert [c.args[0] for c in calls] == ["ingest_posts"] * 3 + ["ingest_comments"]
+    assert [len(c.args[1]["p_rows"]) for c in calls[:3]] == [2, 2, 1]
+    assert {c.args[1]["p_run_id"] for c in calls} == {"r1"}
+    sb.client.table.assert_not_called()
+    assert list(telem.summary()["endpoints"]) == ["supabase.rpc.ingest_posts"]
+
+
+def test_bulk_link_sends_deduplicated_id_arrays() -> None:
+    sb = make_mock_handle()
+    link_run_posts_bulk(sb, "r1", ["a", "b", "a", "c"], batch_size=2)
+    params = [c.args[1] for c in sb.client.rpc.call_args_list]
+    assert params == [
+        {"p_run_id": "r1", "p_post_ids": ["a", "b"]},
+        {"p_run_id": "r1", "p_post_ids": ["c"]},
+    ]
+
+
+def test_adapter_without_rpc_upserts_then_links_in_one_pass(monkeypatch) -> None:
+    sb = make_mock_handle()
+    monkeypatch.setattr(adapter_mod, "make_supabase", lambda *a: sb)
+    cfg = SimpleNamespace(
+        supabase=SimpleNamespace(
+            url="u",
+            key="k",
+            schema="public",
+            chunk_size=500,
+            max_in_flight=1,
+            max_retries=0,
+            rpc_ingest=False,
+        )
+    )
+    sink = adapter_mod.SupabaseSinkAdapter(cfg)
+    sink.ingest_posts("r1", iter([{"id": "t3_a"}, {"id": "t3_b"}]))
+
+    tables = [c.args[0] for c in sb.client.table.call_args_list]
+    assert tables == ["posts", "runs_posts"]
+    links = sb.client.table.return_value.upsert.call_args_list[1].args[0]
+    assert sorted(r["post_id"] for r in links) == ["t3_a", "t3_b"]
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from reddit_researcher.apis.local.spool import Spool, SpoolDrainer, SpoolingSink
+
+
+def test_spooled_calls_replay_in_order_and_segments_are_removed(tmp_path) -> None:
+    spool = Spool(tmp_path, segment_rows=3)
+    sink = SpoolingSink(spool, chunk_rows=2)
+    sink.ingest_posts("r1", [{"id": "p1"}, {"id": "p2"}, {"id": "p3"}])
+    sink.upsert_run({"run_id": "r1"})
+    assert len(spool.sealed_segments()) == 1  # the first 3 rows filled a segment
+
+    target = MagicMock()
+    drainer = SpoolDrainer(spool, target)
+    assert drainer.close()
+
+    assert [c.args for c in target.ingest_posts.call_args_list] == [
+        ("r1", [{"id": "p1"}, {"id": "p2"}]),
+        ("r1", [{"id": "p3"}]),
+    ]
+    target.upsert_run.assert_called_once_with({"run_id": "r1"})
+    assert spool.sealed_segments() == [] and drainer.segments_drained == 2
+
+
+def test_failed_drain_keeps_segment_for_the_next_run(tmp_path) -> None:
+    spool = Spool(tmp_path)
+    SpoolingSink(spool).ingest_comments("r1", [{"id": "c1"}])
+    target = MagicMock()
+    target.ingest_comments.side_effect = RuntimeError("supabase down")
+
+    assert not SpoolDrainer(spool, target).close()
+    assert len(spool.sealed_segments()) == 1
+
+    # A later run (new Spool on the same directory) replays it
+    target.ingest_comments.side_effect = None
+    again = SpoolDrainer(Spool(tmp_path), target)
+    assert again.close()
+    target.ingest_comments.assert_called_with("r1", [{"id": "c1"}])
+
+
+def test_crashed_open_segment_is_sealed_and_torn_line_skipped(tmp_path) -> None:
+    spool = Spool(tmp_path)
+    SpoolingSink(spool).link_run_posts("r1", ["p1"])
+    (open_segment,) = tmp_path.glob("*.jsonl.open")
+    with open_segment.open("a", encoding="utf-8") as f:
+        f.write('{"op":"link_run_posts","args":["r1",')  # torn write
+
+    target = MagicMock()
+    assert SpoolDrainer(Spool(tmp_path), target).drain()
+    target.link_run_posts.assert_called_once_with("r1", ["p1"])
+
+
+def test_segments_seal_by_age_so_draining_overlaps_the_crawl(tmp_path) -> None:
+    now = [0.0]
+    spool = Spool(tmp_path, segment_rows=1000, segment_age_s=5.0, time_fn=lambda: now[0])
+    sink = SpoolingSink(spool)
+    sink.ingest_posts("r1", [{"id": "p1"}])
+    spool.seal_stale()
+    assert spool.sealed_segments() == []
+
+    now[0] = 5.0
+    spool.seal_stale()  # what the background drainer does before each pass
+    assert len(spool.sealed_segments()) == 1
+
+    sink.ingest_posts("r1", [{"id": "p2"}])
+    now[0] = 11.0
+    sink.ingest_posts("r1", [{"id": "p3"}])  # an append to an aged segment seals it
+    assert len(spool.sealed_segments()) == 2
+
+    target = MagicMock()
+    assert SpoolDrainer(spool, target).drain()
+    assert [c.args[1][0]["id"] for c in target.ingest_posts.call_args_list] == ["p1", "p2", "p3"]
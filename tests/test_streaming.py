@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from reddit_researcher.core.streaming import StreamingWriter
+
+
+def test_writer_flushes_in_size_bounded_batches() -> None:
+    sink = MagicMock()
+    with StreamingWriter(sink, "r1", batch_size=2, flush_interval_s=60) as w:
+        for i in range(5):
+            w.put_post({"id": f"p{i}"})
+        w.put_comment({"id": "c1"})
+
+    sizes = [len(call.args[1]) for call in sink.ingest_posts.call_args_list]
+    assert sizes == [2, 2, 1]
+    sink.ingest_comments.assert_called_once_with("r1", [{"id": "c1"}])
+    assert w.posts_written == 5
+    assert w.comments_written == 1
+
+
+def test_writer_flushes_on_interval() -> None:
+    sink = MagicMock()
+    w = StreamingWriter(sink, "r1", batch_size=100, flush_interval_s=0.01).start()
+    w.put_post({"id": "p1"})
+    for _ in range(200):
+        if sink.ingest_posts.called:
+            break
+        time.sleep(0.01)
+    assert sink.ingest_posts.called
+    w.close()
+
+
+def test_writer_surfaces_sink_errors() -> None:
+    sink = MagicMock()
+    sink.ingest_posts.side_effect = RuntimeError("boom")
+    w = StreamingWriter(sink, "r1", batch_size=1, flush_interval_s=60).start()
+    w.put_post({"id": "p1"})
+    with pytest.raises(RuntimeError):
+        w.close()
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import time
 
+from reddit_researcher.core.ratelimit import RateLimiter
 from reddit_researcher.core.telemetry import (
+    LatencySketch,
     Stopwatch,
     TelemetryRecorder,
     parse_ratelimit_headers,
@@ -34,3 +36,43 @@ def test_recorder_collects_entries_and_summary() -> None:
     assert s["ratelimit_windows"] == 1
 
 
+
+
+def test_latency_sketch_quantiles_within_relative_accuracy() -> None:
+    sketch = LatencySketch(relative_accuracy=0.01)
+    values = [i / 1000 for i in range(1, 10_001)]  # 1ms .. 10s
+    for v in values:
+        sketch.add(v)
+    for q in (0.5, 0.9, 0.99):
+        exact = values[int(q * (len(values) - 1))]
+        assert abs(sketch.quantile(q) - exact) <= 0.011 * exact
+    assert sketch.count == 10_000 and sketch.max == 10.0
+    assert len(sketch._buckets) < 1000
+
+
+def test_recorder_aggregates_per_endpoint_and_samples_ratelimit_timeline() -> None:
+    clock = iter([0.0, 0.5, 0.7, 2.0])
+    rec = TelemetryRecorder(time_fn=lambda: next(clock), timeline_interval_s=1.0)
+    rec.record("reddit:/r/{sub}/hot", {"x-ratelimit-remaining": "99"}, 0.2, nbytes=100)
+    rec.record("reddit:/r/{sub}/hot", {"x-ratelimit-remaining": "98"}, 0.4, nbytes=50)
+    rec.record("reddit:/r/{sub}/hot", {"x-ratelimit-remaining": "97"}, 0.3, nbytes=10)
+    rec.record("ratelimit.wait", None, 0.0)
+
+    s = rec.summary()
+    hot = s["endpoints"]["reddit:/r/{sub}/hot"]
+    assert hot["count"] == 3 and hot["bytes"] == 160 and hot["max_s"] == 0.4
+    assert abs(hot["p50_s"] - 0.3) < 0.01
+    assert s["endpoints"]["ratelimit.wait"]["p99_s"] == 0.0
+    # Second sample is within the interval of the first and is dropped
+    assert s["ratelimit_timeline"] == [{"t": 0.5, "remaining": 99.0}, {"t": 2.0, "remaining": 97.0}]
+    assert s["ratelimit_windows"] == 3
+
+
+def test_rate_limiter_records_waits() -> None:
+    now = [0.0]
+    rec = TelemetryRecorder()
+    limiter = RateLimiter(60, time_fn=lambda: now[0], sleep_fn=lambda s: None, telemetry=rec)
+    limiter.acquire()
+    limiter.acquire()
+    wait = rec.endpoint("ratelimit.wait")
+    assert wait is not None and wait["count"] == 2 and wait["max_s"] == 1.0
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+from typing import Any
+
+import reddit_researcher.core.warm as warm_mod
+from reddit_researcher.config.config import HttpCacheConfig
+from reddit_researcher.core.warm import WarmContext
+
+REDDIT = SimpleNamespace(client_id="id", client_secret="sec", user_agent="ua")
+
+
+def test_config_is_loaded_once(tmp_path) -> None:
+    loads: list[Any] = []
+    warm = WarmContext(tmp_path / "config.yaml", loader=lambda p: loads.append(p) or "cfg")
+
+    assert warm.config() == warm.config() == "cfg"
+    assert len(loads) == 1
+    assert warm.invocations == 2
+
+
+def test_reddit_client_is_reused_and_hook_follows_the_latest_adapter(monkeypatch) -> None:
+    built: list[Any] = []
+
+    def fake_make_reddit(cfg: Any, *, on_response: Any = None) -> Any:
+        client = SimpleNamespace(hook=on_response)
+        built.append(client)
+        return client
+
+    monkeypatch.setattr(warm_mod, "make_reddit", fake_make_reddit)
+    warm = WarmContext()
+    first_calls: list[str] = []
+    second_calls: list[str] = []
+
+    cfg = SimpleNamespace(reddit=REDDIT)
+
+    client = warm.reddit(cfg, on_response=lambda *a: first_calls.append(a[0]))
+    again = warm.reddit(cfg, on_response=lambda *a: second_calls.append(a[0]))
+    client.hook("/r/{sub}/hot", {}, 0.1, 200, 10)
+
+    assert again is client and len(built) == 1
+    assert first_calls == [] and second_calls == ["/r/{sub}/hot"]
+
+    other = SimpleNamespace(client_id="other", client_secret="sec", user_agent="ua")
+    assert warm.reddit(other) is not client
+
+
+def test_supabase_handle_is_shared(monkeypatch) -> None:
+    monkeypatch.setattr(warm_mod, "make_supabase", lambda url, key, schema: object())
+    warm = WarmContext()
+
+    assert warm.supabase("https://x", "k") is warm.supabase("https://x", "k")
+    assert warm.supabase("https://x", "k") is not warm.supabase("https://x", "k", "other")
+
+
+def test_response_cache_is_opened_once_and_keys_the_client(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(warm_mod, "make_reddit", lambda cfg, **kwargs: SimpleNamespace(**kwargs))
+    warm = WarmContext()
+    cache_cfg = HttpCacheConfig(path=str(tmp_path / "c.sqlite"))
+    cache = warm.response_cache(cache_cfg)
+    assert warm.response_cache(cache_cfg) is cache
+
+    cached = warm.reddit(REDDIT, cache=cache)
+    assert cached.cache is cache and warm.reddit(REDDIT, cache=cache) is cached
+    assert warm.reddit(REDDIT) is not cached
+
+
+def test_threaded_runtime_does_not_import_asyncio() -> None:
+    code = (
+        "import sys, reddit_researcher.core.orchestrator; "
+        "assert 'asyncio' not in sys.modules, 'asyncio imported'"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    subprocess.run([sys.executable, "-c", code], check=True, env=env)